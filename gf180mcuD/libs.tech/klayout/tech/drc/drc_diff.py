@@ -0,0 +1,511 @@
+################################################################################################
+# Copyright 2023 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################################
+
+"""
+Compare GlobalFoundries 180nm MCU DRC results of two runs.
+
+Usage:
+    drc_diff.py (--help| -h)
+    drc_diff.py (--old=<old_results>) (--new=<new_results>) [--run_dir=<run_dir_path>] [--tolerance=<tolerance>]
+
+Options:
+    --help -h                           Print this help message.
+    --old=<old_results>                 Reference results, a lyrdb file or a DRC run directory.
+    --new=<new_results>                 Results to compare against the reference, a lyrdb file or a DRC run directory.
+    --run_dir=<run_dir_path>            Run directory to save all the results [default: pwd]
+    --tolerance=<tolerance>             Maximum marker displacement in um to consider two markers the same. [default: 0.005]
+"""
+
+from docopt import docopt
+import os
+import re
+import csv
+import glob
+import logging
+import sqlite3
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+from datetime import datetime
+
+# Spatial hash bucket size in um, it's increased to the tolerance if needed.
+GRID_SIZE = 1.0
+
+# Number of markers inserted into the diff database per transaction.
+BATCH_SIZE = 10000
+
+DIFF_STATUS = ["new", "fixed", "unchanged"]
+
+COORD_PATTERN = re.compile(
+    r"(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?),(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)"
+)
+
+
+def get_results_db_files(results_path: str):
+    """
+    get_results_db_files get the list of results databases for one side of the comparison.
+
+    Parameters
+    ----------
+    results_path : str
+        Path to a lyrdb file or to a DRC run directory that holds lyrdb files.
+
+    Returns
+    -------
+    list
+        Sorted list of the lyrdb files paths.
+    """
+    if os.path.isdir(results_path):
+        results_db_files = sorted(glob.glob(os.path.join(results_path, "*.lyrdb")))
+    elif os.path.isfile(results_path):
+        results_db_files = [results_path]
+    else:
+        results_db_files = []
+
+    if len(results_db_files) < 1:
+        logging.error(f"## No lyrdb results found at {results_path}, please recheck.")
+        exit(1)
+
+    return results_db_files
+
+
+def get_marker_bbox(value: str):
+    """
+    get_marker_bbox get the bounding box of a marker value from its text representation.
+
+    Parameters
+    ----------
+    value : str
+        Marker value as written in the lyrdb file (i.e. "polygon: (0,0;0,1;1,1;1,0)").
+
+    Returns
+    -------
+    tuple or None
+        (xmin, ymin, xmax, ymax) of the marker in um, None if the value has no geometry (float or text values).
+    """
+    coords = COORD_PATTERN.findall(value)
+    if len(coords) < 1:
+        return None
+
+    xs = [float(x) for x, _ in coords]
+    ys = [float(y) for _, y in coords]
+
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def stream_results_db(results_database: str, categories: dict):
+    """
+    stream_results_db iterate over all markers in a results database without loading it into memory.
+
+    Parameters
+    ----------
+    results_database : str
+        Path string to the results file.
+    categories : dict
+        Dictionary that gets updated with the rule names and their descriptions found in the database.
+
+    Yields
+    ------
+    tuple
+        (rule_name, cell_name, value) for each marker value in the database.
+    """
+    items_elem = None
+
+    for ev, elem in ET.iterparse(results_database, events=("start", "end")):
+
+        if ev == "start":
+            if elem.tag == "items":
+                items_elem = elem
+            continue
+
+        if elem.tag == "category" and items_elem is None:
+            name = elem.findtext("name")
+            if name is not None:
+                categories.setdefault(name, elem.findtext("description") or "")
+            continue
+
+        if elem.tag != "item":
+            continue
+
+        rule_name = (elem.findtext("category") or "").replace("'", "")
+        cell_name = elem.findtext("cell") or ""
+
+        for v in elem.iterfind("values/value"):
+            if v.text is not None:
+                yield rule_name, cell_name, v.text.strip()
+
+        ## Clearing memory, processed items aren't needed anymore.
+        items_elem.clear()
+
+
+def create_diff_db(db_path: str):
+    """
+    create_diff_db create the on-disk database used for markers matching.
+
+    Parameters
+    ----------
+    db_path : str
+        Path to the sqlite database file.
+
+    Returns
+    -------
+    sqlite3.Connection
+        Connection to the created database.
+    """
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+
+    for side in ["old", "new"]:
+        conn.execute(
+            f"""
+            CREATE TABLE {side}_markers (
+                rule TEXT, cell TEXT, gx INTEGER, gy INTEGER,
+                xmin REAL, ymin REAL, xmax REAL, ymax REAL,
+                value TEXT, matched INTEGER DEFAULT 0
+            )
+            """
+        )
+
+    conn.execute("CREATE TABLE categories (rule TEXT PRIMARY KEY, description TEXT)")
+
+    return conn
+
+
+def load_markers(conn, side: str, results_db_files: list, grid: float):
+    """
+    load_markers stream all markers of one side of the comparison into the diff database.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Connection to the diff database.
+    side : str
+        Side of the comparison, (old, new).
+    results_db_files : list
+        List of lyrdb files of this side.
+    grid : float
+        Spatial hash bucket size in um.
+
+    Returns
+    -------
+    int
+        Number of markers loaded.
+    """
+    insert_str = f"INSERT INTO {side}_markers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)"
+    categories = dict()
+    markers_count = 0
+    batch = []
+
+    for f in results_db_files:
+        logging.info(f"## Reading {side} results database: {f}")
+
+        for rule_name, cell_name, value in stream_results_db(f, categories):
+            bbox = get_marker_bbox(value)
+            if bbox is None:
+                # Non geometrical values (float, text) are matched by value only.
+                row = (rule_name, cell_name, 0, 0, 0.0, 0.0, 0.0, 0.0, value)
+            else:
+                xmin, ymin, xmax, ymax = bbox
+                gx = int((xmin + xmax) / 2 // grid)
+                gy = int((ymin + ymax) / 2 // grid)
+                row = (rule_name, cell_name, gx, gy, xmin, ymin, xmax, ymax, value)
+
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                conn.executemany(insert_str, batch)
+                markers_count += len(batch)
+                batch = []
+
+    if len(batch) > 0:
+        conn.executemany(insert_str, batch)
+        markers_count += len(batch)
+
+    conn.executemany(
+        "INSERT OR IGNORE INTO categories VALUES (?, ?)", categories.items()
+    )
+    conn.execute(
+        f"CREATE INDEX {side}_spatial_idx ON {side}_markers (rule, cell, gx, gy)"
+    )
+    conn.commit()
+
+    logging.info(f"## Total number of {side} markers loaded: {markers_count}")
+
+    return markers_count
+
+
+def match_markers(conn, tolerance: float, grid: float):
+    """
+    match_markers match every new marker with an unmatched old marker of the same rule and cell within tolerance.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Connection to the diff database.
+    tolerance : float
+        Maximum displacement in um of each marker bounding box edge.
+    grid : float
+        Spatial hash bucket size in um.
+    """
+    lookup_str = """
+        SELECT rowid FROM old_markers
+        WHERE rule = ? AND cell = ? AND gx BETWEEN ? AND ? AND gy BETWEEN ? AND ?
+        AND matched = 0
+        AND abs(xmin - ?) <= ? AND abs(ymin - ?) <= ? AND abs(xmax - ?) <= ? AND abs(ymax - ?) <= ?
+        AND (xmax > xmin OR ymax > ymin OR value = ?)
+        LIMIT 1
+    """
+
+    reader = conn.cursor()
+    writer = conn.cursor()
+    matched_new = []
+    matches_count = 0
+
+    # Bucket reach needed to cover the tolerance around the marker center.
+    reach = int(tolerance // grid) + 1
+
+    for rowid, rule, cell, gx, gy, xmin, ymin, xmax, ymax, value in reader.execute(
+        "SELECT rowid, rule, cell, gx, gy, xmin, ymin, xmax, ymax, value FROM new_markers"
+    ):
+        old_row = writer.execute(
+            lookup_str,
+            (
+                rule, cell, gx - reach, gx + reach, gy - reach, gy + reach,
+                xmin, tolerance, ymin, tolerance, xmax, tolerance, ymax, tolerance,
+                value,
+            ),
+        ).fetchone()
+
+        if old_row is None:
+            continue
+
+        writer.execute("UPDATE old_markers SET matched = 1 WHERE rowid = ?", old_row)
+        matched_new.append((rowid,))
+        matches_count += 1
+
+        if len(matched_new) >= BATCH_SIZE:
+            conn.executemany("UPDATE new_markers SET matched = 1 WHERE rowid = ?", matched_new)
+            matched_new = []
+
+    if len(matched_new) > 0:
+        conn.executemany("UPDATE new_markers SET matched = 1 WHERE rowid = ?", matched_new)
+
+    conn.commit()
+    logging.info(f"## Total number of matched markers: {matches_count}")
+
+
+def get_status_query(status: str):
+    """
+    get_status_query get the query that selects the markers of a diff status.
+
+    Parameters
+    ----------
+    status : str
+        Diff status, one of (new, fixed, unchanged).
+
+    Returns
+    -------
+    str
+        SQL query that returns (rule, cell, value) rows ordered by rule.
+    """
+    if status == "new":
+        return "SELECT rule, cell, value FROM new_markers WHERE matched = 0 ORDER BY rule"
+    elif status == "fixed":
+        return "SELECT rule, cell, value FROM old_markers WHERE matched = 0 ORDER BY rule"
+    else:
+        return "SELECT rule, cell, value FROM new_markers WHERE matched = 1 ORDER BY rule"
+
+
+def write_results_db(conn, status: str, output_path: str):
+    """
+    write_results_db write the markers of a diff status into a lyrdb file that could be viewed in klayout.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Connection to the diff database.
+    status : str
+        Diff status, one of (new, fixed, unchanged).
+    output_path : str
+        Path of the output lyrdb file.
+    """
+    query_str = get_status_query(status)
+
+    rules = [r for (r,) in conn.execute(f"SELECT DISTINCT rule FROM ({query_str})")]
+    cells = [c for (c,) in conn.execute(f"SELECT DISTINCT cell FROM ({query_str})")]
+    descriptions = dict(conn.execute("SELECT rule, description FROM categories"))
+
+    with open(output_path, "w") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<report-database>\n')
+        f.write(f" <description>DRC diff {status} violations</description>\n")
+        f.write(" <original-file/>\n <generator/>\n")
+        f.write(f" <top-cell>{escape(cells[0]) if len(cells) > 0 else ''}</top-cell>\n")
+        f.write(" <tags>\n </tags>\n <categories>\n")
+        for r in rules:
+            f.write(
+                f"  <category>\n   <name>{escape(r)}</name>\n"
+                f"   <description>{escape(descriptions.get(r, ''))}</description>\n"
+                "   <categories>\n   </categories>\n  </category>\n"
+            )
+        f.write(" </categories>\n <cells>\n")
+        for c in cells:
+            f.write(
+                f"  <cell>\n   <name>{escape(c)}</name>\n   <variant/>\n"
+                "   <layout-name/>\n   <references>\n   </references>\n  </cell>\n"
+            )
+        f.write(" </cells>\n <items>\n")
+        for rule, cell, value in conn.execute(query_str):
+            f.write(
+                f"  <item>\n   <tags/>\n   <category>'{escape(rule)}'</category>\n"
+                f"   <cell>{escape(cell)}</cell>\n   <visited>false</visited>\n"
+                "   <multiplicity>1</multiplicity>\n   <comment/>\n   <image/>\n"
+                f"   <values>\n    <value>{escape(value)}</value>\n   </values>\n  </item>\n"
+            )
+        f.write(" </items>\n</report-database>\n")
+
+    logging.info(f"## DRC diff {status} violations database at: {output_path}")
+
+
+def write_diff_reports(conn, diff_run_dir: str):
+    """
+    write_diff_reports write all diff outputs (lyrdb per status, markers CSV and summary CSV).
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Connection to the diff database.
+    diff_run_dir : str
+        Path to the run location.
+
+    Returns
+    -------
+    dict
+        Dictionary that holds the total number of markers per status.
+    """
+    for status in DIFF_STATUS:
+        write_results_db(
+            conn, status, os.path.join(diff_run_dir, f"drc_diff_{status}.lyrdb")
+        )
+
+    markers_csv = os.path.join(diff_run_dir, "drc_diff_markers.csv")
+    with open(markers_csv, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["status", "rule", "cell", "value"])
+        for status in DIFF_STATUS:
+            for rule, cell, value in conn.execute(get_status_query(status)):
+                writer.writerow([status, rule, cell, value])
+
+    summary = dict()
+    for status in DIFF_STATUS:
+        query_str = get_status_query(status)
+        for rule, count in conn.execute(
+            f"SELECT rule, count(*) FROM ({query_str}) GROUP BY rule"
+        ):
+            summary.setdefault(rule, dict.fromkeys(DIFF_STATUS, 0))[status] = count
+
+    summary_csv = os.path.join(diff_run_dir, "drc_diff_summary.csv")
+    with open(summary_csv, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["rule"] + DIFF_STATUS)
+        for rule in sorted(summary):
+            writer.writerow([rule] + [summary[rule][s] for s in DIFF_STATUS])
+
+    logging.info(f"## DRC diff markers at: {markers_csv}")
+    logging.info(f"## DRC diff summary at: {summary_csv}")
+
+    return {s: sum(summary[r][s] for r in summary) for s in DIFF_STATUS}
+
+
+def main(diff_run_dir: str, arguments: dict):
+    """
+    main function to compare the DRC results.
+
+    Parameters
+    ----------
+    diff_run_dir : str
+        String with absolute path of the full run dir.
+    arguments : dict
+        Dictionary that holds the arguments used by user in the run command. This is generated by docopt library.
+    """
+    old_results_files = get_results_db_files(arguments["--old"])
+    new_results_files = get_results_db_files(arguments["--new"])
+
+    tolerance = float(arguments["--tolerance"])
+    if tolerance < 0:
+        logging.error("## Tolerance must be a positive value.")
+        exit(1)
+
+    grid = max(GRID_SIZE, tolerance)
+
+    db_path = os.path.join(diff_run_dir, "drc_diff.db")
+    conn = create_diff_db(db_path)
+
+    load_markers(conn, "old", old_results_files, grid)
+    load_markers(conn, "new", new_results_files, grid)
+    match_markers(conn, tolerance, grid)
+    totals = write_diff_reports(conn, diff_run_dir)
+
+    conn.close()
+    os.remove(db_path)
+
+    logging.info(
+        f"## DRC diff totals: new={totals['new']}, fixed={totals['fixed']}, unchanged={totals['unchanged']}"
+    )
+
+    if totals["new"] > 0:
+        logging.error("DRC results have new violations.")
+        exit(1)
+    else:
+        logging.info("DRC results have no new violations.")
+
+
+# ================================================================
+# -------------------------- MAIN --------------------------------
+# ================================================================
+
+if __name__ == "__main__":
+
+    # arguments
+    arguments = docopt(__doc__, version="DRC DIFF: 1.0")
+
+    # logs format
+    now_str = datetime.utcnow().strftime("drc_diff_%Y_%m_%d_%H_%M_%S")
+
+    if (
+        arguments["--run_dir"] == "pwd"
+        or arguments["--run_dir"] == ""
+        or arguments["--run_dir"] is None
+    ):
+        diff_run_dir = os.path.join(os.path.abspath(os.getcwd()), now_str)
+    else:
+        diff_run_dir = os.path.abspath(arguments["--run_dir"])
+
+    os.makedirs(diff_run_dir, exist_ok=True)
+
+    logging.basicConfig(
+        level=logging.DEBUG,
+        handlers=[
+            logging.FileHandler(os.path.join(diff_run_dir, "{}.log".format(now_str))),
+            logging.StreamHandler(),
+        ],
+        format="%(asctime)s | %(levelname)-7s | %(message)s",
+        datefmt="%d-%b-%Y %H:%M:%S",
+    )
+
+    # Calling main function
+    main(diff_run_dir, arguments)
@@ -19,12 +19,13 @@ Run GlobalFoundries 180nm MCU DRC.
 
 Usage:
     run_drc.py (--help| -h)
-    run_drc.py (--path=<file_path>) (--variant=<combined_options>) [--verbose] [--table=<table_name>]... [--mp=<num_cores>] [--run_dir=<run_dir_path>] [--topcell=<topcell_name>] [--thr=<thr>] [--run_mode=<run_mode>] [--no_feol] [--no_beol] [--no_connectivity] [--density] [--density_only] [--antenna] [--antenna_only] [--no_offgrid] [--split_deep] [--macro_gen] [--slow_via]
+    run_drc.py (--path=<file_path>) (--variant=<combined_options>) [--verbose] [--table=<table_name>]... [--mp=<num_cores>] [--run_dir=<run_dir_path>] [--topcell=<topcell_name>] [--thr=<thr>] [--run_mode=<run_mode>] [--no_feol] [--no_beol] [--no_connectivity] [--density] [--density_only] [--antenna] [--antenna_only] [--no_offgrid] [--split_deep] [--macro_gen] [--slow_via] [--cache_dir=<cache_dir_path>] [--cache_size=<cache_size>] [--clean_lib=<lib_path>]... [--clean_cells_db=<db_path>] [--clean_halo=<halo>] [--fail_fast] [--timeout=<timeout>]
 
 Options:
     --help -h                           Print this help message.
     --path=<file_path>                  The input GDS file path.
     --variant=<combined_options>        Select combined options of metal_top, mim_option, and metal_level. Allowed values (A, B, C, D, E, F).
+                                        Comma separated list of variants (i.e. A,B,C) to check all of them in the same run.
                                         variant=A: Select  metal_top=30K  mim_option=A  metal_level=3LM
                                         variant=B: Select  metal_top=11K  mim_option=B  metal_level=4LM
                                         variant=C: Select  metal_top=9K   mim_option=B  metal_level=5LM
@@ -49,6 +50,13 @@ Options:
     --verbose                           Detailed rule execution log for debugging.
     --macro_gen                         Generating the full rule deck without run.
     --slow_via                          Turn on SLOW_VIA option for MT30.8 rule.
+    --cache_dir=<cache_dir_path>        Enable run results cache at the given directory.
+    --cache_size=<cache_size>           Maximum size of the run results cache in MB. [default: 2048]
+    --clean_lib=<lib_path>              Library layout with known clean cells, matching cells are only checked for context interactions (deep mode only).
+    --clean_cells_db=<db_path>          JSON database of known clean cells hashes, it's updated with the cells of --clean_lib libraries.
+    --clean_halo=<halo>                 Boundary halo in um of known clean cells that is kept for context checks. [default: 2]
+    --fail_fast                         Stop all running checks once a check fails or reports violations.
+    --timeout=<timeout>                 Maximum run time in seconds of each klayout run, the run fails if it exceeds it.
 """
 
 
@@ -59,10 +67,32 @@ import logging
 import klayout.db
 import glob
 from datetime import datetime
-from subprocess import check_call
 import shutil
-import concurrent.futures
-import traceback
+import asyncio
+import time
+import hashlib
+import json
+import re
+
+VARIANTS = {
+    "A": {"metal_top": "30K", "mim_option": "A", "metal_level": "3LM"},
+    "B": {"metal_top": "11K", "mim_option": "B", "metal_level": "4LM"},
+    "C": {"metal_top": "9K", "mim_option": "B", "metal_level": "5LM"},
+    "D": {"metal_top": "11K", "mim_option": "B", "metal_level": "5LM"},
+    "E": {"metal_top": "9K", "mim_option": "B", "metal_level": "6LM"},
+    "F": {"metal_top": "9K", "mim_option": "A", "metal_level": "6LM"},
+}
+
+# Switches and layers that are selected or derived differently per variant in the rule deck.
+VARIANT_SENSITIVE_PATTERN = re.compile(
+    r"\b(METAL_TOP|MIM_OPTION|METAL_LEVEL|top_via|topmin1_via|top_metal|topmin1_metal|metal[345]|metaltop|via[2-5])\b"
+)
+
+# Tables list of the rule deck that build connectivity up to the variant dependent metal stack.
+CONN_TABLES_PATTERN = re.compile(r"^\s*conn_tables\s*=\s*%w\[([^\]]*)\]", re.MULTILINE)
+
+## Interval in seconds between progress summaries of the running checks.
+PROGRESS_INTERVAL = 60
 
 
 def get_rules_with_violations(results_database):
@@ -91,7 +121,31 @@ def get_rules_with_violations(results_database):
     return all_violating_rules
 
 
-def check_drc_results(results_db_files: list):
+def get_all_rules_with_violations(results_db_files: list):
+    """
+    get_all_rules_with_violations get all the rules that has violated in all the databases of a run.
+
+    Parameters
+    ----------
+    results_db_files : list
+        A list of strings that represent paths to results databases of all the DRC runs.
+
+    Returns
+    -------
+    set
+        A set that contains all rules in the databases with violations
+    """
+
+    full_violating_rules = set()
+
+    for f in results_db_files:
+        violating_rules = get_rules_with_violations(f)
+        full_violating_rules.update(violating_rules)
+
+    return full_violating_rules
+
+
+def check_drc_results(results_db_files: list, full_violating_rules: set = None):
     """
     check_drc_results Checks the results db generated from run and report at the end if the DRC run failed or passed.
     This function will exit with 1 if there are violations.
@@ -100,17 +154,16 @@ def check_drc_results(results_db_files: list):
     ----------
     results_db_files : list
         A list of strings that represent paths to results databases of all the DRC runs.
+    full_violating_rules : set, optional
+        Set of rules with violations if already known, by default it's collected from the results databases.
     """
 
     if len(results_db_files) < 1:
         logging.error("Klayout did not generate any rdb results. Please check run logs")
         exit(1)
 
-    full_violating_rules = set()
-
-    for f in results_db_files:
-        violating_rules = get_rules_with_violations(f)
-        full_violating_rules.update(violating_rules)
+    if full_violating_rules is None:
+        full_violating_rules = get_all_rules_with_violations(results_db_files)
 
     if len(full_violating_rules) > 0:
         logging.error("Klayout DRC run is not clean.")
@@ -120,6 +173,382 @@ def check_drc_results(results_db_files: list):
         logging.info("Klayout DRC run is clean. GDS has no DRC violations.")
 
 
+def get_file_hash(file_path: str, hasher=None):
+    """
+    get_file_hash get the sha256 hash of a file content.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file to hash.
+    hasher : hashlib object, optional
+        Hash object to update with the file content, by default a new sha256 object is used.
+
+    Returns
+    -------
+    str
+        Hex digest of the file content.
+    """
+    if hasher is None:
+        hasher = hashlib.sha256()
+
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+def get_run_cache_key(
+    arguments: dict, rule_deck_full_path: str, layout_path: str, switches: dict
+):
+    """
+    get_run_cache_key get the key of the run in the results cache.
+
+    Parameters
+    ----------
+    arguments : dict
+        Dictionary that holds the arguments used by user in the run command. This is generated by docopt library.
+    rule_deck_full_path : str
+        String that holds the path of the rule deck files.
+    layout_path : str
+        Path to the target layout.
+    switches : dict
+        Dictionary that holds all the switches that will be passed to klayout run.
+
+    Returns
+    -------
+    str
+        Hex digest that identifies the run.
+    """
+    deck_hasher = hashlib.sha256()
+    for f in sorted(glob.glob(os.path.join(rule_deck_full_path, "rule_decks", "*.drc"))):
+        deck_hasher.update(os.path.basename(f).encode())
+        get_file_hash(f, deck_hasher)
+
+    # Input path and number of threads don't change the results.
+    run_switches = {k: v for k, v in switches.items() if k not in ("input", "thr")}
+
+    key_data = {
+        "layout_name": os.path.basename(layout_path),
+        "layout_hash": get_file_hash(layout_path),
+        "deck_hash": deck_hasher.hexdigest(),
+        "switches": run_switches,
+        "run_mode": arguments["--run_mode"],
+        "tables": sorted(arguments["--table"]),
+        "antenna": bool(arguments["--antenna"]),
+        "antenna_only": bool(arguments["--antenna_only"]),
+        "density": bool(arguments["--density"]),
+        "density_only": bool(arguments["--density_only"]),
+        "parallel": workers_count != 1,
+    }
+
+    return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode()).hexdigest()
+
+
+def restore_cached_results(cache_dir: str, cache_key: str, drc_run_dir: str):
+    """
+    restore_cached_results copy the results of a previous identical run from the cache to the run directory.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Path to the results cache directory.
+    cache_key : str
+        Key of the run in the results cache.
+    drc_run_dir : str
+        Path to the run location.
+
+    Returns
+    -------
+    tuple or None
+        (list of restored results databases, set of violated rules), None if the run is not cached.
+    """
+    entry_dir = os.path.join(cache_dir, cache_key)
+    verdict_path = os.path.join(entry_dir, "verdict.json")
+
+    if not os.path.isfile(verdict_path):
+        return None
+
+    with open(verdict_path, "r") as f:
+        verdict = json.load(f)
+
+    results_db_files = []
+    for r in verdict["results"]:
+        report_path = os.path.join(drc_run_dir, r)
+        shutil.copyfile(os.path.join(entry_dir, r), report_path)
+        results_db_files.append(report_path)
+
+    # Mark entry as recently used for eviction.
+    os.utime(verdict_path)
+
+    return results_db_files, set(verdict["violated_rules"])
+
+
+def store_cached_results(
+    cache_dir: str,
+    cache_key: str,
+    results_db_files: list,
+    full_violating_rules: set,
+    cache_size: int,
+):
+    """
+    store_cached_results save the results of the run in the cache then evict old entries if needed.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Path to the results cache directory.
+    cache_key : str
+        Key of the run in the results cache.
+    results_db_files : list
+        A list of strings that represent paths to results databases of all the DRC runs.
+    full_violating_rules : set
+        Set of rules with violations in the run.
+    cache_size : int
+        Maximum size of the results cache in MB.
+    """
+    entry_dir = os.path.join(cache_dir, cache_key)
+    tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    for f in results_db_files:
+        shutil.copyfile(f, os.path.join(tmp_dir, os.path.basename(f)))
+
+    # verdict is written last, an entry without it is incomplete.
+    with open(os.path.join(tmp_dir, "verdict.json"), "w") as f:
+        json.dump(
+            {
+                "results": [os.path.basename(r) for r in results_db_files],
+                "violated_rules": sorted(full_violating_rules),
+            },
+            f,
+        )
+
+    shutil.rmtree(entry_dir, ignore_errors=True)
+    os.rename(tmp_dir, entry_dir)
+    logging.info(f"## Run results are cached at: {entry_dir}")
+
+    evict_run_cache(cache_dir, cache_size)
+
+
+def evict_run_cache(cache_dir: str, cache_size: int):
+    """
+    evict_run_cache remove the least recently used cache entries until the cache fits its maximum size.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Path to the results cache directory.
+    cache_size : int
+        Maximum size of the results cache in MB.
+    """
+    entries = []
+    total_size = 0
+
+    for entry_dir in glob.glob(os.path.join(cache_dir, "*", "verdict.json")):
+        entry_dir = os.path.dirname(entry_dir)
+        entry_size = sum(
+            os.path.getsize(f) for f in glob.glob(os.path.join(entry_dir, "*"))
+        )
+        last_used = os.path.getmtime(os.path.join(entry_dir, "verdict.json"))
+        entries.append((last_used, entry_size, entry_dir))
+        total_size += entry_size
+
+    max_size = cache_size * 1024 * 1024
+
+    for _, entry_size, entry_dir in sorted(entries):
+        if total_size <= max_size:
+            break
+        logging.info(f"## Evicting run results cache entry: {entry_dir}")
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        total_size -= entry_size
+
+
+def get_cell_hash(layout, cell_index: int, cell_hashes: dict):
+    """
+    get_cell_hash get the hash of a cell content including all its hierarchy.
+
+    Parameters
+    ----------
+    layout : klayout.db.Layout
+        Layout that holds the cell.
+    cell_index : int
+        Index of the cell to hash.
+    cell_hashes : dict
+        Dictionary of already computed hashes per cell index, it's updated with the computed hashes.
+
+    Returns
+    -------
+    str
+        Hex digest of the cell content.
+    """
+    if cell_index in cell_hashes:
+        return cell_hashes[cell_index]
+
+    cell = layout.cell(cell_index)
+    hasher = hashlib.sha256(f"dbu={layout.dbu}".encode())
+
+    for li in layout.layer_indexes():
+        shapes = sorted(str(sh) for sh in cell.shapes(li).each())
+        if len(shapes) > 0:
+            hasher.update(f"layer={layout.get_info(li)}".encode())
+            hasher.update("\n".join(shapes).encode())
+
+    insts = sorted(
+        f"{get_cell_hash(layout, inst.cell_index, cell_hashes)} {inst.cplx_trans} {inst.a} {inst.b} {inst.na} {inst.nb}"
+        for inst in cell.each_inst()
+    )
+    hasher.update("\n".join(insts).encode())
+
+    cell_hashes[cell_index] = hasher.hexdigest()
+
+    return cell_hashes[cell_index]
+
+
+def load_clean_cells_db(db_path: str, lib_paths: list):
+    """
+    load_clean_cells_db get the known clean cells from the database and the library layouts.
+
+    Parameters
+    ----------
+    db_path : str
+        Path to the JSON database of known clean cells, could be None.
+    lib_paths : list
+        List of paths of library layouts that holds known clean cells.
+
+    Returns
+    -------
+    dict
+        Dictionary that holds the set of known clean hashes per cell name.
+    """
+    db = {"libraries": {}}
+    if db_path and os.path.isfile(db_path):
+        with open(db_path, "r") as f:
+            db = json.load(f)
+
+    for lib_path in lib_paths:
+        lib_hash = get_file_hash(lib_path)
+        if lib_hash in db["libraries"]:
+            continue
+
+        logging.info(f"## Hashing known clean cells of library: {lib_path}")
+        layout = klayout.db.Layout()
+        layout.read(lib_path)
+        cell_hashes = dict()
+        db["libraries"][lib_hash] = {
+            "path": os.path.abspath(lib_path),
+            "cells": {
+                c.name: get_cell_hash(layout, c.cell_index(), cell_hashes)
+                for c in layout.each_cell()
+            },
+        }
+
+    if db_path and len(lib_paths) > 0:
+        with open(db_path, "w") as f:
+            json.dump(db, f, indent=1)
+
+    clean_cells = dict()
+    for lib in db["libraries"].values():
+        for name, cell_hash in lib["cells"].items():
+            clean_cells.setdefault(name, set()).add(cell_hash)
+
+    return clean_cells
+
+
+def generate_context_layout(
+    layout_path: str, topcell: str, clean_cells: dict, halo: float, out_path: str
+):
+    """
+    generate_context_layout write a copy of the layout where known clean cells only keep the shapes needed for context checks.
+    Shapes of a clean cell are kept if they interact with its boundary halo or with any geometry from outside the clean cells placed over it.
+
+    Parameters
+    ----------
+    layout_path : str
+        Path to the target layout.
+    topcell : str
+        Name of the top cell to check.
+    clean_cells : dict
+        Dictionary that holds the set of known clean hashes per cell name.
+    halo : float
+        Boundary halo in um kept for context checks.
+    out_path : str
+        Path of the output layout.
+
+    Returns
+    -------
+    int
+        Number of known clean cells found in the layout.
+    """
+    layout = klayout.db.Layout()
+    layout.read(layout_path)
+    top = layout.cell(topcell)
+    halo_dbu = int(round(halo / layout.dbu))
+
+    cell_hashes = dict()
+    called_cells = set(top.called_cells())
+    matched_cells = [
+        ci
+        for ci in layout.each_cell_top_down()
+        if ci in called_cells
+        and layout.cell_name(ci) in clean_cells
+        and get_cell_hash(layout, ci, cell_hashes) in clean_cells[layout.cell_name(ci)]
+    ]
+
+    if len(matched_cells) < 1:
+        return 0
+
+    # Geometry from outside the clean cells, stored in a cell for fast overlapping search.
+    ctx_layout = klayout.db.Layout()
+    ctx_layout.dbu = layout.dbu
+    ctx_shapes = ctx_layout.cell(ctx_layout.add_cell("context")).shapes(ctx_layout.layer())
+    for li in layout.layer_indexes():
+        shapes_iter = top.begin_shapes_rec(li)
+        shapes_iter.unselect_cells(matched_cells)
+        ctx_shapes.insert(klayout.db.Region(shapes_iter))
+
+    for ci in matched_cells:
+        cell = layout.cell(ci)
+        cell_box = cell.bbox()
+
+        context = klayout.db.Region(cell_box)
+        context -= klayout.db.Region(cell_box.enlarged(-halo_dbu, -halo_dbu))
+
+        inst_iter = klayout.db.RecursiveInstanceIterator(layout, top)
+        inst_iter.targets = [ci]
+        for _ in inst_iter.each():
+            inst_trans = inst_iter.trans() * inst_iter.inst_trans()
+            inst_box = cell_box.transformed(inst_trans)
+            for sh in ctx_shapes.each_overlapping(inst_box):
+                context.insert(sh.polygon.transformed(inst_trans.inverted()))
+
+        context = context.sized(halo_dbu)
+
+        # Flatten the clean cell keeping the shapes needed for context checks only.
+        kept = dict()
+        for li in layout.layer_indexes():
+            kept[li] = klayout.db.Region(cell.begin_shapes_rec(li)).interacting(context)
+        texts = {li: klayout.db.Texts(cell.begin_shapes_rec(li)) for li in layout.layer_indexes()}
+
+        cell.clear()
+        for li in layout.layer_indexes():
+            cell.shapes(li).insert(kept[li])
+            cell.shapes(li).insert(texts[li])
+
+    # Cells only used by the clean cells aren't needed anymore.
+    used_cells = set(top.called_cells()) | {top.cell_index()}
+    unused_cells = [c for c in layout.each_cell() if c.cell_index() not in used_cells]
+    if len(unused_cells) > 0:
+        layout.delete_cells(unused_cells)
+
+    options = klayout.db.SaveLayoutOptions()
+    options.gds2_write_timestamps = False
+    layout.write(out_path, options)
+
+    return len(matched_cells)
+
+
 def generate_drc_run_template(drc_dir: str, run_dir: str, run_tables_list: list = []):
     """
     generate_drc_run_template will generate the template file to run drc in the run_dir path.
@@ -288,6 +717,85 @@ def get_run_top_cell_name(arguments, layout_path):
     return topcell
 
 
+def get_run_variants(arguments):
+    """
+    get_run_variants get the list of variants selected for the run.
+
+    Parameters
+    ----------
+    arguments : dict
+        Dictionary that holds the arguments used by user in the run command. This is generated by docopt library.
+
+    Returns
+    -------
+    list
+        List of the selected variants names.
+    """
+    variants = [v.strip() for v in arguments["--variant"].split(",")]
+
+    if any(v not in VARIANTS for v in variants):
+        logging.error("variant switch allowed values are (A , B, C, D, E, F) only")
+        exit(1)
+
+    # Keeping order of selection while dropping repeated variants.
+    return list(dict.fromkeys(variants))
+
+
+def get_conn_tables(drc_dir: str):
+    """
+    get_conn_tables get the list of tables that enable the connectivity rules in the rule deck.
+
+    Parameters
+    ----------
+    drc_dir : str
+        Path to the DRC folder that holds the rule tables.
+
+    Returns
+    -------
+    list
+        List of the tables names listed in conn_tables of main.drc.
+    """
+    with open(os.path.join(drc_dir, "rule_decks", "main.drc"), "r") as f:
+        conn_tables = CONN_TABLES_PATTERN.search(f.read())
+
+    if not conn_tables:
+        logging.error("## Can't find the conn_tables list in main.drc, please check the rule deck.")
+        exit(1)
+
+    return conn_tables.group(1).split()
+
+
+def is_variant_sensitive_table(drc_dir: str, drc_table: str, sws: dict):
+    """
+    is_variant_sensitive_table check if the results of a rule table could change between variants.
+
+    Parameters
+    ----------
+    drc_dir : str
+        Path to the DRC folder that holds the rule tables.
+    drc_table : str
+        Name of the rule table.
+    sws : dict
+        Dictionary that holds all the switches that will be passed to klayout run.
+
+    Returns
+    -------
+    bool
+        True if the table has to run for each variant.
+    """
+    if sws["conn_drc"] == "true" and drc_table in get_conn_tables(drc_dir):
+        return True
+
+    with open(os.path.join(drc_dir, "rule_decks", f"{drc_table}.drc"), "r") as f:
+        for line in f:
+            if line.lstrip().startswith("#"):
+                continue
+            if VARIANT_SENSITIVE_PATTERN.search(line):
+                return True
+
+    return False
+
+
 def generate_klayout_switches(arguments, layout_path):
     """
     parse_switches Function that parse all the args from input to prepare switches for DRC run.
@@ -314,33 +822,8 @@ def generate_klayout_switches(arguments, layout_path):
         logging.error("Allowed klayout modes are (flat , deep) only")
         exit(1)
 
-    if arguments["--variant"] == "A":
-        switches["metal_top"] = "30K"
-        switches["mim_option"] = "A"
-        switches["metal_level"] = "3LM"
-    elif arguments["--variant"] == "B":
-        switches["metal_top"] = "11K"
-        switches["mim_option"] = "B"
-        switches["metal_level"] = "4LM"
-    elif arguments["--variant"] == "C":
-        switches["metal_top"] = "9K"
-        switches["mim_option"] = "B"
-        switches["metal_level"] = "5LM"
-    elif arguments["--variant"] == "D":
-        switches["metal_top"] = "11K"
-        switches["mim_option"] = "B"
-        switches["metal_level"] = "5LM"
-    elif arguments["--variant"] == "E":
-        switches["metal_top"] = "9K"
-        switches["mim_option"] = "B"
-        switches["metal_level"] = "6LM"
-    elif arguments["--variant"] == "F":
-        switches["metal_top"] = "9K"
-        switches["mim_option"] = "A"
-        switches["metal_level"] = "6LM"
-    else:
-        logging.error("variant switch allowed values are (A , B, C, D, E, F) only")
-        exit(1)
+    # Multi variant runs start from the first variant switches.
+    switches.update(VARIANTS[get_run_variants(arguments)[0]])
 
     if arguments["--verbose"]:
         switches["verbose"] = "true"
@@ -447,21 +930,31 @@ def check_layout_path(layout_path):
     return os.path.abspath(layout_path)
 
 
-def build_switches_string(sws: dict):
+def build_switches_args(sws: dict):
     """
-    build_switches_string Build swtiches string from dictionary.
+    build_switches_args Build klayout switches arguments from dictionary.
 
     Parameters
     ----------
     sws : dict
-        Dictionary that holds the Antenna swithces.
+        Dictionary that holds the klayout run swithces.
+
+    Returns
+    -------
+    list
+        List of klayout command line arguments for the switches.
     """
-    return " ".join(f"-rd {k}={v}" for k, v in sws.items())
+    sws_args = []
+    for k, v in sws.items():
+        sws_args += ["-rd", f"{k}={v}"]
+    return sws_args
 
 
-def run_check(drc_file: str, drc_table: str, path: str, run_dir: str, sws: dict):
+async def run_check(
+    drc_file: str, drc_table: str, path: str, run_dir: str, sws: dict, run_status: dict
+):
     """
-    run_antenna_check run DRC check based on DRC file provided.
+    run_check run DRC check based on DRC file provided, klayout output is streamed to a log file for this run.
 
     Parameters
     ----------
@@ -475,6 +968,8 @@ def run_check(drc_file: str, drc_table: str, path: str, run_dir: str, sws: dict)
         String that holds the full path of the run location.
     sws : dict
         Dictionary that holds all switches that needs to be passed to the antenna checks.
+    run_status : dict
+        Dictionary that holds the status of this run, it's updated with the last klayout output line.
 
     Returns
     -------
@@ -483,10 +978,9 @@ def run_check(drc_file: str, drc_table: str, path: str, run_dir: str, sws: dict)
 
     """
 
-    ## Using print because of the multiprocessing
     logging.info(
         "Running Global Foundries 180nm MCU {} checks on design {} on cell {}:".format(
-            path, drc_table, sws["topcell"]
+            drc_table, path, sws["topcell"]
         )
     )
 
@@ -495,6 +989,7 @@ def run_check(drc_file: str, drc_table: str, path: str, run_dir: str, sws: dict)
     report_path = os.path.join(
         run_dir, "{}_{}.lyrdb".format(layout_base_name, drc_table)
     )
+    log_path = os.path.join(run_dir, "{}_{}.log".format(layout_base_name, drc_table))
 
     new_sws["report"] = report_path
 
@@ -504,15 +999,188 @@ def run_check(drc_file: str, drc_table: str, path: str, run_dir: str, sws: dict)
     else:
         new_sws["run_mode"] = arguments["--run_mode"]
 
-    sws_str = build_switches_string(new_sws)
-    sws_str += f" -rd table_name={drc_table}"
+    new_sws["table_name"] = drc_table
 
-    run_str = f"klayout -b -r {drc_file} {sws_str}"
-    check_call(run_str, shell=True)
+    run_args = ["klayout", "-b", "-r", drc_file] + build_switches_args(new_sws)
+    run_status["log"] = log_path
+
+    proc = await asyncio.create_subprocess_exec(
+        *run_args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT
+    )
+
+    try:
+        with open(log_path, "w") as log_file:
+            async for line in proc.stdout:
+                line = line.decode(errors="replace")
+                log_file.write(line)
+                if line.strip():
+                    run_status["last_line"] = line.strip()
+                if run_status["echo"]:
+                    print(line, end="", flush=True)
+        await proc.wait()
+    finally:
+        ## Killing klayout if the run is cancelled or timed out.
+        if proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"klayout exited with code {proc.returncode}, check the run log {log_path}"
+        )
 
     return report_path
 
 
+async def report_drc_progress(runs_status: dict, total_runs: int):
+    """
+    report_drc_progress log a summary of the running checks periodically.
+
+    Parameters
+    ----------
+    runs_status : dict
+        Dictionary that holds the status of each run name.
+    total_runs : int
+        Number of all the runs.
+    """
+    while True:
+        await asyncio.sleep(PROGRESS_INTERVAL)
+
+        num_done = sum(1 for st in runs_status.values() if st["state"] == "done")
+        logging.info(f"## DRC progress: {num_done}/{total_runs} runs completed.")
+
+        for run_name, st in runs_status.items():
+            if st["state"] != "running":
+                continue
+            elapsed = time.monotonic() - st["start"]
+            logging.info(
+                f"##   {run_name} running for {elapsed:.0f}s: {st.get('last_line', '')}"
+            )
+
+
+async def run_drc_jobs_async(drc_jobs: list, fail_fast: bool, timeout: float):
+    """
+    run_drc_jobs_async run a list of drc checks as concurrent klayout processes.
+
+    Parameters
+    ----------
+    drc_jobs : list
+        List of tuples (run_name, drc_file, drc_table, layout_path, run_dir, switches), one for each klayout run.
+    fail_fast : bool
+        Cancel the remaining runs once a run fails or reports violations.
+    timeout : float
+        Maximum run time in seconds of each run, None for no limit.
+
+    Returns
+    -------
+    tuple
+        Dictionary of the results database of each run name, list of failed runs and list of runs with violations.
+    """
+    sem = asyncio.Semaphore(workers_count)
+    runs_status = {
+        run_name: {"state": "pending", "echo": len(drc_jobs) == 1}
+        for run_name, *_ in drc_jobs
+    }
+
+    async def run_job(run_name, *run_args):
+        async with sem:
+            st = runs_status[run_name]
+            st["state"] = "running"
+            st["start"] = time.monotonic()
+            try:
+                return await asyncio.wait_for(run_check(*run_args, st), timeout)
+            finally:
+                st["state"] = "done"
+
+    task_to_run_name = {
+        asyncio.ensure_future(run_job(*job)): job[0] for job in drc_jobs
+    }
+    progress_task = asyncio.ensure_future(
+        report_drc_progress(runs_status, len(drc_jobs))
+    )
+
+    res_db_files = dict()
+    failed_runs = []
+    dirty_runs = []
+    pending = set(task_to_run_name)
+
+    while pending:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+        for task in done:
+            run_name = task_to_run_name[task]
+            elapsed = time.monotonic() - runs_status[run_name]["start"]
+
+            try:
+                res_db_files[run_name] = task.result()
+            except asyncio.TimeoutError:
+                logging.error(f"{run_name} timed out after {timeout}s.")
+                failed_runs.append(run_name)
+                continue
+            except Exception as exc:
+                logging.error("%s generated an exception: %s" % (run_name, str(exc)))
+                failed_runs.append(run_name)
+                continue
+
+            logging.info(
+                f"## [{len(res_db_files)}/{len(drc_jobs)}] {run_name} completed in {elapsed:.1f}s."
+            )
+
+            if fail_fast and len(get_rules_with_violations(res_db_files[run_name])) > 0:
+                dirty_runs.append(run_name)
+
+        if fail_fast and pending and (failed_runs or dirty_runs):
+            logging.warning(
+                f"## Cancelling {len(pending)} remaining runs due to --fail_fast."
+            )
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            break
+
+    progress_task.cancel()
+    await asyncio.gather(progress_task, return_exceptions=True)
+
+    return res_db_files, failed_runs, dirty_runs
+
+
+def run_drc_jobs(drc_jobs: list):
+    """
+    run_drc_jobs run a list of drc checks in parallel.
+
+    Parameters
+    ----------
+    drc_jobs : list
+        List of tuples (run_name, drc_file, drc_table, layout_path, run_dir, switches), one for each klayout run.
+
+    Returns
+    -------
+    dict
+        Dictionary that holds the path to the results database of each run name.
+    """
+    fail_fast = arguments["--fail_fast"]
+    timeout = float(arguments["--timeout"]) if arguments["--timeout"] else None
+
+    res_db_files, failed_runs, dirty_runs = asyncio.run(
+        run_drc_jobs_async(drc_jobs, fail_fast, timeout)
+    )
+
+    ## Incomplete results can't be trusted or cached.
+    if len(failed_runs) > 0:
+        logging.error(f"Klayout DRC run failed for tables: {failed_runs}")
+        exit(1)
+
+    if len(dirty_runs) > 0:
+        full_violating_rules = get_all_rules_with_violations(
+            [res_db_files[r] for r in dirty_runs]
+        )
+        logging.error(f"Klayout DRC run stopped on violations in tables: {dirty_runs}")
+        logging.error(f"Violated rules are : {str(full_violating_rules)}\n")
+        exit(1)
+
+    return res_db_files
+
+
 def run_parallel_run(
     arguments: dict,
     rule_deck_full_path: str,
@@ -535,13 +1203,18 @@ def run_parallel_run(
         Dictionary that holds all the switches that will be passed to klayout run.
     drc_run_dir : str
         Path to the run location.
+
+    Returns
+    -------
+    list
+        A list of strings that represent paths to results databases of all the DRC runs.
     """
 
     ## Main rule deck creation for macros purpose only
     macros_option = arguments["--macro_gen"]
     if macros_option:
         drc_file = generate_drc_run_template(rule_deck_full_path, drc_run_dir)
-        return 0
+        return []
 
     list_rule_deck_files = dict()
 
@@ -566,31 +1239,123 @@ def run_parallel_run(
         list_rule_deck_files[t] = drc_file
 
     ## Run All DRC files.
-    list_res_db_files = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=workers_count) as executor:
-        future_to_run_name = dict()
-        for n in list_rule_deck_files:
-            future_to_run_name[
-                executor.submit(
-                    run_check,
-                    list_rule_deck_files[n],
-                    n,
-                    layout_path,
-                    drc_run_dir,
-                    switches,
-                )
-            ] = n
-
-        for future in concurrent.futures.as_completed(future_to_run_name):
-            run_name = future_to_run_name[future]
-            try:
-                list_res_db_files.append(future.result())
-            except Exception as exc:
-                logging.error("%s generated an exception: %s" % (run_name, str(exc)))
-                traceback.print_exc()
+    drc_jobs = [
+        (n, list_rule_deck_files[n], n, layout_path, drc_run_dir, switches)
+        for n in list_rule_deck_files
+    ]
 
-    ## Check run
-    check_drc_results(list_res_db_files)
+    return list(run_drc_jobs(drc_jobs).values())
+
+
+def run_multi_variant(
+    arguments: dict,
+    rule_deck_full_path: str,
+    layout_path: str,
+    switches: dict,
+    drc_run_dir: str,
+    variants: list,
+):
+    """
+    run_multi_variant run the drc checks for several variants, variant independent tables are only run once.
+
+    Parameters
+    ----------
+    arguments : dict
+        Dictionary that holds the arguments passed to the run_drc script.
+    rule_deck_full_path : str
+        String that holds the path of the rule deck files.
+    layout_path : str
+        Path to the target layout.
+    switches : dict
+        Dictionary that holds all the switches that will be passed to klayout run.
+    drc_run_dir : str
+        Path to the run location.
+    variants : list
+        List of the variants names to check.
+
+    Returns
+    -------
+    dict
+        Dictionary that holds the list of results databases for each variant.
+    """
+
+    if not arguments["--table"]:
+        list_of_tables = get_list_of_tables(rule_deck_full_path)
+    else:
+        list_of_tables = arguments["--table"]
+
+    list_rule_deck_files = dict()
+
+    if arguments["--antenna"] or arguments["--antenna_only"]:
+        list_rule_deck_files["antenna"] = os.path.join(rule_deck_full_path, "rule_decks", "antenna.drc")
+
+    if arguments["--density"] or arguments["--density_only"]:
+        list_rule_deck_files["density"] = os.path.join(rule_deck_full_path, "rule_decks", "density.drc")
+
+    if not arguments["--antenna_only"] and not arguments["--density_only"]:
+        for t in list_of_tables:
+            list_rule_deck_files[t] = generate_drc_run_template(rule_deck_full_path, drc_run_dir, [t])
+
+    common_tables = [
+        t for t in list_rule_deck_files
+        if not is_variant_sensitive_table(rule_deck_full_path, t, switches)
+    ]
+    variant_tables = [t for t in list_rule_deck_files if t not in common_tables]
+
+    logging.info(f"## Variant independent tables run once: {common_tables}")
+    logging.info(f"## Variant sensitive tables run for each of {variants}: {variant_tables}")
+
+    drc_jobs = []
+
+    common_run_dir = os.path.join(drc_run_dir, "common")
+    os.makedirs(common_run_dir, exist_ok=True)
+    for t in common_tables:
+        drc_jobs.append((t, list_rule_deck_files[t], t, layout_path, common_run_dir, switches))
+
+    for v in variants:
+        variant_run_dir = os.path.join(drc_run_dir, f"variant_{v}")
+        os.makedirs(variant_run_dir, exist_ok=True)
+        variant_sws = switches.copy()
+        variant_sws.update(VARIANTS[v])
+        for t in variant_tables:
+            drc_jobs.append(((v, t), list_rule_deck_files[t], t, layout_path, variant_run_dir, variant_sws))
+
+    res_db_files = run_drc_jobs(drc_jobs)
+
+    common_res_db_files = [res_db_files[t] for t in common_tables]
+
+    return {
+        v: common_res_db_files + [res_db_files[(v, t)] for t in variant_tables]
+        for v in variants
+    }
+
+
+def check_multi_variant_results(variants_res_db_files: dict):
+    """
+    check_multi_variant_results Checks the results of each variant and report at the end if the DRC run failed or passed.
+    This function will exit with 1 if there are violations in any variant.
+
+    Parameters
+    ----------
+    variants_res_db_files : dict
+        Dictionary that holds the list of results databases for each variant.
+    """
+    dirty_variants = []
+
+    for v, results_db_files in variants_res_db_files.items():
+        full_violating_rules = get_all_rules_with_violations(results_db_files)
+        if len(full_violating_rules) > 0:
+            logging.error(f"Klayout DRC run is not clean for variant {v}.")
+            logging.error(f"Violated rules for variant {v} are : {str(full_violating_rules)}\n")
+            dirty_variants.append(v)
+        else:
+            logging.info(f"Klayout DRC run is clean for variant {v}.")
+
+    if len(dirty_variants) > 0:
+        logging.error(f"Klayout DRC run is not clean for variants: {dirty_variants}")
+        exit(1)
+    else:
+        logging.info("Klayout DRC run is clean. GDS has no DRC violations for all variants.")
 
 
 def run_single_processor(
@@ -615,6 +1380,11 @@ def run_single_processor(
         Dictionary that holds all the switches that will be passed to klayout run.
     drc_run_dir : str
         Path to the run location.
+
+    Returns
+    -------
+    list
+        A list of strings that represent paths to results databases of all the DRC runs.
     """
 
     list_res_db_files = []
@@ -623,13 +1393,15 @@ def run_single_processor(
     macros_option = arguments["--macro_gen"]
     if macros_option:
         drc_file = generate_drc_run_template(rule_deck_full_path, drc_run_dir)
-        return 0
+        return []
 
     ## Run Antenna if required.
     if arguments["--antenna"] or arguments["--antenna_only"]:
         drc_path = os.path.join(rule_deck_full_path, "rule_decks", "antenna.drc")
         list_res_db_files.append(
-            run_check(drc_path, "antenna", layout_path, drc_run_dir, switches)
+            run_drc_jobs(
+                [("antenna", drc_path, "antenna", layout_path, drc_run_dir, switches)]
+            )["antenna"]
         )
 
         if arguments["--antenna_only"]:
@@ -640,7 +1412,9 @@ def run_single_processor(
     if arguments["--density"] or arguments["--density_only"]:
         drc_path = os.path.join(rule_deck_full_path, "rule_decks", "density.drc")
         list_res_db_files.append(
-            run_check(drc_path, "density", layout_path, drc_run_dir, switches)
+            run_drc_jobs(
+                [("density", drc_path, "density", layout_path, drc_run_dir, switches)]
+            )["density"]
         )
 
         if arguments["--density_only"]:
@@ -658,11 +1432,12 @@ def run_single_processor(
     ## Run Main DRC
     table_name = arguments["--table"] if arguments["--table"] else ["main"]
     list_res_db_files.append(
-        run_check(drc_file, table_name[0], layout_path, drc_run_dir, switches)
+        run_drc_jobs(
+            [(table_name[0], drc_file, table_name[0], layout_path, drc_run_dir, switches)]
+        )[table_name[0]]
     )
 
-    ## Check run
-    check_drc_results(list_res_db_files)
+    return list_res_db_files
 
 
 def main(drc_run_dir: str, arguments: dict):
@@ -699,22 +1474,95 @@ def main(drc_run_dir: str, arguments: dict):
     layout_path = arguments["--path"]
     layout_path = check_layout_path(layout_path)
 
+    ## Replace known clean cells by their context shapes.
+    if arguments["--clean_lib"] or arguments["--clean_cells_db"]:
+        if arguments["--run_mode"] != "deep":
+            logging.error("Known clean cells are only supported in deep mode.")
+            exit(1)
+
+        # Density and antenna results depend on the shapes removed from the clean cells.
+        if any(arguments[a] for a in ("--density", "--density_only", "--antenna", "--antenna_only")):
+            logging.error("Known clean cells can't be used with density or antenna checks.")
+            exit(1)
+
+        clean_cells = load_clean_cells_db(
+            arguments["--clean_cells_db"], arguments["--clean_lib"]
+        )
+        topcell = get_run_top_cell_name(arguments, layout_path)
+        ctx_run_dir = os.path.join(drc_run_dir, "clean_cells")
+        os.makedirs(ctx_run_dir, exist_ok=True)
+        ctx_layout_path = os.path.join(ctx_run_dir, os.path.basename(layout_path))
+
+        num_clean_cells = generate_context_layout(
+            layout_path, topcell, clean_cells, float(arguments["--clean_halo"]), ctx_layout_path
+        )
+        logging.info(f"## Number of known clean cells found in layout: {num_clean_cells}")
+
+        if num_clean_cells > 0:
+            logging.info(f"## Running on layout with known clean cells context only: {ctx_layout_path}")
+            layout_path = ctx_layout_path
+
     ## Get run switches
     switches = generate_klayout_switches(arguments, layout_path)
 
+    ## Run several variants sharing the variant independent tables.
+    variants = get_run_variants(arguments)
+    if len(variants) > 1 and not arguments["--macro_gen"]:
+        if arguments["--cache_dir"]:
+            logging.error("Multiple variants can't be used with --cache_dir.")
+            exit(1)
+
+        variants_res_db_files = run_multi_variant(
+            arguments, rule_deck_full_path, layout_path, switches, drc_run_dir, variants
+        )
+        check_multi_variant_results(variants_res_db_files)
+        return
+
+    ## Restore results of an identical previous run if cached.
+    cache_dir = arguments["--cache_dir"]
+    use_cache = cache_dir and not arguments["--macro_gen"]
+    if use_cache:
+        cache_dir = os.path.abspath(cache_dir)
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_key = get_run_cache_key(
+            arguments, rule_deck_full_path, layout_path, switches
+        )
+        cached_results = restore_cached_results(cache_dir, cache_key, drc_run_dir)
+        if cached_results is not None:
+            logging.info(f"## Run results restored from cache entry: {cache_key}")
+            check_drc_results(*cached_results)
+            return
+
     if (
         workers_count == 1
         or arguments["--antenna_only"]
         or arguments["--density_only"]
     ):
-        run_single_processor(
+        list_res_db_files = run_single_processor(
             arguments, rule_deck_full_path, layout_path, switches, drc_run_dir
         )
     else:
-        run_parallel_run(
+        list_res_db_files = run_parallel_run(
             arguments, rule_deck_full_path, layout_path, switches, drc_run_dir
         )
 
+    if arguments["--macro_gen"]:
+        return
+
+    ## Check run
+    full_violating_rules = get_all_rules_with_violations(list_res_db_files)
+
+    if use_cache and len(list_res_db_files) > 0:
+        store_cached_results(
+            cache_dir,
+            cache_key,
+            list_res_db_files,
+            full_violating_rules,
+            int(arguments["--cache_size"]),
+        )
+
+    check_drc_results(list_res_db_files, full_violating_rules)
+
 
 # ================================================================
 # -------------------------- MAIN --------------------------------
@@ -0,0 +1,134 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## DRC results diff test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import csv
+import pytest
+import klayout.db as k
+import klayout.rdb as rdb
+
+drc_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, drc_dir)
+
+import drc_diff  # noqa E402
+
+TOLERANCE = 0.005
+
+
+def write_lyrdb(path, markers):
+    """
+    Writes a results database with the given markers
+
+    Args :
+        path : path of the lyrdb file
+        markers : list of (rule name, DBox) of the markers
+    """
+
+    db = rdb.ReportDatabase("drc")
+    cell = db.create_cell("TOP")
+    categories = {}
+
+    for rule, box in markers:
+        if rule not in categories:
+            categories[rule] = db.create_category(rule)
+            categories[rule].description = f"{rule} description"
+        item = db.create_item(cell.rdb_id(), categories[rule].rdb_id())
+        item.add_value(box)
+
+    db.save(str(path))
+
+
+def read_markers(path):
+    """
+    Returns the (status, rule) of the markers CSV of a diff run
+    """
+
+    with open(path) as f:
+        return sorted((row["status"], row["rule"]) for row in csv.DictReader(f))
+
+
+@pytest.fixture
+def diff_run(tmp_path):
+    """
+    Runs the diff of two small results databases, returns the run directory and the totals
+    """
+
+    old_db = tmp_path / "old.lyrdb"
+    new_db = tmp_path / "new.lyrdb"
+
+    write_lyrdb(old_db, [
+        ("M1.1", k.DBox(0, 0, 1, 1)),
+        ("M1.1", k.DBox(10, 10, 11, 11)),
+        ("M1.2", k.DBox(20, 20, 21, 21)),
+        ("M1.2", k.DBox(30, 30, 31, 31)),
+    ])
+    write_lyrdb(new_db, [
+        # just inside the tolerance
+        ("M1.1", k.DBox(0.004, 0, 1.004, 1)),
+        # just outside the tolerance
+        ("M1.1", k.DBox(10.006, 10, 11.006, 11)),
+        # same marker of another rule
+        ("M1.3", k.DBox(20, 20, 21, 21)),
+        ("M1.2", k.DBox(30, 30, 31, 31)),
+    ])
+
+    grid = max(drc_diff.GRID_SIZE, TOLERANCE)
+    conn = drc_diff.create_diff_db(str(tmp_path / "drc_diff.db"))
+    drc_diff.load_markers(conn, "old", [str(old_db)], grid)
+    drc_diff.load_markers(conn, "new", [str(new_db)], grid)
+    drc_diff.match_markers(conn, TOLERANCE, grid)
+    totals = drc_diff.write_diff_reports(conn, str(tmp_path))
+    conn.close()
+
+    return tmp_path, totals
+
+
+def test_diff_status(diff_run):
+    """
+    Checks the new, fixed and unchanged split of the markers within the tolerance
+    """
+
+    run_dir, totals = diff_run
+
+    assert totals == {"new": 2, "fixed": 2, "unchanged": 2}
+    assert read_markers(run_dir / "drc_diff_markers.csv") == [
+        ("fixed", "M1.1"),
+        ("fixed", "M1.2"),
+        ("new", "M1.1"),
+        ("new", "M1.3"),
+        ("unchanged", "M1.1"),
+        ("unchanged", "M1.2"),
+    ]
+
+
+def test_diff_results_db(diff_run):
+    """
+    Checks that the results databases of each status are readable by klayout
+    """
+
+    run_dir, totals = diff_run
+
+    for status in drc_diff.DIFF_STATUS:
+        db = rdb.ReportDatabase("diff")
+        db.load(str(run_dir / f"drc_diff_{status}.lyrdb"))
+        assert db.num_items() == totals[status]
+
+    db = rdb.ReportDatabase("diff")
+    db.load(str(run_dir / "drc_diff_new.lyrdb"))
+    assert sorted(c.name() for c in db.each_category()) == ["M1.1", "M1.3"]
@@ -0,0 +1,159 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## DRC run options test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import time
+import pytest
+import klayout.db as k
+
+drc_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, drc_dir)
+
+import run_drc  # noqa E402
+from run_drc import get_conn_tables, is_variant_sensitive_table  # noqa E402
+
+
+def run_arguments(**options):
+    """
+    Returns the run arguments of a plain run, updated with the given options
+
+    Args :
+        options : docopt arguments of the run
+    """
+
+    arguments = {
+        "--run_mode": "deep",
+        "--table": [],
+        "--antenna": False,
+        "--antenna_only": False,
+        "--density": False,
+        "--density_only": False,
+    }
+    arguments.update(options)
+
+    return arguments
+
+
+@pytest.fixture
+def layout_path(tmp_path):
+    """
+    Writes a small layout to run on
+    """
+
+    layout = k.Layout()
+    top = layout.create_cell("TOP")
+    top.shapes(layout.layer(22, 0)).insert(k.Box(0, 0, 1000, 1000))
+    path = tmp_path / "top.gds"
+    layout.write(str(path))
+
+    return str(path)
+
+
+def test_conn_tables():
+    """
+    Checks that the connectivity tables are read from the rule deck
+    """
+
+    conn_tables = get_conn_tables(drc_dir)
+    assert {"dnwell", "nwell_split", "ldnmos", "ldpmos_split", "main"} <= set(conn_tables)
+
+
+@pytest.mark.parametrize("drc_table", ["ldnmos", "ldnmos_split", "nwell_split", "dnwell_split"])
+def test_conn_tables_variant_sensitive(drc_table):
+    """
+    Checks that the connectivity tables run for each variant only when the connectivity is enabled
+
+    Args :
+        drc_table : name of the rule table
+    """
+
+    assert is_variant_sensitive_table(drc_dir, drc_table, {"conn_drc": "true"})
+    assert not is_variant_sensitive_table(drc_dir, drc_table, {"conn_drc": "false"})
+
+
+def test_variant_sensitive_tables():
+    """
+    Checks the tables using the variant switches and layers regardless of the connectivity
+    """
+
+    assert is_variant_sensitive_table(drc_dir, "metal4", {"conn_drc": "false"})
+    assert not is_variant_sensitive_table(drc_dir, "comp", {"conn_drc": "true"})
+
+
+def test_run_cache_key(monkeypatch, layout_path):
+    """
+    Checks that the runs checking different rules don't share their cache entry
+    """
+
+    monkeypatch.setattr(run_drc, "workers_count", 1, raising=False)
+    switches = {"input": layout_path, "thr": "2", "variant": "A"}
+
+    def cache_key(**options):
+        return run_drc.get_run_cache_key(run_arguments(**options), drc_dir, layout_path, switches)
+
+    plain_key = cache_key()
+    assert cache_key() == plain_key
+    assert run_drc.get_run_cache_key(
+        run_arguments(), drc_dir, layout_path, dict(switches, input="other.gds", thr="8")
+    ) == plain_key
+
+    keys = [
+        plain_key,
+        cache_key(**{"--density_only": True}),
+        cache_key(**{"--antenna_only": True}),
+        cache_key(**{"--density": True}),
+        cache_key(**{"--antenna": True}),
+        cache_key(**{"--table": ["comp"]}),
+    ]
+    assert len(set(keys)) == len(keys)
+
+    monkeypatch.setattr(run_drc, "workers_count", 4)
+    assert cache_key() != plain_key
+
+
+def test_run_cache_eviction(tmp_path):
+    """
+    Checks that the cached results are restored and the least recently used entries are evicted
+    """
+
+    cache_dir = str(tmp_path / "cache")
+    run_dir = tmp_path / "run"
+    run_dir.mkdir()
+
+    for i, key in enumerate(["a", "b", "c"]):
+        results = run_dir / f"{key}.lyrdb"
+        results.write_bytes(b"x" * 400 * 1024)
+        run_drc.store_cached_results(cache_dir, key, [str(results)], {f"rule_{key}"}, 1)
+        # entries used in order a, b, c
+        verdict = os.path.join(cache_dir, key, "verdict.json")
+        os.utime(verdict, (time.time() - 100 + i, time.time() - 100 + i))
+
+    # the last entry was stored past the cache size and the oldest one was evicted
+    assert sorted(os.listdir(cache_dir)) == ["b", "c"]
+
+    restore_dir = tmp_path / "restore"
+    restore_dir.mkdir()
+    results, violated_rules = run_drc.restore_cached_results(cache_dir, "b", str(restore_dir))
+    assert results == [str(restore_dir / "b.lyrdb")]
+    assert violated_rules == {"rule_b"}
+    assert run_drc.restore_cached_results(cache_dir, "a", str(restore_dir)) is None
+
+    # b is now the most recently used entry
+    run_drc.evict_run_cache(cache_dir, 0.5)
+    assert sorted(os.listdir(cache_dir)) == ["b"]
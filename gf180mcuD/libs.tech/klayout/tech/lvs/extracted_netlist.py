@@ -0,0 +1,353 @@
+################################################################################################
+# Copyright 2023 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################################
+
+"""Compact binary format of the GF180MCU LVS extracted netlist.
+
+The file is written by run_lvs.py with --netlist_format=nlb and read with BinaryNetlist,
+which memory-maps the file and reads each circuit, device and subcircuit only when it's iterated.
+All numbers are little-endian.
+
+    header          magic "GFNL", version (u16), flags (u16), string count (u32), device class count (u32),
+                    circuit count (u32), string index offset (u64), device class offset (u64), circuit index offset (u64)
+    circuit bodies  one per circuit, at the offset given in the circuit index:
+                        pins         pin count x (pin name, net)
+                        nets         net count x (net name)
+                        devices      device count x (device name, device class,
+                                     terminal count x (net), parameter count x (value (f64)))
+                        subcircuits  subcircuit count x (subcircuit name, circuit, pin count x (net))
+    strings         utf-8 data of all names
+    string index    string count x (offset (u64), length (u32))
+    device classes  device class count x (model, terminal count (u16), parameter count (u16),
+                    terminal count x (terminal name), parameter count x (parameter name))
+    circuit index   circuit count x (circuit name, pin count, net count, device count, subcircuit count, body offset (u64))
+
+Names are string indices and nets are net indices in the circuit (u32), NO_NET is an unconnected pin or terminal.
+Terminals and parameters of a device are in the order of its device class, and the pins of a subcircuit
+are in the pin order of its circuit, given by its index in the circuit index.
+Names are read as written by the klayout SPICE reader, i.e. upper case.
+"""
+
+import mmap
+import struct
+from collections import namedtuple
+
+NETLIST_MAGIC = b"GFNL"
+NETLIST_VERSION = 1
+NO_NET = 0xFFFFFFFF
+
+HEADER = struct.Struct("<4sHHIIIQQQ")
+STRING_ENTRY = struct.Struct("<QI")
+CIRCUIT_ENTRY = struct.Struct("<IIIIIQ")
+PIN = struct.Struct("<II")
+NET = struct.Struct("<I")
+DEVICE_CLASS = struct.Struct("<IHH")
+DEVICE = struct.Struct("<II")
+PARAMETER = struct.Struct("<d")
+SUBCIRCUIT = struct.Struct("<II")
+
+NetlistPin = namedtuple("NetlistPin", ["name", "net"])
+NetlistDevice = namedtuple("NetlistDevice", ["name", "model", "terminals", "parameters"])
+NetlistSubcircuit = namedtuple("NetlistSubcircuit", ["name", "circuit", "pins"])
+
+
+def write_binary_netlist(netlist, netlist_path: str):
+    """
+    write_binary_netlist write a klayout netlist in the binary netlist format.
+
+    Parameters
+    ----------
+    netlist : klayout.db.Netlist
+        Netlist to write.
+    netlist_path : str
+        Path of the binary netlist file.
+    """
+    strings = {}
+    device_classes = {}
+
+    def string_id(name: str):
+        return strings.setdefault(name or "", len(strings))
+
+    def device_class_id(device_class):
+        if device_class.name not in device_classes:
+            device_classes[device_class.name] = (
+                len(device_classes),
+                list(device_class.terminal_definitions()),
+                list(device_class.parameter_definitions()),
+            )
+        return device_classes[device_class.name]
+
+    circuits = list(netlist.each_circuit())
+    circuit_ids = {c.name: i for i, c in enumerate(circuits)}
+    circuit_entries = []
+
+    with open(netlist_path, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+
+        for circuit in circuits:
+            offset = f.tell()
+            nets = list(circuit.each_net())
+            net_ids = {n.expanded_name(): i for i, n in enumerate(nets)}
+
+            def net_id(net):
+                return NO_NET if net is None else net_ids[net.expanded_name()]
+
+            pins = list(circuit.each_pin())
+            for pin in pins:
+                f.write(PIN.pack(string_id(pin.name()), net_id(circuit.net_for_pin(pin))))
+
+            for net in nets:
+                f.write(NET.pack(string_id(net.expanded_name())))
+
+            device_count = 0
+            for device in circuit.each_device():
+                class_id, terminals, parameters = device_class_id(device.device_class())
+                f.write(DEVICE.pack(string_id(device.expanded_name()), class_id))
+                for td in terminals:
+                    f.write(NET.pack(net_id(device.net_for_terminal(td.id()))))
+                for pd in parameters:
+                    f.write(PARAMETER.pack(device.parameter(pd.id())))
+                device_count += 1
+
+            subcircuit_count = 0
+            for subcircuit in circuit.each_subcircuit():
+                ref_pins = list(subcircuit.circuit_ref().each_pin())
+                f.write(
+                    SUBCIRCUIT.pack(
+                        string_id(subcircuit.expanded_name()),
+                        circuit_ids[subcircuit.circuit_ref().name],
+                    )
+                )
+                for pin in ref_pins:
+                    f.write(NET.pack(net_id(subcircuit.net_for_pin(pin.id()))))
+                subcircuit_count += 1
+
+            circuit_entries.append(
+                (string_id(circuit.name), len(pins), len(nets), device_count, subcircuit_count, offset)
+            )
+
+        class_entries = []
+        for name, (_, terminals, parameters) in device_classes.items():
+            class_entries.append(
+                DEVICE_CLASS.pack(string_id(name), len(terminals), len(parameters))
+                + b"".join(NET.pack(string_id(td.name)) for td in terminals)
+                + b"".join(NET.pack(string_id(pd.name)) for pd in parameters)
+            )
+
+        string_entries = []
+        for name in strings:
+            data = name.encode("utf-8")
+            string_entries.append((f.tell(), len(data)))
+            f.write(data)
+
+        string_index_offset = f.tell()
+        for entry in string_entries:
+            f.write(STRING_ENTRY.pack(*entry))
+
+        device_class_offset = f.tell()
+        for entry in class_entries:
+            f.write(entry)
+
+        circuit_index_offset = f.tell()
+        for entry in circuit_entries:
+            f.write(CIRCUIT_ENTRY.pack(*entry))
+
+        f.seek(0)
+        f.write(
+            HEADER.pack(
+                NETLIST_MAGIC,
+                NETLIST_VERSION,
+                0,
+                len(strings),
+                len(device_classes),
+                len(circuits),
+                string_index_offset,
+                device_class_offset,
+                circuit_index_offset,
+            )
+        )
+
+
+class BinaryNetlistCircuit:
+    """
+    BinaryNetlistCircuit is a circuit of a binary netlist, its content is read when it's accessed.
+    """
+
+    def __init__(self, netlist, name: str, counts: tuple, offset: int):
+        self.netlist = netlist
+        self.name = name
+        self.pin_count, self.net_count, self.device_count, self.subcircuit_count = counts
+        self.offset = offset
+
+    def __repr__(self):
+        return f"BinaryNetlistCircuit({self.name!r})"
+
+    @property
+    def nets(self):
+        """List of the net names of the circuit, indexed by net."""
+        start = self.offset + self.pin_count * PIN.size
+        return [
+            self.netlist.string(NET.unpack_from(self.netlist.data, start + i * NET.size)[0])
+            for i in range(self.net_count)
+        ]
+
+    @property
+    def pins(self):
+        """List of the pins of the circuit with their net names."""
+        data = self.netlist.data
+        pins = []
+        for i in range(self.pin_count):
+            name, net = PIN.unpack_from(data, self.offset + i * PIN.size)
+            pins.append(NetlistPin(self.netlist.string(name), self.net_name(net)))
+        return pins
+
+    def net_name(self, net: int):
+        """Name of the net at the given index of the circuit, None if unconnected."""
+        if net == NO_NET:
+            return None
+        start = self.offset + self.pin_count * PIN.size
+        return self.netlist.string(NET.unpack_from(self.netlist.data, start + net * NET.size)[0])
+
+    def _devices_offset(self):
+        return self.offset + self.pin_count * PIN.size + self.net_count * NET.size
+
+    def _iter_devices(self):
+        data = self.netlist.data
+        string = self.netlist.string
+        pos = self._devices_offset()
+        for _ in range(self.device_count):
+            name, device_class = DEVICE.unpack_from(data, pos)
+            model, terminal_names, parameter_names = self.netlist.device_classes[device_class]
+            pos += DEVICE.size
+            terminals = {}
+            for terminal in terminal_names:
+                terminals[terminal] = self.net_name(NET.unpack_from(data, pos)[0])
+                pos += NET.size
+            parameters = {}
+            for parameter in parameter_names:
+                parameters[parameter] = PARAMETER.unpack_from(data, pos)[0]
+                pos += PARAMETER.size
+            yield pos, NetlistDevice(string(name), model, terminals, parameters)
+
+    def each_device(self):
+        """Iterate the devices of the circuit."""
+        for _, device in self._iter_devices():
+            yield device
+
+    def each_subcircuit(self):
+        """Iterate the subcircuits of the circuit, pins are given by the pin names of the subcircuit circuit."""
+        data = self.netlist.data
+        pos = self._devices_offset()
+        for pos, _ in self._iter_devices():
+            pass
+
+        for _ in range(self.subcircuit_count):
+            name, circuit = SUBCIRCUIT.unpack_from(data, pos)
+            pos += SUBCIRCUIT.size
+            ref = self.netlist.circuit_at(circuit)
+            pins = {}
+            for pin in ref.pins:
+                pins[pin.name] = self.net_name(NET.unpack_from(data, pos)[0])
+                pos += NET.size
+            yield NetlistSubcircuit(self.netlist.string(name), ref.name, pins)
+
+
+class BinaryNetlist:
+    """
+    BinaryNetlist reads a binary netlist file written by write_binary_netlist.
+
+    The file is memory-mapped and circuits are read lazily while iterating, e.g.
+
+        with BinaryNetlist("top.nlb") as netlist:
+            for circuit in netlist.each_circuit():
+                for device in circuit.each_device():
+                    print(circuit.name, device.name, device.model, device.terminals, device.parameters)
+    """
+
+    def __init__(self, netlist_path: str):
+        self.path = netlist_path
+        self._file = open(netlist_path, "rb")
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{netlist_path} is not a binary netlist")
+
+        (
+            magic,
+            version,
+            _,
+            self.string_count,
+            device_class_count,
+            self.circuit_count,
+            self._string_index,
+            device_class_offset,
+            self._circuit_index,
+        ) = HEADER.unpack_from(self.data, 0)
+        if magic != NETLIST_MAGIC or version != NETLIST_VERSION:
+            self.close()
+            raise ValueError(f"{netlist_path} is not a binary netlist of version {NETLIST_VERSION}")
+
+        self._strings = {}
+
+        ## Device classes are few, they're read once for all devices.
+        self.device_classes = []
+        pos = device_class_offset
+        for _ in range(device_class_count):
+            model, terminal_count, parameter_count = DEVICE_CLASS.unpack_from(self.data, pos)
+            pos += DEVICE_CLASS.size
+            names = [
+                self.string(NET.unpack_from(self.data, pos + i * NET.size)[0])
+                for i in range(terminal_count + parameter_count)
+            ]
+            pos += (terminal_count + parameter_count) * NET.size
+            self.device_classes.append((self.string(model), names[:terminal_count], names[terminal_count:]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Close the memory map and the file of the netlist."""
+        self.data.close()
+        self._file.close()
+
+    def string(self, index: int):
+        """String of the netlist at the given index."""
+        if index not in self._strings:
+            offset, length = STRING_ENTRY.unpack_from(self.data, self._string_index + index * STRING_ENTRY.size)
+            self._strings[index] = self.data[offset : offset + length].decode("utf-8")
+        return self._strings[index]
+
+    def circuit_at(self, index: int):
+        """Circuit at the given index of the circuit index."""
+        name, *counts, offset = CIRCUIT_ENTRY.unpack_from(
+            self.data, self._circuit_index + index * CIRCUIT_ENTRY.size
+        )
+        return BinaryNetlistCircuit(self, self.string(name), tuple(counts), offset)
+
+    def each_circuit(self):
+        """Iterate the circuits of the netlist."""
+        for i in range(self.circuit_count):
+            yield self.circuit_at(i)
+
+    def circuit_by_name(self, name: str):
+        """Circuit with the given name, None if not found."""
+        for circuit in self.each_circuit():
+            if circuit.name == name:
+                return circuit
+        return None
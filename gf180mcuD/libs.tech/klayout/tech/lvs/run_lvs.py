@@ -18,10 +18,12 @@
 
 Usage:
     run_lvs.py (--help| -h)
-    run_lvs.py (--layout=<layout_path>) (--netlist=<netlist_path>) (--variant=<combined_options>) [--thr=<thr>] [--run_dir=<run_dir_path>] [--topcell=<topcell_name>] [--run_mode=<run_mode>] [--verbose] [--lvs_sub=<sub_name>] [--no_net_names] [--spice_comments] [--scale] [--schematic_simplify] [--net_only] [--top_lvl_pins] [--combine] [--purge] [--purge_nets]
+    run_lvs.py (--summarize=<lvsdb_path>)
+    run_lvs.py (--layout=<layout_path>) (--netlist=<netlist_path>) (--variant=<combined_options>) [--thr=<thr>] [--run_dir=<run_dir_path>] [--topcell=<topcell_name>] [--run_mode=<run_mode>] [--verbose] [--lvs_sub=<sub_name>] [--no_net_names] [--spice_comments] [--scale] [--schematic_simplify] [--net_only] [--top_lvl_pins] [--combine] [--purge] [--purge_nets] [--partition] [--mp=<num_cores>] [--extract_only] [--cache_dir=<cache_dir_path>] [--device_scope] [--schematic_cache=<cache_dir_path>] [--profile] [--incremental] [--netlist_format=<format>]
 
 Options:
     --help -h                           Print this help message.
+    --summarize=<lvsdb_path>            Write the JSON summary of an existing LVS results database, no LVS run.
     --layout=<layout_path>              The input GDS file path.
     --netlist=<netlist_path>            The input netlist file path.
     --variant=<combined_options>        Select combined options of metal_top, mim_option, and metal_level. Allowed values (A, B, C, D).
@@ -29,6 +31,7 @@ Options:
                                         variant=B: Select  metal_top=11K  mim_option=B  metal_level=4LM  poly_res=1K, and mim_cap=2
                                         variant=C: Select  metal_top=9K   mim_option=B  metal_level=5LM  poly_res=1K, and mim_cap=2
                                         variant=D: Select  metal_top=11K  mim_option=B  metal_level=5LM  poly_res=1K, and mim_cap=2
+                                        Comma separated variants (e.g. A,B,C,D) are run in parallel with one report per variant.
     --thr=<thr>                         The number of threads used in run.
     --run_dir=<run_dir_path>            Run directory to save all the results [default: pwd]
     --topcell=<topcell_name>            Topcell name to use.
@@ -44,14 +47,103 @@ Options:
     --combine                           Enable netlist combine only in extracted netlist.
     --purge                             Enable netlist purge all only in extracted netlist.
     --purge_nets                        Enable netlist purge nets only in extracted netlist.
+    --partition                         Compare the subcircuits of the topcell in separate parallel runs.
+    --mp=<num_cores>                    The number of partition or variant runs in parallel. By default, all variants run in parallel and partitions run one at a time.
+    --extract_only                      Extract the layout netlist only without comparing it to the input netlist.
+    --cache_dir=<cache_dir_path>        Enable extraction cache at the given directory, unchanged layouts are only compared again.
+    --device_scope                      Run the rule decks of the device families used in the layout or the netlist only.
+    --schematic_cache=<cache_dir_path>  Pre-parse the input netlist with its includes to the subcircuits of the topcell only, cached at the given directory.
+    --profile                           Record the run time and memory of each LVS phase in a JSON report next to the results database.
+    --incremental                       With --cache_dir, compare again only the subcircuits whose schematic changed since the previous run of the same layout.
+    --netlist_format=<format>           Select the extracted netlist format. Allowed formats (spice, gz, zst, nlb). [default: spice]
 """
 
 from docopt import docopt
 import os
+import re
 import logging
+import glob
+import hashlib
+import json
+import shutil
 import klayout.db
+from extracted_netlist import write_binary_netlist
 from datetime import datetime
 from subprocess import check_call
+import concurrent.futures
+import traceback
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+## lvsdb keywords in long and short formats.
+LVSDB_XREF_KEYS = ["xref(", "Z("]
+LVSDB_STATUS = {
+    "match": "match",
+    "1": "match",
+    "nomatch": "nomatch",
+    "X": "nomatch",
+    "mismatch": "mismatch",
+    "0": "mismatch",
+    "warning": "warning",
+    "W": "warning",
+    "skipped": "skipped",
+    "S": "skipped",
+}
+LVSDB_XREF_KINDS = {
+    "net": "nets",
+    "N": "nets",
+    "pin": "pins",
+    "P": "pins",
+    "device": "devices",
+    "D": "devices",
+    "circuit": "subcircuits",
+    "X": "subcircuits",
+}
+LVSDB_NETLIST_KEYS = {"layout(": "layout", "J(": "layout", "reference(": "reference", "H(": "reference"}
+LVSDB_LOG_SEVERITY = {"error": "error", "E": "error", "warning": "warning", "W": "warning"}
+
+## Number of mismatches and log messages kept in the LVS summary.
+LVS_SUMMARY_TOP_N = 50
+
+## Number of the slowest LVS phases logged at the end of a profiled run.
+LVS_PROFILE_TOP_N = 10
+
+LVSDB_ITEM_PATTERN = re.compile(
+    r"^\s*(\w+)\(('(?:[^'\\]|\\.)*'|\S+) ('(?:[^'\\]|\\.)*'|\S+) (\w+)"
+)
+LVSDB_NAME_PATTERN = re.compile(r"\b(?:name|I)\(('(?:[^'\\]|\\.)*'|[^)\s]+)\)")
+LVSDB_LOG_PATTERN = re.compile(r"^\s*\w+\((\w+) \w+\('((?:[^'\\]|\\.)*)'")
+
+## Marker layers of each device family, a family without its markers in the layout has no devices.
+LVS_DEVICE_FAMILIES = {
+    "mos": ["poly2"],
+    "bjt": ["drc_bjt"],
+    "diode": ["diode_mk", "well_diode_mk", "schottky_diode"],
+    "res": ["res_mk", "metal1_res", "metal2_res", "metal3_res", "metal4_res", "metal5_res", "metal6_res"],
+    "mimcap": ["fusetop"],
+    "moscap": ["mos_cap_mk"],
+    "mos_sab": ["esd_mk"],
+    "efuse": ["efuse_mk"],
+}
+
+LVS_INCLUDE_PATTERN = re.compile(r"^#\s*%include\s+(\S+)")
+LVS_FAMILY_DECK_PATTERN = re.compile(r"^(\w+)_(?:derivations|connections|extraction)$")
+
+SPICE_INCLUDE_PATTERN = re.compile(r"^\.inc(?:lude)?\s+['\"]?([^'\"\s]+)", re.IGNORECASE)
+SPICE_SUBCKT_PATTERN = re.compile(r"^\.subckt\s+(\S+)", re.IGNORECASE)
+SPICE_ENDS_PATTERN = re.compile(r"^\.ends\b", re.IGNORECASE)
+SPICE_END_PATTERN = re.compile(r"^\.end\s*$", re.IGNORECASE)
+
+## Extracted netlist file extension of each netlist format, and the extension of the netlist written by klayout for it.
+EXTRACTED_NETLIST_FORMATS = {
+    "spice": (".cir", ".cir"),
+    "gz": (".cir.gz", ".cir.gz"),
+    "zst": (".cir.zst", ".cir"),
+    "nlb": (".nlb", ".cir.gz"),
+}
 
 
 def check_klayout_version():
@@ -168,55 +260,41 @@ def get_run_top_cell_name(arguments, layout_path):
     return topcell
 
 
-def generate_klayout_switches(arguments, layout_path, netlist_path):
+def get_variant_switches(variant):
     """
-    parse_switches Function that parse all the args from input to prepare switches for LVS run.
+    get_variant_switches Get the switches of the combined options of a variant.
 
     Parameters
     ----------
-    arguments : dict
-        Dictionary that holds the arguments used by user in the run command. This is generated by docopt library.
-    layout_path : string
-        Path to the layout file that we will run LVS on.
-    netlist_path : string
-        Path to the netlist file that we will run LVS on.
+    variant : string
+        Variant name, allowed values are (A, B, C, D).
 
     Returns
     -------
     dict
-        Dictionary that represent all run switches passed to klayout.
+        Dictionary that holds the metal_top, mim_option, metal_level, poly_res and mim_cap switches.
     """
     switches = dict()
 
-    # No. of threads
-    thrCount = 2 if arguments["--thr"] is None else int(arguments["--thr"])
-    switches["thr"] = str(int(thrCount))
-
-    if arguments["--run_mode"] in ["flat", "deep", "tiling"]:
-        switches["run_mode"] = arguments["--run_mode"]
-    else:
-        logging.error("Allowed klayout modes are (flat , deep , tiling) only")
-        exit()
-
-    if arguments["--variant"] == "A":
+    if variant == "A":
         switches["metal_top"] = "30K"
         switches["mim_option"] = "A"
         switches["metal_level"] = "3LM"
         switches["poly_res"] = "1k"
         switches["mim_cap"] = "2"
-    elif arguments["--variant"] == "B":
+    elif variant == "B":
         switches["metal_top"] = "11K"
         switches["mim_option"] = "B"
         switches["metal_level"] = "4LM"
         switches["poly_res"] = "1k"
         switches["mim_cap"] = "2"
-    elif arguments["--variant"] == "C":
+    elif variant == "C":
         switches["metal_top"] = "9K"
         switches["mim_option"] = "B"
         switches["metal_level"] = "5LM"
         switches["poly_res"] = "1k"
         switches["mim_cap"] = "2"
-    elif arguments["--variant"] == "D":
+    elif variant == "D":
         switches["metal_top"] = "11K"
         switches["mim_option"] = "B"
         switches["metal_level"] = "5LM"
@@ -226,6 +304,66 @@ def generate_klayout_switches(arguments, layout_path, netlist_path):
         logging.error("variant switch allowed values are (A , B, C, D) only")
         exit(1)
 
+    return switches
+
+
+def get_run_variants(arguments):
+    """
+    get_run_variants get the list of variants selected for the run.
+
+    Parameters
+    ----------
+    arguments : dict
+        Dictionary that holds the arguments used by user in the run command. This is generated by docopt library.
+
+    Returns
+    -------
+    list
+        List of the selected variants names.
+    """
+    variants = [v.strip() for v in arguments["--variant"].split(",")]
+
+    for variant in variants:
+        get_variant_switches(variant)
+
+    # Keeping order of selection while dropping repeated variants.
+    return list(dict.fromkeys(variants))
+
+
+def generate_klayout_switches(arguments, layout_path, netlist_path, variant):
+    """
+    parse_switches Function that parse all the args from input to prepare switches for LVS run.
+
+    Parameters
+    ----------
+    arguments : dict
+        Dictionary that holds the arguments used by user in the run command. This is generated by docopt library.
+    layout_path : string
+        Path to the layout file that we will run LVS on.
+    netlist_path : string
+        Path to the netlist file that we will run LVS on.
+    variant : string
+        Variant name used for the run switches.
+
+    Returns
+    -------
+    dict
+        Dictionary that represent all run switches passed to klayout.
+    """
+    switches = dict()
+
+    # No. of threads
+    thrCount = 2 if arguments["--thr"] is None else int(arguments["--thr"])
+    switches["thr"] = str(int(thrCount))
+
+    if arguments["--run_mode"] in ["flat", "deep", "tiling"]:
+        switches["run_mode"] = arguments["--run_mode"]
+    else:
+        logging.error("Allowed klayout modes are (flat , deep , tiling) only")
+        exit()
+
+    switches.update(get_variant_switches(variant))
+
     if arguments["--lvs_sub"]:
         switches["lvs_sub"] = arguments["--lvs_sub"]
     else:
@@ -281,6 +419,21 @@ def generate_klayout_switches(arguments, layout_path, netlist_path):
     else:
         switches["purge_nets"] = "false"
 
+    if arguments["--profile"]:
+        switches["profile"] = "true"
+    else:
+        switches["profile"] = "false"
+
+    if arguments["--netlist_format"] in EXTRACTED_NETLIST_FORMATS:
+        switches["netlist_format"] = arguments["--netlist_format"]
+    else:
+        logging.error("Allowed extracted netlist formats are (spice, gz, zst, nlb) only")
+        exit(1)
+
+    if switches["netlist_format"] == "zst" and zstandard is None:
+        logging.error("zst extracted netlist format needs the zstandard package, please install it.")
+        exit(1)
+
     switches["topcell"] = get_run_top_cell_name(arguments, layout_path)
     switches["input"] = os.path.abspath(layout_path)
     switches["schematic"] = os.path.abspath(netlist_path)
@@ -288,34 +441,416 @@ def generate_klayout_switches(arguments, layout_path, netlist_path):
     return switches
 
 
-def build_switches_string(sws: dict):
+def build_switches_args(sws: dict):
     """
-    build_switches_string Build switches string from dictionary.
+    build_switches_args Build klayout switches arguments from dictionary.
 
     Parameters
     ----------
     sws : dict
-        Dictionary that holds the Antenna switches.
+        Dictionary that holds the LVS switches.
+
+    Returns
+    -------
+    list
+        List of klayout command line arguments for the switches.
+    """
+    sws_args = []
+    for k, v in sws.items():
+        sws_args += ["-rd", f"{k}={v}"]
+    return sws_args
+
+
+def summarize_lvsdb(lvsdb_path: str, top_n: int = LVS_SUMMARY_TOP_N):
+    """
+    summarize_lvsdb Summarize the cross reference section of an LVS results database.
+    The database is streamed line by line, so the memory usage doesn't depend on its size.
+
+    Parameters
+    ----------
+    lvsdb_path : str
+        Path to the LVS results database.
+    top_n : int, optional
+        Number of mismatches and log messages to keep in the summary.
+
+    Returns
+    -------
+    dict
+        Dictionary that holds the match result, matched and unmatched counts per circuit and the first mismatches.
+    """
+    summary = {
+        "lvsdb": lvsdb_path,
+        "match": False,
+        "compared": False,
+        "circuits": [],
+        "totals": {},
+        "mismatches": [],
+        "messages": [],
+    }
+
+    in_xref = False
+    circuit = None
+    circuit_section = None
+
+    with open(lvsdb_path, "rb") as f:
+        for raw_line in f:
+            ## Layout and reference sections are skipped without decoding.
+            if not in_xref:
+                if raw_line.startswith(b"xref(") or raw_line.startswith(b"Z("):
+                    in_xref = True
+                    summary["compared"] = True
+                continue
+
+            if raw_line.isspace():
+                continue
+
+            line = raw_line.decode("utf-8", errors="replace").rstrip("\n")
+            depth = len(line) - len(line.lstrip(" "))
+
+            if depth == 0:
+                ## End of the cross reference section.
+                break
+
+            if depth == 1:
+                circuit_section = None
+                m = LVSDB_ITEM_PATTERN.match(line)
+                if m and LVSDB_XREF_KINDS.get(m.group(1)) == "subcircuits":
+                    circuit = {
+                        "layout": m.group(2),
+                        "reference": m.group(3),
+                        "status": LVSDB_STATUS.get(m.group(4), m.group(4)),
+                    }
+                    for kind in ["nets", "pins", "devices", "subcircuits"]:
+                        circuit[kind] = {"matched": 0, "unmatched": 0}
+                    summary["circuits"].append(circuit)
+                else:
+                    circuit = None
+                    circuit_section = "log"
+
+            elif depth == 2 and circuit is not None:
+                circuit_section = "xref" if line.lstrip().startswith(tuple(LVSDB_XREF_KEYS)) else "log"
+
+            elif circuit_section == "log":
+                m = LVSDB_LOG_PATTERN.match(line)
+                if m and m.group(1) in LVSDB_LOG_SEVERITY and len(summary["messages"]) < top_n:
+                    summary["messages"].append(
+                        {
+                            "circuit": circuit["layout"] if circuit else None,
+                            "severity": LVSDB_LOG_SEVERITY[m.group(1)],
+                            "message": m.group(2).replace("\\n", " "),
+                        }
+                    )
+
+            elif circuit_section == "xref":
+                m = LVSDB_ITEM_PATTERN.match(line)
+                if not m or m.group(1) not in LVSDB_XREF_KINDS:
+                    continue
+
+                kind = LVSDB_XREF_KINDS[m.group(1)]
+                status = LVSDB_STATUS.get(m.group(4), m.group(4))
+                if status in ["match", "warning"]:
+                    circuit[kind]["matched"] += 1
+                    continue
+
+                circuit[kind]["unmatched"] += 1
+                if len(summary["mismatches"]) < top_n:
+                    summary["mismatches"].append(
+                        {
+                            "circuit": circuit["layout"],
+                            "reference_circuit": circuit["reference"],
+                            "kind": kind,
+                            "layout": m.group(2),
+                            "reference": m.group(3),
+                            "status": status,
+                        }
+                    )
+
+    update_lvs_summary_totals(summary)
+
+    if len(summary["mismatches"]) > 0:
+        resolve_lvsdb_names(lvsdb_path, summary["mismatches"])
+
+    return summary
+
+
+def update_lvs_summary_totals(summary: dict):
+    """
+    update_lvs_summary_totals Count the totals of all circuits of an LVS summary and set its match result.
+
+    Parameters
+    ----------
+    summary : dict
+        Dictionary that holds the summary of the LVS results, updated in place.
+    """
+    for kind in ["nets", "pins", "devices", "subcircuits"]:
+        summary["totals"][kind] = {
+            c: sum(circuit[kind][c] for circuit in summary["circuits"])
+            for c in ["matched", "unmatched"]
+        }
+
+    summary["totals"]["circuits"] = {
+        "matched": sum(1 for c in summary["circuits"] if c["status"] in ["match", "warning"]),
+        "unmatched": sum(1 for c in summary["circuits"] if c["status"] not in ["match", "warning"]),
+    }
+
+    summary["match"] = (
+        summary["compared"]
+        and len(summary["circuits"]) > 0
+        and summary["totals"]["circuits"]["unmatched"] == 0
+    )
+
+
+def get_lvsdb_circuit_name(name: str):
+    """
+    get_lvsdb_circuit_name Get the upper case circuit name from a circuit name of the LVS results database.
+
+    Parameters
+    ----------
+    name : str
+        Circuit name as written in the LVS results database, quoted if it has special characters.
+
+    Returns
+    -------
+    str
+        Upper case circuit name, SPICE names are case insensitive.
+    """
+    if len(name) > 1 and name[0] == name[-1] == "'":
+        name = re.sub(r"\\(.)", r"\1", name[1:-1])
+
+    return name.upper()
+
+
+def merge_lvs_summary(summary: dict, reused_circuits: list, reused_mismatches: list):
+    """
+    merge_lvs_summary Merge the results of circuits that weren't compared again into an LVS summary.
+
+    Parameters
+    ----------
+    summary : dict
+        Dictionary that holds the summary of the LVS results, updated in place.
+    reused_circuits : list
+        List of the circuits summaries reused from the previous run.
+    reused_mismatches : list
+        List of the mismatches of the reused circuits in the previous run.
+    """
+    reused_names = {get_lvsdb_circuit_name(c["reference"]) for c in reused_circuits}
+
+    recompared = [
+        c for c in summary["circuits"]
+        if get_lvsdb_circuit_name(c["reference"]) not in reused_names
+    ]
+    summary["circuits"] = recompared + reused_circuits
+
+    summary["mismatches"] = [
+        m for m in summary["mismatches"]
+        if get_lvsdb_circuit_name(m["reference_circuit"]) not in reused_names
+    ]
+    summary["mismatches"] = (summary["mismatches"] + reused_mismatches)[:LVS_SUMMARY_TOP_N]
+
+    summary["incremental"] = {
+        "recompared": [c["reference"] for c in recompared],
+        "reused": [c["reference"] for c in reused_circuits],
+    }
+
+    update_lvs_summary_totals(summary)
+
+
+def resolve_lvsdb_names(lvsdb_path: str, mismatches: list):
+    """
+    resolve_lvsdb_names Replace the ids of mismatched objects by their names from the netlists of an LVS results database.
+    Only the names of the given mismatches are kept while streaming the netlists.
+
+    Parameters
+    ----------
+    lvsdb_path : str
+        Path to the LVS results database.
+    mismatches : list
+        List of mismatches dictionaries from summarize_lvsdb, updated in place.
+    """
+    needed = set()
+    for m in mismatches:
+        needed.add(("layout", m["circuit"], m["kind"], m["layout"]))
+        needed.add(("reference", m["reference_circuit"], m["kind"], m["reference"]))
+
+    names = dict()
+    side = None
+    circuit = None
+    pin_index = 0
+
+    with open(lvsdb_path, "rb") as f:
+        for raw_line in f:
+            if raw_line.isspace():
+                continue
+
+            if raw_line[:1] != b" ":
+                line = raw_line.decode("utf-8", errors="replace")
+                side = next(
+                    (v for k, v in LVSDB_NETLIST_KEYS.items() if line.startswith(k)),
+                    None,
+                )
+                continue
+
+            ## Only circuits and their direct content are needed.
+            if side is None or raw_line[2:3] == b" ":
+                continue
+
+            line = raw_line.decode("utf-8", errors="replace").strip()
+            m = re.match(r"^(\w+)\(('(?:[^'\\]|\\.)*'|[^\s)]+)\s*(\S*)", line)
+            if not m or m.group(1) not in LVSDB_XREF_KINDS:
+                continue
+
+            kind = LVSDB_XREF_KINDS[m.group(1)]
+
+            if raw_line[1:2] != b" ":
+                if kind == "subcircuits":
+                    circuit = m.group(2)
+                    pin_index = 0
+                continue
+
+            if kind == "pins":
+                obj_id = str(pin_index)
+                pin_index += 1
+            else:
+                obj_id = m.group(2)
+
+            if (side, circuit, kind, obj_id) not in needed:
+                continue
+
+            name_match = LVSDB_NAME_PATTERN.search(line)
+            names[(side, circuit, kind, obj_id)] = (
+                name_match.group(1) if name_match else f"{obj_id} ({m.group(3)})"
+            )
+
+    for m in mismatches:
+        for side, circuit in [("layout", m["circuit"]), ("reference", m["reference_circuit"])]:
+            m[side] = names.get((side, circuit, m["kind"], m[side]), m[side])
+
+
+def write_lvs_summary(lvsdb_path: str, reused_results: dict = None):
+    """
+    write_lvs_summary Write the summary of an LVS results database to a JSON file next to it.
+
+    Parameters
+    ----------
+    lvsdb_path : str
+        Path to the LVS results database.
+    reused_results : dict, optional
+        Circuits and mismatches reused from the previous run, merged into the summary.
+
+    Returns
+    -------
+    dict
+        Dictionary that holds the summary of the LVS results.
     """
-    return " ".join(f"-rd {k}={v}" for k, v in sws.items())
+    summary = summarize_lvsdb(lvsdb_path)
+
+    if reused_results:
+        merge_lvs_summary(summary, reused_results["circuits"], reused_results["mismatches"])
+    summary_path = f"{os.path.splitext(lvsdb_path)[0]}_summary.json"
+
+    with open(summary_path, "w") as f:
+        json.dump(summary, f, indent=2)
 
+    logging.info(f"## LVS results summary at: {summary_path}")
 
-def check_lvs_results(results_db_files: list):
+    return summary
+
+
+def check_lvs_results(results_db_file: str, reused_results: dict = None):
     """
     check_lvs_results Checks the results db generated from run and report at the end if the LVS run failed or passed.
+    This function will exit with 1 if the netlists don't match.
 
     Parameters
     ----------
-    results_db_files : list
-        A list of strings that represent paths to results databases of all the LVS runs.
+    results_db_file : str
+        Path to the results database of the LVS run.
+    reused_results : dict, optional
+        Circuits and mismatches reused from the previous run, merged into the summary.
     """
 
-    if len(results_db_files) < 1:
+    if not os.path.isfile(results_db_file):
         logging.error("Klayout did not generate any db results. Please check run logs")
         exit(1)
 
+    report_lvs_summary(write_lvs_summary(results_db_file, reused_results))
+
+
+def report_lvs_summary(summary: dict):
+    """
+    report_lvs_summary Report the LVS summary at the end of the run.
+    This function will exit with 1 if the netlists don't match.
+
+    Parameters
+    ----------
+    summary : dict
+        Dictionary that holds the summary of the LVS results.
+    """
+
+    if "incremental" in summary:
+        logging.info(
+            f"## Incremental compare: {len(summary['incremental']['recompared'])} circuits compared again, "
+            f"{len(summary['incremental']['reused'])} circuits reused from previous run."
+        )
+
+    for kind, counts in summary["totals"].items():
+        logging.info(
+            f"## {kind}: {counts['matched']} matched, {counts['unmatched']} unmatched"
+        )
+
+    for m in summary["mismatches"][:10]:
+        logging.error(
+            f"## {m['circuit']}: {m['kind']} {m['layout']} <-> {m['reference']} {m['status']}"
+        )
+
+    if not summary["compared"]:
+        logging.error("Klayout LVS results database has no comparison results.")
+        exit(1)
+    elif not summary["match"]:
+        logging.error("Klayout LVS run failed, netlists don't match.")
+        exit(1)
+    else:
+        logging.info("Klayout LVS run is clean, netlists match.")
+
+
+def summarize_lvs_profile(profile_path: str, top_n: int = LVS_PROFILE_TOP_N):
+    """
+    summarize_lvs_profile log the slowest phases of a profiled LVS run.
+
+    Parameters
+    ----------
+    profile_path : str
+        Path to the JSON profile report written by the LVS rule deck.
+    top_n : int, optional
+        Number of the slowest phases to log, by default LVS_PROFILE_TOP_N.
+
+    Returns
+    -------
+    dict
+        The profile report, None if the rule deck didn't write it.
+    """
+    if not os.path.isfile(profile_path):
+        logging.warning(f"## LVS profile report {profile_path} isn't found.")
+        return None
+
+    with open(profile_path) as f:
+        profile = json.load(f)
 
-def run_check(lvs_file: str, path: str, run_dir: str, sws: dict):
+    logging.info(f"## LVS profile report at: {profile_path}")
+    logging.info(
+        f"## LVS total run time: {profile['total_time']:.3f} seconds, peak memory: {profile['peak_rss_mb']} MB"
+    )
+
+    for phase in sorted(profile["phases"], key=lambda p: p["time"], reverse=True)[:top_n]:
+        time_share = 100 * phase["time"] / profile["total_time"] if profile["total_time"] else 0
+        logging.info(
+            f"## {phase['phase']:<24} {phase['time']:>10.3f} s {time_share:>6.1f} %  memory: {phase['rss_mb']} MB"
+        )
+
+    return profile
+
+
+def run_check(lvs_file: str, path: str, run_dir: str, sws: dict, log_path: str = None):
     """
     run_check run LVS check.
 
@@ -329,6 +864,8 @@ def run_check(lvs_file: str, path: str, run_dir: str, sws: dict):
         String that holds the full path of the run location.
     sws : dict
         Dictionary that holds all switches that needs to be passed to the antenna checks.
+    log_path : str
+        Path of a log file to write klayout output to, klayout output is printed if not given.
 
     Returns
     -------
@@ -344,70 +881,1344 @@ def run_check(lvs_file: str, path: str, run_dir: str, sws: dict):
     layout_base_name = os.path.basename(path).split(".")[0]
     new_sws = sws.copy()
     report_path = os.path.join(run_dir, f"{layout_base_name}.lvsdb")
-    ext_net_path = os.path.join(run_dir, f"{layout_base_name}.cir")
+    ext_net_path, new_sws["target_netlist"] = get_extracted_netlist_paths(run_dir, layout_base_name, sws)
     new_sws["report"] = report_path
-    new_sws["target_netlist"] = ext_net_path
+    if sws.get("profile") == "true":
+        new_sws["profile_report"] = os.path.join(run_dir, f"{layout_base_name}_profile.json")
+
+    run_args = ["klayout", "-b", "-r", lvs_file] + build_switches_args(new_sws)
 
-    sws_str = build_switches_string(new_sws)
+    if log_path:
+        with open(log_path, "w") as log_file:
+            check_call(run_args, stdout=log_file, stderr=log_file)
+    else:
+        check_call(run_args)
+
+    write_extracted_netlist(new_sws["target_netlist"], ext_net_path, sws)
 
-    run_str = f"klayout -b -r {lvs_file} {sws_str}"
-    check_call(run_str, shell=True)
+    if "profile_report" in new_sws:
+        summarize_lvs_profile(new_sws["profile_report"])
 
     return report_path
 
 
-def main(lvs_run_dir: str, arguments: dict):
+def run_extraction(lvs_file: str, path: str, run_dir: str, sws: dict):
     """
-    main function to run the LVS.
+    run_extraction run LVS extraction only without compare.
 
     Parameters
     ----------
-    lvs_run_dir : str
-        String with absolute path of the full run dir.
-    arguments : dict
-        Dictionary that holds the arguments used by user in the run command. This is generated by docopt library.
+    lvs_file : str
+        String that has the file full path to run.
+    path : str
+        String that holds the full path of the layout.
+    run_dir : str
+        String that holds the full path of the run location.
+    sws : dict
+        Dictionary that holds all switches that needs to be passed to the LVS run.
+
+    Returns
+    -------
+    string
+        string that represent the path to the extraction database for this run.
     """
 
-    ## Check Klayout version
-    check_klayout_version()
+    logging.info(
+        f'Running Global Foundries 180nm MCU extraction only on design {path} on cell {sws["topcell"]}'
+    )
 
-    ## Check layout file existence
-    layout_path = arguments["--layout"]
-    if not os.path.exists(arguments["--layout"]):
-        logging.error(
-            f"The input GDS file path {layout_path} doesn't exist, please recheck."
-        )
-        exit(1)
+    layout_base_name = os.path.basename(path).split(".")[0]
+    new_sws = sws.copy()
+    l2n_path = os.path.join(run_dir, f"{layout_base_name}.l2n")
+    new_sws["extract_only"] = "true"
+    new_sws["l2n"] = l2n_path
+    ext_net_path, new_sws["target_netlist"] = get_extracted_netlist_paths(run_dir, layout_base_name, sws)
+    if sws.get("profile") == "true":
+        new_sws["profile_report"] = os.path.join(run_dir, f"{layout_base_name}_profile.json")
 
-    ## Check layout type
-    layout_path = check_layout_type(layout_path)
+    check_call(["klayout", "-b", "-r", lvs_file] + build_switches_args(new_sws))
+    write_extracted_netlist(new_sws["target_netlist"], ext_net_path, sws)
 
-    # Check netlist file existence
-    netlist_path = arguments["--netlist"]
-    if not os.path.exists(arguments["--netlist"]):
-        logging.error(
-            f"The input netlist file path {netlist_path} doesn't exist, please recheck."
-        )
-        exit(1)
+    if "profile_report" in new_sws:
+        summarize_lvs_profile(new_sws["profile_report"])
+
+    return l2n_path
+
+
+def run_cached_compare(
+    compare_file: str, l2n_path: str, path: str, run_dir: str, sws: dict, log_path: str = None
+):
+    """
+    run_cached_compare run LVS compare of the input netlist against a previous extraction.
+
+    Parameters
+    ----------
+    compare_file : str
+        String that has the compare rule deck full path.
+    l2n_path : str
+        Path to the extraction database.
+    path : str
+        String that holds the full path of the layout.
+    run_dir : str
+        String that holds the full path of the run location.
+    sws : dict
+        Dictionary that holds all switches that needs to be passed to the LVS run.
+    log_path : str
+        Path of a log file to write klayout output to, klayout output is printed if not given.
+
+    Returns
+    -------
+    string
+        string that represent the path to the results output database for this run.
+    """
 
-    lvs_rule_deck = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "gf180mcu.lvs"
+    logging.info(
+        f'Running Global Foundries 180nm MCU compare with extraction {l2n_path} on cell {sws["topcell"]}'
     )
 
-    ## Get run switches
-    switches = generate_klayout_switches(arguments, layout_path, netlist_path)
+    layout_base_name = os.path.basename(path).split(".")[0]
+    new_sws = sws.copy()
+    report_path = os.path.join(run_dir, f"{layout_base_name}.lvsdb")
+    new_sws["extracted_l2n"] = l2n_path
+    new_sws["report"] = report_path
+    ext_net_path, new_sws["target_netlist"] = get_extracted_netlist_paths(run_dir, layout_base_name, sws)
+    new_sws["ignore_params"] = ",".join(
+        f"{c}:{p}" for c, p in get_ignored_parameters(os.path.dirname(compare_file))
+    )
 
-    ## Run LVS check
-    res_db_files = run_check(lvs_rule_deck, layout_path, lvs_run_dir, switches)
+    if sws.get("profile") == "true":
+        new_sws["profile_report"] = os.path.join(run_dir, f"{layout_base_name}_profile.json")
 
-    ## Check run
-    check_lvs_results(res_db_files)
+    run_args = ["klayout", "-b", "-r", compare_file] + build_switches_args(new_sws)
 
+    if log_path:
+        with open(log_path, "w") as log_file:
+            check_call(run_args, stdout=log_file, stderr=log_file)
+    else:
+        check_call(run_args)
 
-if __name__ == "__main__":
+    write_extracted_netlist(new_sws["target_netlist"], ext_net_path, sws)
 
-    # arguments
-    arguments = docopt(__doc__, version="RUN LVS: 1.0")
+    if "profile_report" in new_sws:
+        summarize_lvs_profile(new_sws["profile_report"])
+
+    return report_path
+
+
+def get_extracted_netlist_paths(run_dir: str, layout_base_name: str, sws: dict):
+    """
+    get_extracted_netlist_paths get the paths of the extracted netlist and of the netlist written by klayout for it.
+
+    Parameters
+    ----------
+    run_dir : str
+        String that holds the full path of the run location.
+    layout_base_name : str
+        Base name of the layout file.
+    sws : dict
+        Dictionary that holds all switches of the LVS run.
+
+    Returns
+    -------
+    tuple
+        Path of the extracted netlist in the selected format, and path of the netlist written by klayout.
+    """
+    netlist_ext, target_ext = EXTRACTED_NETLIST_FORMATS[sws.get("netlist_format", "spice")]
+    return (
+        os.path.join(run_dir, f"{layout_base_name}{netlist_ext}"),
+        os.path.join(run_dir, f"{layout_base_name}{target_ext}"),
+    )
+
+
+def write_extracted_netlist(target_netlist: str, netlist_path: str, sws: dict):
+    """
+    write_extracted_netlist convert the netlist written by klayout to the selected extracted netlist format.
+
+    spice and gz netlists are written by klayout directly, gz is compressed while it's written.
+    zst netlists are compressed in chunks from the klayout netlist, and nlb netlists are converted
+    to the binary netlist format of extracted_netlist.py, then the klayout netlist is removed.
+
+    Parameters
+    ----------
+    target_netlist : str
+        Path of the netlist written by klayout.
+    netlist_path : str
+        Path of the extracted netlist in the selected format.
+    sws : dict
+        Dictionary that holds all switches of the LVS run.
+    """
+    if target_netlist == netlist_path or not os.path.exists(target_netlist):
+        return
+
+    netlist_format = sws.get("netlist_format", "spice")
+    if netlist_format == "zst":
+        with open(target_netlist, "rb") as src, open(netlist_path, "wb") as dst:
+            zstandard.ZstdCompressor().copy_stream(src, dst)
+    elif netlist_format == "nlb":
+        netlist = klayout.db.Netlist()
+        netlist.read(target_netlist, klayout.db.NetlistSpiceReader())
+        write_binary_netlist(netlist, netlist_path)
+
+    os.remove(target_netlist)
+    logging.info(f"## Extracted netlist written in {netlist_format} format at: {netlist_path}")
+
+
+def get_ignored_parameters(lvs_dir: str):
+    """
+    get_ignored_parameters get the device parameters ignored in compare by the extraction rule decks.
+
+    Parameters
+    ----------
+    lvs_dir : str
+        Path to the LVS rule deck directory.
+
+    Returns
+    -------
+    list
+        List of tuples (device class name, parameter name).
+    """
+    ignore_pattern = re.compile(r"^\s*ignore_parameter\('([^']+)',\s*'([^']+)'\)")
+    ignored_params = []
+
+    for deck in sorted(glob.glob(os.path.join(lvs_dir, "rule_decks", "*.lvs"))):
+        with open(deck) as f:
+            for line in f:
+                m = ignore_pattern.match(line)
+                if m:
+                    ignored_params.append((m.group(1), m.group(2)))
+
+    return ignored_params
+
+
+def get_file_hash(file_path: str, hasher=None):
+    """
+    get_file_hash get the sha256 hash of a file content.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file to hash.
+    hasher : hashlib object, optional
+        Hash object to update with the file content, by default a new sha256 object is used.
+
+    Returns
+    -------
+    str
+        Hex digest of the file content.
+    """
+    if hasher is None:
+        hasher = hashlib.sha256()
+
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+def get_extraction_cache_key(lvs_dir: str, lvs_file: str, layout_path: str, switches: dict):
+    """
+    get_extraction_cache_key get the key of the layout extraction in the extraction cache.
+    The key depends on the layout content, the rule decks content and the extraction switches.
+
+    Parameters
+    ----------
+    lvs_dir : str
+        Path to the LVS rule deck directory.
+    lvs_file : str
+        Path to the main LVS rule deck used in run.
+    layout_path : str
+        Path to the target layout.
+    switches : dict
+        Dictionary that holds all the switches that will be passed to klayout run.
+
+    Returns
+    -------
+    str
+        Hex digest that represent the extraction.
+    """
+    deck_hasher = hashlib.sha256()
+    deck_files = [lvs_file]
+    deck_files += sorted(glob.glob(os.path.join(lvs_dir, "rule_decks", "*.lvs")))
+    for deck in deck_files:
+        get_file_hash(deck, deck_hasher)
+
+    ## Schematic options and run resources don't change the extraction.
+    ext_sws = {
+        k: v
+        for k, v in switches.items()
+        if k not in ["input", "schematic", "schematic_simplify", "thr", "profile"]
+    }
+
+    key_data = {
+        "layout": get_file_hash(layout_path),
+        "rule_decks": deck_hasher.hexdigest(),
+        "switches": ext_sws,
+    }
+
+    return hashlib.sha256(
+        json.dumps(key_data, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def restore_cached_extraction(
+    cache_dir: str, cache_key: str, path: str, run_dir: str, netlist_format: str = "spice"
+):
+    """
+    restore_cached_extraction copy a previous extraction of the layout from the cache to the run directory.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Path to the extraction cache directory.
+    cache_key : str
+        Key of the extraction in the cache.
+    path : str
+        String that holds the full path of the layout.
+    run_dir : str
+        String that holds the full path of the run location.
+    netlist_format : str
+        Format of the cached extracted netlist.
+
+    Returns
+    -------
+    str or None
+        Path to the restored extraction database, None if the extraction is not cached.
+    """
+    entry_dir = os.path.join(cache_dir, cache_key)
+
+    if not os.path.isdir(entry_dir):
+        return None
+
+    layout_base_name = os.path.basename(path).split(".")[0]
+    for ext in [".l2n", EXTRACTED_NETLIST_FORMATS[netlist_format][0]]:
+        shutil.copyfile(
+            os.path.join(entry_dir, f"extracted{ext}"),
+            os.path.join(run_dir, f"{layout_base_name}{ext}"),
+        )
+
+    return os.path.join(run_dir, f"{layout_base_name}.l2n")
+
+
+def store_cached_extraction(
+    cache_dir: str, cache_key: str, l2n_path: str, netlist_format: str = "spice"
+):
+    """
+    store_cached_extraction save the extraction of the layout in the cache.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Path to the extraction cache directory.
+    cache_key : str
+        Key of the extraction in the cache.
+    l2n_path : str
+        Path to the extraction database, the extracted netlist is next to it.
+    netlist_format : str
+        Format of the extracted netlist.
+    """
+    entry_dir = os.path.join(cache_dir, cache_key)
+    tmp_dir = f"{entry_dir}.tmp{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    for ext in [".l2n", EXTRACTED_NETLIST_FORMATS[netlist_format][0]]:
+        shutil.copyfile(
+            f"{os.path.splitext(l2n_path)[0]}{ext}",
+            os.path.join(tmp_dir, f"extracted{ext}"),
+        )
+
+    shutil.rmtree(entry_dir, ignore_errors=True)
+    os.rename(tmp_dir, entry_dir)
+    logging.info(f"## Layout extraction is cached at: {entry_dir}")
+
+
+def get_compare_state_switches(switches: dict):
+    """
+    get_compare_state_switches get the switches that change the compare of a cached extraction.
+
+    Parameters
+    ----------
+    switches : dict
+        Dictionary that holds all the switches that will be passed to klayout run.
+
+    Returns
+    -------
+    dict
+        Dictionary of the switches that change the compare.
+    """
+    return {
+        k: v
+        for k, v in switches.items()
+        if k not in ["input", "schematic", "thr", "profile"]
+    }
+
+
+def load_compare_state(cache_dir: str, cache_key: str):
+    """
+    load_compare_state load the compare state of the previous run with a cached extraction.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Path to the extraction cache directory.
+    cache_key : str
+        Key of the extraction in the cache.
+
+    Returns
+    -------
+    dict or None
+        The compare state, None if there is no previous compare.
+    """
+    state_path = os.path.join(cache_dir, cache_key, "compare_state.json")
+
+    if not os.path.isfile(state_path):
+        return None
+
+    with open(state_path) as f:
+        return json.load(f)
+
+
+def store_compare_state(
+    cache_dir: str, cache_key: str, switches: dict, schematic_hashes: dict, summary: dict
+):
+    """
+    store_compare_state save the compare state of a run with a cached extraction, used by the next incremental compare.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Path to the extraction cache directory.
+    cache_key : str
+        Key of the extraction in the cache.
+    switches : dict
+        Dictionary that holds all the switches passed to klayout run.
+    schematic_hashes : dict
+        Dictionary of upper case subcircuit names to their hashes.
+    summary : dict
+        Dictionary that holds the summary of the LVS results.
+    """
+    state = {
+        "switches": get_compare_state_switches(switches),
+        "schematic_hashes": schematic_hashes,
+        "circuits": summary["circuits"],
+        "mismatches": summary["mismatches"],
+    }
+
+    state_path = os.path.join(cache_dir, cache_key, "compare_state.json")
+    tmp_path = f"{state_path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+
+def get_reused_compare_results(state: dict, switches: dict, schematic_hashes: dict):
+    """
+    get_reused_compare_results get the results of the previous compare that are still valid.
+    A circuit result is reused if its schematic subcircuit hash didn't change, the topcell is always compared again.
+
+    Parameters
+    ----------
+    state : dict
+        The compare state of the previous run, None if there is no previous compare.
+    switches : dict
+        Dictionary that holds all the switches that will be passed to klayout run.
+    schematic_hashes : dict
+        Dictionary of upper case subcircuit names to their hashes.
+
+    Returns
+    -------
+    dict
+        Circuits and mismatches reused from the previous run.
+    """
+    reused = {"circuits": [], "mismatches": []}
+
+    if state is None or state["switches"] != get_compare_state_switches(switches):
+        return reused
+
+    topcell = switches["topcell"].upper()
+    for circuit in state["circuits"]:
+        name = get_lvsdb_circuit_name(circuit["reference"])
+        if (
+            name != topcell
+            and name in schematic_hashes
+            and state["schematic_hashes"].get(name) == schematic_hashes[name]
+        ):
+            reused["circuits"].append(circuit)
+
+    reused_names = {get_lvsdb_circuit_name(c["reference"]) for c in reused["circuits"]}
+    reused["mismatches"] = [
+        m for m in state["mismatches"]
+        if get_lvsdb_circuit_name(m["reference_circuit"]) in reused_names
+    ]
+
+    return reused
+
+
+def get_marker_layers(lvs_dir: str):
+    """
+    get_marker_layers get the GDS layer and datatype of the marker layers of each device family.
+
+    Parameters
+    ----------
+    lvs_dir : str
+        Path to the LVS rule deck directory.
+
+    Returns
+    -------
+    dict
+        Dictionary of device family names to sets of (layer, datatype) tuples.
+    """
+    layer_pattern = re.compile(r"^\s*(\w+)\s*=\s*get_polygons\((\d+),\s*(\d+)\)")
+    layers = {}
+
+    with open(os.path.join(lvs_dir, "rule_decks", "layers_definitions.lvs")) as f:
+        for line in f:
+            m = layer_pattern.match(line)
+            if m:
+                layers[m.group(1)] = (int(m.group(2)), int(m.group(3)))
+
+    return {
+        family: {layers[mk] for mk in markers if mk in layers}
+        for family, markers in LVS_DEVICE_FAMILIES.items()
+    }
+
+
+def get_family_device_models(lvs_dir: str):
+    """
+    get_family_device_models get the device models extracted by the rule decks of each device family.
+
+    Parameters
+    ----------
+    lvs_dir : str
+        Path to the LVS rule deck directory.
+
+    Returns
+    -------
+    dict
+        Dictionary of device family names to sets of lower case device model names.
+    """
+    model_pattern = re.compile(r"extract_devices\(\w+\(['\"](\w+)['\"]")
+    family_models = {}
+
+    for family in LVS_DEVICE_FAMILIES:
+        with open(os.path.join(lvs_dir, "rule_decks", f"{family}_extraction.lvs")) as f:
+            family_models[family] = {m.lower() for m in model_pattern.findall(f.read())}
+
+    return family_models
+
+
+def get_layout_layers(layout_path: str, layers: set):
+    """
+    get_layout_layers get the layers that have shapes in the layout, among the given layers.
+    Only the given layers are read from the layout.
+
+    Parameters
+    ----------
+    layout_path : str
+        Path to the target layout.
+    layers : set
+        Set of (layer, datatype) tuples to look for.
+
+    Returns
+    -------
+    set
+        Set of (layer, datatype) tuples.
+    """
+    layer_map = klayout.db.LayerMap()
+    for i, (layer, datatype) in enumerate(sorted(layers)):
+        layer_map.map(klayout.db.LayerInfo(layer, datatype), i)
+
+    options = klayout.db.LoadLayoutOptions()
+    options.set_layer_map(layer_map, False)
+
+    layout = klayout.db.Layout()
+    layout.read(layout_path, options)
+
+    return {
+        (layout.get_info(li).layer, layout.get_info(li).datatype)
+        for li in layout.layer_indexes()
+        if any(not cell.shapes(li).is_empty() for cell in layout.each_cell())
+    }
+
+
+def get_schematic_words(netlist_path: str):
+    """
+    get_schematic_words get all words used in the element lines of the schematic netlist and its includes.
+    Device models are among them, SPICE names are case insensitive.
+
+    Parameters
+    ----------
+    netlist_path : str
+        Path to the schematic netlist.
+
+    Returns
+    -------
+    set
+        Set of lower case words.
+    """
+    word_pattern = re.compile(r"[\w.]+")
+    words = set()
+
+    for spice_file in get_spice_files(netlist_path):
+        with open(spice_file, errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line[0] in "*$.":
+                    continue
+                words.update(w.lower() for w in word_pattern.findall(line))
+
+    return words
+
+
+def get_lvs_device_families(lvs_dir: str, layout_path: str, netlist_path: str):
+    """
+    get_lvs_device_families get the device families used in the layout or the schematic netlist.
+    A family is used if any of its marker layers has shapes in the layout or any of its models is in the netlist.
+
+    Parameters
+    ----------
+    lvs_dir : str
+        Path to the LVS rule deck directory.
+    layout_path : str
+        Path to the target layout.
+    netlist_path : str
+        Path to the schematic netlist.
+
+    Returns
+    -------
+    list
+        List of the used device family names.
+    """
+    marker_layers = get_marker_layers(lvs_dir)
+    layout_layers = get_layout_layers(layout_path, set().union(*marker_layers.values()))
+    schematic_words = get_schematic_words(netlist_path)
+    family_models = get_family_device_models(lvs_dir)
+
+    return [
+        family
+        for family in LVS_DEVICE_FAMILIES
+        if marker_layers[family] & layout_layers
+        or family_models[family] & schematic_words
+    ]
+
+
+def assemble_lvs_deck(lvs_file: str, families: list, run_dir: str):
+    """
+    assemble_lvs_deck write a copy of the LVS rule deck that includes the rule decks of the selected device families only.
+
+    Parameters
+    ----------
+    lvs_file : str
+        Path to the main LVS rule deck.
+    families : list
+        List of the device family names to keep.
+    run_dir : str
+        String that holds the full path of the run location.
+
+    Returns
+    -------
+    str
+        Path to the assembled LVS rule deck.
+    """
+
+    def expand_includes(deck_path: str):
+        deck_lines = []
+        deck_dir = os.path.dirname(os.path.abspath(deck_path))
+
+        with open(deck_path) as f:
+            for line in f:
+                m = LVS_INCLUDE_PATTERN.match(line)
+                if not m:
+                    deck_lines.append(line)
+                    continue
+
+                include_path = os.path.join(deck_dir, m.group(1))
+                include_name = os.path.splitext(os.path.basename(include_path))[0]
+                family_match = LVS_FAMILY_DECK_PATTERN.match(include_name)
+
+                if include_name == "devices_connections":
+                    ## Connections of all families are included from this deck.
+                    deck_lines += expand_includes(include_path)
+                elif (
+                    family_match
+                    and family_match.group(1) in LVS_DEVICE_FAMILIES
+                    and family_match.group(1) not in families
+                ):
+                    deck_lines.append(f"# {include_name} is skipped, device family isn't used.\n")
+                else:
+                    deck_lines.append(f"# %include {include_path}\n")
+
+        return deck_lines
+
+    scoped_deck = os.path.join(run_dir, os.path.basename(lvs_file).replace(".lvs", "_scoped.lvs"))
+    with open(scoped_deck, "w") as f:
+        f.writelines(expand_includes(lvs_file))
+
+    return scoped_deck
+
+
+def get_spice_files(netlist_path: str, spice_files: list = None):
+    """
+    get_spice_files get the netlist file and all files included by it.
+
+    Parameters
+    ----------
+    netlist_path : str
+        Path to the schematic netlist.
+    spice_files : list, optional
+        List of the files already found, by default a new list is used.
+
+    Returns
+    -------
+    list
+        List of the absolute paths of the netlist files, in include order.
+    """
+    if spice_files is None:
+        spice_files = []
+
+    netlist_path = os.path.abspath(netlist_path)
+    if netlist_path in spice_files:
+        return spice_files
+    spice_files.append(netlist_path)
+
+    with open(netlist_path, errors="replace") as f:
+        for line in f:
+            m = SPICE_INCLUDE_PATTERN.match(line.strip())
+            if m:
+                get_spice_files(
+                    os.path.join(os.path.dirname(netlist_path), m.group(1)), spice_files
+                )
+
+    return spice_files
+
+
+def read_spice_lines(netlist_path: str):
+    """
+    read_spice_lines read the statements of the netlist with its includes resolved.
+    Continuation lines are joined, comment lines and .end are removed.
+
+    Parameters
+    ----------
+    netlist_path : str
+        Path to the schematic netlist.
+
+    Returns
+    -------
+    list
+        List of the netlist statements.
+    """
+    spice_lines = []
+    netlist_dir = os.path.dirname(os.path.abspath(netlist_path))
+
+    with open(netlist_path, errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line[0] == "*":
+                continue
+
+            if line[0] == "+" and spice_lines:
+                spice_lines[-1] += " " + line[1:].strip()
+                continue
+
+            m = SPICE_INCLUDE_PATTERN.match(line)
+            if m:
+                spice_lines += read_spice_lines(os.path.join(netlist_dir, m.group(1)))
+            elif not SPICE_END_PATTERN.match(line):
+                spice_lines.append(line)
+
+    return spice_lines
+
+
+def prune_spice_subckts(spice_lines: list, topcell: str):
+    """
+    prune_spice_subckts remove the subcircuits that are not used by the topcell from the netlist statements.
+    Statements outside subcircuits are kept and the subcircuits they use too.
+
+    Parameters
+    ----------
+    spice_lines : list
+        List of the netlist statements.
+    topcell : str
+        Name of the topcell used in run.
+
+    Returns
+    -------
+    list
+        List of the netlist statements of the used subcircuits.
+    """
+    subckts = {}
+    subckt_refs = {}
+    top_refs = set()
+    current = None
+
+    for i, line in enumerate(spice_lines):
+        m = SPICE_SUBCKT_PATTERN.match(line)
+        if m:
+            current = m.group(1).upper()
+            subckts[current] = [i, None]
+            subckt_refs[current] = set()
+        elif current and SPICE_ENDS_PATTERN.match(line):
+            subckts[current][1] = i
+            current = None
+        elif line[0] in "xX":
+            ## Any word of a subcircuit call may be the subcircuit name, pin and parameter words are harmless.
+            refs = subckt_refs[current] if current else top_refs
+            refs.update(w.upper() for w in line.split()[1:])
+
+    if topcell.upper() not in subckts and not top_refs:
+        logging.warning(f"## Topcell {topcell} isn't a subcircuit of the netlist, all subcircuits are kept.")
+        return spice_lines
+
+    used = set()
+    pending = [topcell.upper()] + list(top_refs)
+    while pending:
+        name = pending.pop()
+        if name in subckts and name not in used:
+            used.add(name)
+            pending += list(subckt_refs[name])
+
+    dropped = [subckts[name] for name in subckts if name not in used]
+    keep = [True] * len(spice_lines)
+    for start, end in dropped:
+        end = len(spice_lines) - 1 if end is None else end
+        keep[start:end + 1] = [False] * (end - start + 1)
+
+    logging.info(f"## Schematic subcircuits used by {topcell}: {len(used)} of {len(subckts)}")
+
+    return [line for line, k in zip(spice_lines, keep) if k]
+
+
+def prepare_schematic(netlist_path: str, topcell: str, cache_dir: str):
+    """
+    prepare_schematic pre-parse the schematic netlist to one netlist with the subcircuits used by the topcell only.
+    The result is cached, keyed by the content of the netlist files and the topcell name.
+
+    Parameters
+    ----------
+    netlist_path : str
+        Path to the schematic netlist.
+    topcell : str
+        Name of the topcell used in run.
+    cache_dir : str
+        Path to the schematic cache directory.
+
+    Returns
+    -------
+    str
+        Path to the pre-parsed netlist.
+    """
+    hasher = hashlib.sha256(topcell.upper().encode("utf-8"))
+    for spice_file in get_spice_files(netlist_path):
+        hasher.update(spice_file.encode("utf-8"))
+        get_file_hash(spice_file, hasher)
+
+    cached_netlist = os.path.join(cache_dir, f"{hasher.hexdigest()}.cir")
+    if os.path.isfile(cached_netlist):
+        logging.info(f"## Pre-parsed schematic netlist restored from cache: {cached_netlist}")
+        return cached_netlist
+
+    spice_lines = prune_spice_subckts(read_spice_lines(netlist_path), topcell)
+
+    tmp_netlist = f"{cached_netlist}.tmp{os.getpid()}"
+    with open(tmp_netlist, "w") as f:
+        f.write(f"* Pre-parsed from {os.path.abspath(netlist_path)} for {topcell}\n")
+        f.write("\n".join(spice_lines))
+        f.write("\n.end\n")
+    os.replace(tmp_netlist, cached_netlist)
+
+    logging.info(f"## Pre-parsed schematic netlist is cached at: {cached_netlist}")
+
+    return cached_netlist
+
+
+def get_schematic_subckt_hashes(netlist_path: str):
+    """
+    get_schematic_subckt_hashes get the hash of each subcircuit of the schematic netlist.
+    The hash of a subcircuit covers its statements, the statements outside subcircuits and the hashes of the subcircuits it uses.
+
+    Parameters
+    ----------
+    netlist_path : str
+        Path to the schematic netlist.
+
+    Returns
+    -------
+    dict
+        Dictionary of upper case subcircuit names to their hashes.
+    """
+    subckt_lines = {}
+    global_lines = []
+    current = None
+
+    for line in read_spice_lines(netlist_path):
+        m = SPICE_SUBCKT_PATTERN.match(line)
+        if m:
+            current = m.group(1).upper()
+            subckt_lines[current] = [line]
+        elif current:
+            subckt_lines[current].append(line)
+            if SPICE_ENDS_PATTERN.match(line):
+                current = None
+        else:
+            global_lines.append(line)
+
+    global_hash = hashlib.sha256("\n".join(global_lines).encode("utf-8")).hexdigest()
+    subckt_hashes = {}
+
+    def subckt_hash(name: str, visiting: set):
+        if name in subckt_hashes:
+            return subckt_hashes[name]
+
+        hasher = hashlib.sha256(global_hash.encode("utf-8"))
+        hasher.update("\n".join(subckt_lines[name]).encode("utf-8"))
+
+        ## Any word of a subcircuit call that names a subcircuit is a child.
+        children = {
+            w.upper()
+            for line in subckt_lines[name] if line[0] in "xX"
+            for w in line.split()[1:]
+        }
+        for child in sorted(children & subckt_lines.keys() - visiting - {name}):
+            hasher.update(subckt_hash(child, visiting | {name}).encode("utf-8"))
+
+        subckt_hashes[name] = hasher.hexdigest()
+        return subckt_hashes[name]
+
+    for name in subckt_lines:
+        subckt_hash(name, set())
+
+    return subckt_hashes
+
+
+def get_schematic_subckt_names(netlist_path: str):
+    """
+    get_schematic_subckt_names get the names of all subcircuits defined in the schematic netlist.
+
+    Parameters
+    ----------
+    netlist_path : str
+        Path to the schematic netlist.
+
+    Returns
+    -------
+    set
+        Set of upper case subcircuit names, SPICE names are case insensitive.
+    """
+    subckt_pattern = re.compile(r"^\s*\.subckt\s+(\S+)", re.IGNORECASE)
+    subckt_names = set()
+
+    with open(netlist_path, errors="replace") as f:
+        for line in f:
+            m = subckt_pattern.match(line)
+            if m:
+                subckt_names.add(m.group(1).upper())
+
+    return subckt_names
+
+
+def get_lvs_partitions(layout_path: str, topcell: str, netlist_path: str):
+    """
+    get_lvs_partitions get the subcircuits of the topcell that could be compared independently.
+    These are the child cells of the topcell that have a matching subcircuit in the schematic netlist.
+
+    Parameters
+    ----------
+    layout_path : str
+        Path to the target layout.
+    topcell : str
+        Name of the topcell used in run.
+    netlist_path : str
+        Path to the schematic netlist.
+
+    Returns
+    -------
+    list
+        List of the layout cell names of all partitions.
+    """
+    layout = klayout.db.Layout()
+    layout.read(layout_path)
+    top_cell = layout.cell(topcell)
+
+    if top_cell is None:
+        logging.error(f"## Topcell {topcell} doesn't exist in layout {layout_path}.")
+        exit(1)
+
+    subckt_names = get_schematic_subckt_names(netlist_path)
+
+    return sorted(
+        layout.cell_name(ci)
+        for ci in top_cell.each_child_cell()
+        if layout.cell_name(ci).upper() in subckt_names
+    )
+
+
+def run_lvs_jobs(
+    lvs_file: str, layout_path: str, lvs_jobs: dict, workers_count: int, l2n_path: str = None
+):
+    """
+    run_lvs_jobs run LVS jobs in parallel, each in its own run directory with its own log.
+
+    Parameters
+    ----------
+    lvs_file : str
+        String that has the file full path to run, the compare rule deck if l2n_path is given.
+    layout_path : str
+        String that holds the full path of the layout.
+    lvs_jobs : dict
+        Dictionary of run names to tuples of (run directory, switches).
+    workers_count : int
+        Number of klayout runs in parallel.
+    l2n_path : str
+        Path to an extraction database, the jobs only compare against it if given.
+
+    Returns
+    -------
+    dict
+        Dictionary that holds the match result of each run name.
+    """
+    lvs_results = dict()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers_count) as executor:
+        future_to_run_name = dict()
+        for run_name, (run_dir, sws) in lvs_jobs.items():
+            os.makedirs(run_dir, exist_ok=True)
+            log_path = os.path.join(run_dir, f"{run_name}.log")
+            if l2n_path:
+                future = executor.submit(
+                    run_cached_compare, lvs_file, l2n_path, layout_path, run_dir, sws, log_path
+                )
+            else:
+                future = executor.submit(
+                    run_check, lvs_file, layout_path, run_dir, sws, log_path
+                )
+            future_to_run_name[future] = run_name
+
+        for future in concurrent.futures.as_completed(future_to_run_name):
+            run_name = future_to_run_name[future]
+            try:
+                lvs_results[run_name] = write_lvs_summary(future.result())["match"]
+            except Exception as exc:
+                logging.error("%s generated an exception: %s" % (run_name, str(exc)))
+                traceback.print_exc()
+                lvs_results[run_name] = False
+
+            logging.info(
+                f"## LVS of {run_name} completed, netlists match: {lvs_results[run_name]}"
+            )
+
+    return lvs_results
+
+
+def run_partitioned_lvs(
+    lvs_file: str,
+    compare_file: str,
+    layout_path: str,
+    lvs_run_dir: str,
+    switches: dict,
+    partitions: list,
+    workers_count: int,
+):
+    """
+    run_partitioned_lvs extract the layout netlist once, then compare the topcell and each of its
+    partition subcircuits against the extraction in parallel.
+    The partitions are kept as black boxes in the topcell comparison.
+
+    Parameters
+    ----------
+    lvs_file : str
+        String that has the extraction rule deck full path.
+    compare_file : str
+        String that has the compare rule deck full path.
+    layout_path : str
+        String that holds the full path of the layout.
+    lvs_run_dir : str
+        String that holds the full path of the run location.
+    switches : dict
+        Dictionary that holds all switches that needs to be passed to the LVS run.
+    partitions : list
+        List of the partition cell names.
+    workers_count : int
+        Number of klayout runs in parallel.
+
+    Returns
+    -------
+    dict
+        Dictionary that holds the match result of each run name.
+    """
+    lvs_jobs = dict()
+
+    top_sws = switches.copy()
+    if len(partitions) > 0:
+        top_sws["blank_circuits"] = ",".join(partitions)
+    lvs_jobs[switches["topcell"]] = (os.path.join(lvs_run_dir, "top"), top_sws)
+
+    for p in partitions:
+        part_sws = switches.copy()
+        part_sws["topcell"] = p
+        lvs_jobs[p] = (os.path.join(lvs_run_dir, "partitions", p), part_sws)
+
+    l2n_path = run_extraction(lvs_file, layout_path, lvs_run_dir, switches)
+
+    return run_lvs_jobs(compare_file, layout_path, lvs_jobs, workers_count, l2n_path)
+
+
+def run_multi_variant_lvs(
+    lvs_file: str,
+    layout_path: str,
+    lvs_run_dir: str,
+    switches: dict,
+    variants: list,
+    workers_count: int,
+):
+    """
+    run_multi_variant_lvs run LVS of all variants in parallel, each in its own run directory.
+
+    Parameters
+    ----------
+    lvs_file : str
+        String that has the file full path to run.
+    layout_path : str
+        String that holds the full path of the layout.
+    lvs_run_dir : str
+        String that holds the full path of the run location.
+    switches : dict
+        Dictionary that holds all switches that needs to be passed to the LVS run.
+    variants : list
+        List of the variant names.
+    workers_count : int
+        Number of klayout runs in parallel.
+
+    Returns
+    -------
+    dict
+        Dictionary that holds the match result of each variant.
+    """
+    lvs_jobs = dict()
+
+    for variant in variants:
+        variant_sws = switches.copy()
+        variant_sws.update(get_variant_switches(variant))
+        lvs_jobs[f"variant_{variant}"] = (os.path.join(lvs_run_dir, f"variant_{variant}"), variant_sws)
+
+    return run_lvs_jobs(lvs_file, layout_path, lvs_jobs, workers_count)
+
+
+def check_lvs_runs_results(lvs_results: dict):
+    """
+    check_lvs_runs_results Checks the results of all parallel LVS runs and report at the end if the LVS run failed or passed.
+
+    Parameters
+    ----------
+    lvs_results : dict
+        Dictionary that holds the match result of each run name.
+    """
+    failed_runs = [r for r, match in lvs_results.items() if not match]
+
+    if len(failed_runs) > 0:
+        logging.error(f"## Netlists don't match for: {failed_runs}")
+        exit(1)
+    else:
+        logging.info(f"## Netlists match for all runs: {sorted(lvs_results)}")
+
+
+def main(lvs_run_dir: str, arguments: dict):
+    """
+    main function to run the LVS.
+
+    Parameters
+    ----------
+    lvs_run_dir : str
+        String with absolute path of the full run dir.
+    arguments : dict
+        Dictionary that holds the arguments used by user in the run command. This is generated by docopt library.
+    """
+
+    ## Check Klayout version
+    check_klayout_version()
+
+    ## Check layout file existence
+    layout_path = arguments["--layout"]
+    if not os.path.exists(arguments["--layout"]):
+        logging.error(
+            f"The input GDS file path {layout_path} doesn't exist, please recheck."
+        )
+        exit(1)
+
+    ## Check layout type
+    layout_path = check_layout_type(layout_path)
+
+    # Check netlist file existence
+    netlist_path = arguments["--netlist"]
+    if not os.path.exists(arguments["--netlist"]):
+        logging.error(
+            f"The input netlist file path {netlist_path} doesn't exist, please recheck."
+        )
+        exit(1)
+
+    lvs_dir = os.path.dirname(os.path.abspath(__file__))
+    lvs_rule_deck = os.path.join(lvs_dir, "gf180mcu.lvs")
+
+    ## Get run switches
+    variants = get_run_variants(arguments)
+    switches = generate_klayout_switches(arguments, layout_path, netlist_path, variants[0])
+
+    ## Pre-parse the schematic netlist once for all runs of the same netlist files
+    if arguments["--schematic_cache"]:
+        schematic_cache = os.path.abspath(arguments["--schematic_cache"])
+        os.makedirs(schematic_cache, exist_ok=True)
+        netlist_path = prepare_schematic(netlist_path, switches["topcell"], schematic_cache)
+        switches["schematic"] = netlist_path
+
+    ## Run the rule decks of the used device families only
+    if arguments["--device_scope"]:
+        families = get_lvs_device_families(lvs_dir, layout_path, netlist_path)
+        logging.info(f"## LVS device families used in run: {families}")
+        lvs_rule_deck = assemble_lvs_deck(lvs_rule_deck, families, lvs_run_dir)
+
+    ## Run LVS of each variant in parallel
+    if len(variants) > 1:
+        if arguments["--partition"] or arguments["--extract_only"] or arguments["--cache_dir"]:
+            logging.error(
+                "Multiple variants can't be used with --partition, --extract_only or --cache_dir."
+            )
+            exit(1)
+
+        lvs_results = run_multi_variant_lvs(
+            lvs_rule_deck,
+            layout_path,
+            lvs_run_dir,
+            switches,
+            variants,
+            int(arguments["--mp"]) if arguments["--mp"] else len(variants),
+        )
+        check_lvs_runs_results(lvs_results)
+        return
+
+    ## Run LVS of each partition separately
+    if arguments["--partition"]:
+        if arguments["--extract_only"] or arguments["--cache_dir"] or arguments["--incremental"]:
+            logging.error(
+                "Partitioned LVS can't be used with --extract_only, --cache_dir or --incremental."
+            )
+            exit(1)
+
+        if switches["run_mode"] != "deep":
+            logging.error("Partitioned LVS is only supported in deep mode.")
+            exit(1)
+
+        partitions = get_lvs_partitions(layout_path, switches["topcell"], netlist_path)
+        logging.info(f"## LVS partitions compared separately: {partitions}")
+
+        lvs_results = run_partitioned_lvs(
+            lvs_rule_deck,
+            os.path.join(lvs_dir, "gf180mcu_compare.lvs"),
+            layout_path,
+            lvs_run_dir,
+            switches,
+            partitions,
+            int(arguments["--mp"]) if arguments["--mp"] else 1,
+        )
+        check_lvs_runs_results(lvs_results)
+        return
+
+    ## Reuse a previous extraction of the same layout if cached.
+    cache_dir = arguments["--cache_dir"]
+    if arguments["--incremental"] and not cache_dir:
+        logging.error("Incremental compare needs the extraction cache, please use --cache_dir.")
+        exit(1)
+
+    if arguments["--extract_only"] or cache_dir:
+        layout_base_name = os.path.basename(layout_path).split(".")[0]
+        l2n_path = None
+
+        if cache_dir:
+            cache_dir = os.path.abspath(cache_dir)
+            os.makedirs(cache_dir, exist_ok=True)
+            cache_key = get_extraction_cache_key(
+                lvs_dir, lvs_rule_deck, layout_path, switches
+            )
+            l2n_path = restore_cached_extraction(
+                cache_dir, cache_key, layout_path, lvs_run_dir, switches["netlist_format"]
+            )
+            if l2n_path is not None:
+                logging.info(f"## Layout extraction restored from cache entry: {cache_key}")
+
+        if l2n_path is None and arguments["--extract_only"]:
+            l2n_path = run_extraction(lvs_rule_deck, layout_path, lvs_run_dir, switches)
+            if cache_dir:
+                store_cached_extraction(cache_dir, cache_key, l2n_path, switches["netlist_format"])
+
+        elif l2n_path is None:
+            ## Full run that also saves its extraction for later compares.
+            ext_sws = switches.copy()
+            ext_sws["l2n"] = os.path.join(lvs_run_dir, f"{layout_base_name}.l2n")
+            res_db_files = run_check(lvs_rule_deck, layout_path, lvs_run_dir, ext_sws)
+            store_cached_extraction(cache_dir, cache_key, ext_sws["l2n"], switches["netlist_format"])
+
+            if arguments["--incremental"]:
+                summary = write_lvs_summary(res_db_files)
+                store_compare_state(
+                    cache_dir, cache_key, switches,
+                    get_schematic_subckt_hashes(netlist_path), summary,
+                )
+                report_lvs_summary(summary)
+            else:
+                check_lvs_results(res_db_files)
+            return
+
+        if arguments["--extract_only"]:
+            netlist_ext = EXTRACTED_NETLIST_FORMATS[switches["netlist_format"]][0]
+            logging.info(f"## Layout extracted netlist at: {os.path.splitext(l2n_path)[0]}{netlist_ext}")
+            return
+
+        compare_rule_deck = os.path.join(lvs_dir, "gf180mcu_compare.lvs")
+
+        if arguments["--incremental"]:
+            ## Unchanged circuits are kept as black boxes and their previous results are reused.
+            schematic_hashes = get_schematic_subckt_hashes(netlist_path)
+            reused_results = get_reused_compare_results(
+                load_compare_state(cache_dir, cache_key), switches, schematic_hashes
+            )
+            compare_sws = switches.copy()
+            if reused_results["circuits"]:
+                compare_sws["blank_circuits"] = ",".join(
+                    c["layout"].strip("'") for c in reused_results["circuits"] if c["layout"] != "()"
+                )
+
+            res_db_files = run_cached_compare(
+                compare_rule_deck, l2n_path, layout_path, lvs_run_dir, compare_sws
+            )
+            summary = write_lvs_summary(res_db_files, reused_results)
+            store_compare_state(cache_dir, cache_key, switches, schematic_hashes, summary)
+            report_lvs_summary(summary)
+            return
+
+        res_db_files = run_cached_compare(
+            compare_rule_deck, l2n_path, layout_path, lvs_run_dir, switches
+        )
+        check_lvs_results(res_db_files)
+        return
+
+    ## Run LVS check
+    res_db_files = run_check(lvs_rule_deck, layout_path, lvs_run_dir, switches)
+
+    ## Check run
+    check_lvs_results(res_db_files)
+
+
+if __name__ == "__main__":
+
+    # arguments
+    arguments = docopt(__doc__, version="RUN LVS: 1.0")
+
+    ## Summarize an existing results database only.
+    if arguments["--summarize"]:
+        logging.basicConfig(
+            level=logging.DEBUG,
+            format="%(asctime)s | %(levelname)-7s | %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        check_lvs_results(os.path.abspath(arguments["--summarize"]))
+        exit(0)
 
     # logs format
     now_str = datetime.utcnow().strftime("lvs_run_%Y_%m_%d_%H_%M_%S")
@@ -0,0 +1,165 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## LVS binary extracted netlist test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import gzip
+import pytest
+import klayout.db as k
+
+lvs_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, lvs_dir)
+
+from extracted_netlist import BinaryNetlist, write_binary_netlist  # noqa E402
+from run_lvs import write_extracted_netlist  # noqa E402
+
+NETLIST = """* extracted netlist
+.SUBCKT INV A Y VDD VSS
+M$1 Y A VSS VSS nfet_03v3 L=0.28U W=1U AS=0.44P AD=0.44P PS=2.88U PD=2.88U
+M$2 Y A VDD VDD pfet_03v3 L=0.28U W=2U AS=0.88P AD=0.88P PS=4.88U PD=4.88U
+.ENDS INV
+.SUBCKT TOP IN OUT VDD VSS FLOAT
+X$1 IN N VDD VSS INV
+X$2 N OUT VDD VSS INV
+R$3 IN OUT 1000
+.ENDS TOP
+"""
+
+
+def read_netlist(path):
+    """
+    Returns the klayout netlist of a SPICE file
+    """
+
+    netlist = k.Netlist()
+    netlist.read(str(path), k.NetlistSpiceReader())
+
+    return netlist
+
+
+def net_name(net):
+    """
+    Returns the name of a klayout net, None if unconnected
+    """
+
+    return None if net is None else net.expanded_name()
+
+
+def check_netlist(netlist, binary):
+    """
+    Checks that a binary netlist has the circuits, pins, nets, devices and subcircuits of a klayout netlist
+
+    Args :
+        netlist : klayout netlist
+        binary : binary netlist
+    """
+
+    assert [c.name for c in binary.each_circuit()] == [c.name for c in netlist.each_circuit()]
+
+    for circuit in netlist.each_circuit():
+        binary_circuit = binary.circuit_by_name(circuit.name)
+
+        assert binary_circuit.nets == [n.expanded_name() for n in circuit.each_net()]
+        assert [(p.name, p.net) for p in binary_circuit.pins] == [
+            (p.name(), net_name(circuit.net_for_pin(p))) for p in circuit.each_pin()
+        ]
+
+        devices = list(binary_circuit.each_device())
+        assert len(devices) == len(list(circuit.each_device()))
+        for device, binary_device in zip(circuit.each_device(), devices):
+            device_class = device.device_class()
+            assert binary_device.name == device.expanded_name()
+            assert binary_device.model == device_class.name
+            assert binary_device.terminals == {
+                td.name: net_name(device.net_for_terminal(td.id()))
+                for td in device_class.terminal_definitions()
+            }
+            assert binary_device.parameters == {
+                pd.name: device.parameter(pd.id()) for pd in device_class.parameter_definitions()
+            }
+
+        subcircuits = list(binary_circuit.each_subcircuit())
+        assert len(subcircuits) == len(list(circuit.each_subcircuit()))
+        for subcircuit, binary_subcircuit in zip(circuit.each_subcircuit(), subcircuits):
+            assert binary_subcircuit.name == subcircuit.expanded_name()
+            assert binary_subcircuit.circuit == subcircuit.circuit_ref().name
+            assert binary_subcircuit.pins == {
+                p.name(): net_name(subcircuit.net_for_pin(p.id()))
+                for p in subcircuit.circuit_ref().each_pin()
+            }
+
+
+def test_binary_netlist_round_trip(tmp_path):
+    """
+    Checks that a netlist written in the binary format reads back the same
+    """
+
+    spice_path = tmp_path / "top.cir"
+    spice_path.write_text(NETLIST)
+    netlist = read_netlist(spice_path)
+
+    nlb_path = str(tmp_path / "top.nlb")
+    write_binary_netlist(netlist, nlb_path)
+
+    with BinaryNetlist(nlb_path) as binary:
+        check_netlist(netlist, binary)
+
+        top = binary.circuit_by_name("TOP")
+        assert dict(top.pins)["FLOAT"] is not None
+        assert [s.pins for s in top.each_subcircuit()][1] == {
+            "A": "N", "Y": "OUT", "VDD": "VDD", "VSS": "VSS"
+        }
+        assert binary.circuit_by_name("OTHER") is None
+
+
+def test_write_extracted_netlist(tmp_path):
+    """
+    Checks the conversion of the compressed netlist written by klayout to the binary format
+    """
+
+    target_path = str(tmp_path / "top.cir.gz")
+    with gzip.open(target_path, "wt") as f:
+        f.write(NETLIST)
+
+    spice_path = tmp_path / "top.cir"
+    spice_path.write_text(NETLIST)
+
+    nlb_path = str(tmp_path / "top.nlb")
+    write_extracted_netlist(target_path, nlb_path, {"netlist_format": "nlb"})
+
+    assert not os.path.exists(target_path)
+    with BinaryNetlist(nlb_path) as binary:
+        check_netlist(read_netlist(spice_path), binary)
+
+
+def test_not_binary_netlist(tmp_path):
+    """
+    Checks that other files aren't read as binary netlists
+    """
+
+    spice_path = tmp_path / "top.cir"
+    spice_path.write_text(NETLIST)
+
+    with pytest.raises(ValueError):
+        BinaryNetlist(str(spice_path))
+
+    empty_path = tmp_path / "empty.nlb"
+    empty_path.write_bytes(b"")
+
+    with pytest.raises(ValueError):
+        BinaryNetlist(str(empty_path))
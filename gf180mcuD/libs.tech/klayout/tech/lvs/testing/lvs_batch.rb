@@ -0,0 +1,51 @@
+################################################################################################
+# Copyright 2023 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+################################################################################################
+
+#=======================================================================================================================
+#------------------------------------------ GF 0.18um MCU LVS BATCH RUNNER ---------------------------------------------
+#=======================================================================================================================
+# Runs the LVS rule deck ($lvs_deck) on all testcases listed in the JSON batch file ($batch) in one klayout session.
+# Each testcase entry has its input, schematic, report, target_netlist and log paths.
+# Other switches passed to klayout are shared by all testcases of the batch.
+
+require 'json'
+
+deck = RBA::Macro.new($lvs_deck)
+test_cases = JSON.parse(File.read($batch))
+batch_stdout = $stdout
+
+test_cases.each do |tc|
+  $input = tc['input']
+  $schematic = tc['schematic']
+  $report = tc['report']
+  $target_netlist = tc['target_netlist']
+
+  start_time = Time.now
+
+  File.open(tc['log'], 'w') do |log|
+    # Deck logger writes to $stdout, so each testcase gets its own log
+    $stdout = log
+    begin
+      deck.run
+    rescue StandardError => e
+      log.puts("ERROR : LVS run of #{tc['device_name']} failed: #{e}")
+    ensure
+      $stdout = batch_stdout
+    end
+  end
+
+  batch_stdout.puts(format('%s completed in %f seconds', tc['device_name'], Time.now - start_time))
+end
@@ -0,0 +1,454 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## LVS results and schematic netlist parsing test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import json
+import pytest
+import klayout.db as k
+
+lvs_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, lvs_dir)
+
+import run_lvs  # noqa E402
+
+LVSDB_LONG = """#%lvsdb-klayout
+layout(
+ top(TOP)
+ unit(0.001)
+ circuit(INV
+  net(1 name(A))
+  net(2 name(Y))
+  pin(1 name(A))
+  pin(2 name(Y))
+ )
+ circuit(TOP
+  net(1 name(IN))
+  net(2 name(OUT))
+  circuit(1 INV location(0 0)
+   pin(0 1)
+   pin(1 2)
+  )
+ )
+)
+reference(
+ circuit(INV
+  net(1 name(A))
+  net(2 name(Y))
+  pin(1 name(A))
+  pin(2 name(Y))
+ )
+ circuit(TOP
+  net(1 name(IN))
+  net(2 name(OUT))
+  net(3 name(X))
+  pin(1 name(IN))
+  pin(2 name(OUT))
+  pin(3 name(X))
+  circuit(1 INV name(I1)
+   pin(0 1)
+   pin(1 2)
+  )
+ )
+)
+xref(
+ circuit(INV INV match
+  xref(
+   net(1 1 match)
+   net(2 2 match)
+   pin(0 0 match)
+   pin(1 1 match)
+  )
+ )
+ circuit(TOP TOP nomatch
+  log(
+   entry(error description('Net X is not matched'))
+  )
+  xref(
+   net(() 3 mismatch)
+   net(1 1 match)
+   net(2 2 match)
+   pin(() 0 match)
+   pin(() 1 match)
+   pin(() 2 mismatch)
+   circuit(1 1 match)
+  )
+ )
+)
+"""
+
+LVSDB_SHORT = """#%lvsdb-klayout
+J(
+ W(TOP)
+ U(0.001)
+ X(INV
+  N(1 I(A))
+  N(2 I(Y))
+  P(1 I(A))
+  P(2 I(Y))
+ )
+ X(TOP
+  N(1 I(IN))
+  N(2 I(OUT))
+  X(1 INV Y(0 0)
+   P(0 1)
+   P(1 2)
+  )
+ )
+)
+H(
+ X(INV
+  N(1 I(A))
+  N(2 I(Y))
+  P(1 I(A))
+  P(2 I(Y))
+ )
+ X(TOP
+  N(1 I(IN))
+  N(2 I(OUT))
+  N(3 I(X))
+  P(1 I(IN))
+  P(2 I(OUT))
+  P(3 I(X))
+  X(1 INV I(I1)
+   P(0 1)
+   P(1 2)
+  )
+ )
+)
+Z(
+ X(INV INV 1
+  Z(
+   N(1 1 1)
+   N(2 2 1)
+   P(0 0 1)
+   P(1 1 1)
+  )
+ )
+ X(TOP TOP X
+  L(
+   M(E B('Net X is not matched'))
+  )
+  Z(
+   N(() 3 0)
+   N(1 1 1)
+   N(2 2 1)
+   P(() 0 1)
+   P(() 1 1)
+   P(() 2 0)
+   X(1 1 1)
+  )
+ )
+)
+"""
+
+
+@pytest.fixture(params=["long", "short"])
+def lvsdb_path(request, tmp_path):
+    """
+    Writes the LVS results database in the long and short formats
+    """
+
+    path = tmp_path / f"{request.param}.lvsdb"
+    path.write_text(LVSDB_LONG if request.param == "long" else LVSDB_SHORT)
+
+    return str(path)
+
+
+def test_summarize_lvsdb(lvsdb_path):
+    """
+    Checks the circuits, totals, mismatches and messages of the LVS summary
+
+    Args :
+        lvsdb_path : path of the LVS results database
+    """
+
+    summary = run_lvs.summarize_lvsdb(lvsdb_path)
+
+    assert summary["compared"] and not summary["match"]
+    assert [(c["layout"], c["status"]) for c in summary["circuits"]] == [
+        ("INV", "match"),
+        ("TOP", "nomatch"),
+    ]
+    assert summary["circuits"][1]["nets"] == {"matched": 2, "unmatched": 1}
+    assert summary["circuits"][1]["subcircuits"] == {"matched": 1, "unmatched": 0}
+    assert summary["totals"]["pins"] == {"matched": 4, "unmatched": 1}
+    assert summary["totals"]["circuits"] == {"matched": 1, "unmatched": 1}
+
+    # the reference ids of the mismatches are resolved to their names
+    assert [(m["kind"], m["layout"], m["reference"], m["status"]) for m in summary["mismatches"]] == [
+        ("nets", "()", "X", "mismatch"),
+        ("pins", "()", "X", "mismatch"),
+    ]
+    assert summary["messages"] == [
+        {"circuit": "TOP", "severity": "error", "message": "Net X is not matched"}
+    ]
+
+
+def test_summarize_lvsdb_top_n(lvsdb_path):
+    """
+    Checks that the summary keeps the given number of mismatches only
+
+    Args :
+        lvsdb_path : path of the LVS results database
+    """
+
+    summary = run_lvs.summarize_lvsdb(lvsdb_path, top_n=1)
+
+    assert len(summary["mismatches"]) == 1
+    assert summary["totals"]["nets"]["unmatched"] + summary["totals"]["pins"]["unmatched"] == 2
+
+
+def test_summarize_lvsdb_not_compared(tmp_path):
+    """
+    Checks that a database without cross reference doesn't match
+    """
+
+    path = tmp_path / "extract.lvsdb"
+    path.write_text(LVSDB_LONG.split("xref(")[0])
+
+    summary = run_lvs.summarize_lvsdb(str(path))
+
+    assert not summary["compared"] and not summary["match"]
+    assert summary["circuits"] == []
+
+
+def test_write_lvs_summary(lvsdb_path):
+    """
+    Checks the JSON summary written next to the LVS results database
+
+    Args :
+        lvsdb_path : path of the LVS results database
+    """
+
+    summary = run_lvs.write_lvs_summary(lvsdb_path)
+
+    with open(f"{os.path.splitext(lvsdb_path)[0]}_summary.json") as f:
+        assert json.load(f) == summary
+
+
+@pytest.fixture
+def netlist_path(tmp_path):
+    """
+    Writes a schematic netlist including a chain of two files, with continuation lines
+    """
+
+    (tmp_path / "models").mkdir()
+    (tmp_path / "cells.spice").write_text(
+        """* cells
+.include models/devices.spice
+.subckt INV A Y VDD VSS
+MN Y A VSS VSS nfet_03v3
++ w=1u l=0.28u
+MP Y A VDD VDD pfet_03v3 w=2u
++ l=0.28u
+.ends
+.subckt UNUSED A
+XI1 A A VDD VSS INV
+.ends
+"""
+    )
+    (tmp_path / "models" / "devices.spice").write_text(
+        """.subckt BUF A Y VDD VSS
+XI1 A N VDD VSS INV
+XI2 N Y VDD VSS INV
+.ends
+"""
+    )
+    path = tmp_path / "top.spice"
+    path.write_text(
+        """* top netlist
+.INCLUDE 'cells.spice'
+.subckt TOP IN OUT VDD VSS
+XB IN OUT VDD VSS BUF
+.ends
+.end
+"""
+    )
+
+    return str(path)
+
+
+def test_spice_files(netlist_path, tmp_path):
+    """
+    Checks the chain of included files of a netlist
+
+    Args :
+        netlist_path : path of the schematic netlist
+    """
+
+    assert run_lvs.get_spice_files(netlist_path) == [
+        str(tmp_path / "top.spice"),
+        str(tmp_path / "cells.spice"),
+        str(tmp_path / "models" / "devices.spice"),
+    ]
+
+
+def test_read_spice_lines(netlist_path):
+    """
+    Checks the netlist statements with the includes resolved and the continuation lines joined
+
+    Args :
+        netlist_path : path of the schematic netlist
+    """
+
+    spice_lines = run_lvs.read_spice_lines(netlist_path)
+
+    assert spice_lines[:2] == [".subckt BUF A Y VDD VSS", "XI1 A N VDD VSS INV"]
+    assert "MN Y A VSS VSS nfet_03v3 w=1u l=0.28u" in spice_lines
+    assert "MP Y A VDD VDD pfet_03v3 w=2u l=0.28u" in spice_lines
+    assert not any(line.startswith(("*", "+", ".include", ".INCLUDE")) for line in spice_lines)
+    assert spice_lines[-1] == ".ends"
+
+
+def test_lvs_device_families(netlist_path, tmp_path):
+    """
+    Checks the device families used by the marker layers of the layout and the models of the netlist includes
+
+    Args :
+        netlist_path : path of the schematic netlist
+    """
+
+    layout = k.Layout()
+    top = layout.create_cell("TOP")
+    # efuse_mk and comp
+    top.shapes(layout.layer(80, 5)).insert(k.Box(0, 0, 1000, 1000))
+    top.shapes(layout.layer(22, 0)).insert(k.Box(0, 0, 1000, 1000))
+    layout_path = str(tmp_path / "top.gds")
+    layout.write(layout_path)
+
+    assert run_lvs.get_layout_layers(layout_path, {(80, 5), (30, 0)}) == {(80, 5)}
+    # nfet_03v3 is used in an included file only
+    assert "nfet_03v3" in run_lvs.get_schematic_words(netlist_path)
+    assert run_lvs.get_lvs_device_families(lvs_dir, layout_path, netlist_path) == ["mos", "efuse"]
+
+
+def test_prune_spice_subckts(netlist_path):
+    """
+    Checks that the subcircuits not used by the topcell are removed
+
+    Args :
+        netlist_path : path of the schematic netlist
+    """
+
+    spice_lines = run_lvs.read_spice_lines(netlist_path)
+
+    pruned = run_lvs.prune_spice_subckts(spice_lines, "top")
+    assert [line for line in pruned if line.startswith(".subckt")] == [
+        ".subckt BUF A Y VDD VSS",
+        ".subckt INV A Y VDD VSS",
+        ".subckt TOP IN OUT VDD VSS",
+    ]
+
+    pruned = run_lvs.prune_spice_subckts(spice_lines, "INV")
+    assert [line for line in pruned if line.startswith(".subckt")] == [".subckt INV A Y VDD VSS"]
+
+    # an unknown topcell keeps all the subcircuits
+    assert run_lvs.prune_spice_subckts(spice_lines, "OTHER") == spice_lines
+
+
+def test_prepare_schematic(netlist_path, tmp_path):
+    """
+    Checks the pre-parsed netlist cache, keyed by the content of all the netlist files
+
+    Args :
+        netlist_path : path of the schematic netlist
+    """
+
+    cache_dir = str(tmp_path / "cache")
+    os.makedirs(cache_dir)
+
+    cached = run_lvs.prepare_schematic(netlist_path, "TOP", cache_dir)
+    with open(cached) as f:
+        lines = f.read().splitlines()
+    assert ".subckt UNUSED A" not in lines and lines[-1] == ".end"
+
+    assert run_lvs.prepare_schematic(netlist_path, "TOP", cache_dir) == cached
+    assert run_lvs.prepare_schematic(netlist_path, "BUF", cache_dir) != cached
+
+    # a change in an included file gives a new cache entry
+    with open(tmp_path / "models" / "devices.spice", "a") as f:
+        f.write("* changed\n")
+    assert run_lvs.prepare_schematic(netlist_path, "TOP", cache_dir) != cached
+
+
+def test_schematic_subckt_hashes(netlist_path, tmp_path):
+    """
+    Checks that a subcircuit hash changes with its statements and with the subcircuits it uses
+
+    Args :
+        netlist_path : path of the schematic netlist
+    """
+
+    hashes = run_lvs.get_schematic_subckt_hashes(netlist_path)
+    assert sorted(hashes) == ["BUF", "INV", "TOP", "UNUSED"]
+    assert run_lvs.get_schematic_subckt_hashes(netlist_path) == hashes
+
+    # a change of BUF changes the hash of its parent TOP only
+    devices = tmp_path / "models" / "devices.spice"
+    devices.write_text(devices.read_text().replace("XI2 N Y", "XI2 N Y2"))
+    changed = run_lvs.get_schematic_subckt_hashes(netlist_path)
+    assert [name for name in hashes if changed[name] != hashes[name]] == ["BUF", "TOP"]
+
+    # a change of INV, on a continuation line, changes all the subcircuits using it
+    cells = tmp_path / "cells.spice"
+    cells.write_text(cells.read_text().replace("+ w=1u", "+ w=2u"))
+    changed_inv = run_lvs.get_schematic_subckt_hashes(netlist_path)
+    assert all(changed_inv[name] != changed[name] for name in hashes)
+
+
+def test_merge_lvs_summary(lvsdb_path):
+    """
+    Checks the merge of the results reused from the previous run into the summary of the recompared circuits
+
+    Args :
+        lvsdb_path : path of the LVS results database
+    """
+
+    previous = run_lvs.summarize_lvsdb(lvsdb_path)
+    switches = {"topcell": "TOP", "input": "top.gds", "thr": "2"}
+    state = {
+        "switches": run_lvs.get_compare_state_switches(switches),
+        "schematic_hashes": {"INV": "inv", "TOP": "top"},
+        "circuits": previous["circuits"],
+        "mismatches": previous["mismatches"],
+    }
+
+    # the topcell is always compared again, and INV only if its schematic changed
+    reused = run_lvs.get_reused_compare_results(state, switches, {"INV": "inv", "TOP": "top2"})
+    assert [c["reference"] for c in reused["circuits"]] == ["INV"]
+    assert reused["mismatches"] == []
+    assert run_lvs.get_reused_compare_results(
+        state, switches, {"INV": "inv2", "TOP": "top"}
+    )["circuits"] == []
+    assert run_lvs.get_reused_compare_results(
+        state, dict(switches, variant="B"), {"INV": "inv", "TOP": "top"}
+    )["circuits"] == []
+
+    # the INV circuit is blank in the new compare, its previous result replaces it
+    summary = run_lvs.summarize_lvsdb(lvsdb_path)
+    summary["circuits"][0]["status"] = "skipped"
+    run_lvs.merge_lvs_summary(summary, reused["circuits"], reused["mismatches"])
+
+    assert [(c["reference"], c["status"]) for c in summary["circuits"]] == [
+        ("TOP", "nomatch"),
+        ("INV", "match"),
+    ]
+    assert summary["incremental"] == {"recompared": ["TOP"], "reused": ["INV"]}
+    assert summary["totals"]["circuits"] == {"matched": 1, "unmatched": 1}
+    assert len(summary["mismatches"]) == 2 and not summary["match"]
@@ -16,13 +16,14 @@
 
 Usage:
     run_regression.py (--help| -h)
-    run_regression.py [--device_name=<device_name>] [--mp=<num>] [--run_name=<run_name>]
+    run_regression.py [--device_name=<device_name>] [--mp=<num>] [--run_name=<run_name>] [--batch]
 
 Options:
     --help -h                      Print this help message.
     --device_name=<device_name>    Name of device that we want to run regression for, Allowed values (MOS, BJT, DIODE, RES, MIMCAP, MOSCAP, MOS_SAB, EFUSE).
     --mp=<num>                     The number of threads used in run.
     --run_name=<run_name>          Select your run name.
+    --batch                        Run all test cases of a device group with the same switches in one klayout session.
 """
 
 from subprocess import check_call
@@ -45,6 +46,7 @@ import errno
 import numpy as np
 from collections import defaultdict
 import shutil
+import json
 
 SUPPORTED_TC_EXT = "gds"
 SUPPORTED_SPICE_EXT = "cdl"
@@ -206,6 +208,105 @@ def get_switches(yaml_file, rule_name):
     return [f"{param}={value}" for param, value in yaml_dic[rule_name].items()]
 
 
+def get_test_case_switches(layout_path, device_name):
+    """
+    get_test_case_switches get the klayout switches used for a test case.
+
+    Parameters
+    ----------
+    layout_path : stirng or Path object
+        Path string to the layout of the test pattern we want to test.
+    device_name : string
+        Device name that we are running on.
+
+    Returns
+    -------
+    string
+        Klayout switches of the test case.
+    """
+    sw_file = os.path.join(
+        Path(layout_path.parent).absolute(), f"{device_name}.{SUPPORTED_SW_EXT}"
+    )
+
+    if os.path.exists(sw_file):
+        return " ".join(get_switches(sw_file, device_name))
+    else:
+        return " -rd lvs_sub=sub!" if device_name == "sample_ggnfet_06v0_dss" else " -rd lvs_sub=vdd!"  # default switch
+
+
+def prepare_test_case(layout_path, netlist_path, run_dir, device_name):
+    """
+    prepare_test_case create the run folder of a test case and copy the test case files in it.
+
+    Parameters
+    ----------
+    layout_path : stirng or Path object
+        Path string to the layout of the test pattern we want to test.
+    netlist_path : stirng or Path object
+        Path string to the netlist of the test pattern we want to test.
+    run_dir : stirng or Path object
+        Path to the location where is the regression run is done.
+    device_name : string
+        Device name that we are running on.
+
+    Returns
+    -------
+    dict
+        A dict with the paths of the test case run files.
+    """
+    pattern_clean = ".".join(os.path.basename(layout_path).split(".")[:-1])
+    output_loc = os.path.join(run_dir, device_name)
+    os.makedirs(output_loc, exist_ok=True)
+
+    tc_files = {
+        "device_name": device_name,
+        "input": os.path.join(output_loc, f"{device_name}.gds"),
+        "schematic": os.path.join(output_loc, f"{device_name}.cdl"),
+        "report": os.path.join(output_loc, f"{device_name}.lvsdb"),
+        "target_netlist": os.path.join(output_loc, f"{device_name}_extracted.cir"),
+        "log": os.path.join(output_loc, f"{pattern_clean}_lvs.log"),
+    }
+
+    shutil.copyfile(layout_path, tc_files["input"])
+    shutil.copyfile(netlist_path, tc_files["schematic"])
+
+    return tc_files
+
+
+def get_test_case_status(device_name, layout_path, pattern_log):
+    """
+    get_test_case_status check the LVS result of a test case from its run log.
+
+    Parameters
+    ----------
+    device_name : string
+        Device name that we are running on.
+    layout_path : stirng or Path object
+        Path string to the layout of the test pattern we want to test.
+    pattern_log : string
+        Path to the klayout log of the test case run.
+
+    Returns
+    -------
+    string
+        Status of the test case, Passed or Failed.
+    """
+    if not os.path.isfile(pattern_log):
+        logging.error("Klayout LVS run failed, there is no log file is generated")
+        exit(1)
+
+    with open(pattern_log, "r") as f:
+        result = f.read()
+
+    if "Congratulations! Netlists match" in result:
+        logging.info(f"{device_name} testcase passed")
+        return "Passed"
+    else:
+        logging.error(f"{device_name} testcase failed.")
+        logging.error(f"Please recheck {layout_path} file.")
+        return "Failed"
+
+
 def run_test_case(
     lvs_dir,
     layout_path,
@@ -236,25 +337,14 @@ def run_test_case(
     """
 
     # Get switches used for each run
-    sw_file = os.path.join(
-        Path(layout_path.parent).absolute(), f"{device_name}.{SUPPORTED_SW_EXT}"
-    )
-
-    if os.path.exists(sw_file):
-        switches = " ".join(get_switches(sw_file, device_name))
-    else:
-        # Get switches
-        switches = " -rd lvs_sub=sub!" if device_name == "sample_ggnfet_06v0_dss" else " -rd lvs_sub=vdd!"  # default switch
+    switches = get_test_case_switches(layout_path, device_name)
 
     # Creating run folder structure and copy testcases in it
     pattern_clean = ".".join(os.path.basename(layout_path).split(".")[:-1])
     output_loc = os.path.join(run_dir, device_name)
-    pattern_log = os.path.join(output_loc, f"{pattern_clean}_lvs.log")
-    os.makedirs(output_loc, exist_ok=True)
-    layout_path_run = os.path.join(run_dir, device_name, f"{device_name}.gds")
-    netlist_path_run = os.path.join(run_dir, device_name, f"{device_name}.cdl")
-    shutil.copyfile(layout_path, layout_path_run)
-    shutil.copyfile(netlist_path, netlist_path_run)
+    tc_files = prepare_test_case(layout_path, netlist_path, run_dir, device_name)
+    pattern_log = tc_files["log"]
+    layout_path_run = tc_files["input"]
 
     # command to run drc
     call_str = f"klayout -b -r {lvs_dir}/gf180mcu.lvs -rd input={layout_path_run} -rd schematic={device_name}.cdl -rd report={device_name}.lvsdb  -rd target_netlist={device_name}_extracted.cir {switches} > {pattern_log} 2>&1"
@@ -269,27 +359,117 @@ def run_test_case(
             traceback.print_exc()
             raise Exception("Failed DRC run.")
 
-    # dumping log into output to make CI have the log
-    if os.path.isfile(pattern_log):
-        with open(pattern_log, "r") as f:
-            result = f.read()
-            for line in f:
-                line = line.strip()
-                logging.info(f"{line}")
-
     # checking device status
-        device_status = 'Failed'
-        if "Congratulations! Netlists match" in result:
-            logging.info(f"{device_name} testcase passed")
-            device_status = 'Passed'
-        else:
-            logging.error(f"{device_name} testcase failed.")
-            logging.error(f"Please recheck {layout_path} file.")
-    else:
-        logging.error("Klayout LVS run failed, there is no log file is generated")
-        exit(1)
+    return get_test_case_status(device_name, layout_path, pattern_log)
+
+
+def run_test_cases_batch(lvs_dir, test_cases, run_dir, batch_name, switches):
+    """
+    This function runs a batch of test cases in one klayout session.
+
+    Parameters
+    ----------
+    lvs_dir : string or Path
+        Path to the location where all runsets exist.
+    test_cases : list
+        List of tuples (layout_path, netlist_path, device_name) of the test cases in the batch.
+    run_dir : stirng or Path object
+        Path to the location where is the regression run is done.
+    batch_name : string
+        Name of the batch, used for its files.
+    switches : string
+        Klayout switches shared by all test cases of the batch.
+
+    Returns
+    -------
+    dict
+        A dict with the status of each device name in the batch.
+    """
+    batch_cases = [
+        prepare_test_case(layout_path, netlist_path, run_dir, device_name)
+        for layout_path, netlist_path, device_name in test_cases
+    ]
+
+    batch_file = os.path.join(run_dir, f"{batch_name}_batch.json")
+    batch_log = os.path.join(run_dir, f"{batch_name}_batch.log")
+    with open(batch_file, "w") as f:
+        json.dump(batch_cases, f, indent=2)
+
+    testing_dir = os.path.join(lvs_dir, "testing")
+    call_str = f"klayout -b -r {testing_dir}/lvs_batch.rb -rd lvs_deck={lvs_dir}/gf180mcu.lvs -rd batch={batch_file} {switches} > {batch_log} 2>&1"
+
+    logging.info(f"## Running batch {batch_name} with {len(batch_cases)} test cases.")
+
+    try:
+        check_call(call_str, shell=True)
+    except Exception as e:
+        logging.error("%s generated an exception: %s" % (batch_name, e))
+        traceback.print_exc()
+
+    return {
+        tc["device_name"]: get_test_case_status(tc["device_name"], layout_path, tc["log"])
+        for tc, (layout_path, _, _) in zip(batch_cases, test_cases)
+    }
+
 
-    return device_status
+def run_all_test_cases_batched(tc_df, lvs_dir, run_dir, num_workers):
+    """
+    This function run all test cases from the input dataframe in batches.
+    Test cases of the same device group and switches are run in the same klayout session.
+
+    Parameters
+    ----------
+    tc_df : pd.DataFrame
+        DataFrame that holds all the test cases information for running.
+    lvs_dir : string or Path
+        Path string to the location of the lvs runsets.
+    run_dir : string or Path
+        Path string to the location of the testing code and output.
+    num_workers : int
+        Number of batches to run in parallel.
+
+    Returns
+    -------
+    pd.DataFrame
+        A pandas DataFrame with all test cases information post running.
+    """
+
+    tc_df["device_status"] = "no status"
+    tc_df["switches"] = tc_df.apply(
+        lambda row: get_test_case_switches(row["test_layout_path"], row["device_name"]),
+        axis=1,
+    )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+        future_to_batch = dict()
+        for batch_id, ((device_group, switches), batch_df) in enumerate(
+            tc_df.groupby(["device_group", "switches"])
+        ):
+            test_cases = list(
+                zip(
+                    batch_df["test_layout_path"],
+                    batch_df["test_netlist_path"],
+                    batch_df["device_name"],
+                )
+            )
+            batch_name = f"{device_group.lower()}_{batch_id}"
+            future = executor.submit(
+                run_test_cases_batch, lvs_dir, test_cases, run_dir, batch_name, switches
+            )
+            future_to_batch[future] = batch_name
+
+        for future in concurrent.futures.as_completed(future_to_batch):
+            batch_name = future_to_batch[future]
+            try:
+                for device_name, device_status in future.result().items():
+                    tc_df.loc[tc_df["device_name"] == device_name, "device_status"] = device_status
+            except Exception as exc:
+                logging.error("%s generated an exception: %s" % (batch_name, exc))
+                traceback.print_exc()
+
+    tc_df.loc[tc_df["device_status"] == "no status", "device_status"] = "exception"
+
+    return tc_df.drop("switches", axis=1)
 
 
 def run_all_test_cases(tc_df, lvs_dir, run_dir, num_workers):
@@ -374,7 +554,7 @@ def aggregate_results(
     return df
 
 
-def run_regression(lvs_dir, output_path, target_device_group, cpu_count):
+def run_regression(lvs_dir, output_path, target_device_group, cpu_count, batch=False):
     """
     Running Regression Procedure.
 
@@ -390,6 +570,8 @@ def run_regression(lvs_dir, output_path, target_device_group, cpu_count):
         Name of device group that we want to run regression for. If None, run all found.
     cpu_count : int
         Number of cpus to use in running testcases.
+    batch : bool, optional
+        Run test cases of the same device group in one klayout session.
     Returns
     -------
     bool
@@ -411,7 +593,10 @@ def run_regression(lvs_dir, output_path, target_device_group, cpu_count):
     logging.info("## Found testcases: \n" + str(tc_df))
 
     ## Run all test cases.
-    results_df = run_all_test_cases(tc_df, lvs_dir, output_path, cpu_count)
+    if batch:
+        results_df = run_all_test_cases_batched(tc_df, lvs_dir, output_path, cpu_count)
+    else:
+        results_df = run_all_test_cases(tc_df, lvs_dir, output_path, cpu_count)
     logging.info("## Testcases found results: \n" + str(results_df))
 
     ## Aggregate all dataframes into one
@@ -475,7 +660,9 @@ def main(lvs_dir, output_path, target_device_group):
     check_klayout_version()
 
     # Calling regression function
-    run_status = run_regression(lvs_dir, output_path, target_device_group, cpu_count)
+    run_status = run_regression(
+        lvs_dir, output_path, target_device_group, cpu_count, args["--batch"]
+    )
 
     #  End of execution time
     logging.info("Total execution time {}s".format(time.time() - t0))
@@ -18,11 +18,8 @@
 
 import pya
 
-# NOTE: the cell code was written for gdsfactory v7
-#       install mixins for legacy classes for gdsfactory v9 compatiblity
-from ._patches import patch_legacy_classes
-patch_legacy_classes()
-
+# NOTE: the PCell declarations only import pya, gdsfactory and the draw modules
+#       are loaded on the first PCell produced of each family (see _lazy.py)
 from .fet import nfet, pfet, nfet_06v0_nvt
 from .diode import (
     diode_dw2ps,
@@ -51,6 +48,8 @@ from .res import (
 )
 from .efuse import efuse
 from .vias_gen import via_dev
+from ._arena import arena_stats, kfactory_cell_count, release_layout
+from ._hierarchy import flatten_pcell
 
 
 # It's a Python class that inherits from the pya.Library class
@@ -0,0 +1,95 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# ==============================================================================
+# ------------- Lifecycle of the gdsfactory cells of the PCells ----------------
+# ==============================================================================
+
+from contextlib import contextmanager
+
+# cells deleted by the arenas since the session started
+_arena_stats = {"arenas": 0, "deleted_cells": 0}
+
+
+def kfactory_cell_count():
+    """
+    Get the number of live cells in the global kfactory layout used by gdsfactory.
+    """
+    import kfactory as kf
+
+    return sum(1 for _ in kf.kcl.layout.each_cell())
+
+
+def arena_stats():
+    """
+    Get the cells lifecycle metrics of the session.
+
+    Returns:
+        A dict with the number of closed arenas, the number of cells they deleted
+        and the current number of cells in the kfactory layout.
+    """
+    return dict(_arena_stats, kfactory_cells=kfactory_cell_count())
+
+
+@contextmanager
+def component_arena():
+    """
+    Delete the gdsfactory cells created inside the block when it ends.
+
+    The draw functions build their device from many gdsfactory components, e.g.
+    "temp_store", "dev_temp" or "poly con", then read the result into the PCell
+    layout. Those cells stay in the global kfactory layout, and as duplicate cell
+    names are allowed, every produced PCell adds new ones. The arena removes all
+    the cells added to the kfactory layout by the block, so the layout keeps the
+    same size over a session. The cached @gf.cell components deleted this way are
+    drawn again by kfactory on their next call.
+    """
+    import kfactory as kf
+
+    kcl = kf.kcl
+    cells_before = {c.cell_index() for c in kcl.layout.each_cell()}
+
+    try:
+        yield
+    finally:
+        new_cells = [
+            c.cell_index()
+            for c in kcl.layout.each_cell()
+            if c.cell_index() not in cells_before
+        ]
+        # NOTE: Layout.delete_cells can't tell an empty list apart from its other overloads
+        if new_cells:
+            kcl.delete_cells(new_cells)
+
+            # drop the deleted cells from the @gf.cell caches
+            for factory in kcl.factories.values():
+                for key in [k for k, c in factory.cache.items() if c._destroyed()]:
+                    del factory.cache[key]
+
+        _arena_stats["arenas"] += 1
+        _arena_stats["deleted_cells"] += len(new_cells)
+
+
+def release_layout(layout):
+    """
+    Release a layout holding drawn PCells now.
+
+    The drawing functions leave reference cycles holding the frames that used the
+    layout, so it would only be released by a later garbage collection, keeping all
+    its cells in memory until then.
+
+    Args:
+        layout: The layout to release, it can't be used afterwards.
+    """
+    layout._destroy()
@@ -0,0 +1,123 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# ==============================================================================
+# ---------------------- Hierarchy of the PCells output ------------------------
+# ==============================================================================
+
+import pya
+
+
+def _array_box(cell):
+    """
+    Get the (layer index, box) of a cell holding a single box and no instances, else None.
+    """
+    if cell.child_cells() > 0:
+        return None
+
+    found = None
+    layout = cell.layout()
+    for li in layout.layer_indexes():
+        for shape in cell.shapes(li).each():
+            if found is not None or not shape.is_box():
+                return None
+            found = (li, shape.box)
+
+    return found
+
+
+def _shared_cell(layout, li, box):
+    """
+    Get the cell of the layout holding only the box on the layer, created on first use.
+    """
+    info = layout.get_info(li)
+    name = f"gf180mcu_{info.layer}_{info.datatype}_{box.width()}x{box.height()}"
+    if box.p1 != pya.Point(0, 0):
+        name += f"_{box.left}_{box.bottom}"
+
+    cell = layout.cell(name)
+    if cell is None:
+        cell = layout.create_cell(name)
+        cell.shapes(li).insert(box)
+
+    return cell
+
+
+def flatten_pcell(cell, keep_arrays=False):
+    """
+    Flatten the drawn device into the PCell cell.
+
+    Args:
+        cell: The PCell cell, holding the instance of the drawn device.
+        keep_arrays: If True, the cells of a single box that are placed as arrays, e.g. the
+            contacts and vias, stay instances of a cell shared by all the PCells of the layout,
+            and the rest of the device is flattened.
+    """
+    if not keep_arrays:
+        cell.flatten(1)
+        return
+
+    layout = cell.layout()
+    drawn = [inst.cell_index for inst in cell.each_inst()]
+
+    # the single box cells placed in arrays anywhere in the device
+    kept = {}
+    for ci in {c for d in drawn for c in layout.cell(d).called_cells()} | set(drawn):
+        child = layout.cell(ci)
+        array_box = _array_box(child)
+        if array_box is not None and any(
+            parent.inst().size() > 1 for parent in child.each_parent_inst()
+        ):
+            kept[ci] = _shared_cell(layout, *array_box).cell_index()
+
+    arrays = []
+
+    def collect_arrays(parent, trans):
+        for inst in parent.each_inst():
+            array = inst.cell_inst
+            if inst.cell_index in kept:
+                arrays.append(
+                    pya.CellInstArray(
+                        kept[inst.cell_index],
+                        trans * array.cplx_trans,
+                        trans * array.a,
+                        trans * array.b,
+                        max(array.na, 1),
+                        max(array.nb, 1),
+                    )
+                )
+            elif inst.cell.child_cells() > 0:
+                for element in array.each_cplx_trans():
+                    collect_arrays(inst.cell, trans * element)
+
+    collect_arrays(cell, pya.ICplxTrans())
+
+    # the shapes of the device except the ones of the kept cells
+    for li in layout.layer_indexes():
+        it = cell.begin_shapes_rec(li)
+        it.min_depth = 1
+        it.unselect_cells(list(kept))
+        shapes = pya.Shapes()
+        while not it.at_end():
+            shapes.insert(it.shape(), it.trans())
+            it.next()
+        cell.shapes(li).insert(shapes)
+
+    cell.clear_insts()
+    for array in arrays:
+        cell.insert(array)
+
+    for ci in set(drawn):
+        if layout.is_valid_cell_index(ci) and layout.cell(ci).parent_cells() == 0:
+            layout.cell(ci).prune_cell()
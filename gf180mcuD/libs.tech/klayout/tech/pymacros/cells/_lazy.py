@@ -0,0 +1,70 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# ==============================================================================
+# ------------------- Lazy loading of the PCells draw modules ------------------
+# ==============================================================================
+
+import importlib
+
+from ._arena import component_arena
+
+_legacy_classes_patched = False
+
+
+def load_gdsfactory():
+    """
+    Import gdsfactory and install the legacy classes patches, once.
+    """
+    global _legacy_classes_patched
+
+    if not _legacy_classes_patched:
+        # NOTE: the cell code was written for gdsfactory v7
+        #       install mixins for legacy classes for gdsfactory v9 compatiblity
+        from ._patches import patch_legacy_classes
+        patch_legacy_classes()
+        _legacy_classes_patched = True
+
+
+def lazy_draw(module_name, function_name, gdsfactory=True):
+    """
+    Get a function that loads a draw function on its first call, then calls it.
+
+    The PCell declarations only need pya to register their parameters, so the draw
+    modules, and gdsfactory with them, are only imported when the first PCell of
+    the family is produced. The gdsfactory cells created by each draw call are
+    deleted once it returns (see _arena.py).
+
+    Args:
+        module_name: The draw module name in the cells package, e.g. "draw_fet".
+        function_name: The draw function name in the module.
+        gdsfactory: False for draw modules that only use pya.
+    """
+    draw = None
+
+    def load_and_draw(*args, **kwargs):
+        nonlocal draw
+        if draw is None:
+            if gdsfactory:
+                load_gdsfactory()
+            module = importlib.import_module(f".{module_name}", __package__)
+            draw = getattr(module, function_name)
+        if not gdsfactory:
+            return draw(*args, **kwargs)
+        # the drawn cell is read into the PCell layout, the gdsfactory cells are not needed after
+        with component_arena():
+            return draw(*args, **kwargs)
+
+    load_and_draw.__name__ = function_name
+    return load_and_draw
@@ -101,4 +101,19 @@ def patch_legacy_classes():
     ) -> kdb.Cell:
         return original_method(self, name, *args, allow_duplicate=allow_duplicate)
 
-    kfactory.layout.KCLayout.create_cell = __kfactory__layout__KCLayout_create_cell
\ No newline at end of file
+    kfactory.layout.KCLayout.create_cell = __kfactory__layout__KCLayout_create_cell
+
+    # every gf.cell call sets KCLayout.future_cell_name twice, and each assignment validates the whole
+    # KCLayout model again, which builds a new layers enum. This is most of the time of drawing the
+    # small cached cells like the vias, so the name is set without validating the model.
+
+    original_setattr = kfactory.layout.KCLayout.__setattr__
+
+    # noinspection PyPep8Naming
+    def __kfactory__layout__KCLayout__setattr__(self, name: str, value) -> None:
+        if name == "future_cell_name":
+            self.__dict__[name] = value
+        else:
+            original_setattr(self, name, value)
+
+    kfactory.layout.KCLayout.__setattr__ = __kfactory__layout__KCLayout__setattr__
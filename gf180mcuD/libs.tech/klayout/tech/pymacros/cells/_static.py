@@ -0,0 +1,96 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# ==============================================================================
+# ------------------ Static devices of the PCells (BJT, efuse) -----------------
+# ==============================================================================
+
+from importlib import resources
+
+import pya
+
+# layouts of the static devices GDS files, by resource path in the cells package
+_static_layouts = {}
+
+# cells copied into the target layouts, by (id of the layout, resource path, cell name)
+_static_cells = {}
+
+
+def static_resource(*parts):
+    """
+    Get a resource of the cells package, e.g. static_resource("bjt", "npn_10p00x10p00.gds").
+
+    The resources are found next to the cells modules, wherever the package is installed.
+    """
+    return resources.files(__package__).joinpath(*parts)
+
+
+def load_static_layout(*parts):
+    """
+    Get the layout of a static device GDS file of the cells package, read on its first use.
+
+    Args:
+        parts: The path of the GDS file in the cells package, e.g. ("bjt", "npn_10p00x10p00.gds").
+
+    Returns:
+        The layout of the file, None if the file doesn't exist.
+    """
+    if parts not in _static_layouts:
+        resource = static_resource(*parts)
+        if not resource.is_file():
+            return None
+
+        layout = pya.Layout()
+        with resources.as_file(resource) as gds_file:
+            layout.read(str(gds_file))
+        _static_layouts[parts] = layout
+
+    return _static_layouts[parts]
+
+
+def copy_static_cell(layout, cell_name, *parts):
+    """
+    Copy the tree of a cell of a static device GDS file into the layout.
+
+    Only the requested cell and its child cells are copied, the file is read once per session.
+    The cell is copied once into each target layout, the next calls get the same cell as
+    long as it isn't deleted from the layout.
+
+    Args:
+        layout: The target layout.
+        cell_name: The name of the cell in the GDS file.
+        parts: The path of the GDS file in the cells package, e.g. ("efuse", "efuse.gds").
+
+    Returns:
+        The cell of the target layout, None if the file or the cell doesn't exist.
+    """
+    key = (id(layout), parts, cell_name)
+    cell = _static_cells.get(key)
+    # NOTE: the id of a released layout may be reused by a new one, its cells are destroyed then
+    if cell is not None and not cell._destroyed() and cell.layout() is layout:
+        return cell
+
+    source = load_static_layout(*parts)
+    if source is None or not source.has_cell(cell_name):
+        return None
+
+    cell = layout.create_cell(cell_name)
+    cell.copy_tree(source.cell(cell_name))
+
+    # drop the cells of the released layouts
+    for k in [k for k, c in _static_cells.items() if c._destroyed()]:
+        del _static_cells[k]
+    _static_cells[key] = cell
+
+    return cell
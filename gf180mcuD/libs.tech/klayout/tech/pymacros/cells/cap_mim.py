@@ -18,7 +18,10 @@
 
 import pya
 import os
-from .draw_cap_mim import draw_cap_mim
+from ._lazy import lazy_draw
+from ._hierarchy import flatten_pcell
+
+draw_cap_mim = lazy_draw("draw_cap_mim", "draw_cap_mim")
 
 mim_min_l = 5
 mim_min_w = 5
@@ -56,6 +59,7 @@ class cap_mim(pya.PCellDeclarationHelper):
         self.param("top_lbl", self.TypeString, "Top plate label", default="")
 
         self.param("bot_lbl", self.TypeString, "Bottom plate label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -118,4 +122,4 @@ class cap_mim(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
@@ -17,7 +17,10 @@
 ########################################################################################################################
 
 import pya
-from .draw_cap_mos import draw_cap_mos
+from ._lazy import lazy_draw
+from ._hierarchy import flatten_pcell
+
+draw_cap_mos = lazy_draw("draw_cap_mos", "draw_cap_mos")
 
 cap_nmos_w = 1
 cap_nmos_l = 1
@@ -61,6 +64,7 @@ class cap_nmos(pya.PCellDeclarationHelper):
         self.param("g_lbl", self.TypeString, "Gate terminal label", default="")
 
         self.param("sd_lbl", self.TypeString, "Source/Drain terminal label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -116,7 +120,7 @@ class cap_nmos(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class cap_pmos(pya.PCellDeclarationHelper):
@@ -146,6 +150,7 @@ class cap_pmos(pya.PCellDeclarationHelper):
         self.param("g_lbl", self.TypeString, "Gate terminal label", default="")
 
         self.param("sd_lbl", self.TypeString, "Source/Drain terminal label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -201,7 +206,7 @@ class cap_pmos(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class cap_nmos_b(pya.PCellDeclarationHelper):
@@ -229,6 +234,7 @@ class cap_nmos_b(pya.PCellDeclarationHelper):
         self.param("g_lbl", self.TypeString, "Gate terminal label", default="")
 
         self.param("sd_lbl", self.TypeString, "Source/Drain terminal label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -284,7 +290,7 @@ class cap_nmos_b(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class cap_pmos_b(pya.PCellDeclarationHelper):
@@ -312,6 +318,7 @@ class cap_pmos_b(pya.PCellDeclarationHelper):
         self.param("g_lbl", self.TypeString, "Gate terminal label", default="")
 
         self.param("sd_lbl", self.TypeString, "Source/Drain terminal label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -367,4 +374,4 @@ class cap_pmos_b(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
@@ -17,14 +17,15 @@
 ########################################################################################################################
 
 import pya
-from .draw_diode import (
-    draw_diode_dw2ps,
-    draw_diode_nd2ps,
-    draw_diode_nw2ps,
-    draw_diode_pd2nw,
-    draw_diode_pw2dw,
-    draw_sc_diode,
-)
+from ._lazy import lazy_draw
+from ._hierarchy import flatten_pcell
+
+draw_diode_dw2ps = lazy_draw("draw_diode", "draw_diode_dw2ps")
+draw_diode_nd2ps = lazy_draw("draw_diode", "draw_diode_nd2ps")
+draw_diode_nw2ps = lazy_draw("draw_diode", "draw_diode_nw2ps")
+draw_diode_pd2nw = lazy_draw("draw_diode", "draw_diode_pd2nw")
+draw_diode_pw2dw = lazy_draw("draw_diode", "draw_diode_pw2dw")
+draw_sc_diode = lazy_draw("draw_diode", "draw_sc_diode")
 
 np_l = 0.36
 np_w = 0.36
@@ -80,6 +81,7 @@ class diode_nd2ps(pya.PCellDeclarationHelper):
         self.param("p_lbl", self.TypeString, "plus label", default="")
 
         self.param("n_lbl", self.TypeString, "minus label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -139,7 +141,7 @@ class diode_nd2ps(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class diode_pd2nw(pya.PCellDeclarationHelper):
@@ -170,6 +172,7 @@ class diode_pd2nw(pya.PCellDeclarationHelper):
         self.param("p_lbl", self.TypeString, "plus label", default="")
 
         self.param("n_lbl", self.TypeString, "minus label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -229,7 +232,7 @@ class diode_pd2nw(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class diode_nw2ps(pya.PCellDeclarationHelper):
@@ -258,6 +261,7 @@ class diode_nw2ps(pya.PCellDeclarationHelper):
         self.param("p_lbl", self.TypeString, "plus label", default="")
 
         self.param("n_lbl", self.TypeString, "minus label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -315,7 +319,7 @@ class diode_nw2ps(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class diode_pw2dw(pya.PCellDeclarationHelper):
@@ -345,6 +349,7 @@ class diode_pw2dw(pya.PCellDeclarationHelper):
         self.param("p_lbl", self.TypeString, "plus label", default="")
 
         self.param("n_lbl", self.TypeString, "minus label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -405,7 +410,7 @@ class diode_pw2dw(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class diode_dw2ps(pya.PCellDeclarationHelper):
@@ -434,6 +439,7 @@ class diode_dw2ps(pya.PCellDeclarationHelper):
         self.param("p_lbl", self.TypeString, "plus label", default="")
 
         self.param("n_lbl", self.TypeString, "minus label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -492,7 +498,7 @@ class diode_dw2ps(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class sc_diode(pya.PCellDeclarationHelper):
@@ -521,6 +527,7 @@ class sc_diode(pya.PCellDeclarationHelper):
         self.param("p_lbl", self.TypeString, "plus label", default="")
 
         self.param("n_lbl", self.TypeString, "minus label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -575,4 +582,4 @@ class sc_diode(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
@@ -16,18 +16,21 @@
 ## BJT Pcells Generators for Klayout of GF180MCU
 ########################################################################################################################
 
-import os
-
-gds_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bjt")
+from ._static import copy_static_cell
 
 
 def draw_bjt(layout, device_name):
+    """
+    Copies the BJT cell from its GDS file of cells/bjt into the layout.
+
+    Args:
+        layout : layout object
+        device_name : name of the BJT cell, e.g. npn_10p00x10p00
+    """
 
-    gds_file = f"{gds_path}/{device_name}.gds"
+    bjt_cell = copy_static_cell(layout, device_name, "bjt", f"{device_name}.gds")
 
-    if os.path.exists(gds_file) and os.path.isfile(gds_file):
-        layout.read(gds_file)
-    else:
-        print(f"{gds_file} is not exist, please recheck")
+    if bjt_cell is None:
+        print(f"bjt/{device_name}.gds is not exist, please recheck")
 
-    return layout.cell(device_name)
+    return bjt_cell
@@ -19,7 +19,8 @@
 import gdsfactory as gf
 from gdsfactory.typings import Float2, LayerSpec
 
-from .via_generator import via_generator, via_stack
+from .via_generator import via_stack, guard_ring_gen
+from .guard_ring import rectangle_box
 from .layers_def import layer
 
 import numpy as np
@@ -371,155 +372,35 @@ def draw_cap_mos(
 
     if pcmpgr == 1:
 
-        c_temp_gr = gf.Component("temp_store guard ring")
-        rect_pcmpgr_in = c_temp_gr.add_ref(
-            gf.components.rectangle(
+        gr = guard_ring_gen(
+            c,
+            rectangle_box(
                 size=(
                     (pcmpgr_enc.dxmax - pcmpgr_enc.dxmin) + 2 * pcmpgr_enc_dn,
                     (pcmpgr_enc.dymax - pcmpgr_enc.dymin) + 2 * pcmpgr_enc_dn,
                 ),
-                layer=layer["comp"],
-            )
-        )
-        rect_pcmpgr_in.dmove(
-            (pcmpgr_enc.dxmin - pcmpgr_enc_dn, pcmpgr_enc.dymin - pcmpgr_enc_dn)
-        )
-        rect_pcmpgr_out = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) + 2 * grw,
-                    (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) + 2 * grw,
-                ),
-                layer=layer["comp"],
-            )
-        )
-        rect_pcmpgr_out.dmove((rect_pcmpgr_in.dxmin - grw, rect_pcmpgr_in.dymin - grw))
-        c.add_ref(
-            gf.boolean(
-                A=rect_pcmpgr_out,
-                B=rect_pcmpgr_in,
-                operation="A-B",
-                layer=layer["comp"],
-            )
-        )  # guardring Bullk
-
-        psdm_in = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) - 2 * comp_pp_enc,
-                    (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) - 2 * comp_pp_enc,
-                ),
-                layer=layer["pplus"],
-            )
-        )
-        psdm_in.dmove(
-            (rect_pcmpgr_in.dxmin + comp_pp_enc, rect_pcmpgr_in.dymin + comp_pp_enc,)
-        )
-        psdm_out = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_out.dxmax - rect_pcmpgr_out.dxmin) + 2 * comp_pp_enc,
-                    (rect_pcmpgr_out.dymax - rect_pcmpgr_out.dymin) + 2 * comp_pp_enc,
+                position=(
+                    pcmpgr_enc.dxmin - pcmpgr_enc_dn,
+                    pcmpgr_enc.dymin - pcmpgr_enc_dn,
                 ),
-                layer=layer["pplus"],
-            )
-        )
-        psdm_out.dmove(
-            (rect_pcmpgr_out.dxmin - comp_pp_enc, rect_pcmpgr_out.dymin - comp_pp_enc,)
-        )
-        c.add_ref(
-            gf.boolean(A=psdm_out, B=psdm_in, operation="A-B", layer=gr_imp)
-        )  # psdm
-
-        # generating contacts
+            ),
+            grw=grw,
+            implant_layer=gr_imp,
+            implant_enc=comp_pp_enc,
+            con_size=con_size,
+            con_sp=con_sp,
+            con_comp_enc=con_comp_enc,
+        )  # comp, implant, contacts and metal1 of the guardring
 
         if deepnwell == 0 and gr_imp == layer["nplus"]:
 
             nwell_rect = c.add_ref(
                 gf.components.rectangle(
-                    size=(psdm_out.dxsize, psdm_out.dysize), layer=layer["nwell"]
+                    size=(gr.dxsize + 2 * comp_pp_enc, gr.dysize + 2 * comp_pp_enc),
+                    layer=layer["nwell"],
                 )
             )
-            nwell_rect.dcenter = psdm_out.dcenter
-
-        c.add_ref(
-            via_generator(
-                x_range=(
-                    rect_pcmpgr_in.dxmin + con_size,
-                    rect_pcmpgr_in.dxmax - con_size,
-                ),
-                y_range=(rect_pcmpgr_out.dymin, rect_pcmpgr_in.dymin),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # bottom contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(
-                    rect_pcmpgr_in.dxmin + con_size,
-                    rect_pcmpgr_in.dxmax - con_size,
-                ),
-                y_range=(rect_pcmpgr_in.dymax, rect_pcmpgr_out.dymax),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # upper contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(rect_pcmpgr_out.dxmin, rect_pcmpgr_in.dxmin),
-                y_range=(
-                    rect_pcmpgr_in.dymin + con_size,
-                    rect_pcmpgr_in.dymax - con_size,
-                ),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # right contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(rect_pcmpgr_in.dxmax, rect_pcmpgr_out.dxmax),
-                y_range=(
-                    rect_pcmpgr_in.dymin + con_size,
-                    rect_pcmpgr_in.dymax - con_size,
-                ),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # left contact
-
-        comp_m1_in = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(rect_pcmpgr_in.dxsize, rect_pcmpgr_in.dysize),
-                layer=layer["metal1"],
-            )
-        )
-
-        comp_m1_out = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=((comp_m1_in.dxsize) + 2 * grw, (comp_m1_in.dysize) + 2 * grw,),
-                layer=layer["metal1"],
-            )
-        )
-        comp_m1_out.dmove((rect_pcmpgr_in.dxmin - grw, rect_pcmpgr_in.dymin - grw))
-        c.add_ref(
-            gf.boolean(
-                A=rect_pcmpgr_out,
-                B=rect_pcmpgr_in,
-                operation="A-B",
-                layer=layer["metal1"],
-            )
-        )  # guardring metal1
+            nwell_rect.dcenter = gr.dcenter
 
     c.write_gds("cap_mos_temp.gds")
     layout.read("cap_mos_temp.gds")
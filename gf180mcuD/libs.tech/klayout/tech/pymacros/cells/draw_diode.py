@@ -19,7 +19,8 @@
 import gdsfactory as gf
 from .layers_def import layer
 from gdsfactory.typings import Float2
-from .via_generator import via_generator, via_stack
+from .via_generator import via_stack, guard_ring_gen
+from .guard_ring import rectangle_box
 
 import numpy as np
 import os
@@ -183,158 +184,22 @@ def draw_diode_nd2ps(
 
         if pcmpgr == 1:
 
-            c_temp_gr = gf.Component("temp_store guard ring")
-            rect_pcmpgr_in = c_temp_gr.add_ref(
-                gf.components.rectangle(
+            guard_ring_gen(
+                c,
+                rectangle_box(
                     size=(
                         (dn_rect.dxmax - dn_rect.dxmin) + 2 * pcmpgr_enc_dn,
                         (dn_rect.dymax - dn_rect.dymin) + 2 * pcmpgr_enc_dn,
                     ),
-                    layer=layer["comp"],
-                )
-            )
-            rect_pcmpgr_in.dmove(
-                (dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn)
-            )
-            rect_pcmpgr_out = c_temp_gr.add_ref(
-                gf.components.rectangle(
-                    size=(
-                        (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) + 2 * pcmp_gr_wid,
-                        (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) + 2 * pcmp_gr_wid,
-                    ),
-                    layer=layer["comp"],
-                )
-            )
-            rect_pcmpgr_out.dmove(
-                (rect_pcmpgr_in.dxmin - pcmp_gr_wid, rect_pcmpgr_in.dymin - pcmp_gr_wid)
-            )
-            c.add_ref(
-                gf.boolean(
-                    A=rect_pcmpgr_out,
-                    B=rect_pcmpgr_in,
-                    operation="A-B",
-                    layer=layer["comp"],
-                )
-            )  # guardring Bulk draw
-
-            psdm_in = c_temp_gr.add_ref(
-                gf.components.rectangle(
-                    size=(
-                        (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) - 2 * pp_enc_comp,
-                        (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) - 2 * pp_enc_comp,
-                    ),
-                    layer=layer["pplus"],
-                )
-            )
-            psdm_in.dmove(
-                (rect_pcmpgr_in.dxmin + pp_enc_comp, rect_pcmpgr_in.dymin + pp_enc_comp,)
-            )
-            psdm_out = c_temp_gr.add_ref(
-                gf.components.rectangle(
-                    size=(
-                        (rect_pcmpgr_out.dxmax - rect_pcmpgr_out.dxmin) + 2 * pp_enc_comp,
-                        (rect_pcmpgr_out.dymax - rect_pcmpgr_out.dymin) + 2 * pp_enc_comp,
-                    ),
-                    layer=layer["pplus"],
-                )
-            )
-            psdm_out.dmove(
-                (
-                    rect_pcmpgr_out.dxmin - pp_enc_comp,
-                    rect_pcmpgr_out.dymin - pp_enc_comp,
-                )
-            )
-            c.add_ref(
-                gf.boolean(
-                    A=psdm_out, B=psdm_in, operation="A-B", layer=layer["pplus"]
-                )
-            )  # psdm draw
-
-            # generating contacts
-
-            c.add_ref(
-                via_generator(
-                    x_range=(
-                        rect_pcmpgr_in.dxmin + con_size,
-                        rect_pcmpgr_in.dxmax - con_size,
-                    ),
-                    y_range=(rect_pcmpgr_out.dymin, rect_pcmpgr_in.dymin),
-                    via_enclosure=(con_comp_enc, con_comp_enc),
-                    via_layer=layer["contact"],
-                    via_size=(con_size, con_size),
-                    via_spacing=(con_sp, con_sp),
-                )
-            )  # bottom contact
-
-            c.add_ref(
-                via_generator(
-                    x_range=(
-                        rect_pcmpgr_in.dxmin + con_size,
-                        rect_pcmpgr_in.dxmax - con_size,
-                    ),
-                    y_range=(rect_pcmpgr_in.dymax, rect_pcmpgr_out.dymax),
-                    via_enclosure=(con_comp_enc, con_comp_enc),
-                    via_layer=layer["contact"],
-                    via_size=(con_size, con_size),
-                    via_spacing=(con_sp, con_sp),
-                )
-            )  # upper contact
-
-            c.add_ref(
-                via_generator(
-                    x_range=(rect_pcmpgr_out.dxmin, rect_pcmpgr_in.dxmin),
-                    y_range=(
-                        rect_pcmpgr_in.dymin + con_size,
-                        rect_pcmpgr_in.dymax - con_size,
-                    ),
-                    via_enclosure=(con_comp_enc, con_comp_enc),
-                    via_layer=layer["contact"],
-                    via_size=(con_size, con_size),
-                    via_spacing=(con_sp, con_sp),
-                )
-            )  # right contact
-
-            c.add_ref(
-                via_generator(
-                    x_range=(rect_pcmpgr_in.dxmax, rect_pcmpgr_out.dxmax),
-                    y_range=(
-                        rect_pcmpgr_in.dymin + con_size,
-                        rect_pcmpgr_in.dymax - con_size,
-                    ),
-                    via_enclosure=(con_comp_enc, con_comp_enc),
-                    via_layer=layer["contact"],
-                    via_size=(con_size, con_size),
-                    via_spacing=(con_sp, con_sp),
-                )
-            )  # left contact
-
-            comp_m1_in = c_temp_gr.add_ref(
-                gf.components.rectangle(
-                    size=(rect_pcmpgr_in.dxsize, rect_pcmpgr_in.dysize),
-                    layer=layer["metal1"],
-                )
-            )
-
-            comp_m1_out = c_temp_gr.add_ref(
-                gf.components.rectangle(
-                    size=(
-                        (comp_m1_in.dxsize) + 2 * pcmp_gr_wid,
-                        (comp_m1_in.dysize) + 2 * pcmp_gr_wid,
-                    ),
-                    layer=layer["metal1"],
-                )
-            )
-            comp_m1_out.dmove(
-                (rect_pcmpgr_in.dxmin - pcmp_gr_wid, rect_pcmpgr_in.dymin - pcmp_gr_wid)
-            )
-            c.add_ref(
-                gf.boolean(
-                    A=rect_pcmpgr_out,
-                    B=rect_pcmpgr_in,
-                    operation="A-B",
-                    layer=layer["metal1"],
-                )
-            )  # guardring metal1
+                    position=(dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn),
+                ),
+                grw=pcmp_gr_wid,
+                implant_layer=layer["pplus"],
+                implant_enc=pp_enc_comp,
+                con_size=con_size,
+                con_sp=con_sp,
+                con_comp_enc=con_comp_enc,
+            )  # comp, pplus, contacts and metal1 of the guardring
 
     else:
 
@@ -524,158 +389,22 @@ def draw_diode_pd2nw(
 
         if pcmpgr == 1:
 
-            c_temp_gr = gf.Component("temp_store guard ring")
-            rect_pcmpgr_in = c_temp_gr.add_ref(
-                gf.components.rectangle(
+            guard_ring_gen(
+                c,
+                rectangle_box(
                     size=(
                         (dn_rect.dxmax - dn_rect.dxmin) + 2 * pcmpgr_enc_dn,
                         (dn_rect.dymax - dn_rect.dymin) + 2 * pcmpgr_enc_dn,
                     ),
-                    layer=layer["comp"],
-                )
-            )
-            rect_pcmpgr_in.dmove(
-                (dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn)
-            )
-            rect_pcmpgr_out = c_temp_gr.add_ref(
-                gf.components.rectangle(
-                    size=(
-                        (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) + 2 * pcmp_gr_wid,
-                        (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) + 2 * pcmp_gr_wid,
-                    ),
-                    layer=layer["comp"],
-                )
-            )
-            rect_pcmpgr_out.dmove(
-                (rect_pcmpgr_in.dxmin - pcmp_gr_wid, rect_pcmpgr_in.dymin - pcmp_gr_wid)
-            )
-            c.add_ref(
-                gf.boolean(
-                    A=rect_pcmpgr_out,
-                    B=rect_pcmpgr_in,
-                    operation="A-B",
-                    layer=layer["comp"],
-                )
-            )  # Bulk guardring
-
-            psdm_in = c_temp_gr.add_ref(
-                gf.components.rectangle(
-                    size=(
-                        (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) - 2 * pp_enc_comp,
-                        (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) - 2 * pp_enc_comp,
-                    ),
-                    layer=layer["pplus"],
-                )
-            )
-            psdm_in.dmove(
-                (rect_pcmpgr_in.dxmin + pp_enc_comp, rect_pcmpgr_in.dymin + pp_enc_comp,)
-            )
-            psdm_out = c_temp_gr.add_ref(
-                gf.components.rectangle(
-                    size=(
-                        (rect_pcmpgr_out.dxmax - rect_pcmpgr_out.dxmin) + 2 * pp_enc_comp,
-                        (rect_pcmpgr_out.dymax - rect_pcmpgr_out.dymin) + 2 * pp_enc_comp,
-                    ),
-                    layer=layer["pplus"],
-                )
-            )
-            psdm_out.dmove(
-                (
-                    rect_pcmpgr_out.dxmin - pp_enc_comp,
-                    rect_pcmpgr_out.dymin - pp_enc_comp,
-                )
-            )
-            c.add_ref(
-                gf.boolean(
-                    A=psdm_out, B=psdm_in, operation="A-B", layer=layer["pplus"]
-                )
-            )  # psdm guardring
-
-            # generating contacts
-
-            c.add_ref(
-                via_generator(
-                    x_range=(
-                        rect_pcmpgr_in.dxmin + con_size,
-                        rect_pcmpgr_in.dxmax - con_size,
-                    ),
-                    y_range=(rect_pcmpgr_out.dymin, rect_pcmpgr_in.dymin),
-                    via_enclosure=(con_comp_enc, con_comp_enc),
-                    via_layer=layer["contact"],
-                    via_size=(con_size, con_size),
-                    via_spacing=(con_sp, con_sp),
-                )
-            )  # bottom contact
-
-            c.add_ref(
-                via_generator(
-                    x_range=(
-                        rect_pcmpgr_in.dxmin + con_size,
-                        rect_pcmpgr_in.dxmax - con_size,
-                    ),
-                    y_range=(rect_pcmpgr_in.dymax, rect_pcmpgr_out.dymax),
-                    via_enclosure=(con_comp_enc, con_comp_enc),
-                    via_layer=layer["contact"],
-                    via_size=(con_size, con_size),
-                    via_spacing=(con_sp, con_sp),
-                )
-            )  # upper contact
-
-            c.add_ref(
-                via_generator(
-                    x_range=(rect_pcmpgr_out.dxmin, rect_pcmpgr_in.dxmin),
-                    y_range=(
-                        rect_pcmpgr_in.dymin + con_size,
-                        rect_pcmpgr_in.dymax - con_size,
-                    ),
-                    via_enclosure=(con_comp_enc, con_comp_enc),
-                    via_layer=layer["contact"],
-                    via_size=(con_size, con_size),
-                    via_spacing=(con_sp, con_sp),
-                )
-            )  # right contact
-
-            c.add_ref(
-                via_generator(
-                    x_range=(rect_pcmpgr_in.dxmax, rect_pcmpgr_out.dxmax),
-                    y_range=(
-                        rect_pcmpgr_in.dymin + con_size,
-                        rect_pcmpgr_in.dymax - con_size,
-                    ),
-                    via_enclosure=(con_comp_enc, con_comp_enc),
-                    via_layer=layer["contact"],
-                    via_size=(con_size, con_size),
-                    via_spacing=(con_sp, con_sp),
-                )
-            )  # left contact
-
-            comp_m1_in = c_temp_gr.add_ref(
-                gf.components.rectangle(
-                    size=(rect_pcmpgr_in.dxsize, rect_pcmpgr_in.dysize),
-                    layer=layer["metal1"],
-                )
-            )
-
-            comp_m1_out = c_temp_gr.add_ref(
-                gf.components.rectangle(
-                    size=(
-                        (comp_m1_in.dxsize) + 2 * pcmp_gr_wid,
-                        (comp_m1_in.dysize) + 2 * pcmp_gr_wid,
-                    ),
-                    layer=layer["metal1"],
-                )
-            )
-            comp_m1_out.dmove(
-                (rect_pcmpgr_in.dxmin - pcmp_gr_wid, rect_pcmpgr_in.dymin - pcmp_gr_wid)
-            )
-            c.add_ref(
-                gf.boolean(
-                    A=rect_pcmpgr_out,
-                    B=rect_pcmpgr_in,
-                    operation="A-B",
-                    layer=layer["metal1"],
-                )
-            )  # guardring metal1
+                    position=(dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn),
+                ),
+                grw=pcmp_gr_wid,
+                implant_layer=layer["pplus"],
+                implant_enc=pp_enc_comp,
+                con_size=con_size,
+                con_sp=con_sp,
+                con_comp_enc=con_comp_enc,
+            )  # comp, pplus, contacts and metal1 of the guardring
 
     else:
 
@@ -933,112 +662,24 @@ def draw_diode_pw2dw(
 
     else:
 
-        c_temp = gf.Component("temp_store guard ring")
-
-        pcmp_in = c_temp.add_ref(
-            gf.components.rectangle(
+        pcmp = guard_ring_gen(
+            c,
+            rectangle_box(
                 size=(
                     lvpwell.dxsize - (2 * lvpwell_enc_pcmp) - (2 * grw),
                     lvpwell.dysize - (2 * lvpwell_enc_pcmp) - (2 * grw),
                 ),
-                layer=layer["comp"],
-            )
-        )
-        pcmp_in.dcenter = lvpwell.dcenter
-
-        pcmp_out = c_temp.add_ref(
-            gf.components.rectangle(
-                size=(
-                    lvpwell.dxsize - (2 * lvpwell_enc_pcmp),
-                    lvpwell.dysize - (2 * lvpwell_enc_pcmp),
-                ),
-                layer=layer["comp"],
-            )
-        )
-        pcmp_out.dmove((pcmp_in.dxmin - grw, pcmp_in.dymin - grw))
-        pcmp = c.add_ref(
-            gf.boolean(
-                A=pcmp_out, B=pcmp_in, operation="A-B", layer=layer["comp"],
-            )
-        )
-
-        pplus_in = c_temp.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (pcmp_in.dxmax - pcmp_in.dxmin) - 2 * pp_enc_comp,
-                    (pcmp_in.dymax - pcmp_in.dymin) - 2 * pp_enc_comp,
-                ),
-                layer=layer["pplus"],
-            )
-        )
-        pplus_in.dmove((pcmp_in.dxmin + pp_enc_comp, pcmp_in.dymin + pp_enc_comp,))
-        pplus_out = c_temp.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (pcmp_out.dxmax - pcmp_out.dxmin) + 2 * pp_enc_comp,
-                    (pcmp_out.dymax - pcmp_out.dymin) + 2 * pp_enc_comp,
-                ),
-                layer=layer["pplus"],
-            )
-        )
-        pplus_out.dmove((pcmp_out.dxmin - pp_enc_comp, pcmp_out.dymin - pp_enc_comp,))
-        pplus = c.add_ref(
-            gf.boolean(
-                A=pplus_out, B=pplus_in, operation="A-B", layer=layer["pplus"]
-            )
-        )  # pplus
-
-        # generating contacts
-
-        c.add_ref(
-            via_generator(
-                x_range=(pcmp_in.dxmin + con_size, pcmp_in.dxmax - con_size,),
-                y_range=(pcmp_out.dymin, pcmp_in.dymin),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # bottom contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(pcmp_in.dxmin + con_size, pcmp_in.dxmax - con_size,),
-                y_range=(pcmp_in.dymax, pcmp_out.dymax),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # upper contact
-
-        p_con = c.add_ref(
-            via_generator(
-                x_range=(pcmp_out.dxmin, pcmp_in.dxmin),
-                y_range=(pcmp_in.dymin + con_size, pcmp_in.dymax - con_size,),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # left contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(pcmp_in.dxmax, pcmp_out.dxmax),
-                y_range=(pcmp_in.dymin + con_size, pcmp_in.dymax - con_size,),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # right contact
+                center=lvpwell.dcenter,
+            ),
+            grw=grw,
+            implant_layer=layer["pplus"],
+            implant_enc=pp_enc_comp,
+            con_size=con_size,
+            con_sp=con_sp,
+            con_comp_enc=con_comp_enc,
+        )  # comp, pplus, contacts and metal1 of the guardring
 
-        c.add_ref(
-            gf.boolean(
-                A=pcmp_out, B=pcmp_in, operation="A-B", layer=layer["metal1"],
-            )
-        )  # guardring metal1
+        p_con = pcmp.contact(2)  # left contact
 
     # n generation
     ncmp = c.add_ref(
@@ -1105,155 +746,22 @@ def draw_diode_pw2dw(
 
     if pcmpgr == 1:
 
-        c_temp_gr = gf.Component("temp_store guard ring")
-        rect_pcmpgr_in = c_temp_gr.add_ref(
-            gf.components.rectangle(
+        guard_ring_gen(
+            c,
+            rectangle_box(
                 size=(
                     (dn_rect.dxmax - dn_rect.dxmin) + 2 * pcmpgr_enc_dn,
                     (dn_rect.dymax - dn_rect.dymin) + 2 * pcmpgr_enc_dn,
                 ),
-                layer=layer["comp"],
-            )
-        )
-        rect_pcmpgr_in.dmove(
-            (dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn)
-        )
-        rect_pcmpgr_out = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) + 2 * pcmp_gr_wid,
-                    (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) + 2 * pcmp_gr_wid,
-                ),
-                layer=layer["comp"],
-            )
-        )
-        rect_pcmpgr_out.dmove(
-            (rect_pcmpgr_in.dxmin - pcmp_gr_wid, rect_pcmpgr_in.dymin - pcmp_gr_wid)
-        )
-        c.add_ref(
-            gf.boolean(
-                A=rect_pcmpgr_out,
-                B=rect_pcmpgr_in,
-                operation="A-B",
-                layer=layer["comp"],
-            )
-        )  # guardring Bulk
-
-        psdm_in = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) - 2 * pp_enc_comp,
-                    (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) - 2 * pp_enc_comp,
-                ),
-                layer=layer["pplus"],
-            )
-        )
-        psdm_in.dmove(
-            (rect_pcmpgr_in.dxmin + pp_enc_comp, rect_pcmpgr_in.dymin + pp_enc_comp,)
-        )
-        psdm_out = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_out.dxmax - rect_pcmpgr_out.dxmin) + 2 * pp_enc_comp,
-                    (rect_pcmpgr_out.dymax - rect_pcmpgr_out.dymin) + 2 * pp_enc_comp,
-                ),
-                layer=layer["pplus"],
-            )
-        )
-        psdm_out.dmove(
-            (rect_pcmpgr_out.dxmin - pp_enc_comp, rect_pcmpgr_out.dymin - pp_enc_comp,)
-        )
-        c.add_ref(
-            gf.boolean(
-                A=psdm_out, B=psdm_in, operation="A-B", layer=layer["pplus"]
-            )
-        )  # guardring psdm
-
-        # generating contacts
-
-        c.add_ref(
-            via_generator(
-                x_range=(
-                    rect_pcmpgr_in.dxmin + con_size,
-                    rect_pcmpgr_in.dxmax - con_size,
-                ),
-                y_range=(rect_pcmpgr_out.dymin, rect_pcmpgr_in.dymin),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # bottom contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(
-                    rect_pcmpgr_in.dxmin + con_size,
-                    rect_pcmpgr_in.dxmax - con_size,
-                ),
-                y_range=(rect_pcmpgr_in.dymax, rect_pcmpgr_out.dymax),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # upper contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(rect_pcmpgr_out.dxmin, rect_pcmpgr_in.dxmin),
-                y_range=(
-                    rect_pcmpgr_in.dymin + con_size,
-                    rect_pcmpgr_in.dymax - con_size,
-                ),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # right contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(rect_pcmpgr_in.dxmax, rect_pcmpgr_out.dxmax),
-                y_range=(
-                    rect_pcmpgr_in.dymin + con_size,
-                    rect_pcmpgr_in.dymax - con_size,
-                ),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # left contact
-
-        comp_m1_in = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(rect_pcmpgr_in.dxsize, rect_pcmpgr_in.dysize),
-                layer=layer["metal1"],
-            )
-        )
-
-        comp_m1_out = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (comp_m1_in.dxsize) + 2 * pcmp_gr_wid,
-                    (comp_m1_in.dysize) + 2 * pcmp_gr_wid,
-                ),
-                layer=layer["metal1"],
-            )
-        )
-        comp_m1_out.dmove(
-            (rect_pcmpgr_in.dxmin - pcmp_gr_wid, rect_pcmpgr_in.dymin - pcmp_gr_wid)
-        )
-        c.add_ref(
-            gf.boolean(
-                A=rect_pcmpgr_out,
-                B=rect_pcmpgr_in,
-                operation="A-B",
-                layer=layer["metal1"],
-            )
-        )  # guardring metal1
+                position=(dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn),
+            ),
+            grw=pcmp_gr_wid,
+            implant_layer=layer["pplus"],
+            implant_enc=pp_enc_comp,
+            con_size=con_size,
+            con_sp=con_sp,
+            con_comp_enc=con_comp_enc,
+        )  # comp, pplus, contacts and metal1 of the guardring
 
     if volt == "5/6V":
         dg = c.add_ref(
@@ -1359,120 +867,24 @@ def draw_diode_dw2ps(
         nplus.dxmin = ncmp.dxmin - np_enc_comp
         nplus.dymin = ncmp.dymin - np_enc_comp
     else:
-        c_temp = gf.Component("temp_store guard ring")
-        ncmp_in = c_temp.add_ref(
-            gf.components.rectangle(
+        ncmp = guard_ring_gen(
+            c,
+            rectangle_box(
                 size=(
                     wa - (2 * dn_enc_ncmp) - (2 * cw),
                     la - (2 * dn_enc_ncmp) - (2 * cw),
                 ),
-                layer=layer["comp"],
-            )
-        )
-        ncmp_in.dcenter = dn_rect.dcenter
-        ncmp_out = c_temp.add_ref(
-            gf.components.rectangle(
-                size=(wa - (2 * dn_enc_ncmp), la - (2 * dn_enc_ncmp)),
-                layer=layer["comp"],
-            )
-        )
-        ncmp_out.dmove((ncmp_in.dxmin - cw, ncmp_in.dymin - cw))
-        ncmp = c.add_ref(
-            gf.boolean(
-                A=ncmp_out, B=ncmp_in, operation="A-B", layer=layer["comp"],
-            )
-        )
-
-        nplus_in = c_temp.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (ncmp_in.dxmax - ncmp_in.dxmin) - 2 * pp_enc_comp,
-                    (ncmp_in.dymax - ncmp_in.dymin) - 2 * pp_enc_comp,
-                ),
-                layer=layer["pplus"],
-            )
-        )
-        nplus_in.dmove((ncmp_in.dxmin + pp_enc_comp, ncmp_in.dymin + pp_enc_comp,))
-        nplus_out = c_temp.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (ncmp_out.dxmax - ncmp_out.dxmin) + 2 * pp_enc_comp,
-                    (ncmp_out.dymax - ncmp_out.dymin) + 2 * pp_enc_comp,
-                ),
-                layer=layer["nplus"],
-            )
-        )
-        nplus_out.dmove((ncmp_out.dxmin - pp_enc_comp, ncmp_out.dymin - pp_enc_comp,))
-        nplus = c.add_ref(
-            gf.boolean(
-                A=nplus_out, B=nplus_in, operation="A-B", layer=layer["nplus"]
-            )
-        )  # nplus
-
-        # generating contacts
-
-        c.add_ref(
-            via_generator(
-                x_range=(ncmp_in.dxmin + con_size, ncmp_in.dxmax - con_size,),
-                y_range=(ncmp_out.dymin, ncmp_in.dymin),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # bottom contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(ncmp_in.dxmin + con_size, ncmp_in.dxmax - con_size,),
-                y_range=(ncmp_in.dymax, ncmp_out.dymax),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # upper contact
-
-        n_con = c.add_ref(
-            via_generator(
-                x_range=(ncmp_out.dxmin, ncmp_in.dxmin),
-                y_range=(ncmp_in.dymin + con_size, ncmp_in.dymax - con_size,),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # left contact
+                center=dn_rect.dcenter,
+            ),
+            grw=cw,
+            implant_layer=layer["nplus"],
+            implant_enc=pp_enc_comp,
+            con_size=con_size,
+            con_sp=con_sp,
+            con_comp_enc=con_comp_enc,
+        )  # comp, nplus, contacts and metal1 of the guardring
 
-        c.add_ref(
-            via_generator(
-                x_range=(ncmp_in.dxmax, ncmp_out.dxmax),
-                y_range=(ncmp_in.dymin + con_size, ncmp_in.dymax - con_size,),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # right contact
-
-        comp_m1_in = c_temp.add_ref(
-            gf.components.rectangle(
-                size=(ncmp_in.dxsize, ncmp_in.dysize), layer=layer["metal1"],
-            )
-        )
-
-        comp_m1_out = c_temp.add_ref(
-            gf.components.rectangle(
-                size=((comp_m1_in.dxsize) + 2 * cw, (comp_m1_in.dxsize) + 2 * cw,),
-                layer=layer["metal1"],
-            )
-        )
-        comp_m1_out.dmove((ncmp_in.dxmin - cw, ncmp_in.dymin - cw))
-        c.add_ref(
-            gf.boolean(
-                A=ncmp_out, B=ncmp_in, operation="A-B", layer=layer["metal1"],
-            )
-        )  # guardring metal1
+        n_con = ncmp.contact(2)  # left contact
 
     # labels generation
     if lbl == 1:
@@ -1491,127 +903,24 @@ def draw_diode_dw2ps(
 
     if pcmpgr == 1:
 
-        c_temp_gr = gf.Component("temp_store guard ring")
-        rect_pcmpgr_in = c_temp_gr.add_ref(
-            gf.components.rectangle(
+        pcmp = guard_ring_gen(
+            c,
+            rectangle_box(
                 size=(
                     (dn_rect.dxmax - dn_rect.dxmin) + 2 * pcmpgr_enc_dn,
                     (dn_rect.dymax - dn_rect.dymin) + 2 * pcmpgr_enc_dn,
                 ),
-                layer=layer["comp"],
-            )
-        )
-        rect_pcmpgr_in.dmove(
-            (dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn)
-        )
-        rect_pcmpgr_out = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) + 2 * pcmp_gr_wid,
-                    (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) + 2 * pcmp_gr_wid,
-                ),
-                layer=layer["comp"],
-            )
-        )
-        rect_pcmpgr_out.dmove(
-            (rect_pcmpgr_in.dxmin - pcmp_gr_wid, rect_pcmpgr_in.dymin - pcmp_gr_wid)
-        )
-        c.add_ref(
-            gf.boolean(
-                A=rect_pcmpgr_out,
-                B=rect_pcmpgr_in,
-                operation="A-B",
-                layer=layer["comp"],
-            )
-        )  # guardring Bulk
-
-        psdm_in = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) - 2 * pp_enc_comp,
-                    (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) - 2 * pp_enc_comp,
-                ),
-                layer=layer["pplus"],
-            )
-        )
-        psdm_in.dmove(
-            (rect_pcmpgr_in.dxmin + pp_enc_comp, rect_pcmpgr_in.dymin + pp_enc_comp,)
-        )
-        psdm_out = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_out.dxmax - rect_pcmpgr_out.dxmin) + 2 * pp_enc_comp,
-                    (rect_pcmpgr_out.dymax - rect_pcmpgr_out.dymin) + 2 * pp_enc_comp,
-                ),
-                layer=layer["pplus"],
-            )
-        )
-        psdm_out.dmove(
-            (rect_pcmpgr_out.dxmin - pp_enc_comp, rect_pcmpgr_out.dymin - pp_enc_comp,)
-        )
-        c.add_ref(
-            gf.boolean(
-                A=psdm_out, B=psdm_in, operation="A-B", layer=layer["pplus"]
-            )
-        )  # psdm
-
-        # generating contacts
-
-        c.add_ref(
-            via_generator(
-                x_range=(
-                    rect_pcmpgr_in.dxmin + con_size,
-                    rect_pcmpgr_in.dxmax - con_size,
-                ),
-                y_range=(rect_pcmpgr_out.dymin, rect_pcmpgr_in.dymin),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # bottom contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(
-                    rect_pcmpgr_in.dxmin + con_size,
-                    rect_pcmpgr_in.dxmax - con_size,
-                ),
-                y_range=(rect_pcmpgr_in.dymax, rect_pcmpgr_out.dymax),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # upper contact
+                position=(dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn),
+            ),
+            grw=pcmp_gr_wid,
+            implant_layer=layer["pplus"],
+            implant_enc=pp_enc_comp,
+            con_size=con_size,
+            con_sp=con_sp,
+            con_comp_enc=con_comp_enc,
+        )  # comp, pplus, contacts and metal1 of the guardring
 
-        p_con = c.add_ref(
-            via_generator(
-                x_range=(rect_pcmpgr_out.dxmin, rect_pcmpgr_in.dxmin),
-                y_range=(
-                    rect_pcmpgr_in.dymin + con_size,
-                    rect_pcmpgr_in.dymax - con_size,
-                ),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # left contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(rect_pcmpgr_in.dxmax, rect_pcmpgr_out.dxmax),
-                y_range=(
-                    rect_pcmpgr_in.dymin + con_size,
-                    rect_pcmpgr_in.dymax - con_size,
-                ),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # right contact
+        p_con = pcmp.contact(2)  # left contact
 
         # labels generation
         if lbl == 1:
@@ -1626,34 +935,6 @@ def draw_diode_dw2ps(
                 layer=layer["metal1_label"],
             )
 
-        comp_m1_in = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(rect_pcmpgr_in.dxsize, rect_pcmpgr_in.dysize),
-                layer=layer["metal1"],
-            )
-        )
-
-        comp_m1_out = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) + 2 * pcmp_gr_wid,
-                    (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) + 2 * pcmp_gr_wid,
-                ),
-                layer=layer["metal1"],
-            )
-        )
-        comp_m1_out.dmove(
-            (rect_pcmpgr_in.dxmin - pcmp_gr_wid, rect_pcmpgr_in.dymin - pcmp_gr_wid)
-        )
-        c.add_ref(
-            gf.boolean(
-                A=rect_pcmpgr_out,
-                B=rect_pcmpgr_in,
-                operation="A-B",
-                layer=layer["metal1"],
-            )
-        )  # guardring metal1
-
     # generate dualgate
 
     if volt == "5/6V":
@@ -1912,155 +1193,22 @@ def draw_sc_diode(
 
     if pcmpgr == 1:
 
-        c_temp_gr = gf.Component("temp_store guard ring")
-        rect_pcmpgr_in = c_temp_gr.add_ref(
-            gf.components.rectangle(
+        guard_ring_gen(
+            c,
+            rectangle_box(
                 size=(
                     (dn_rect.dxmax - dn_rect.dxmin) + 2 * pcmpgr_enc_dn,
                     (dn_rect.dymax - dn_rect.dymin) + 2 * pcmpgr_enc_dn,
                 ),
-                layer=layer["comp"],
-            )
-        )
-        rect_pcmpgr_in.dmove(
-            (dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn)
-        )
-        rect_pcmpgr_out = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) + 2 * pcmp_gr_wid,
-                    (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) + 2 * pcmp_gr_wid,
-                ),
-                layer=layer["comp"],
-            )
-        )
-        rect_pcmpgr_out.dmove(
-            (rect_pcmpgr_in.dxmin - pcmp_gr_wid, rect_pcmpgr_in.dymin - pcmp_gr_wid)
-        )
-        c.add_ref(
-            gf.boolean(
-                A=rect_pcmpgr_out,
-                B=rect_pcmpgr_in,
-                operation="A-B",
-                layer=layer["comp"],
-            )
-        )  # guardring Bulk
-
-        psdm_in = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) - 2 * pp_enc_comp,
-                    (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) - 2 * pp_enc_comp,
-                ),
-                layer=layer["pplus"],
-            )
-        )
-        psdm_in.dmove(
-            (rect_pcmpgr_in.dxmin + pp_enc_comp, rect_pcmpgr_in.dymin + pp_enc_comp,)
-        )
-        psdm_out = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_pcmpgr_out.dxmax - rect_pcmpgr_out.dxmin) + 2 * pp_enc_comp,
-                    (rect_pcmpgr_out.dymax - rect_pcmpgr_out.dymin) + 2 * pp_enc_comp,
-                ),
-                layer=layer["pplus"],
-            )
-        )
-        psdm_out.dmove(
-            (rect_pcmpgr_out.dxmin - pp_enc_comp, rect_pcmpgr_out.dymin - pp_enc_comp,)
-        )
-        c.add_ref(
-            gf.boolean(
-                A=psdm_out, B=psdm_in, operation="A-B", layer=layer["pplus"]
-            )
-        )  # psdm
-
-        # generating contacts
-
-        c.add_ref(
-            via_generator(
-                x_range=(
-                    rect_pcmpgr_in.dxmin + con_size,
-                    rect_pcmpgr_in.dxmax - con_size,
-                ),
-                y_range=(rect_pcmpgr_out.dymin, rect_pcmpgr_in.dymin),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # bottom contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(
-                    rect_pcmpgr_in.dxmin + con_size,
-                    rect_pcmpgr_in.dxmax - con_size,
-                ),
-                y_range=(rect_pcmpgr_in.dymax, rect_pcmpgr_out.dymax),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # upper contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(rect_pcmpgr_out.dxmin, rect_pcmpgr_in.dxmin),
-                y_range=(
-                    rect_pcmpgr_in.dymin + con_size,
-                    rect_pcmpgr_in.dymax - con_size,
-                ),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # right contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(rect_pcmpgr_in.dxmax, rect_pcmpgr_out.dxmax),
-                y_range=(
-                    rect_pcmpgr_in.dymin + con_size,
-                    rect_pcmpgr_in.dymax - con_size,
-                ),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # left contact
-
-        comp_m1_in = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(rect_pcmpgr_in.dxsize, rect_pcmpgr_in.dysize),
-                layer=layer["metal1"],
-            )
-        )
-
-        comp_m1_out = c_temp_gr.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (comp_m1_in.dxsize) + 2 * pcmp_gr_wid,
-                    (comp_m1_in.dysize) + 2 * pcmp_gr_wid,
-                ),
-                layer=layer["metal1"],
-            )
-        )
-        comp_m1_out.dmove(
-            (rect_pcmpgr_in.dxmin - pcmp_gr_wid, rect_pcmpgr_in.dymin - pcmp_gr_wid)
-        )
-        c.add_ref(
-            gf.boolean(
-                A=rect_pcmpgr_out,
-                B=rect_pcmpgr_in,
-                operation="A-B",
-                layer=layer["metal1"],
-            )
-        )  # guardring metal1
+                position=(dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn),
+            ),
+            grw=pcmp_gr_wid,
+            implant_layer=layer["pplus"],
+            implant_enc=pp_enc_comp,
+            con_size=con_size,
+            con_sp=con_sp,
+            con_comp_enc=con_comp_enc,
+        )  # comp, pplus, contacts and metal1 of the guardring
 
     # creating layout and cell in klayout
 
@@ -12,16 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import pya
-import os
+from ._static import copy_static_cell
 
-USER = os.environ["USER"]
-gds_path = f"/home/{USER}/.klayout/pymacros/cells/efuse"
 
+def draw_efuse(layout, device_name="efuse_cell"):
+    """
+    Copies the efuse cell from cells/efuse/efuse.gds into the layout.
 
-def draw_efuse(layout, device_name):
+    Args:
+        layout : layout object
+        device_name : name of the efuse cell in the GDS file
+    """
 
-    layout.read(f"{gds_path}/efuse.gds")
-    cell_name = "efuse_cell"
-
-    return layout.cell(cell_name)
+    return copy_static_cell(layout, device_name, "efuse", "efuse.gds")
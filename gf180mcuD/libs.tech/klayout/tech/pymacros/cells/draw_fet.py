@@ -20,9 +20,13 @@ from math import ceil, floor
 import numpy as np
 
 import gdsfactory as gf
+import klayout.db as kdb
 from gdsfactory.typings import Float2, LayerSpec
-from .via_generator import via_generator, via_stack
+from .via_generator import via_stack, guard_ring_gen, place_via_array
+from .guard_ring import rectangle_box
+from .interdigit import VIA_SIZE, interdigit_plan
 from .layers_def import layer
+from .via_plan import DBU
 import os
 
 
@@ -59,506 +63,79 @@ def labels_gen(
     return c
 
 
-def get_patt_lbl(nl_b, nl, nt, nt_e, g_lbl, nl_u, nt_o):
-    """Returns list of odd,even gate label patterns for alternating gate connection
-
-    Args :
-        nl_b : number of bottom connected gates transistors
-        nl : number of transistor
-        nt : patterns of tansistor [with out redundency]
-        nt_e : number of transistor with even order
-        g_lbl : list of transistors gate label
-        nl_u :  number of upper connected gates transistors
-        nt_o : number of transistor with odd order
-    """
-
-    g_lbl_e = []
-    g_lbl_o = []
-
-    if nt == len(g_lbl):
-
-        for i in range(nl_b):
-            for j in range(nl):
-                if nt[j] == nt_e[i]:
-                    g_lbl_e.append(g_lbl[j])
-
-        for i in range(nl_u):
-            for j in range(nl):
-                if nt[j] == nt_o[i]:
-                    g_lbl_o.append(g_lbl[j])
-
-    return [g_lbl_e, g_lbl_o]
-
-
-def alter_interdig(
+def interdigit(
+    c,
     sd_diff,
     pc1,
     pc2,
-    poly_con,
-    sd_diff_intr,
-    l_gate=0.15,
-    inter_sd_l=0.15,
-    sd_l=0.36,
-    nf=1,
-    pat="",
     pc_x=0.1,
     pc_spacing=0.1,
+    sd_l: float = 0.15,
+    nf=1,
+    patt="",
+    gate_con_pos="top",
     lbl: bool = 0,
     g_lbl: list = [],
-    nl: int = 1,
     patt_lbl: bool = 0,
-) -> gf.Component:
-    """Returns interdigitation polygons of gate with alterating poly contacts
+):
+    """Adds the interdigitation gate routing to the component, see interdigit.interdigit_plan
 
     Args :
+        c : component of the device instance
         sd_diff : source/drain diffusion rectangle
         pc1 : first poly contact array
         pc2 : second poly contact array
-        poly_con : componenet of poly contact
-        sd_diff_inter : inter source/drain diffusion rectangle
-        l_gate : gate length
-        inter_sd_l : inter diffusion length
+        pc_x : poly contact width
+        pc_spacing : poly contact array spacing
+        sd_l : source/drain diffusion length
         nf : number of fingers
-        pat : string of the required pattern
+        patt : string of the required pattern
+        gate_con_pos : position of gate contact
+        lbl : boolean of having gate labels
+        g_lbl : list of the gate labels of the pattern symbols
+        patt_lbl : boolean of having pattern labels
     """
 
-    c_inst = gf.Component()
-
-    m2_spacing: float = 0.29
-    via_size: float = (0.26, 0.26)
-    via_enc: float = (0.07, 0.07)
-    via_spacing: float = (0.27, 0.27)
-
-    pat_o = []
-    pat_e = []
-
-    for i in range(int(nf)):
-        if i % 2 == 0:
-            pat_e.append(pat[i])
-        else:
-            pat_o.append(pat[i])
-
-    nt = []
-    [nt.append(x) for x in pat if x not in nt]
-
-    nt_o = []
-    [nt_o.append(x) for x in pat_o if x not in nt_o]
-
-    nt_e = []
-    [nt_e.append(x) for x in pat_e if x not in nt_e]
-
-    nl = len(nt)
-    nl_b = len(nt_e)
-    nl_u = len(nt_o)
-
-    g_lbl_e, g_lbl_o = get_patt_lbl(nl_b, nl, nt, nt_e, g_lbl, nl_u, nt_o)
-
-    m2_y = via_size[1] + 2 * via_enc[1]
-    m2 = gf.components.rectangle(
-        size=(sd_diff.dxmax - sd_diff.dxmin, m2_y), layer=layer["metal2"],
-    )
-
-    m2_arrb = c_inst.add_array(
-        component=m2, columns=1, rows=nl_b, spacing=(0, -m2_y - m2_spacing),
+    if nf != len(patt):
+        return
+
+    plan = interdigit_plan(
+        sd_diff.dbbox(),
+        pc1.dbbox(),
+        pc2.dbbox(),
+        pc_x=pc_x,
+        pc_spacing=pc_spacing,
+        sd_l=sd_l,
+        patt=patt,
+        gate_con_pos=gate_con_pos,
+        lbl=lbl,
+        g_lbl=g_lbl,
+        patt_lbl=patt_lbl,
     )
-    m2_arrb.dmovey(pc1.dymin - m2_spacing - m2_y)
 
-    m2_arru = c_inst.add_array(
-        component=m2, columns=1, rows=nl_u, spacing=(0, m2_y + m2_spacing),
-    )
-    m2_arru.dmovey(pc2.dymax + m2_spacing)
-
-    for i in range(nl_u):
-        for j in range(floor(nf / 2)):
-            if pat_o[j] == nt_o[i]:
-                m1 = c_inst.add_ref(
-                    gf.components.rectangle(
-                        size=(
-                            pc_x,
-                            ((pc2.dymax + (i + 1) * (m2_spacing + m2_y)) - pc2.dymin),
-                        ),
-                        layer=layer["metal1"],
-                    )
-                )
-                m1.dxmin = pc2.dxmin + j * (pc_spacing)
-                m1.dymin = pc2.dymin
-
-                via1_dr = via_generator(
-                    x_range=(m1.dxmin, m1.dxmax),
-                    y_range=(
-                        m2_arru.dymin + i * (m2_y + m2_spacing),
-                        m2_arru.dymin + i * (m2_y + m2_spacing) + m2_y,
-                    ),
-                    via_enclosure=via_enc,
-                    via_layer=layer["via1"],
-                    via_size=via_size,
-                    via_spacing=via_spacing,
-                )
-                via1 = c_inst.add_ref(via1_dr)
-
-                c_inst.add_ref(
-                    labels_gen(
-                        lbl_str="None",
-                        position=(
-                            (via1.dxmax + via1.dxmin) / 2,
-                            (via1.dymax + via1.dymin) / 2,
-                        ),
-                        layer=layer["metal2_label"],
-                        lbl=patt_lbl,
-                        lbl_lst=pat_o,
-                        lbl_valid_len=len(pat_o),
-                        index=j,
-                    )
-                )
-
-                # adding gate_label
-                c_inst.add_ref(
-                    labels_gen(
-                        lbl_str="None",
-                        position=(
-                            m1.dxmin + (m1.dxsize / 2),
-                            pc2.dymin + (pc2.dysize / 2),
-                        ),
-                        layer=layer["metal1_label"],
-                        lbl=lbl,
-                        lbl_lst=g_lbl_o,
-                        lbl_valid_len=nl_u,
-                        index=i,
-                    )
-                )
-
-    for i in range(nl_b):
-        for j in range(ceil(nf / 2)):
-            if pat_e[j] == nt_e[i]:
-
-                m1 = c_inst.add_ref(
-                    gf.components.rectangle(
-                        size=(
-                            pc_x,
-                            ((pc1.dymax + (i + 1) * (m2_spacing + m2_y)) - pc1.dymin),
-                        ),
-                        layer=layer["metal1"],
-                    )
-                )
-                m1.dxmin = pc1.dxmin + j * (pc_spacing)
-                m1.dymin = -(m1.dymax - m1.dymin) + (pc1.dymax)
-                via1_dr = via_generator(
-                    x_range=(m1.dxmin, m1.dxmax),
-                    y_range=(
-                        m2_arrb.dymax - i * (m2_spacing + m2_y) - m2_y,
-                        m2_arrb.dymax - i * (m2_spacing + m2_y),
-                    ),
-                    via_enclosure=via_enc,
-                    via_layer=layer["via1"],
-                    via_size=via_size,
-                    via_spacing=via_spacing,
-                )
-                via1 = c_inst.add_ref(via1_dr)
-
-                c_inst.add_ref(
-                    labels_gen(
-                        lbl_str="None",
-                        position=(
-                            (via1.dxmax + via1.dxmin) / 2,
-                            (via1.dymax + via1.dymin) / 2,
-                        ),
-                        layer=layer["metal2_label"],
-                        lbl=patt_lbl,
-                        lbl_lst=pat_e,
-                        lbl_valid_len=len(pat_e),
-                        index=j,
-                    )
-                )
-
-                # adding gate_label
-                c_inst.add_ref(
-                    labels_gen(
-                        lbl_str="None",
-                        position=(
-                            m1.dxmin + (m1.dxsize / 2),
-                            pc1.dymin + (pc1.dysize / 2),
-                        ),
-                        layer=layer["metal1_label"],
-                        lbl=lbl,
-                        lbl_lst=g_lbl_e,
-                        lbl_valid_len=nl_b,
-                        index=i,
-                    )
-                )
-
-    m3_x = via_size[0] + 2 * via_enc[0]
-    m3_spacing = m2_spacing
-
-    for i in range(nl_b):
-        for j in range(nl_u):
-            if nt_e[i] == nt_o[j]:
-
-                m2_join_b = c_inst.add_ref(
-                    gf.components.rectangle(
-                        size=(m2_y + sd_l + (i + 1) * (m3_spacing + m3_x), m2_y,),
-                        layer=layer["metal2"],
-                    )
-                ).dmove(
-                    (
-                        m2_arrb.dxmin - (m2_y + sd_l + (i + 1) * (m3_spacing + m3_x)),
-                        m2_arrb.dymax - i * (m2_spacing + m2_y) - m2_y,
-                    )
-                )
-
-                m2_join_u = c_inst.add_ref(
-                    gf.components.rectangle(
-                        size=(m2_y + sd_l + (i + 1) * (m3_spacing + m3_x), m2_y,),
-                        layer=layer["metal2"],
-                    )
-                ).dmove(
-                    (
-                        m2_arru.dxmin - (m2_y + sd_l + (i + 1) * (m3_spacing + m3_x)),
-                        m2_arru.dymin + j * (m2_spacing + m2_y),
-                    )
-                )
-                m3 = c_inst.add_ref(
-                    gf.components.rectangle(
-                        size=(m3_x, m2_join_u.dymax - m2_join_b.dymin,),
-                        layer=layer["metal1"],
-                    )
-                )
-                m3.dmove((m2_join_b.dxmin, m2_join_b.dymin))
-                via2_dr = via_generator(
-                    x_range=(m3.dxmin, m3.dxmax),
-                    y_range=(m2_join_b.dymin, m2_join_b.dymax),
-                    via_enclosure=via_enc,
-                    via_size=via_size,
-                    via_layer=layer["via1"],
-                    via_spacing=via_spacing,
-                )
-                c_inst.add_array(
-                    component=via2_dr,
-                    columns=1,
-                    rows=2,
-                    spacing=(0, m2_join_u.dymin - m2_join_b.dymin,),
-                )  # via2_draw
-    return c_inst
+    m2 = c.shapes(c.kcl.layer(*layer["metal2"]))
+    for box, pitch, rows in plan.rails:
+        for i in range(rows):
+            m2.insert(box.moved(0, i * pitch))
 
+    for layer_spec, box in plan.joins:
+        c.shapes(c.kcl.layer(*layer_spec)).insert(box)
 
-def interdigit(
-    sd_diff,
-    pc1,
-    pc2,
-    poly_con,
-    sd_diff_intr,
-    l_gate: float = 0.15,
-    inter_sd_l: float = 0.23,
-    sd_l: float = 0.15,
-    nf=1,
-    patt=[""],
-    gate_con_pos="top",
-    pc_x=0.1,
-    pc_spacing=0.1,
-    lbl: bool = 0,
-    g_lbl: list = [],
-    patt_lbl: bool = 0,
-) -> gf.Component:
-    """Returns interdigitation related polygons
+    for via in plan.join_vias:
+        place_via_array(c, via, VIA_SIZE, layer["via1"])
 
-    Args :
-        sd_diff : source/drain diffusion rectangle
-        pc1 : first poly contact array
-        pc2 : second poly contact array
-        poly_con : componenet of poly contact
-        sd_diff_inter : inter source/drain diffusion rectangle
-        l_gate : gate length
-        inter_sd_l : inter diffusion length
-        nf : number of fingers
-        pat : string of the required pattern
-        gate_con_pos : position of gate contact
-    """
-    c_inst = gf.Component()
-
-    if nf == len(patt):
-        pat = list(patt)
-        nt = (
-            []
-        )  # list to store the symbols of transistors and thier number nt(number of transistors)
-        [nt.append(x) for x in pat if x not in nt]
-        nl = int(len(nt))
-
-        m2_spacing: float = 0.29
-        via_size: float = (0.26, 0.26)
-        via_enc: float = (0.07, 0.07)
-        via_spacing: float = (0.27, 0.27)
-
-        m2_y = via_size[1] + 2 * via_enc[1]
-        m2 = gf.components.rectangle(
-            size=(sd_diff.dxmax - sd_diff.dxmin, m2_y), layer=layer["metal2"]
-        )
-
-        if gate_con_pos == "alternating":
-            c_inst.add_ref(
-                alter_interdig(
-                    sd_diff=sd_diff,
-                    pc1=pc1,
-                    pc2=pc2,
-                    poly_con=poly_con,
-                    sd_diff_intr=sd_diff_intr,
-                    l_gate=l_gate,
-                    inter_sd_l=inter_sd_l,
-                    sd_l=sd_l,
-                    nf=nf,
-                    pat=pat,
-                    pc_x=pc_x,
-                    pc_spacing=pc_spacing,
-                    lbl=lbl,
-                    g_lbl=g_lbl,
-                    nl=nl,
-                    patt_lbl=patt_lbl,
-                )
-            )
+    # one cell per finger unit, placed as arrays of its fingers
+    for unit in plan.units:
+        finger = gf.Component()
+        finger.shapes(finger.kcl.layer(*layer["metal1"])).insert(unit.m1)
+        place_via_array(finger, unit.via, VIA_SIZE, layer["via1"])
 
-        elif gate_con_pos == "top":
+        for offset, pitch, count in unit.runs:
+            finger_arr = c.add_ref(finger, columns=count, column_pitch=pitch * DBU)
+            finger_arr.trans = kdb.Trans(offset, 0)
 
-            m2_arr = c_inst.add_array(
-                component=m2,
-                columns=1,
-                rows=nl,
-                spacing=(0, m2.dymax - m2.dymin + m2_spacing),
-            )
-            m2_arr.dmovey(pc2.dymax + m2_spacing)
-
-            for i in range(nl):
-                for j in range(int(nf)):
-                    if pat[j] == nt[i]:
-                        m1 = c_inst.add_ref(
-                            gf.components.rectangle(
-                                size=(
-                                    pc_x,
-                                    (
-                                        (pc2.dymax + (i + 1) * (m2_spacing + m2_y))
-                                        - ((1 - j % 2) * pc1.dymin)
-                                        - (j % 2) * pc2.dymin
-                                    ),
-                                ),
-                                layer=layer["metal1"],
-                            )
-                        )
-                        m1.dxmin = pc1.dxmin + j * (pc2.dxmin - pc1.dxmin)
-                        m1.dymin = pc1.dymin
-
-                        via1_dr = via_generator(
-                            x_range=(m1.dxmin, m1.dxmax),
-                            y_range=(
-                                m2_arr.dymin + i * (m2_spacing + m2_y),
-                                m2_arr.dymin + i * (m2_spacing + m2_y) + m2_y,
-                            ),
-                            via_enclosure=via_enc,
-                            via_layer=layer["via1"],
-                            via_size=via_size,
-                            via_spacing=via_spacing,
-                        )
-                        via1 = c_inst.add_ref(via1_dr)
-
-                        c_inst.add_ref(
-                            labels_gen(
-                                lbl_str="None",
-                                position=(
-                                    (via1.dxmax + via1.dxmin) / 2,
-                                    (via1.dymax + via1.dymin) / 2,
-                                ),
-                                layer=layer["metal2_label"],
-                                lbl=patt_lbl,
-                                lbl_lst=pat,
-                                lbl_valid_len=nl,
-                                index=j,
-                            )
-                        )
-
-                        # adding gate_label
-                        c_inst.add_ref(
-                            labels_gen(
-                                lbl_str="None",
-                                position=(
-                                    m1.dxmin + (m1.dxsize / 2),
-                                    pc1.dymin + (pc1.dysize / 2),
-                                ),
-                                layer=layer["metal1_label"],
-                                lbl=lbl,
-                                lbl_lst=g_lbl,
-                                lbl_valid_len=nl,
-                                index=i,
-                            )
-                        )
-
-        elif gate_con_pos == "bottom":
-
-            m2_arr = c_inst.add_array(
-                component=m2, columns=1, rows=nl, spacing=(0, -m2_y - m2_spacing),
-            )
-            m2_arr.dmovey(pc2.dymin - m2_spacing - m2_y)
-
-            for i in range(nl):
-                for j in range(int(nf)):
-                    if pat[j] == nt[i]:
-
-                        m1 = c_inst.add_ref(
-                            gf.components.rectangle(
-                                size=(
-                                    pc_x,
-                                    (
-                                        (pc1.dymax + (i + 1) * (m2_spacing + m2_y))
-                                        - (j % 2) * pc1.dymin
-                                        - (1 - j % 2) * pc2.dymin
-                                    ),
-                                ),
-                                layer=layer["metal1"],
-                            )
-                        )
-                        m1.dxmin = pc1.dxmin + j * (pc2.dxmin - pc1.dxmin)
-                        m1.dymax = pc1.dymax
-
-                        via1_dr = via_generator(
-                            x_range=(m1.dxmin, m1.dxmax),
-                            y_range=(
-                                m2_arr.dymax - i * (m2_spacing + m2_y) - m2_y,
-                                m2_arr.dymax - i * (m2_spacing + m2_y),
-                            ),
-                            via_enclosure=via_enc,
-                            via_layer=layer["via1"],
-                            via_size=via_size,
-                            via_spacing=via_spacing,
-                        )
-                        via1 = c_inst.add_ref(via1_dr)
-
-                        c_inst.add_ref(
-                            labels_gen(
-                                lbl_str="None",
-                                position=(
-                                    (via1.dxmax + via1.dxmin) / 2,
-                                    (via1.dymax + via1.dymin) / 2,
-                                ),
-                                layer=layer["metal2_label"],
-                                lbl=patt_lbl,
-                                lbl_lst=pat,
-                                lbl_valid_len=nl,
-                                index=j,
-                            )
-                        )
-
-                        # adding gate_label
-                        c_inst.add_ref(
-                            labels_gen(
-                                lbl_str="None",
-                                position=(
-                                    m1.dxmin + (m1.dxsize / 2),
-                                    pc1.dymin + (pc1.dysize / 2),
-                                ),
-                                layer=layer["metal1_label"],
-                                lbl=lbl,
-                                lbl_lst=g_lbl,
-                                lbl_valid_len=nl,
-                                index=i,
-                            )
-                        )
-
-    return c_inst
+    for text, layer_spec, position in plan.labels:
+        c.add_label(text, position=position, layer=layer_spec)
 
 
 # @gf.cell
@@ -633,128 +210,22 @@ def bulk_gr_gen(
     con_comp_enc: float = 0.08
     dg_enc_cmp: float = 0.25
 
-    c_temp = gf.Component("temp_store")
-    rect_bulk_in = c_temp.add_ref(
-        gf.components.rectangle(
+    B = guard_ring_gen(
+        c,
+        rectangle_box(
             size=(
                 (c_inst.dxmax - c_inst.dxmin) + 2 * m1_sp,
                 (c_inst.dymax - c_inst.dymin) + 2 * m1_sp,
             ),
-            layer=layer["comp"],
-        )
-    )
-    rect_bulk_in.dmove((c_inst.dxmin - m1_sp, c_inst.dymin - m1_sp))
-    rect_bulk_out = c_temp.add_ref(
-        gf.components.rectangle(
-            size=(
-                (rect_bulk_in.dxmax - rect_bulk_in.dxmin) + 2 * grw,
-                (rect_bulk_in.dymax - rect_bulk_in.dymin) + 2 * grw,
-            ),
-            layer=layer["comp"],
-        )
-    )
-    rect_bulk_out.dmove((rect_bulk_in.dxmin - grw, rect_bulk_in.dymin - grw))
-    B = c.add_ref(
-        gf.boolean(
-            A=rect_bulk_out, B=rect_bulk_in, operation="A-B", layer=layer["comp"],
-        )
-    )
-
-    psdm_in = c_temp.add_ref(
-        gf.components.rectangle(
-            size=(
-                (rect_bulk_in.dxmax - rect_bulk_in.dxmin) - 2 * comp_pp_enc,
-                (rect_bulk_in.dymax - rect_bulk_in.dymin) - 2 * comp_pp_enc,
-            ),
-            layer=layer["pplus"],
-        )
-    )
-    psdm_in.dmove((rect_bulk_in.dxmin + comp_pp_enc, rect_bulk_in.dymin + comp_pp_enc))
-    psdm_out = c_temp.add_ref(
-        gf.components.rectangle(
-            size=(
-                (rect_bulk_out.dxmax - rect_bulk_out.dxmin) + 2 * comp_pp_enc,
-                (rect_bulk_out.dymax - rect_bulk_out.dymin) + 2 * comp_pp_enc,
-            ),
-            layer=layer["pplus"],
-        )
-    )
-    psdm_out.dmove((rect_bulk_out.dxmin - comp_pp_enc, rect_bulk_out.dymin - comp_pp_enc,))
-    c.add_ref(
-        gf.boolean(A=psdm_out, B=psdm_in, operation="A-B", layer=implant_layer)
-    )  # implant_draw(pplus or nplus)
-
-    # generating contacts
-
-    c.add_ref(
-        via_generator(
-            x_range=(rect_bulk_in.dxmin + con_size, rect_bulk_in.dxmax - con_size),
-            y_range=(rect_bulk_out.dymin, rect_bulk_in.dymin),
-            via_enclosure=(con_comp_enc, con_comp_enc),
-            via_layer=layer["contact"],
-            via_size=(con_size, con_size),
-            via_spacing=(con_sp, con_sp),
-        )
-    )  # bottom contact
-
-    c.add_ref(
-        via_generator(
-            x_range=(rect_bulk_in.dxmin + con_size, rect_bulk_in.dxmax - con_size),
-            y_range=(rect_bulk_in.dymax, rect_bulk_out.dymax),
-            via_enclosure=(con_comp_enc, con_comp_enc),
-            via_layer=layer["contact"],
-            via_size=(con_size, con_size),
-            via_spacing=(con_sp, con_sp),
-        )
-    )  # upper contact
-
-    c.add_ref(
-        via_generator(
-            x_range=(rect_bulk_out.dxmin, rect_bulk_in.dxmin),
-            y_range=(rect_bulk_in.dymin + con_size, rect_bulk_in.dymax - con_size),
-            via_enclosure=(con_comp_enc, con_comp_enc),
-            via_layer=layer["contact"],
-            via_size=(con_size, con_size),
-            via_spacing=(con_sp, con_sp),
-        )
-    )  # right contact
-
-    c.add_ref(
-        via_generator(
-            x_range=(rect_bulk_in.dxmax, rect_bulk_out.dxmax),
-            y_range=(rect_bulk_in.dymin + con_size, rect_bulk_in.dymax - con_size),
-            via_enclosure=(con_comp_enc, con_comp_enc),
-            via_layer=layer["contact"],
-            via_size=(con_size, con_size),
-            via_spacing=(con_sp, con_sp),
-        )
-    )  # left contact
-
-    comp_m1_in = c_temp.add_ref(
-        gf.components.rectangle(
-            size=(
-                (l_d) + 2 * comp_spacing,
-                (c_inst.dymax - c_inst.dymin) + 2 * poly2_comp_spacing,
-            ),
-            layer=layer["metal1"],
-        )
-    )
-    comp_m1_in.dmove((-comp_spacing, c_inst.dymin - poly2_comp_spacing))
-    comp_m1_out = c_temp.add_ref(
-        gf.components.rectangle(
-            size=(
-                (rect_bulk_in.dxmax - rect_bulk_in.dxmin) + 2 * grw,
-                (rect_bulk_in.dymax - rect_bulk_in.dymin) + 2 * grw,
-            ),
-            layer=layer["metal1"],
-        )
-    )
-    comp_m1_out.dmove((rect_bulk_in.dxmin - grw, rect_bulk_in.dymin - grw))
-    c.add_ref(
-        gf.boolean(
-            A=rect_bulk_out, B=rect_bulk_in, operation="A-B", layer=layer["metal1"],
-        )
-    )  # metal1_gaurdring
+            position=(c_inst.dxmin - m1_sp, c_inst.dymin - m1_sp),
+        ),
+        grw=grw,
+        implant_layer=implant_layer,
+        implant_enc=comp_pp_enc,
+        con_size=con_size,
+        con_sp=con_sp,
+        con_comp_enc=con_comp_enc,
+    )  # comp, implant, contacts and metal1 of the guardring
 
     hv_gen(c, c_inst=B, volt=volt, dg_encx=dg_enc_cmp, dg_ency=dg_enc_cmp)
 
@@ -777,9 +248,9 @@ def bulk_gr_gen(
             nfet_deep_nwell(
                 deepnwell=deepnwell,
                 pcmpgr=pcmpgr,
-                inst_size=(rect_bulk_out.dxsize, rect_bulk_out.dysize),
-                inst_xmin=rect_bulk_out.dxmin,
-                inst_ymin=rect_bulk_out.dymin,
+                inst_size=(B.dxsize, B.dysize),
+                inst_xmin=B.dxmin,
+                inst_ymin=B.dymin,
                 grw=grw,
                 volt=volt,
             )
@@ -818,128 +289,22 @@ def pcmpgr_gen(dn_rect, grw: float = 0.36) -> gf.Component:
     con_comp_enc: float = 0.08
     pcmpgr_enc_dn: float = 2.7
 
-    c_temp_gr = gf.Component("temp_store guard ring")
-    rect_pcmpgr_in = c_temp_gr.add_ref(
-        gf.components.rectangle(
+    guard_ring_gen(
+        c,
+        rectangle_box(
             size=(
                 (dn_rect.dxmax - dn_rect.dxmin) + 2 * pcmpgr_enc_dn,
                 (dn_rect.dymax - dn_rect.dymin) + 2 * pcmpgr_enc_dn,
             ),
-            layer=layer["comp"],
-        )
-    )
-    rect_pcmpgr_in.dmove((dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn))
-    rect_pcmpgr_out = c_temp_gr.add_ref(
-        gf.components.rectangle(
-            size=(
-                (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) + 2 * grw,
-                (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) + 2 * grw,
-            ),
-            layer=layer["comp"],
-        )
-    )
-    rect_pcmpgr_out.dmove((rect_pcmpgr_in.dxmin - grw, rect_pcmpgr_in.dymin - grw))
-    c.add_ref(
-        gf.boolean(
-            A=rect_pcmpgr_out, B=rect_pcmpgr_in, operation="A-B", layer=layer["comp"],
-        )
-    )  # guardring bulk
-
-    psdm_in = c_temp_gr.add_ref(
-        gf.components.rectangle(
-            size=(
-                (rect_pcmpgr_in.dxmax - rect_pcmpgr_in.dxmin) - 2 * comp_pp_enc,
-                (rect_pcmpgr_in.dymax - rect_pcmpgr_in.dymin) - 2 * comp_pp_enc,
-            ),
-            layer=layer["pplus"],
-        )
-    )
-    psdm_in.dmove(
-        (rect_pcmpgr_in.dxmin + comp_pp_enc, rect_pcmpgr_in.dymin + comp_pp_enc,)
-    )
-    psdm_out = c_temp_gr.add_ref(
-        gf.components.rectangle(
-            size=(
-                (rect_pcmpgr_out.dxmax - rect_pcmpgr_out.dxmin) + 2 * comp_pp_enc,
-                (rect_pcmpgr_out.dymax - rect_pcmpgr_out.dymin) + 2 * comp_pp_enc,
-            ),
-            layer=layer["pplus"],
-        )
-    )
-    psdm_out.dmove(
-        (rect_pcmpgr_out.dxmin - comp_pp_enc, rect_pcmpgr_out.dymin - comp_pp_enc,)
-    )
-    c.add_ref(
-        gf.boolean(
-            A=psdm_out, B=psdm_in, operation="A-B", layer=layer["pplus"]
-        )
-    )  # pplus_draw
-
-    # generating contacts
-
-    c.add_ref(
-        via_generator(
-            x_range=(rect_pcmpgr_in.dxmin + con_size, rect_pcmpgr_in.dxmax - con_size,),
-            y_range=(rect_pcmpgr_out.dymin, rect_pcmpgr_in.dymin),
-            via_enclosure=(con_comp_enc, con_comp_enc),
-            via_layer=layer["contact"],
-            via_size=(con_size, con_size),
-            via_spacing=(con_sp, con_sp),
-        )
-    )  # bottom contact
-
-    c.add_ref(
-        via_generator(
-            x_range=(rect_pcmpgr_in.dxmin + con_size, rect_pcmpgr_in.dxmax - con_size),
-            y_range=(rect_pcmpgr_in.dymax, rect_pcmpgr_out.dymax),
-            via_enclosure=(con_comp_enc, con_comp_enc),
-            via_layer=layer["contact"],
-            via_size=(con_size, con_size),
-            via_spacing=(con_sp, con_sp),
-        )
-    )  # upper contact
-
-    c.add_ref(
-        via_generator(
-            x_range=(rect_pcmpgr_out.dxmin, rect_pcmpgr_in.dxmin),
-            y_range=(rect_pcmpgr_in.dymin + con_size, rect_pcmpgr_in.dymax - con_size),
-            via_enclosure=(con_comp_enc, con_comp_enc),
-            via_layer=layer["contact"],
-            via_size=(con_size, con_size),
-            via_spacing=(con_sp, con_sp),
-        )
-    )  # right contact
-
-    c.add_ref(
-        via_generator(
-            x_range=(rect_pcmpgr_in.dxmax, rect_pcmpgr_out.dxmax),
-            y_range=(rect_pcmpgr_in.dymin + con_size, rect_pcmpgr_in.dymax - con_size),
-            via_enclosure=(con_comp_enc, con_comp_enc),
-            via_layer=layer["contact"],
-            via_size=(con_size, con_size),
-            via_spacing=(con_sp, con_sp),
-        )
-    )  # left contact
-
-    comp_m1_in = c_temp_gr.add_ref(
-        gf.components.rectangle(
-            size=(rect_pcmpgr_in.dxsize, rect_pcmpgr_in.dysize),
-            layer=layer["metal1"],
-        )
-    )
-
-    comp_m1_out = c_temp_gr.add_ref(
-        gf.components.rectangle(
-            size=((comp_m1_in.dxsize) + 2 * grw, (comp_m1_in.dysize) + 2 * grw,),
-            layer=layer["metal1"],
-        )
-    )
-    comp_m1_out.dmove((rect_pcmpgr_in.dxmin - grw, rect_pcmpgr_in.dymin - grw))
-    c.add_ref(
-        gf.boolean(
-            A=rect_pcmpgr_out, B=rect_pcmpgr_in, operation="A-B", layer=layer["metal1"],
-        )
-    )  # metal1 guardring
+            position=(dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn),
+        ),
+        grw=grw,
+        implant_layer=layer["pplus"],
+        implant_enc=comp_pp_enc,
+        con_size=con_size,
+        con_sp=con_sp,
+        con_comp_enc=con_comp_enc,
+    )  # comp, pplus, contacts and metal1 of the guardring
 
     return c
 
@@ -1075,20 +440,17 @@ def add_inter_sd_labels(
     else:
         lbl_layer = layer["comp_label"]
 
+    if lbl != 1 or len(sd_lbl) != nf + 1:
+        return
+
     for i in range(int(nf - 1)):
-        c.add_ref(
-            labels_gen(
-                lbl_str="None",
-                position=(
-                    poly1.dxmin + l_gate + (inter_sd_l / 2) + i * (l_gate + inter_sd_l),
-                    sd_diff_intr.dymin + (sd_diff_intr.dysize / 2),
-                ),
-                layer=lbl_layer,
-                lbl=lbl,
-                lbl_lst=sd_lbl,
-                lbl_valid_len=nf + 1,
-                index=i + 1,
-            )
+        c.add_label(
+            sd_lbl[i + 1],
+            position=(
+                poly1.dxmin + l_gate + (inter_sd_l / 2) + i * (l_gate + inter_sd_l),
+                sd_diff_intr.dymin + (sd_diff_intr.dysize / 2),
+            ),
+            layer=lbl_layer,
         )
 
 
@@ -1109,36 +471,27 @@ def add_gate_labels(c, g_lbl, pc1, c_pc, pc_spacing, nc1, nc2, pc2, lbl, layer,
         nf : number of fingers
     """
 
+    if lbl != 1 or len(g_lbl) != nf:
+        return
+
     for i in range(nc1):
-        c.add_ref(
-            labels_gen(
-                lbl_str="None",
-                position=(
-                    pc1.dxmin + (c_pc.dxsize / 2) + i * (pc_spacing),
-                    pc1.dymin + (c_pc.dysize / 2),
-                ),
-                layer=layer["metal1_label"],
-                lbl=lbl,
-                lbl_lst=g_lbl,
-                lbl_valid_len=nf,
-                index=2 * i,
-            )
+        c.add_label(
+            g_lbl[2 * i],
+            position=(
+                pc1.dxmin + (c_pc.dxsize / 2) + i * (pc_spacing),
+                pc1.dymin + (c_pc.dysize / 2),
+            ),
+            layer=layer["metal1_label"],
         )
 
     for i in range(nc2):
-        c.add_ref(
-            labels_gen(
-                lbl_str="None",
-                position=(
-                    pc2.dxmin + (c_pc.dxsize / 2) + i * (pc_spacing),
-                    pc2.dymin + (c_pc.dysize / 2),
-                ),
-                layer=layer["metal1_label"],
-                lbl=lbl,
-                lbl_lst=g_lbl,
-                lbl_valid_len=nf,
-                index=(2 * i) + 1,
-            )
+        c.add_label(
+            g_lbl[(2 * i) + 1],
+            position=(
+                pc2.dxmin + (c_pc.dxsize / 2) + i * (pc_spacing),
+                pc2.dymin + (c_pc.dysize / 2),
+            ),
+            layer=layer["metal1_label"],
         )
 
 
@@ -1564,25 +917,20 @@ def draw_nfet(
         )
 
         if interdig == 1:
-            c_inst.add_ref(
-                interdigit(
-                    sd_diff=sd_diff,
-                    pc1=pc1,
-                    pc2=pc2,
-                    poly_con=poly_con,
-                    sd_diff_intr=sd_diff_intr,
-                    l_gate=l_gate,
-                    inter_sd_l=inter_sd_l,
-                    sd_l=sd_l,
-                    nf=nf,
-                    patt=patt,
-                    gate_con_pos=gate_con_pos,
-                    pc_x=pc_x,
-                    pc_spacing=pc_spacing,
-                    lbl=lbl,
-                    g_lbl=g_lbl,
-                    patt_lbl=patt_lbl,
-                )
+            interdigit(
+                c_inst,
+                sd_diff=sd_diff,
+                pc1=pc1,
+                pc2=pc2,
+                pc_x=pc_x,
+                pc_spacing=pc_spacing,
+                sd_l=sd_l,
+                nf=nf,
+                patt=patt,
+                gate_con_pos=gate_con_pos,
+                lbl=lbl,
+                g_lbl=g_lbl,
+                patt_lbl=patt_lbl,
             )
         else:
             add_gate_labels(
@@ -2182,25 +1530,20 @@ def draw_pfet(
         add_gate_labels(c, g_lbl, pc1, c_pc, pc_spacing, nc1, nc2, pc2, lbl, layer, nf)
 
         if interdig == 1:
-            c_inst.add_ref(
-                interdigit(
-                    sd_diff=sd_diff,
-                    pc1=pc1,
-                    pc2=pc2,
-                    poly_con=poly_con,
-                    sd_diff_intr=sd_diff_intr,
-                    l_gate=l_gate,
-                    inter_sd_l=inter_sd_l,
-                    sd_l=sd_l,
-                    nf=nf,
-                    patt=patt,
-                    gate_con_pos=gate_con_pos,
-                    pc_x=pc_x,
-                    pc_spacing=pc_spacing,
-                    lbl=lbl,
-                    g_lbl=g_lbl,
-                    patt_lbl=patt_lbl,
-                )
+            interdigit(
+                c_inst,
+                sd_diff=sd_diff,
+                pc1=pc1,
+                pc2=pc2,
+                pc_x=pc_x,
+                pc_spacing=pc_spacing,
+                sd_l=sd_l,
+                nf=nf,
+                patt=patt,
+                gate_con_pos=gate_con_pos,
+                lbl=lbl,
+                g_lbl=g_lbl,
+                patt_lbl=patt_lbl,
             )
 
     # generating bulk
@@ -2690,25 +2033,20 @@ def draw_nfet_06v0_nvt(
         add_gate_labels(c, g_lbl, pc1, c_pc, pc_spacing, nc1, nc2, pc2, lbl, layer, nf)
 
         if interdig == 1:
-            c_inst.add_ref(
-                interdigit(
-                    sd_diff=sd_diff,
-                    pc1=pc1,
-                    pc2=pc2,
-                    poly_con=poly_con,
-                    sd_diff_intr=sd_diff_intr,
-                    l_gate=l_gate,
-                    inter_sd_l=inter_sd_l,
-                    sd_l=sd_l,
-                    nf=nf,
-                    patt=patt,
-                    gate_con_pos=gate_con_pos,
-                    pc_x=pc_x,
-                    pc_spacing=pc_spacing,
-                    lbl=lbl,
-                    g_lbl=g_lbl,
-                    patt_lbl=patt_lbl,
-                )
+            interdigit(
+                c_inst,
+                sd_diff=sd_diff,
+                pc1=pc1,
+                pc2=pc2,
+                pc_x=pc_x,
+                pc_spacing=pc_spacing,
+                sd_l=sd_l,
+                nf=nf,
+                patt=patt,
+                gate_con_pos=gate_con_pos,
+                lbl=lbl,
+                g_lbl=g_lbl,
+                patt_lbl=patt_lbl,
             )
 
     # generating bulk
@@ -2782,134 +2120,22 @@ def draw_nfet_06v0_nvt(
         nsdm.dymin = sd_diff_intr.dymin - gate_np_enc
         c.add_ref(c_inst)
 
-        c_temp = gf.Component("temp_store")
-        rect_bulk_in = c_temp.add_ref(
-            gf.components.rectangle(
+        b_gr = guard_ring_gen(
+            c,
+            rectangle_box(
                 size=(
                     (c_inst.dxmax - c_inst.dxmin) + 2 * comp_spacing,
                     (c_inst.dymax - c_inst.dymin) + 2 * poly2_comp_spacing,
                 ),
-                layer=layer["comp"],
-            )
-        )
-        rect_bulk_in.dmove(
-            (c_inst.dxmin - comp_spacing, c_inst.dymin - poly2_comp_spacing)
-        )
-        rect_bulk_out = c_temp.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_bulk_in.dxmax - rect_bulk_in.dxmin) + 2 * grw,
-                    (rect_bulk_in.dymax - rect_bulk_in.dymin) + 2 * grw,
-                ),
-                layer=layer["comp"],
-            )
-        )
-        rect_bulk_out.dmove((rect_bulk_in.dxmin - grw, rect_bulk_in.dymin - grw))
-        c.add_ref(
-            gf.boolean(
-                A=rect_bulk_out, B=rect_bulk_in, operation="A-B", layer=layer["comp"],
-            )
-        )
-
-        psdm_in = c_temp.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_bulk_in.dxmax - rect_bulk_in.dxmin) - 2 * comp_pp_enc,
-                    (rect_bulk_in.dymax - rect_bulk_in.dymin) - 2 * comp_pp_enc,
-                ),
-                layer=layer["pplus"],
-            )
-        )
-        psdm_in.dmove((rect_bulk_in.dxmin + comp_pp_enc, rect_bulk_in.dymin + comp_pp_enc))
-        psdm_out = c_temp.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_bulk_out.dxmax - rect_bulk_out.dxmin) + 2 * comp_pp_enc,
-                    (rect_bulk_out.dymax - rect_bulk_out.dymin) + 2 * comp_pp_enc,
-                ),
-                layer=layer["pplus"],
-            )
-        )
-        psdm_out.dmove(
-            (rect_bulk_out.dxmin - comp_pp_enc, rect_bulk_out.dymin - comp_pp_enc,)
-        )
-        psdm = c.add_ref(
-            gf.boolean(
-                A=psdm_out, B=psdm_in, operation="A-B", layer=layer["pplus"]
-            )
-        )
-
-        # generating contacts
-
-        c.add_ref(
-            via_generator(
-                x_range=(rect_bulk_in.dxmin + con_size, rect_bulk_in.dxmax - con_size,),
-                y_range=(rect_bulk_out.dymin, rect_bulk_in.dymin),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # bottom contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(rect_bulk_in.dxmin + con_size, rect_bulk_in.dxmax - con_size),
-                y_range=(rect_bulk_in.dymax, rect_bulk_out.dymax),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # upper contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(rect_bulk_out.dxmin, rect_bulk_in.dxmin),
-                y_range=(rect_bulk_in.dymin + con_size, rect_bulk_in.dymax - con_size),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # right contact
-
-        c.add_ref(
-            via_generator(
-                x_range=(rect_bulk_in.dxmax, rect_bulk_out.dxmax),
-                y_range=(rect_bulk_in.dymin + con_size, rect_bulk_in.dymax - con_size),
-                via_enclosure=(con_comp_enc, con_comp_enc),
-                via_layer=layer["contact"],
-                via_size=(con_size, con_size),
-                via_spacing=(con_sp, con_sp),
-            )
-        )  # left contact
-
-        comp_m1_in = c_temp.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (l_d) + 2 * comp_spacing,
-                    (c_inst.dymax - c_inst.dymin) + 2 * poly2_comp_spacing,
-                ),
-                layer=layer["metal1"],
-            )
-        )
-        comp_m1_in.dmove((-comp_spacing, c_inst.dymin - poly2_comp_spacing))
-        comp_m1_out = c_temp.add_ref(
-            gf.components.rectangle(
-                size=(
-                    (rect_bulk_in.dxmax - rect_bulk_in.dxmin) + 2 * grw,
-                    (rect_bulk_in.dymax - rect_bulk_in.dymin) + 2 * grw,
-                ),
-                layer=layer["metal1"],
-            )
-        )
-        comp_m1_out.dmove((rect_bulk_in.dxmin - grw, rect_bulk_in.dymin - grw))
-        b_gr = c.add_ref(
-            gf.boolean(
-                A=rect_bulk_out, B=rect_bulk_in, operation="A-B", layer=layer["metal1"],
-            )
-        )  # guardring metal1
+                position=(c_inst.dxmin - comp_spacing, c_inst.dymin - poly2_comp_spacing),
+            ),
+            grw=grw,
+            implant_layer=layer["pplus"],
+            implant_enc=comp_pp_enc,
+            con_size=con_size,
+            con_sp=con_sp,
+            con_comp_enc=con_comp_enc,
+        )  # comp, pplus, contacts and metal1 of the guardring
 
         c.add_ref(
             labels_gen(
@@ -0,0 +1,1236 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## FET Pcells Generators for Klayout of GF180MCU, native pya backend
+########################################################################################################################
+
+# The generators below draw the same geometry as draw_fet.py, directly into the target layout with
+# pya boxes, regions and cell instance arrays, without gdsfactory and without a temporary GDS file.
+#
+# The shapes are placed exactly the way gdsfactory places them: rectangles are cells of a box snapped
+# to 2 dbu with the origin at their south-west corner (see guard_ring.rectangle_box), and references
+# are moved with the same transformations kfactory applies, so both backends round the coordinates
+# to the same dbu.
+
+from math import ceil, floor
+
+import pya
+
+from .guard_ring import BoxGeometry, guard_ring, rectangle_box
+from .interdigit import VIA_SIZE, interdigit_plan
+from .layers_def import layer
+from .via_plan import via_array_plan
+
+
+class _Ref(BoxGeometry):
+    """
+    Instance of a drawing cell, moved like a gdsfactory reference.
+    """
+
+    def __init__(self, instance):
+        self.instance = instance
+
+    def dbbox(self):
+        return self.instance.dbbox()
+
+    @BoxGeometry.dxmin.setter
+    def dxmin(self, value):
+        self.instance.transform(pya.DTrans(value - self.dxmin, 0))
+
+    @BoxGeometry.dymin.setter
+    def dymin(self, value):
+        self.instance.transform(pya.DTrans(0, value - self.dymin))
+
+    @BoxGeometry.dcenter.setter
+    def dcenter(self, value):
+        center = self.dbbox().center()
+        self.instance.transform(pya.DTrans(value[0] - center.x, value[1] - center.y))
+
+    def dmove(self, offset):
+        self.instance.transform(pya.DCplxTrans(offset[0], offset[1]))
+
+    def dmovex(self, offset):
+        self.instance.transform(pya.DCplxTrans(offset, 0))
+
+    def dmovey(self, offset):
+        self.instance.transform(pya.DCplxTrans(0, offset))
+
+    def connect_east_of(self, other):
+        """Places the west edge center of the reference on the east edge center of other."""
+        bbox = self.instance.bbox()
+        other_bbox = other.instance.bbox()
+        self.instance.transform(
+            pya.Trans(
+                other_bbox.right - bbox.left,
+                other_bbox.center().y - bbox.center().y,
+            )
+        )
+
+
+class _Component(BoxGeometry):
+    """
+    Drawing cell of the target layout standing for a gdsfactory component.
+    """
+
+    def __init__(self, layout, name):
+        self.layout = layout
+        self.cell = layout.create_cell(name)
+
+    def dbbox(self):
+        return self.cell.dbbox()
+
+    def add_ref(self, component):
+        return _Ref(
+            self.cell.insert(pya.CellInstArray(component.cell.cell_index(), pya.Trans()))
+        )
+
+    def add_array(self, component, columns, rows, spacing):
+        if columns == 1 and rows == 1:
+            return self.add_ref(component)
+
+        return _Ref(
+            self.cell.insert(
+                pya.DCellInstArray(
+                    component.cell.cell_index(),
+                    pya.DTrans(),
+                    pya.DVector(spacing[0], 0),
+                    pya.DVector(0, spacing[1]),
+                    columns,
+                    rows,
+                )
+            )
+        )
+
+    def add_region(self, region, layer_spec):
+        self.cell.shapes(self.layout.layer(*layer_spec)).insert(region)
+
+    def add_label(self, text, position, layer_spec):
+        self.cell.shapes(self.layout.layer(*layer_spec)).insert(
+            pya.DText(text, pya.DTrans(position[0], position[1]))
+        )
+
+
+class _Drawing:
+    """
+    Drawing cells of one device, rectangles and vias are shared as gdsfactory caches its cells.
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.components = []
+        self.cache = {}
+
+    def component(self, name):
+        c = _Component(self.layout, name)
+        self.components.append(c)
+        return c
+
+    def rectangle(self, size, layer_spec):
+        # gdsfactory snaps the rectangle size to 2 dbu and places it as rectangle_box does,
+        # one dbu off the origin for some odd sizes
+        box = rectangle_box(size)
+
+        key = ("rectangle", box.left, box.bottom, box.right, box.top, layer_spec)
+        if key not in self.cache:
+            c = self.component("rectangle")
+            c.cell.shapes(self.layout.layer(*layer_spec)).insert(box)
+            self.cache[key] = c
+
+        return self.cache[key]
+
+    def finish(self, c):
+        """Removes the drawing cells the device cell doesn't use, the PCell flattens the device."""
+        used = set(c.cell.called_cells())
+        for component in self.components:
+            if component is not c and component.cell.cell_index() not in used:
+                self.layout.delete_cell(component.cell.cell_index())
+        return c.cell
+
+
+def via_generator(
+    d,
+    x_range=(0, 1),
+    y_range=(0, 1),
+    via_size=(0.17, 0.17),
+    via_layer=(66, 44),
+    via_enclosure=(0.06, 0.06),
+    via_spacing=(0.17, 0.17),
+):
+    """
+    Returns vias within x_range and y_range, see via_generator.py.
+    """
+
+    key = ("via", x_range, y_range, via_size, via_layer, via_enclosure, via_spacing)
+    if key in d.cache:
+        return d.cache[key]
+
+    c = d.component("via")
+
+    plan = via_array_plan(x_range, y_range, via_size, via_enclosure, via_spacing)
+    place_via_array(d, c, plan, via_size, via_layer)
+
+    d.cache[key] = c
+    return c
+
+
+def place_via_array(d, c, plan, via_size=(0.17, 0.17), via_layer=(66, 44)):
+    """
+    Adds the array of vias placed by the via array plan, see via_generator.place_via_array.
+    """
+
+    rect_via = d.rectangle(via_size, via_layer)
+
+    c.cell.insert(
+        pya.CellInstArray(
+            rect_via.cell.cell_index(),
+            pya.Trans(*plan.origin),
+            pya.Vector(plan.pitch[0], 0),
+            pya.Vector(0, plan.pitch[1]),
+            plan.columns,
+            plan.rows,
+        )
+    )
+
+
+def via_stack(d, x_range=(0, 1), y_range=(0, 1)):
+    """
+    Returns contacts and metal1 within x_range and y_range, see via_generator.py.
+    """
+
+    key = ("via_stack", x_range, y_range)
+    if key in d.cache:
+        return d.cache[key]
+
+    c = d.component("via_stack")
+
+    con_size = (0.22, 0.22)
+    con_enc = 0.08
+    con_spacing = (0.29, 0.29)
+    m1_area = 0.145
+
+    con = c.add_ref(
+        via_generator(
+            d,
+            x_range=x_range,
+            y_range=y_range,
+            via_size=con_size,
+            via_enclosure=(con_enc, con_enc),
+            via_layer=layer["contact"],
+            via_spacing=con_spacing,
+        )
+    )
+
+    m1_x = con.dxsize + 2 * con_enc
+
+    m1_y = con.dysize + 2 * con_enc
+
+    if (m1_x * m1_y) < m1_area:
+        m1_size = (m1_x, round(m1_area / m1_x, 3))
+    else:
+        m1_size = (m1_x, m1_y)
+
+    m1 = c.add_ref(d.rectangle(m1_size, layer["metal1"]))
+    m1.dcenter = con.dcenter
+
+    d.cache[key] = c
+    return c
+
+
+def labels_gen(
+    c,
+    lbl_str="",
+    position=(0.1, 0.1),
+    layer_spec=layer["metal1_label"],
+    lbl=0,
+    lbl_lst=[],
+    lbl_valid_len=1,
+    index=0,
+):
+    """
+    Adds the label at the given position when lbl is enabled, see draw_fet.labels_gen.
+    """
+
+    if lbl == 1 and len(lbl_lst) == lbl_valid_len:
+        if lbl_str == "None":
+            c.add_label(lbl_lst[index], position, layer_spec)
+        else:
+            c.add_label(lbl_str, position, layer_spec)
+
+
+def hv_gen(d, c, c_inst, volt, dg_encx=0.1, dg_ency=0.1):
+    """
+    Adds the dualgate and v5_xtor enclosing c_inst for 5V and 6V devices.
+    """
+
+    if volt == "5V" or volt == "6V":
+        dg = c.add_ref(
+            d.rectangle(
+                (c_inst.dxsize + (2 * dg_encx), c_inst.dysize + (2 * dg_ency)),
+                layer["dualgate"],
+            )
+        )
+        dg.dxmin = c_inst.dxmin - dg_encx
+        dg.dymin = c_inst.dymin - dg_ency
+
+        if volt == "5V":
+            v5x = c.add_ref(d.rectangle((dg.dxsize, dg.dysize), layer["v5_xtor"]))
+            v5x.dxmin = dg.dxmin
+            v5x.dymin = dg.dymin
+
+
+def guard_ring_gen(
+    d,
+    c,
+    inner,
+    grw=0.36,
+    implant_layer=layer["pplus"],
+    implant_enc=0.17,
+    con_size=0.22,
+    con_sp=0.29,
+    con_comp_enc=0.08,
+):
+    """
+    Adds the guard ring around the box inner (in dbu), see via_generator.guard_ring_gen.
+    """
+
+    ring = guard_ring(
+        (inner.left, inner.bottom, inner.right, inner.top),
+        grw,
+        implant_layer,
+        implant_enc,
+        con_size,
+        con_sp,
+        con_comp_enc,
+    )
+
+    for layer_spec, region in ring.regions.items():
+        c.add_region(region, layer_spec)
+
+    for plan in ring.contacts:
+        place_via_array(d, c, plan, (con_size, con_size), layer["contact"])
+
+    return ring
+
+
+def interdigit(
+    d,
+    c,
+    sd_diff,
+    pc1,
+    pc2,
+    pc_x=0.1,
+    pc_spacing=0.1,
+    sd_l=0.15,
+    nf=1,
+    patt="",
+    gate_con_pos="top",
+    lbl=0,
+    g_lbl=[],
+    patt_lbl=0,
+):
+    """
+    Adds the interdigitation gate routing, see draw_fet.interdigit.
+    """
+
+    if nf != len(patt):
+        return
+
+    plan = interdigit_plan(
+        sd_diff.dbbox(),
+        pc1.dbbox(),
+        pc2.dbbox(),
+        pc_x=pc_x,
+        pc_spacing=pc_spacing,
+        sd_l=sd_l,
+        patt=patt,
+        gate_con_pos=gate_con_pos,
+        lbl=lbl,
+        g_lbl=g_lbl,
+        patt_lbl=patt_lbl,
+    )
+
+    m2 = c.cell.shapes(d.layout.layer(*layer["metal2"]))
+    for box, pitch, rows in plan.rails:
+        for i in range(rows):
+            m2.insert(box.moved(0, i * pitch))
+
+    for layer_spec, box in plan.joins:
+        c.cell.shapes(d.layout.layer(*layer_spec)).insert(box)
+
+    for via in plan.join_vias:
+        place_via_array(d, c, via, VIA_SIZE, layer["via1"])
+
+    # one cell per finger unit, placed as arrays of its fingers
+    for unit in plan.units:
+        finger = d.component("finger")
+        finger.cell.shapes(d.layout.layer(*layer["metal1"])).insert(unit.m1)
+        place_via_array(d, finger, unit.via, VIA_SIZE, layer["via1"])
+
+        for offset, pitch, count in unit.runs:
+            c.cell.insert(
+                pya.CellInstArray(
+                    finger.cell.cell_index(),
+                    pya.Trans(offset, 0),
+                    pya.Vector(pitch, 0),
+                    pya.Vector(0, 0),
+                    count,
+                    1,
+                )
+            )
+
+    for text, layer_spec, position in plan.labels:
+        c.add_label(text, position, layer_spec)
+
+
+def bulk_gr_gen(
+    d,
+    c,
+    c_inst,
+    comp_spacing=0.1,
+    poly2_comp_spacing=0.1,
+    volt="3.3V",
+    grw=0.36,
+    l_d=0.1,
+    implant_layer=layer["pplus"],
+    lbl=0,
+    sub_lbl="",
+    deepnwell=0,
+    pcmpgr=0,
+    nw_enc_pcmp=0.1,
+    m1_sp=0.1,
+):
+    """
+    Adds the guard ring around c_inst, see draw_fet.bulk_gr_gen.
+    """
+
+    comp_pp_enc = 0.17
+
+    con_size = 0.22
+    con_sp = 0.29
+    con_comp_enc = 0.08
+    dg_enc_cmp = 0.25
+
+    B = guard_ring_gen(
+        d,
+        c,
+        rectangle_box(
+            (
+                (c_inst.dxmax - c_inst.dxmin) + 2 * m1_sp,
+                (c_inst.dymax - c_inst.dymin) + 2 * m1_sp,
+            ),
+            position=(c_inst.dxmin - m1_sp, c_inst.dymin - m1_sp),
+        ),
+        grw=grw,
+        implant_layer=implant_layer,
+        implant_enc=comp_pp_enc,
+        con_size=con_size,
+        con_sp=con_sp,
+        con_comp_enc=con_comp_enc,
+    )
+
+    hv_gen(d, c, c_inst=B, volt=volt, dg_encx=dg_enc_cmp, dg_ency=dg_enc_cmp)
+
+    labels_gen(
+        c,
+        lbl_str=sub_lbl,
+        position=(
+            B.dxmin + (grw + 2 * (comp_pp_enc)) / 2,
+            B.dymin + (B.dysize / 2),
+        ),
+        layer_spec=layer["metal1_label"],
+        lbl=lbl,
+        lbl_lst=[sub_lbl],
+        lbl_valid_len=1,
+    )
+
+    if implant_layer == layer["pplus"]:
+        nfet_deep_nwell(
+            d,
+            c,
+            deepnwell=deepnwell,
+            pcmpgr=pcmpgr,
+            inst_size=(B.dxsize, B.dysize),
+            inst_xmin=B.dxmin,
+            inst_ymin=B.dymin,
+            grw=grw,
+            volt=volt,
+        )
+    else:
+        pfet_deep_nwell(
+            d,
+            c,
+            deepnwell=deepnwell,
+            pcmpgr=pcmpgr,
+            enc_size=(B.dxsize, B.dysize),
+            enc_xmin=B.dxmin,
+            enc_ymin=B.dymin,
+            nw_enc_pcmp=nw_enc_pcmp,
+            grw=grw,
+            volt=volt,
+        )
+
+
+def pcmpgr_gen(d, c, dn_rect, grw=0.36):
+    """
+    Adds the deepnwell guard ring, see draw_fet.pcmpgr_gen.
+    """
+
+    comp_pp_enc = 0.17
+    con_size = 0.22
+    con_sp = 0.29
+    con_comp_enc = 0.08
+    pcmpgr_enc_dn = 2.7
+
+    guard_ring_gen(
+        d,
+        c,
+        rectangle_box(
+            (
+                (dn_rect.dxmax - dn_rect.dxmin) + 2 * pcmpgr_enc_dn,
+                (dn_rect.dymax - dn_rect.dymin) + 2 * pcmpgr_enc_dn,
+            ),
+            position=(dn_rect.dxmin - pcmpgr_enc_dn, dn_rect.dymin - pcmpgr_enc_dn),
+        ),
+        grw=grw,
+        implant_layer=layer["pplus"],
+        implant_enc=comp_pp_enc,
+        con_size=con_size,
+        con_sp=con_sp,
+        con_comp_enc=con_comp_enc,
+    )
+
+
+def dualgate_gen(d, c, rect, enc_x, enc_y, volt):
+    """
+    Adds the dualgate and v5_xtor enclosing the rect reference for 5V and 6V devices.
+    """
+
+    if volt == "5V" or volt == "6V":
+        dg = c.add_ref(
+            d.rectangle(
+                (rect.dxsize + (2 * enc_x), rect.dysize + (2 * enc_y)),
+                layer["dualgate"],
+            )
+        )
+        dg.dxmin = rect.dxmin - enc_x
+        dg.dymin = rect.dymin - enc_y
+
+        if volt == "5V":
+            v5x = c.add_ref(d.rectangle((dg.dxsize, dg.dysize), layer["v5_xtor"]))
+            v5x.dxmin = dg.dxmin
+            v5x.dymin = dg.dymin
+
+
+def nfet_deep_nwell(
+    d,
+    c,
+    volt="3.3V",
+    deepnwell=0,
+    pcmpgr=0,
+    inst_size=(0.1, 0.1),
+    inst_xmin=0.1,
+    inst_ymin=0.1,
+    grw=0.36,
+):
+    """
+    Adds the nfet deepnwell or dualgate, see draw_fet.nfet_deep_nwell.
+    """
+
+    dn_enc_lvpwell = 2.51
+    lvpwell_enc_ncmp = 0.45
+    dg_enc_dn = 0.51
+    dg_enc_cmp = 0.25
+    dg_enc_poly = 0.41
+
+    if deepnwell == 1:
+
+        lvp_rect = c.add_ref(
+            d.rectangle(
+                (
+                    inst_size[0] + (2 * lvpwell_enc_ncmp),
+                    inst_size[1] + (2 * lvpwell_enc_ncmp),
+                ),
+                layer["lvpwell"],
+            )
+        )
+
+        lvp_rect.dxmin = inst_xmin - lvpwell_enc_ncmp
+        lvp_rect.dymin = inst_ymin - lvpwell_enc_ncmp
+
+        dn_rect = c.add_ref(
+            d.rectangle(
+                (
+                    lvp_rect.dxsize + (2 * dn_enc_lvpwell),
+                    lvp_rect.dysize + (2 * dn_enc_lvpwell),
+                ),
+                layer["dnwell"],
+            )
+        )
+
+        dn_rect.dxmin = lvp_rect.dxmin - dn_enc_lvpwell
+        dn_rect.dymin = lvp_rect.dymin - dn_enc_lvpwell
+
+        if pcmpgr == 1:
+            pcmpgr_gen(d, c, dn_rect=dn_rect, grw=grw)
+
+        dualgate_gen(d, c, dn_rect, dg_enc_dn, dg_enc_dn, volt)
+
+    elif volt == "5V" or volt == "6V":
+        dg = c.add_ref(
+            d.rectangle(
+                (
+                    inst_size[0] + (2 * dg_enc_cmp),
+                    inst_size[1] + (2 * dg_enc_poly),
+                ),
+                layer["dualgate"],
+            )
+        )
+        dg.dxmin = inst_xmin - dg_enc_cmp
+        dg.dymin = inst_ymin - dg_enc_poly
+
+        if volt == "5V":
+            v5x = c.add_ref(d.rectangle((dg.dxsize, dg.dysize), layer["v5_xtor"]))
+            v5x.dxmin = dg.dxmin
+            v5x.dymin = dg.dymin
+
+
+def pfet_deep_nwell(
+    d,
+    c,
+    volt="3.3V",
+    deepnwell=0,
+    pcmpgr=0,
+    enc_size=(0.1, 0.1),
+    enc_xmin=0.1,
+    enc_ymin=0.1,
+    nw_enc_pcmp=0.1,
+    grw=0.36,
+):
+    """
+    Adds the pfet deepnwell or nwell and dualgate, see draw_fet.pfet_deep_nwell.
+    """
+
+    dnwell_enc_pcmp = 1.1
+    dg_enc_dn = 0.5
+
+    if deepnwell == 1:
+        dn_rect = c.add_ref(
+            d.rectangle(
+                (
+                    enc_size[0] + (2 * dnwell_enc_pcmp),
+                    enc_size[1] + (2 * dnwell_enc_pcmp),
+                ),
+                layer["dnwell"],
+            )
+        )
+
+        dn_rect.dxmin = enc_xmin - dnwell_enc_pcmp
+        dn_rect.dymin = enc_ymin - dnwell_enc_pcmp
+
+        if pcmpgr == 1:
+            pcmpgr_gen(d, c, dn_rect=dn_rect, grw=grw)
+
+        dualgate_gen(d, c, dn_rect, dg_enc_dn, dg_enc_dn, volt)
+
+    else:
+        nw = c.add_ref(
+            d.rectangle(
+                (
+                    enc_size[0] + (2 * nw_enc_pcmp),
+                    enc_size[1] + (2 * nw_enc_pcmp),
+                ),
+                layer["nwell"],
+            )
+        )
+        nw.dxmin = enc_xmin - nw_enc_pcmp
+        nw.dymin = enc_ymin - nw_enc_pcmp
+
+        dualgate_gen(d, c, nw, dg_enc_dn, dg_enc_dn, volt)
+
+
+def m1_area_array(d, c_inst, con, m1_area, columns, spacing, ref_ysize):
+    """
+    Adds metal1 over an array of contacts stacks whose area is below the minimum metal1 area.
+    """
+
+    if con.dxsize * con.dysize < m1_area:
+        con_m1 = d.rectangle((con.dxsize, m1_area / con.dysize), layer["metal1"])
+        m1_arr = c_inst.add_array(con_m1, columns=columns, rows=1, spacing=(spacing, 0))
+        m1_arr.dxmin = con.dxmin
+        m1_arr.dymin = con.dymin - (con_m1.dysize - ref_ysize) / 2
+
+
+def draw_fet(
+    layout,
+    mos,
+    l_gate,
+    w_gate,
+    sd_con_col,
+    inter_sd_l,
+    nf,
+    grw,
+    volt,
+    bulk,
+    con_bet_fin,
+    gate_con_pos,
+    interdig,
+    patt,
+    deepnwell,
+    pcmpgr,
+    lbl,
+    sd_lbl,
+    g_lbl,
+    sub_lbl,
+    patt_lbl,
+):
+    """
+    Returns the nfet or pfet cell drawn in layout, see draw_fet.draw_nfet and draw_fet.draw_pfet.
+
+    Args:
+        layout : layout object
+        mos : string of the device type (nfet, pfet)
+    """
+
+    # used layers and dimensions
+
+    end_cap = 0.3
+
+    comp_spacing = 0.29 if volt == "3.3V" else 0.37
+
+    gate_imp_enc = 0.24
+    comp_np_enc = 0.17
+    comp_pp_enc = 0.17
+    poly2_spacing = 0.25
+    pc_ext = 0.04
+
+    con_size = 0.22
+    con_comp_enc = 0.11 if bulk == "Bulk Tie" else 0.08
+
+    pl_cmp_spacing = 0.19 if volt == "3.3V" else 0.31
+    m1_area = 0.145
+    m1_sp = 0.31
+
+    if mos == "nfet":
+        con_sp = 0.29
+        con_pp_sp = 0.1 - con_comp_enc
+        con_pl_enc = 0.07
+        pl_cmpcon_sp = 0.17
+    else:
+        nw_enc_pcmp = 0.44 if volt == "3.3V" else 0.61
+        con_sp = 0.27
+        con_pp_sp = 0.12 - con_comp_enc
+        con_pl_enc = 0.08
+        pl_cmpcon_sp = 0.16
+        dg_enc_cmp = 0.25
+        dg_enc_poly = 0.41
+
+    sd_l_con = (
+        ((sd_con_col) * con_size)
+        + ((sd_con_col - 1) * con_sp)
+        + 2 * con_comp_enc
+        + 2 * con_pp_sp
+    )
+    sd_l = sd_l_con
+
+    # drawing cells to store a single instance and the generated device
+    d = _Drawing(layout)
+
+    c = d.component(f"{mos}_dev")
+
+    c_inst = d.component("dev_temp")
+
+    # generating sd diffusion
+
+    if interdig == 1 and nf > 1 and nf != len(patt) and patt != "":
+        nf = len(patt)
+
+    l_d = (
+        nf * l_gate + (nf - 1) * inter_sd_l + 2 * (pl_cmp_spacing)
+    )  # diffution total length
+    sd_diff_intr = c_inst.add_ref(d.rectangle((l_d, w_gate), layer["comp"]))
+
+    # generatin sd contacts
+
+    if w_gate <= con_size + 2 * con_comp_enc:
+        cmpc_y = con_comp_enc + con_size + con_comp_enc
+
+    else:
+        cmpc_y = w_gate
+
+    cmpc_size = (sd_l_con, cmpc_y)
+
+    sd_diff = c_inst.add_array(
+        d.rectangle(cmpc_size, layer["comp"]),
+        rows=1,
+        columns=2,
+        spacing=(cmpc_size[0] + sd_diff_intr.dxsize, 0),
+    )
+
+    sd_diff.dxmin = sd_diff_intr.dxmin - cmpc_size[0]
+    sd_diff.dymin = sd_diff_intr.dymin - (sd_diff.dysize - sd_diff_intr.dysize) / 2
+
+    sd_con = via_stack(
+        d,
+        x_range=(sd_diff.dxmin + con_pp_sp, sd_diff_intr.dxmin - con_pp_sp),
+        y_range=(sd_diff.dymin, sd_diff.dymax),
+    )
+    sd_spacing = sd_l + nf * l_gate + (nf - 1) * inter_sd_l + 2 * (pl_cmp_spacing)
+    sd_con_arr = c_inst.add_array(sd_con, columns=2, rows=1, spacing=(sd_spacing, 0))
+
+    m1_area_array(d, c_inst, sd_con, m1_area, 2, sd_spacing, sd_con.dysize)
+
+    if con_bet_fin == 1 and nf > 1:
+        inter_sd_con = via_stack(
+            d,
+            x_range=(
+                sd_diff_intr.dxmin + pl_cmp_spacing + l_gate + pl_cmpcon_sp,
+                sd_diff_intr.dxmin + pl_cmp_spacing + l_gate + inter_sd_l - pl_cmpcon_sp,
+            ),
+            y_range=(0, w_gate),
+        )
+
+        c_inst.add_array(
+            inter_sd_con, columns=nf - 1, rows=1, spacing=(l_gate + inter_sd_l, 0)
+        )
+
+        m1_area_array(
+            d, c_inst, inter_sd_con, m1_area, nf - 1, l_gate + inter_sd_l, sd_con.dysize
+        )
+
+    ### adding source/drain labels
+    for position, index in (
+        ((sd_diff.dxmin + (sd_l / 2), sd_diff.dymin + (sd_diff.dysize / 2)), 0),
+        ((sd_diff.dxmax - (sd_l / 2), sd_diff.dymin + (sd_diff.dysize / 2)), nf),
+    ):
+        labels_gen(
+            c,
+            lbl_str="None",
+            position=position,
+            lbl=lbl,
+            lbl_lst=sd_lbl,
+            lbl_valid_len=nf + 1,
+            index=index,
+        )
+
+    # generating poly
+
+    if l_gate <= con_size + 2 * con_pl_enc:
+        pc_x = con_pl_enc + con_size + con_pl_enc
+
+    else:
+        pc_x = l_gate
+
+    pc_size = (pc_x, con_pl_enc + con_size + con_pl_enc)
+
+    c_pc = d.component("poly con")
+
+    rect_pc = c_pc.add_ref(d.rectangle(pc_size, layer["poly2"]))
+
+    poly_con = via_stack(
+        d,
+        x_range=(rect_pc.dxmin, rect_pc.dxmax),
+        y_range=(rect_pc.dymin, rect_pc.dymax),
+    )
+    c_pl_con = c_pc.add_ref(poly_con)
+
+    if poly_con.dxsize * poly_con.dysize < m1_area:
+        m1_poly = c_pc.add_ref(
+            d.rectangle((m1_area / poly_con.dxsize, poly_con.dysize), layer["metal1"])
+        )
+        m1_poly.dxmin = c_pl_con.dxmin - (m1_poly.dxsize - poly_con.dxsize) / 2
+        m1_poly.dymin = c_pl_con.dymin
+
+    if nf == 1:
+        poly = c_inst.add_ref(
+            d.rectangle((l_gate, w_gate + 2 * end_cap), layer["poly2"])
+        )
+        poly.dxmin = sd_diff_intr.dxmin + pl_cmp_spacing
+        poly.dymin = sd_diff_intr.dymin - end_cap
+
+        if gate_con_pos == "bottom":
+            mv = 0
+            nr = 1
+        elif gate_con_pos == "top":
+            mv = pc_size[1] + w_gate + 2 * end_cap
+            nr = 1
+        else:
+            mv = 0
+            nr = 2
+
+        pc = c_inst.add_array(
+            c_pc, rows=nr, columns=1, spacing=(0, pc_size[1] + w_gate + 2 * end_cap),
+        )
+        pc.dmove((poly.dxmin - ((pc_x - l_gate) / 2), -pc_size[1] - end_cap + mv))
+
+        # gate_lablel
+        labels_gen(
+            c,
+            lbl_str="None",
+            position=(pc.dxmin + c_pc.dxsize / 2, pc.dymin + c_pc.dysize / 2),
+            lbl=lbl,
+            lbl_lst=g_lbl,
+            lbl_valid_len=nf,
+            index=0,
+        )
+
+    else:
+
+        w_p1 = end_cap + w_gate + end_cap  # poly total width
+
+        if inter_sd_l < (poly2_spacing + 2 * pc_ext):
+
+            if gate_con_pos == "alternating":
+                w_p1 += 0.2
+                w_p2 = w_p1
+                e_c = 0.2
+            else:
+                w_p2 = w_p1 + con_pl_enc + con_size + con_pl_enc + poly2_spacing + 0.1
+                e_c = 0
+
+            if gate_con_pos == "bottom":
+                p_mv = -end_cap - (w_p2 - w_p1)
+            else:
+                p_mv = -end_cap
+
+        else:
+
+            w_p2 = w_p1
+            p_mv = -end_cap
+            e_c = 0
+
+        poly1 = c_inst.add_array(
+            d.rectangle((l_gate, w_p1), layer["poly2"]),
+            rows=1,
+            columns=ceil(nf / 2),
+            spacing=[2 * (inter_sd_l + l_gate), 0],
+        )
+        poly1.dxmin = sd_diff_intr.dxmin + pl_cmp_spacing
+        poly1.dymin = sd_diff_intr.dymin - end_cap - e_c
+
+        poly2 = c_inst.add_array(
+            d.rectangle((l_gate, w_p2), layer["poly2"]),
+            rows=1,
+            columns=floor(nf / 2),
+            spacing=[2 * (inter_sd_l + l_gate), 0],
+        )
+        poly2.dxmin = poly1.dxmin + l_gate + inter_sd_l
+        poly2.dymin = p_mv
+
+        # generating poly contacts setups
+
+        if gate_con_pos == "bottom":
+            mv_1 = 0
+            mv_2 = -(w_p2 - w_p1)
+        elif gate_con_pos == "top":
+            mv_1 = pc_size[1] + w_p1
+            mv_2 = pc_size[1] + w_p2
+        else:
+            mv_1 = -e_c
+            mv_2 = pc_size[1] + w_p2
+
+        nc1 = ceil(nf / 2)
+        nc2 = floor(nf / 2)
+
+        pc_spacing = 2 * (inter_sd_l + l_gate)
+
+        # generating poly contacts
+
+        pc1 = c_inst.add_array(c_pc, rows=1, columns=nc1, spacing=(pc_spacing, 0))
+        pc1.dmove((poly1.dxmin - ((pc_x - l_gate) / 2), -pc_size[1] - end_cap + mv_1))
+
+        pc2 = c_inst.add_array(c_pc, rows=1, columns=nc2, spacing=(pc_spacing, 0))
+        pc2.dmove(
+            (
+                poly1.dxmin - ((pc_x - l_gate) / 2) + (inter_sd_l + l_gate),
+                -pc_size[1] - end_cap + mv_2,
+            )
+        )
+
+        # inter source/drain labels
+        for i in range(int(nf - 1)):
+            labels_gen(
+                c,
+                lbl_str="None",
+                position=(
+                    poly1.dxmin + l_gate + (inter_sd_l / 2) + i * (l_gate + inter_sd_l),
+                    sd_diff_intr.dymin + (sd_diff_intr.dysize / 2),
+                ),
+                layer_spec=layer["metal1_label" if con_bet_fin == 1 else "comp_label"],
+                lbl=lbl,
+                lbl_lst=sd_lbl,
+                lbl_valid_len=nf + 1,
+                index=i + 1,
+            )
+
+        if interdig == 1:
+            interdigit(
+                d,
+                c_inst,
+                sd_diff=sd_diff,
+                pc1=pc1,
+                pc2=pc2,
+                pc_x=pc_x,
+                pc_spacing=pc_spacing,
+                sd_l=sd_l,
+                nf=nf,
+                patt=patt,
+                gate_con_pos=gate_con_pos,
+                lbl=lbl,
+                g_lbl=g_lbl,
+                patt_lbl=patt_lbl,
+            )
+
+        # gate labels, draw_fet.draw_pfet keeps them on the interdigitated fingers
+        if interdig != 1 or mos == "pfet":
+            for pc_arr, nc, first in ((pc1, nc1, 0), (pc2, nc2, 1)):
+                for i in range(nc):
+                    labels_gen(
+                        c,
+                        lbl_str="None",
+                        position=(
+                            pc_arr.dxmin + (c_pc.dxsize / 2) + i * (pc_spacing),
+                            pc_arr.dymin + (c_pc.dysize / 2),
+                        ),
+                        lbl=lbl,
+                        lbl_lst=g_lbl,
+                        lbl_valid_len=nf,
+                        index=(2 * i) + first,
+                    )
+
+    # generating bulk
+
+    if bulk == "Bulk Tie":
+        rect_bulk = c_inst.add_ref(
+            d.rectangle((sd_l + con_sp, sd_diff.dysize), layer["comp"])
+        )
+        rect_bulk.dxmin = sd_diff.dxmax
+        rect_bulk.dymin = sd_diff.dymin
+
+        # implant of the device and of the tie abutted on its east edge
+        if mos == "nfet":
+            dev_imp, tie_imp, dev_enc, tie_enc = "nplus", "pplus", comp_np_enc, comp_pp_enc
+        else:
+            dev_imp, tie_imp, dev_enc, tie_enc = "pplus", "nplus", comp_pp_enc, comp_np_enc
+
+        dev_sdm = c_inst.add_ref(
+            d.rectangle(
+                (
+                    sd_diff.dxmax - sd_diff.dxmin + dev_enc,
+                    sd_diff.dysize + (2 * gate_imp_enc),
+                ),
+                layer[dev_imp],
+            )
+        )
+        dev_sdm.dxmin = sd_diff.dxmin - dev_enc
+        dev_sdm.dymin = sd_diff.dymin - gate_imp_enc
+        tie_sdm = c_inst.add_ref(
+            d.rectangle(
+                (rect_bulk.dxmax - rect_bulk.dxmin + tie_enc, w_gate + 2 * tie_enc),
+                layer[tie_imp],
+            )
+        )
+        tie_sdm.connect_east_of(dev_sdm)
+
+        bulk_con = via_stack(
+            d,
+            x_range=(sd_con_arr.dxmax + m1_sp, rect_bulk.dxmax),
+            y_range=(rect_bulk.dymin, rect_bulk.dymax),
+        )
+        c_inst.add_ref(bulk_con)
+
+        if bulk_con.dxsize * bulk_con.dysize < m1_area:
+            bulk_m1 = c_inst.add_ref(
+                d.rectangle((bulk_con.dxsize, m1_area / bulk_con.dysize), layer["metal1"])
+            )
+            bulk_m1.dxmin = bulk_con.dxmin
+            bulk_m1.dymin = bulk_con.dymin - (bulk_m1.dysize - bulk_con.dysize) / 2
+
+        labels_gen(
+            c,
+            lbl_str=sub_lbl,
+            position=(
+                bulk_con.dxmin + bulk_con.dxsize / 2,
+                bulk_con.dymin + bulk_con.dysize / 2,
+            ),
+            lbl=lbl,
+            lbl_lst=[sub_lbl],
+            lbl_valid_len=1,
+        )
+
+        c.add_ref(c_inst)
+
+        if mos == "nfet":
+            nfet_deep_nwell(
+                d,
+                c,
+                deepnwell=deepnwell,
+                pcmpgr=pcmpgr,
+                inst_size=(c_inst.dxsize, c_inst.dysize),
+                inst_xmin=c_inst.dxmin,
+                inst_ymin=c_inst.dymin,
+                grw=grw,
+                volt=volt,
+            )
+        else:
+            pfet_deep_nwell(
+                d,
+                c,
+                deepnwell=deepnwell,
+                pcmpgr=pcmpgr,
+                enc_size=(sd_diff.dxsize + rect_bulk.dxsize, sd_diff.dysize),
+                enc_xmin=sd_diff.dxmin,
+                enc_ymin=sd_diff.dymin,
+                nw_enc_pcmp=0.45 + comp_np_enc + dev_sdm.dymax - tie_sdm.dymax,
+                grw=grw,
+                volt=volt,
+            )
+
+        return d.finish(c)
+
+    if mos == "nfet":
+        imp = c_inst.add_ref(
+            d.rectangle(
+                (sd_diff.dxsize + 2 * comp_np_enc, sd_diff.dysize + 2 * gate_imp_enc),
+                layer["nplus"],
+            )
+        )
+        imp.dymin = sd_diff.dymin - gate_imp_enc
+    else:
+        imp = c_inst.add_ref(
+            d.rectangle(
+                (sd_diff.dxsize + 2 * comp_pp_enc, w_gate + 2 * gate_imp_enc),
+                layer["pplus"],
+            )
+        )
+        imp.dymin = sd_diff_intr.dymin - gate_imp_enc
+    imp.dxmin = sd_diff.dxmin - (comp_np_enc if mos == "nfet" else comp_pp_enc)
+
+    c.add_ref(c_inst)
+
+    if bulk == "Guard Ring":
+        bulk_gr_gen(
+            d,
+            c,
+            c_inst=c_inst,
+            comp_spacing=comp_spacing,
+            poly2_comp_spacing=comp_spacing,
+            volt=volt,
+            grw=grw,
+            l_d=l_d,
+            implant_layer=layer["pplus" if mos == "nfet" else "nplus"],
+            lbl=lbl,
+            sub_lbl=sub_lbl,
+            deepnwell=deepnwell,
+            pcmpgr=pcmpgr,
+            nw_enc_pcmp=0.1 if mos == "nfet" else nw_enc_pcmp,
+            m1_sp=m1_sp,
+        )
+
+    elif mos == "nfet":
+        nfet_deep_nwell(
+            d,
+            c,
+            deepnwell=deepnwell,
+            pcmpgr=pcmpgr,
+            inst_size=(c_inst.dxsize, c_inst.dysize),
+            inst_xmin=c_inst.dxmin,
+            inst_ymin=c_inst.dymin,
+            grw=grw,
+            volt=volt,
+        )
+
+    else:
+        pfet_deep_nwell(
+            d,
+            c,
+            deepnwell=deepnwell,
+            pcmpgr=pcmpgr,
+            enc_size=(sd_diff.dxsize, sd_diff.dysize),
+            enc_xmin=sd_diff.dxmin,
+            enc_ymin=sd_diff.dymin,
+            nw_enc_pcmp=nw_enc_pcmp,
+            grw=grw,
+            volt=volt,
+        )
+
+        hv_gen(d, c, c_inst=c_inst, volt=volt, dg_encx=dg_enc_cmp, dg_ency=dg_enc_poly)
+
+    return d.finish(c)
+
+
+def draw_nfet(
+    layout,
+    l_gate: float = 0.28,
+    w_gate: float = 0.22,
+    sd_con_col: int = 1,
+    inter_sd_l: float = 0.24,
+    nf: int = 1,
+    grw: float = 0.22,
+    volt: str = "3.3V",
+    bulk="None",
+    con_bet_fin: int = 1,
+    gate_con_pos="alternating",
+    interdig: int = 0,
+    patt="",
+    deepnwell: int = 0,
+    pcmpgr: int = 0,
+    lbl: bool = 0,
+    sd_lbl: list = [],
+    g_lbl: str = [],
+    sub_lbl: str = "",
+    patt_lbl: bool = 0,
+):
+    """
+    Retern nfet drawn with pya, same arguments as draw_fet.draw_nfet
+    """
+
+    return draw_fet(
+        layout, "nfet", l_gate, w_gate, sd_con_col, inter_sd_l, nf, grw, volt, bulk,
+        con_bet_fin, gate_con_pos, interdig, patt, deepnwell, pcmpgr, lbl, sd_lbl, g_lbl,
+        sub_lbl, patt_lbl,
+    )
+
+
+def draw_pfet(
+    layout,
+    l_gate: float = 0.28,
+    w_gate: float = 0.22,
+    sd_con_col: int = 1,
+    inter_sd_l: float = 0.24,
+    nf: int = 1,
+    grw: float = 0.22,
+    volt: str = "3.3V",
+    bulk="None",
+    con_bet_fin: int = 1,
+    gate_con_pos="alternating",
+    interdig: int = 0,
+    patt="",
+    deepnwell: int = 0,
+    pcmpgr: int = 0,
+    lbl: bool = 0,
+    sd_lbl: list = [],
+    g_lbl: str = [],
+    sub_lbl: str = "",
+    patt_lbl: bool = 0,
+):
+    """
+    Retern pfet drawn with pya, same arguments as draw_fet.draw_pfet
+    """
+
+    return draw_fet(
+        layout, "pfet", l_gate, w_gate, sd_con_col, inter_sd_l, nf, grw, volt, bulk,
+        con_bet_fin, gate_con_pos, interdig, patt, deepnwell, pcmpgr, lbl, sd_lbl, g_lbl,
+        sub_lbl, patt_lbl,
+    )
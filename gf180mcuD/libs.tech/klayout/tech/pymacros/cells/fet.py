@@ -16,7 +16,21 @@
 # FET Generator for GF180MCU
 ########################################################################################################################
 import pya
-from .draw_fet import draw_nfet, draw_nfet_06v0_nvt, draw_pfet
+from ._lazy import lazy_draw
+from ._hierarchy import flatten_pcell
+
+draw_nfet = lazy_draw("draw_fet", "draw_nfet")
+draw_nfet_06v0_nvt = lazy_draw("draw_fet", "draw_nfet_06v0_nvt")
+draw_pfet = lazy_draw("draw_fet", "draw_pfet")
+
+# native pya geometry backend of the nfet and pfet PCells
+draw_nfet_pya = lazy_draw("draw_fet_pya", "draw_nfet", gdsfactory=False)
+draw_pfet_pya = lazy_draw("draw_fet_pya", "draw_pfet", gdsfactory=False)
+
+fet_backends = {
+    "gdsfactory": (draw_nfet, draw_pfet),
+    "pya": (draw_nfet_pya, draw_pfet_pya),
+}
 
 fet_3p3_l = float(0.28)
 fet_3p3_w = float(0.22)
@@ -103,6 +117,13 @@ class nfet(pya.PCellDeclarationHelper):
 
         self.param("sub_lbl", self.TypeString, "Substrate Label", default="")
 
+        self.Type_handle = self.param(
+            "backend", self.TypeList, "Geometry Backend", default="gdsfactory"
+        )
+        self.Type_handle.add_choice("gdsfactory", "gdsfactory")
+        self.Type_handle.add_choice("pya", "pya")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
+
     def display_text_impl(self):
         # Provide a descriptive text for the cell
         return "nfet(L=" + ("%.3f" % self.l_gate) + ",W=" + ("%.3f" % self.w_gate) + ")"
@@ -164,7 +185,8 @@ class nfet(pya.PCellDeclarationHelper):
         return pya.Trans(self.shape.bbox().dcenter())
 
     def produce_impl(self):
-        nfet_instance = draw_nfet(
+        draw_nfet_backend = fet_backends[self.backend][0]
+        nfet_instance = draw_nfet_backend(
             layout=self.layout,
             l_gate=self.l_gate,
             w_gate=self.w_gate,
@@ -195,7 +217,7 @@ class nfet(pya.PCellDeclarationHelper):
             1,
         )
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class pfet(pya.PCellDeclarationHelper):
@@ -260,6 +282,13 @@ class pfet(pya.PCellDeclarationHelper):
 
         self.param("sub_lbl", self.TypeString, "Substrate Label", default="")
 
+        self.Type_handle = self.param(
+            "backend", self.TypeList, "Geometry Backend", default="gdsfactory"
+        )
+        self.Type_handle.add_choice("gdsfactory", "gdsfactory")
+        self.Type_handle.add_choice("pya", "pya")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
+
     def display_text_impl(self):
         # Provide a descriptive text for the cell
         return "pfet(L=" + ("%.3f" % self.l_gate) + ",W=" + ("%.3f" % self.w_gate) + ")"
@@ -321,7 +350,8 @@ class pfet(pya.PCellDeclarationHelper):
         return pya.Trans(self.shape.bbox().dcenter())
 
     def produce_impl(self):
-        instance = draw_pfet(
+        draw_pfet_backend = fet_backends[self.backend][1]
+        instance = draw_pfet_backend(
             self.layout,
             l_gate=self.l_gate,
             w_gate=self.w_gate,
@@ -352,7 +382,7 @@ class pfet(pya.PCellDeclarationHelper):
             1,
         )
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class nfet_06v0_nvt(pya.PCellDeclarationHelper):
@@ -410,6 +440,7 @@ class nfet_06v0_nvt(pya.PCellDeclarationHelper):
         self.param("g_lbl", self.TypeList, "Pattern of Gate Labels", default=[])
 
         self.param("sub_lbl", self.TypeString, "Substrate Label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -487,4 +518,4 @@ class nfet_06v0_nvt(pya.PCellDeclarationHelper):
             1,
         )
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
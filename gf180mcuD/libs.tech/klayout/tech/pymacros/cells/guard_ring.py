@@ -0,0 +1,202 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+# guard rings generator for GF180MCU
+########################################################################################################################
+
+from functools import lru_cache
+from math import floor
+
+import pya
+
+from .layers_def import layer
+from .via_plan import DBU, to_dbu, via_array_plan
+
+
+def _move(x, y):
+    """
+    Returns the displacement in dbu of a reference moved by (x, y) in um.
+    """
+    return (pya.VCplxTrans(1 / DBU) * pya.DCplxTrans(x, y) * pya.CplxTrans(DBU)).disp
+
+
+def rectangle_box(size, position=(0, 0), center=None):
+    """
+    Returns the box in database units of a gdsfactory rectangle of size moved by position,
+    or centered on center.
+
+    The size is snapped to 2 dbu rounding half up as gdsfactory does, and the move is
+    rounded to the database unit as kfactory does when it moves a reference.
+
+    Args:
+        size: The size of the rectangle in um.
+        position: The move of the rectangle lower left corner in um.
+        center: The center of the rectangle in um, replaces position.
+    """
+
+    w = 2 * floor(size[0] / (2 * DBU) + 0.5)
+    h = 2 * floor(size[1] / (2 * DBU) + 0.5)
+
+    # gdsfactory draws the box centered and moves it by half the size before snapping, and the
+    # displacements of the references are rounded as the instance transformations in dbu
+    box = pya.Box(-w // 2, -h // 2, w // 2, h // 2).moved(_move(size[0] / 2, size[1] / 2))
+
+    if center is not None:
+        current = box.to_dtype(DBU).center()
+        position = (center[0] - current.x, center[1] - current.y)
+
+    return box.moved(_move(*position))
+
+
+class BoxGeometry:
+    """
+    Bounding box in um with the accessors named as the gdsfactory ones, so it can stand for a
+    reference in the drawing code. Subclasses drawing into a layout override dbbox.
+    """
+
+    def __init__(self, box):
+        self.box = box
+
+    def dbbox(self):
+        return self.box.to_dtype(DBU)
+
+    @property
+    def dxmin(self):
+        return self.dbbox().left
+
+    @property
+    def dymin(self):
+        return self.dbbox().bottom
+
+    @property
+    def dxmax(self):
+        return self.dbbox().right
+
+    @property
+    def dymax(self):
+        return self.dbbox().top
+
+    @property
+    def dxsize(self):
+        return self.dbbox().width()
+
+    @property
+    def dysize(self):
+        return self.dbbox().height()
+
+    @property
+    def dcenter(self):
+        center = self.dbbox().center()
+        return center.x, center.y
+
+
+class GuardRing(BoxGeometry):
+    """
+    Geometry of a guard ring in database units, shared by all the rings of the same inner box,
+    width and rules. The regions and the via plans must not be modified.
+
+    The bounding box is the one of the comp ring, so the ring can stand for the reference of
+    the comp ring.
+
+    Attributes:
+        inner: The inner edge of the comp ring.
+        outer: The outer edge of the comp ring.
+        regions: The regions of the ring by layer: comp, metal1 and the implant.
+        contacts: The via array plans of the contacts of the bottom, top, left and right sides.
+        con_size: The contact size in um.
+    """
+
+    def __init__(self, inner, outer, regions, contacts, con_size):
+        super().__init__(outer)
+        self.inner = inner
+        self.outer = outer
+        self.regions = regions
+        self.contacts = contacts
+        self.con_size = con_size
+
+    def contact(self, side):
+        """
+        Returns the BoxGeometry of the contacts of a side, 0 to 3 for bottom, top, left and right.
+        """
+        plan = self.contacts[side]
+        size = to_dbu(self.con_size)
+        return BoxGeometry(
+            pya.Box(
+                0,
+                0,
+                (plan.columns - 1) * plan.pitch[0] + size,
+                (plan.rows - 1) * plan.pitch[1] + size,
+            ).moved(*plan.origin)
+        )
+
+
+@lru_cache(maxsize=1024)
+def guard_ring(
+    inner=(0, 0, 1000, 1000),
+    grw=0.36,
+    implant_layer=layer["pplus"],
+    implant_enc=0.17,
+    con_size=0.22,
+    con_sp=0.29,
+    con_comp_enc=0.08,
+):
+    """
+    Returns the geometry of the guard ring around the inner box, see GuardRing.
+
+    The comp ring and the implant ring are computed at once as differences of regions, the
+    metal1 ring is the comp ring, and the contacts are centered in each side of the ring,
+    the top and bottom sides between the inner corners shrunk by a contact.
+
+    Args:
+        inner: The inner edge of the comp ring, (left, bottom, right, top) in database units.
+        grw: The width of the ring in um.
+        implant_layer: The layer of the implant of the ring (pplus or nplus).
+        implant_enc: The enclosure of the comp ring by the implant, inside and outside, in um.
+        con_size: The contact size in um.
+        con_sp: The contact spacing in um.
+        con_comp_enc: The minimum enclosure of the contacts by the ring in um.
+    """
+
+    inner = pya.Box(*inner)
+    outer = inner.enlarged(to_dbu(grw))
+    enc = to_dbu(implant_enc)
+
+    ring = pya.Region(outer) - pya.Region(inner)
+    implant = pya.Region(outer.enlarged(enc)) - pya.Region(inner.enlarged(-enc))
+
+    regions = {layer["comp"]: ring, implant_layer: implant, layer["metal1"]: ring}
+
+    i_box = inner.to_dtype(DBU)
+    o_box = outer.to_dtype(DBU)
+    contacts = tuple(
+        via_array_plan(
+            x_range,
+            y_range,
+            (con_size, con_size),
+            (con_comp_enc, con_comp_enc),
+            (con_sp, con_sp),
+        )
+        for x_range, y_range in (
+            (
+                (i_box.left + con_size, i_box.right - con_size),
+                (o_box.bottom, i_box.bottom),
+            ),
+            ((i_box.left + con_size, i_box.right - con_size), (i_box.top, o_box.top)),
+            ((o_box.left, i_box.left), (i_box.bottom + con_size, i_box.top - con_size)),
+            ((i_box.right, o_box.right), (i_box.bottom + con_size, i_box.top - con_size)),
+        )
+    )
+
+    return GuardRing(inner, outer, regions, contacts, con_size)
@@ -0,0 +1,300 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+# interdigitated FETs gate routing generator for GF180MCU
+########################################################################################################################
+
+from collections import namedtuple
+from math import floor
+
+import numpy as np
+import pya
+
+from .guard_ring import BoxGeometry, rectangle_box
+from .layers_def import layer
+from .via_plan import DBU, to_dbu, via_array_plan
+
+# metal2 tracks and via1 of the gate routing
+M2_SPACING = 0.29
+VIA_SIZE = (0.26, 0.26)
+VIA_ENC = (0.07, 0.07)
+VIA_SPACING = (0.27, 0.27)
+
+FingerUnit = namedtuple("FingerUnit", ["m1", "via", "runs"])
+FingerUnit.__doc__ = """
+Gate strap of the fingers of one symbol on one side of the device.
+
+Attributes:
+    m1: The metal1 strap box of the first finger, in database units.
+    via: The ViaArrayPlan of the via1 array of the first finger on its metal2 track.
+    runs: The (offset, pitch, count) arrays of the fingers, offsets from the first finger in
+        database units.
+"""
+
+InterdigitPlan = namedtuple("InterdigitPlan", ["rails", "units", "joins", "join_vias", "labels"])
+InterdigitPlan.__doc__ = """
+Gate routing of an interdigitated device, in database units.
+
+Attributes:
+    rails: The (box, pitch, rows) arrays of the metal2 tracks, the box of the first track.
+    units: The FingerUnit of each symbol and side.
+    joins: The (layer, box) of the metal2 and metal1 joins of the symbols connected on both
+        sides (alternating gate contacts).
+    join_vias: The ViaArrayPlan of the via1 arrays of the joins.
+    labels: The (text, layer, position) of the labels, the position in um.
+"""
+
+
+def _moves(values):
+    """
+    Returns the moves in um rounded to the database unit as the moves of the references are,
+    half away from zero.
+    """
+    v = np.asarray(values, dtype=float) * (1 / DBU)
+    return np.where(v >= 0, np.floor(v + 0.5), np.ceil(v - 0.5)).astype(np.int64)
+
+
+def _runs(offsets):
+    """
+    Returns the (offset, pitch, count) arrays of the sorted offsets, each array evenly spaced.
+    """
+    runs = []
+    start = 0
+    n = len(offsets)
+
+    while start < n:
+        end = start + 1
+        pitch = 0
+        if end < n:
+            pitch = offsets[end] - offsets[start]
+            while end < n and offsets[end] - offsets[end - 1] == pitch:
+                end += 1
+        runs.append((int(offsets[start]), int(pitch), end - start))
+        start = end
+
+    return tuple(runs)
+
+
+def _rails(width, rows, pitch, move):
+    """
+    Returns the (box, pitch, rows) array of the metal2 tracks of width, moved by move in y.
+    """
+    size = (width, VIA_SIZE[1] + 2 * VIA_ENC[1])
+    return (rectangle_box(size, (0, move)), to_dbu(pitch), rows)
+
+
+def _rails_geometry(rails):
+    """
+    Returns the BoxGeometry of a (box, pitch, rows) array of metal2 tracks.
+    """
+    box, pitch, rows = rails
+    return BoxGeometry(box + box.moved(0, (rows - 1) * pitch))
+
+
+def _via_plan(m1, y_range):
+    """
+    Returns the plan of the via1 array on the metal1 strap box m1 within y_range.
+    """
+    m1 = BoxGeometry(m1)
+    return via_array_plan((m1.dxmin, m1.dxmax), y_range, VIA_SIZE, VIA_ENC, VIA_SPACING)
+
+
+def _via_box(plan):
+    """
+    Returns the bounding box of the via1 array of the plan.
+    """
+    w, h = (2 * floor(v / (2 * DBU) + 0.5) for v in VIA_SIZE)
+    return pya.Box(
+        0, 0, (plan.columns - 1) * plan.pitch[0] + w, (plan.rows - 1) * plan.pitch[1] + h
+    ).moved(*plan.origin)
+
+
+def _straps(size, xs, ymin=None, ymax=None):
+    """
+    Returns the metal1 strap box of the first finger and the moves in dbu of the fingers from
+    it, for the straps of size with their left edge moved on xs and their bottom edge on ymin
+    or their top edge on ymax.
+    """
+    box = rectangle_box(size)
+    geo = BoxGeometry(box)
+    moves = _moves(np.asarray(xs) - geo.dxmin)
+    dy = _moves([ymin - geo.dymin if ymax is None else ymax - geo.dymax])[0]
+
+    return box.moved(int(moves[0]), int(dy)), moves - moves[0]
+
+
+def interdigit_plan(
+    sd_diff,
+    pc1,
+    pc2,
+    pc_x=0.1,
+    pc_spacing=0.1,
+    sd_l=0.36,
+    patt="",
+    gate_con_pos="top",
+    lbl=0,
+    g_lbl=(),
+    patt_lbl=0,
+):
+    """
+    Returns the InterdigitPlan of the gate routing of the fingers of the pattern.
+
+    The fingers of a symbol are connected by metal1 straps from their poly contacts to the
+    metal2 track of the symbol. The straps of a symbol on one side of the device make one
+    finger unit, placed as arrays of its evenly spaced fingers, with the finger positions
+    computed at once for all the fingers of the symbol. Everything lands on the database unit
+    grid exactly where the per finger references of the gdsfactory generator were placed.
+
+    Args:
+        sd_diff: The DBox of the source/drain diffusion array.
+        pc1: The DBox of the first poly contacts array (even fingers).
+        pc2: The DBox of the second poly contacts array (odd fingers).
+        pc_x: The width of the poly contacts in um.
+        pc_spacing: The pitch of the poly contacts arrays in um.
+        sd_l: The length of the source/drain diffusion in um.
+        patt: The pattern, one symbol per finger.
+        gate_con_pos: The position of the gate contacts (top, bottom, alternating).
+        lbl: True to add the gate labels.
+        g_lbl: The gate labels, one per symbol.
+        patt_lbl: True to add the pattern labels on the metal2 tracks.
+    """
+
+    pat = list(patt)
+    m2_y = VIA_SIZE[1] + 2 * VIA_ENC[1]
+    track = M2_SPACING + m2_y
+    width = sd_diff.right - sd_diff.left
+
+    rails = []
+    units = []
+    joins = []
+    join_vias = []
+    labels = []
+
+    def add_unit(fingers, m1, moves, via_y, texts=None, gate_text=None):
+        """Adds the finger unit and the labels of the fingers."""
+        via = _via_plan(m1, via_y)
+        units.append(FingerUnit(m1, via, _runs(moves)))
+
+        via_box = _via_box(via)
+        for j, move in zip(fingers, moves):
+            if texts is not None:
+                via_geo = BoxGeometry(via_box.moved(int(move), 0))
+                position = ((via_geo.dxmax + via_geo.dxmin) / 2, (via_geo.dymax + via_geo.dymin) / 2)
+                labels.append((texts[j], layer["metal2_label"], position))
+
+            if gate_text is not None:
+                m1_geo = BoxGeometry(m1.moved(int(move), 0))
+                position = (m1_geo.dxmin + (m1_geo.dxsize / 2), pc1.bottom + (pc1.height() / 2))
+                labels.append((gate_text, layer["metal1_label"], position))
+
+    if gate_con_pos == "alternating":
+        pat_e = pat[0::2]
+        pat_o = pat[1::2]
+        nt_e = list(dict.fromkeys(pat_e))
+        nt_o = list(dict.fromkeys(pat_o))
+
+        rails_b = _rails(width, len(nt_e), -m2_y - M2_SPACING, pc1.bottom - M2_SPACING - m2_y)
+        rails_u = _rails(width, len(nt_o), m2_y + M2_SPACING, pc2.top + M2_SPACING)
+        rails += [rails_b, rails_u]
+        arrb = _rails_geometry(rails_b)
+        arru = _rails_geometry(rails_u)
+
+        # NOTE: the gate labels used to be matched to the symbols by comparing the symbols
+        #       list to the labels count, the alternating devices only have the pattern labels
+        texts_e = pat_e if patt_lbl == 1 else None
+        texts_o = pat_o if patt_lbl == 1 else None
+
+        for i, symbol in enumerate(nt_o):
+            fingers = np.flatnonzero(np.asarray(pat_o) == symbol)
+            size = (pc_x, ((pc2.top + (i + 1) * track) - pc2.bottom))
+            m1, moves = _straps(size, pc2.left + fingers * pc_spacing, ymin=pc2.bottom)
+            y = arru.dymin + i * track
+            add_unit(fingers, m1, moves, (y, y + m2_y), texts_o)
+
+        for i, symbol in enumerate(nt_e):
+            fingers = np.flatnonzero(np.asarray(pat_e) == symbol)
+            size = (pc_x, ((pc1.top + (i + 1) * track) - pc1.bottom))
+            height = BoxGeometry(rectangle_box(size)).dysize
+            m1, moves = _straps(size, pc1.left + fingers * pc_spacing, ymin=-height + pc1.top)
+            y = arrb.dymax - i * track
+            add_unit(fingers, m1, moves, (y - m2_y, y), texts_e)
+
+        # the symbols on both sides are joined west of the device
+        m3_x = VIA_SIZE[0] + 2 * VIA_ENC[0]
+        m3_spacing = M2_SPACING
+
+        for i, symbol in enumerate(nt_e):
+            if symbol not in nt_o:
+                continue
+            j = nt_o.index(symbol)
+
+            join_x = m2_y + sd_l + (i + 1) * (m3_spacing + m3_x)
+            join_b = rectangle_box(
+                (join_x, m2_y), (arrb.dxmin - join_x, arrb.dymax - i * track - m2_y)
+            )
+            join_u = rectangle_box((join_x, m2_y), (arru.dxmin - join_x, arru.dymin + j * track))
+            geo_b = BoxGeometry(join_b)
+            geo_u = BoxGeometry(join_u)
+            m3 = rectangle_box((m3_x, geo_u.dymax - geo_b.dymin), (geo_b.dxmin, geo_b.dymin))
+            joins += [(layer["metal2"], join_b), (layer["metal2"], join_u), (layer["metal1"], m3)]
+
+            via = _via_plan(m3, (geo_b.dymin, geo_b.dymax))
+            dy = to_dbu(geo_u.dymin - geo_b.dymin)
+            join_vias += [via, via._replace(origin=(via.origin[0], via.origin[1] + dy))]
+
+    else:
+        nt = list(dict.fromkeys(pat))
+        nl = len(nt)
+        texts = pat if patt_lbl == 1 and len(pat) == nl else None
+        gate_texts = g_lbl if lbl == 1 and len(g_lbl) == nl else [None] * nl
+
+        if gate_con_pos == "top":
+            rails.append(_rails(width, nl, m2_y + M2_SPACING, pc2.top + M2_SPACING))
+        else:
+            rails.append(_rails(width, nl, -m2_y - M2_SPACING, pc2.bottom - M2_SPACING - m2_y))
+        arr = _rails_geometry(rails[0])
+
+        # the fingers of a symbol on the first and on the second poly contacts
+        for i, symbol in enumerate(nt):
+            for parity in (0, 1):
+                fingers = parity + 2 * np.flatnonzero(np.asarray(pat[parity::2]) == symbol)
+                if len(fingers) == 0:
+                    continue
+                xs = pc1.left + fingers * (pc2.left - pc1.left)
+
+                if gate_con_pos == "top":
+                    size = (
+                        pc_x,
+                        (pc2.top + (i + 1) * track)
+                        - ((1 - parity) * pc1.bottom)
+                        - parity * pc2.bottom,
+                    )
+                    m1, moves = _straps(size, xs, ymin=pc1.bottom)
+                    y = arr.dymin + i * track
+                    via_y = (y, y + m2_y)
+                else:
+                    size = (
+                        pc_x,
+                        (pc1.top + (i + 1) * track)
+                        - parity * pc1.bottom
+                        - (1 - parity) * pc2.bottom,
+                    )
+                    m1, moves = _straps(size, xs, ymax=pc1.top)
+                    y = arr.dymax - i * track
+                    via_y = (y - m2_y, y)
+
+                add_unit(fingers, m1, moves, via_y, texts, gate_texts[i])
+
+    return InterdigitPlan(tuple(rails), tuple(units), tuple(joins), tuple(join_vias), tuple(labels))
@@ -18,15 +18,16 @@
 
 import pya
 import os
-from .draw_res import (
-    draw_metal_res,
-    draw_nplus_res,
-    draw_pplus_res,
-    draw_npolyf_res,
-    draw_ppolyf_res,
-    draw_ppolyf_u_high_Rs_res,
-    draw_well_res,
-)
+from ._lazy import lazy_draw
+from ._hierarchy import flatten_pcell
+
+draw_metal_res = lazy_draw("draw_res", "draw_metal_res")
+draw_nplus_res = lazy_draw("draw_res", "draw_nplus_res")
+draw_pplus_res = lazy_draw("draw_res", "draw_pplus_res")
+draw_npolyf_res = lazy_draw("draw_res", "draw_npolyf_res")
+draw_ppolyf_res = lazy_draw("draw_res", "draw_ppolyf_res")
+draw_ppolyf_u_high_Rs_res = lazy_draw("draw_res", "draw_ppolyf_u_high_Rs_res")
+draw_well_res = lazy_draw("draw_res", "draw_well_res")
 
 rm1_l = 0.23
 rm1_w = 0.23
@@ -125,6 +126,7 @@ class metal_resistor(pya.PCellDeclarationHelper):
         self.param("r0_lbl", self.TypeString, "R0 label", default="")
 
         self.param("r1_lbl", self.TypeString, "R1 label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -217,7 +219,7 @@ class metal_resistor(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class nplus_s_resistor(pya.PCellDeclarationHelper):
@@ -254,6 +256,7 @@ class nplus_s_resistor(pya.PCellDeclarationHelper):
         self.param("r1_lbl", self.TypeString, "R1 label", default="")
 
         self.param("sub_lbl", self.TypeString, "Substrate label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -317,7 +320,7 @@ class nplus_s_resistor(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class pplus_s_resistor(pya.PCellDeclarationHelper):
@@ -353,6 +356,7 @@ class pplus_s_resistor(pya.PCellDeclarationHelper):
         self.param("r1_lbl", self.TypeString, "R1 label", default="")
 
         self.param("sub_lbl", self.TypeString, "Substrate label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -415,7 +419,7 @@ class pplus_s_resistor(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class nplus_u_resistor(pya.PCellDeclarationHelper):
@@ -452,6 +456,7 @@ class nplus_u_resistor(pya.PCellDeclarationHelper):
         self.param("r1_lbl", self.TypeString, "R1 label", default="")
 
         self.param("sub_lbl", self.TypeString, "Substrate label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -515,7 +520,7 @@ class nplus_u_resistor(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class pplus_u_resistor(pya.PCellDeclarationHelper):
@@ -551,6 +556,7 @@ class pplus_u_resistor(pya.PCellDeclarationHelper):
         self.param("r1_lbl", self.TypeString, "R1 label", default="")
 
         self.param("sub_lbl", self.TypeString, "Substrate label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -613,7 +619,7 @@ class pplus_u_resistor(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class nwell_resistor(pya.PCellDeclarationHelper):
@@ -647,6 +653,7 @@ class nwell_resistor(pya.PCellDeclarationHelper):
         self.param("r1_lbl", self.TypeString, "R1 label", default="")
 
         self.param("sub_lbl", self.TypeString, "Substrate label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -708,7 +715,7 @@ class nwell_resistor(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class pwell_resistor(pya.PCellDeclarationHelper):
@@ -743,6 +750,7 @@ class pwell_resistor(pya.PCellDeclarationHelper):
         self.param("r1_lbl", self.TypeString, "R1 label", default="")
 
         self.param("sub_lbl", self.TypeString, "Substrate label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -804,7 +812,7 @@ class pwell_resistor(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class npolyf_s_resistor(pya.PCellDeclarationHelper):
@@ -840,6 +848,7 @@ class npolyf_s_resistor(pya.PCellDeclarationHelper):
         self.param("r1_lbl", self.TypeString, "R1 label", default="")
 
         self.param("sub_lbl", self.TypeString, "Substrate label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -902,7 +911,7 @@ class npolyf_s_resistor(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class ppolyf_s_resistor(pya.PCellDeclarationHelper):
@@ -938,6 +947,7 @@ class ppolyf_s_resistor(pya.PCellDeclarationHelper):
         self.param("r1_lbl", self.TypeString, "R1 label", default="")
 
         self.param("sub_lbl", self.TypeString, "Substrate label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -1000,7 +1010,7 @@ class ppolyf_s_resistor(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class npolyf_u_resistor(pya.PCellDeclarationHelper):
@@ -1036,6 +1046,7 @@ class npolyf_u_resistor(pya.PCellDeclarationHelper):
         self.param("r1_lbl", self.TypeString, "R1 label", default="")
 
         self.param("sub_lbl", self.TypeString, "Substrate label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -1098,7 +1109,7 @@ class npolyf_u_resistor(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class ppolyf_u_resistor(pya.PCellDeclarationHelper):
@@ -1134,6 +1145,7 @@ class ppolyf_u_resistor(pya.PCellDeclarationHelper):
         self.param("r1_lbl", self.TypeString, "R1 label", default="")
 
         self.param("sub_lbl", self.TypeString, "Substrate label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -1196,7 +1208,7 @@ class ppolyf_u_resistor(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
 
 
 class ppolyf_u_high_Rs_resistor(pya.PCellDeclarationHelper):
@@ -1240,6 +1252,7 @@ class ppolyf_u_high_Rs_resistor(pya.PCellDeclarationHelper):
         self.param("r1_lbl", self.TypeString, "R1 label", default="")
 
         self.param("sub_lbl", self.TypeString, "Substrate label", default="")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -1302,4 +1315,4 @@ class ppolyf_u_high_Rs_resistor(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
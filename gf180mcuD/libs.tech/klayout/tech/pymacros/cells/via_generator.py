@@ -18,8 +18,11 @@
 
 from math import ceil, floor
 import gdsfactory as gf
+import klayout.db as kdb
 from gdsfactory.typings import Float2, LayerSpec
 from .layers_def import layer
+from .via_plan import DBU, via_array_plan
+from .guard_ring import guard_ring
 import os
 
 
@@ -44,6 +47,80 @@ def get_level_num(base_layer, base_layers, metal_level, metal_layers):
     return level_1, level_2
 
 
+# via cells shared by the via arrays, by via size and layer
+_via_cells = {}
+
+
+def via_cell(
+    via_size: Float2 = (0.17, 0.17),
+    via_layer: LayerSpec = (66, 44),
+) -> gf.Component:
+
+    """
+    return the via cell of via_size on via_layer, a box with its origin at the lower left corner
+    sized like gf.components.rectangle, shared by all the via arrays of this size and layer
+
+    """
+
+    key = (tuple(via_size), tuple(via_layer))
+    c = _via_cells.get(key)
+    if c is None or c.destroyed():
+        w, h = (2 * floor(v / (2 * DBU) + 0.5) for v in via_size)
+        c = gf.Component(f"via_{via_layer[0]}_{via_layer[1]}_{w}x{h}")
+        c.shapes(c.kcl.layer(*via_layer)).insert(kdb.Box(0, 0, w, h))
+        _via_cells[key] = c
+
+    return c
+
+
+def via_array(
+    c: gf.Component,
+    x_range: Float2 = (0, 1),
+    y_range: Float2 = (0, 1),
+    via_size: Float2 = (0.17, 0.17),
+    via_layer: LayerSpec = (66, 44),
+    via_enclosure: Float2 = (0.06, 0.06),
+    via_spacing: Float2 = (0.17, 0.17),
+) -> gf.ComponentReference:
+
+    """
+    add to the component c an array of the via cell within the range xrange and yrange,
+    placed by via_array_plan, and return the array reference
+
+    """
+
+    plan = via_array_plan(
+        tuple(x_range), tuple(y_range), tuple(via_size), tuple(via_enclosure), tuple(via_spacing)
+    )
+
+    return place_via_array(c, plan, via_size, via_layer)
+
+
+def place_via_array(
+    c: gf.Component,
+    plan,
+    via_size: Float2 = (0.17, 0.17),
+    via_layer: LayerSpec = (66, 44),
+) -> gf.ComponentReference:
+
+    """
+    add to the component c an array of the via cell placed by the via array plan,
+    and return the array reference
+
+    """
+
+    via_arr = c.add_ref(
+        via_cell(via_size, via_layer),
+        columns=plan.columns,
+        rows=plan.rows,
+        column_pitch=plan.pitch[0] * DBU,
+        row_pitch=plan.pitch[1] * DBU,
+    )
+    via_arr.trans = kdb.Trans(*plan.origin)
+
+    return via_arr
+
+
 @gf.cell
 def via_generator(
     x_range: Float2 = (0, 1),
@@ -62,37 +139,53 @@ def via_generator(
 
     c = gf.Component()
 
-    width = x_range[1] - x_range[0]
-    length = y_range[1] - y_range[0]
-    nr = floor(length / (via_size[1] + via_spacing[1]))
-    if (length - nr * via_size[1] - (nr - 1) * via_spacing[1]) / 2 < via_enclosure[1]:
-        nr -= 1
-
-    if nr < 1:
-        nr = 1
+    via_array(
+        c,
+        x_range=x_range,
+        y_range=y_range,
+        via_size=via_size,
+        via_layer=via_layer,
+        via_enclosure=via_enclosure,
+        via_spacing=via_spacing,
+    )
 
-    nc = floor(width / (via_size[0] + via_spacing[0]))
+    return c
 
-    if (
-        round(width - nc * via_size[0] - (nc - 1) * via_spacing[0], 2)
-    ) / 2 < via_enclosure[0]:
-        nc -= 1
 
-    if nc < 1:
-        nc = 1
+def guard_ring_gen(
+    c: gf.Component,
+    inner: kdb.Box,
+    grw: float = 0.36,
+    implant_layer: LayerSpec = layer["pplus"],
+    implant_enc: float = 0.17,
+    con_size: float = 0.22,
+    con_sp: float = 0.29,
+    con_comp_enc: float = 0.08,
+):
 
-    via_sp = (via_size[0] + via_spacing[0], via_size[1] + via_spacing[1])
+    """
+    add to the component c the guard ring around the box inner (in dbu): the comp, metal1
+    and implant rings and the contacts of the four sides, and return its GuardRing geometry
 
-    rect_via = gf.components.rectangle(size=via_size, layer=via_layer)
+    """
 
-    via_arr = c.add_array(rect_via, rows=nr, columns=nc, spacing=via_sp)
+    ring = guard_ring(
+        (inner.left, inner.bottom, inner.right, inner.top),
+        grw,
+        tuple(implant_layer),
+        implant_enc,
+        con_size,
+        con_sp,
+        con_comp_enc,
+    )
 
-    via_arr.dmove((x_range[0], y_range[0]))
+    for layer_spec, region in ring.regions.items():
+        c.shapes(c.kcl.layer(*layer_spec)).insert(region)
 
-    via_arr.dmovex((width - nc * via_size[0] - (nc - 1) * via_spacing[0]) / 2)
-    via_arr.dmovey((length - nr * via_size[1] - (nr - 1) * via_spacing[1]) / 2)
+    for plan in ring.contacts:
+        place_via_array(c, plan, (con_size, con_size), layer["contact"])
 
-    return c
+    return ring
 
 
 @gf.cell
@@ -129,7 +222,8 @@ def via_stack(
     m1_area = 0.145
 
     if metal_level >= 1:
-        con_gen = via_generator(
+        con = via_array(
+            c,
             x_range=x_range,
             y_range=y_range,
             via_size=con_size,
@@ -137,7 +231,6 @@ def via_stack(
             via_layer=layer["contact"],
             via_spacing=con_spacing,
         )
-        con = c.add_ref(con_gen)
 
         m1_x = con.dxsize + 2 * con_enc
 
@@ -152,7 +245,8 @@ def via_stack(
         m1.dcenter = con.dcenter
 
     if metal_level >= 2:
-        via1_gen = via_generator(
+        via1 = via_array(
+            c,
             x_range=(m1.dxmin, m1.dxmax),
             y_range=(m1.dymin, m1.dymax),
             via_size=via_size,
@@ -160,7 +254,6 @@ def via_stack(
             via_layer=layer["via1"],
             via_spacing=via_spacing,
         )
-        via1 = c.add_ref(via1_gen)
 
         m2 = c.add_ref(
             gf.components.rectangle(
@@ -170,7 +263,8 @@ def via_stack(
         m2.dcenter = via1.dcenter
 
     if metal_level >= 3:
-        via2_gen = via_generator(
+        via2 = via_array(
+            c,
             x_range=(m2.dxmin, m2.dxmax),
             y_range=(m2.dymin, m2.dymax),
             via_size=via_size,
@@ -178,7 +272,6 @@ def via_stack(
             via_layer=layer["via2"],
             via_spacing=via_spacing,
         )
-        via2 = c.add_ref(via2_gen)
 
         m3 = c.add_ref(
             gf.components.rectangle(
@@ -188,7 +281,8 @@ def via_stack(
         m3.dcenter = via2.dcenter
 
     if metal_level >= 4:
-        via3_gen = via_generator(
+        via3 = via_array(
+            c,
             x_range=(m3.dxmin, m3.dxmax),
             y_range=(m3.dymin, m3.dymax),
             via_size=via_size,
@@ -196,7 +290,6 @@ def via_stack(
             via_layer=layer["via2"],
             via_spacing=via_spacing,
         )
-        via3 = c.add_ref(via3_gen)
 
         m4 = c.add_ref(
             gf.components.rectangle(
@@ -206,7 +299,8 @@ def via_stack(
         m4.dcenter = via3.dcenter
 
     if metal_level >= 5:
-        via4_gen = via_generator(
+        via4 = via_array(
+            c,
             x_range=(m4.dxmin, m4.dxmax),
             y_range=(m4.dymin, m4.dymax),
             via_size=via_size,
@@ -214,7 +308,6 @@ def via_stack(
             via_layer=layer["via4"],
             via_spacing=via_spacing,
         )
-        via4 = c.add_ref(via4_gen)
 
         m5 = c.add_ref(
             gf.components.rectangle(
@@ -0,0 +1,89 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+# via arrays planner for GF180MCU
+########################################################################################################################
+
+from collections import namedtuple
+from functools import lru_cache
+
+# database unit of the PCells layouts in um
+DBU = 0.001
+
+ViaArrayPlan = namedtuple("ViaArrayPlan", ["columns", "rows", "origin", "pitch"])
+
+
+def to_dbu(value):
+    """
+    Returns the value in um as an integer number of database units.
+    """
+    return int(round(value / DBU))
+
+
+@lru_cache(maxsize=4096)
+def via_array_plan(
+    x_range=(0, 1),
+    y_range=(0, 1),
+    via_size=(0.17, 0.17),
+    via_enclosure=(0.06, 0.06),
+    via_spacing=(0.17, 0.17),
+):
+    """
+    Returns the placement of the via array within x_range and y_range, see via_generator.
+
+    The numbers of columns and rows are the most vias with the given size and spacing
+    that keep the enclosure to the range (one at least), and the array is centered in
+    the range. All the placement is computed in database units.
+
+    Args:
+        x_range: The range of the array in x, in um.
+        y_range: The range of the array in y, in um.
+        via_size: The via size in x and y, in um.
+        via_enclosure: The minimum enclosure of the vias by the range in x and y, in um.
+        via_spacing: The spacing between the vias in x and y, in um.
+
+    Returns:
+        A ViaArrayPlan with the columns and rows of the array, the origin of its
+        lower left via and the pitch of the array in x and y, in database units.
+    """
+
+    origin = []
+    pitch = []
+    counts = []
+
+    for axis in (0, 1):
+        start = to_dbu((x_range, y_range)[axis][0])
+        width = to_dbu((x_range, y_range)[axis][1]) - start
+        size = to_dbu(via_size[axis])
+        spacing = to_dbu(via_spacing[axis])
+        enclosure = to_dbu(via_enclosure[axis])
+
+        n = width // (size + spacing)
+        margin = width - n * (size + spacing) + spacing
+
+        # NOTE: the x margin used to be rounded to 0.01um before the enclosure check
+        if axis == 0:
+            margin = 10 * round(margin / 10)
+
+        if margin < 2 * enclosure:
+            n -= 1
+        n = max(n, 1)
+
+        counts.append(n)
+        pitch.append(size + spacing)
+        # a half database unit margin is rounded down, as the moves of the arrays did
+        origin.append(start + (width - n * size - (n - 1) * spacing) // 2)
+
+    return ViaArrayPlan(counts[0], counts[1], tuple(origin), tuple(pitch))
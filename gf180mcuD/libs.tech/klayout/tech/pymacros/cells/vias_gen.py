@@ -17,7 +17,10 @@
 ########################################################################################################################
 
 import pya
-from .via_generator import draw_via_dev
+from ._lazy import lazy_draw
+from ._hierarchy import flatten_pcell
+
+draw_via_dev = lazy_draw("via_generator", "draw_via_dev")
 
 via_size = 0.26
 via_enc = 0.07
@@ -57,6 +60,7 @@ class via_dev(pya.PCellDeclarationHelper):
 
         self.param("x_max", self.TypeDouble, "width", default=1, unit="um")
         self.param("y_max", self.TypeDouble, "length", default=1, unit="um")
+        self.param("keep_arrays", self.TypeBoolean, "Keep Via Arrays", default=0)
 
     def display_text_impl(self):
         # Provide a descriptive text for the cell
@@ -116,4 +120,4 @@ class via_dev(pya.PCellDeclarationHelper):
         )
 
         self.cell.insert(write_cells)
-        self.cell.flatten(1)
+        flatten_pcell(self.cell, self.keep_arrays)
@@ -0,0 +1,437 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## PCells generation server for Klayout of GF180MCU
+########################################################################################################################
+
+"""
+Globalfoundries 180u PCells generation server.
+
+Keeps the gf180mcu library registered and its PCell variants cached in a long lived process,
+and generates the batches of PCells sent by the clients over a Unix domain socket.
+
+Usage:
+    pcell_server.py (--help| -h)
+    pcell_server.py serve [--socket=<path>] [--cache_size=<n>]
+    pcell_server.py request (--input=<batch>) [--output=<file>] [--socket=<path>]
+    pcell_server.py stats [--socket=<path>]
+    pcell_server.py stop [--socket=<path>]
+
+Options:
+    --help -h               Print this help message.
+    --socket=<path>         Path of the server socket, default is gf180mcu_pcells.sock in $XDG_RUNTIME_DIR or the temporary directory.
+    --cache_size=<n>        Number of PCell variants kept drawn between the batches. [default: 1000]
+    --input=<batch>         JSON file of the batch of PCells to generate.
+    --output=<file>         Layout file written by the client, .gds or .oas. Default is the output of the batch, written by the server.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import signal
+import logging
+import tempfile
+import socketserver
+from collections import OrderedDict
+from docopt import docopt
+
+# NOTE: the clients only need the standard library, klayout and the PCells are imported by the server
+pcell_path = os.path.dirname(os.path.abspath(__file__))
+
+SOCKET_NAME = "gf180mcu_pcells.sock"
+FORMATS = {"gds": "GDS2", "oas": "OASIS"}
+
+
+def default_socket():
+    """
+    Get the default path of the server socket.
+    """
+    return os.path.join(os.environ.get("XDG_RUNTIME_DIR", tempfile.gettempdir()), SOCKET_NAME)
+
+
+class PCellGenerator:
+    """
+    Generates batches of PCells from the registered libraries.
+
+    The library only keeps a PCell variant drawn while a layout is using it, so the generator
+    holds a proxy of the last cache_size variants in a private layout, and the next batches
+    asking for the same parameters copy them instead of drawing them again.
+
+    Args:
+        cache_size: The number of PCell variants kept drawn.
+    """
+
+    def __init__(self, cache_size=1000):
+        import klayout.db as k
+
+        sys.path.insert(0, pcell_path)
+        from cells import gf180mcu, flatten_pcell, release_layout
+
+        self.k = k
+        self.flatten_pcell = flatten_pcell
+        self.release_layout = release_layout
+        self.cache_size = cache_size
+        self.cache_layout = k.Layout()
+        self.cache = OrderedDict()
+        self.stats = {"batches": 0, "cells": 0, "errors": 0, "cache_hits": 0, "cache_misses": 0}
+
+        # Instantiate and register the libraries
+        gf180mcu()
+        try:
+            from sealring_cells import gf180mcu_sealring
+
+            gf180mcu_sealring()
+        except ImportError:
+            logging.info("The seal ring library isn't available.")
+
+    def variant(self, layout, library, pcell, params):
+        """
+        Get the cell index of the PCell variant in the layout, keeping the variant drawn.
+
+        Args:
+            layout: The layout of the batch.
+            library: The name of the library.
+            pcell: The name of the PCell.
+            params: The dict of the PCell parameters.
+        """
+        lib = self.k.Library.library_by_name(library)
+        if lib is None:
+            raise ValueError(f"unknown library {library}")
+        declaration = lib.layout().pcell_declaration(pcell)
+        if declaration is None:
+            raise ValueError(f"unknown pcell {pcell} in library {library}")
+        pcell_id = declaration.id()
+
+        key = (library, pcell, json.dumps(params, sort_keys=True))
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+        else:
+            self.stats["cache_misses"] += 1
+            self.cache[key] = self.cache_layout.add_pcell_variant(lib, pcell_id, params)
+            if len(self.cache) > self.cache_size:
+                _, ci = self.cache.popitem(last=False)
+                self.cache_layout.delete_cell(ci)
+
+        return layout.add_pcell_variant(lib, pcell_id, params)
+
+    def close(self):
+        """
+        Release the cached PCell variants.
+        """
+        self.cache.clear()
+        self.release_layout(self.cache_layout)
+
+    def generate(self, batch):
+        """
+        Generate a batch of PCells into one layout.
+
+        Args:
+            batch: The dict of the batch, with keys:
+                cells: The list of the PCells, each a dict with the pcell name, its params
+                    dict, and optionally its library (default gf180mcu), its position [x, y]
+                    in um and its name.
+                top: The name of the top cell (default TOP).
+                flatten: If True (default), the PCells are flattened into the top cell, else
+                    each PCell is a static cell, named by its name if given.
+                keep_arrays: Keep the contact and via arrays of the PCells.
+                format: The layout format, gds (default) or oas.
+                output: The absolute path of the layout file written by the server, else the
+                    layout is returned.
+
+        Returns:
+            The reply dict, with the number of generated cells and the errors of the failed
+            ones, and the bytes of the layout if it's not written to the output.
+        """
+        k = self.k
+        start = time.time()
+        fmt = batch.get("format")
+        output = batch.get("output")
+        if fmt is not None and fmt not in FORMATS:
+            raise ValueError(f"unknown format {fmt}, allowed formats are {', '.join(FORMATS)}")
+        # the working directory of the server isn't the one of the client
+        if output and not os.path.isabs(output):
+            raise ValueError(f"output {output} isn't an absolute path")
+
+        keep_arrays = bool(batch.get("keep_arrays", False))
+        flatten = batch.get("flatten", True)
+
+        layout = k.Layout()
+        top = layout.create_cell(batch.get("top", "TOP"))
+        static = {}
+        errors = []
+
+        for i, entry in enumerate(batch.get("cells", [])):
+            try:
+                param = dict(entry.get("params", {}))
+                param["keep_arrays"] = keep_arrays
+                pc = self.variant(
+                    layout, entry.get("library", "gf180mcu"), entry["pcell"], param
+                )
+
+                if not flatten:
+                    if pc not in static:
+                        static[pc] = layout.convert_cell_to_static(pc)
+                    # the cells of the PCells that failed to draw have no name
+                    name = entry.get("name") or layout.cell(static[pc]).name or entry["pcell"]
+                    layout.rename_cell(static[pc], name)
+                    pc = static[pc]
+
+                x, y = entry.get("position", (0, 0))
+                top.insert(k.DCellInstArray(pc, k.DTrans(k.DVector(x, y))))
+            except Exception as e:
+                errors.append({"index": i, "pcell": entry.get("pcell"), "message": str(e)})
+                logging.error(f"Exception happened: {str(e)} for pcell {entry}")
+
+        if flatten:
+            self.flatten_pcell(top, keep_arrays)
+        else:
+            for pc in static:
+                layout.delete_cell(pc)
+
+        options = k.SaveLayoutOptions()
+        options.write_context_info = False
+        if fmt is None and output:
+            options.set_format_from_filename(output)
+        else:
+            options.format = FORMATS[fmt or "gds"]
+
+        generated = len(batch.get("cells", [])) - len(errors)
+        self.stats["batches"] += 1
+        self.stats["cells"] += generated
+        self.stats["errors"] += len(errors)
+
+        reply = {"status": "ok", "cells": generated, "errors": errors}
+        if output:
+            layout.write(output, options)
+            data = b""
+            reply["output"] = output
+        else:
+            data = layout.write_bytes(options)
+        reply["size"] = len(data)
+
+        self.release_layout(layout)
+        reply["time"] = round(time.time() - start, 4)
+        logging.info(f"Generated {generated} pcells in {reply['time']}s")
+
+        return reply, data
+
+
+class PCellRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Serves the requests of a client connection, one JSON line each.
+
+    A request is a batch dict (see PCellGenerator.generate) or a dict with a command, stats or
+    stop. The reply is a JSON line followed by the size bytes of the layout.
+    """
+
+    def handle(self):
+        for line in self.rfile:
+            data = b""
+            try:
+                request = json.loads(line)
+                command = request.get("command", "generate")
+
+                if command == "generate":
+                    reply, data = self.server.generator.generate(request)
+                elif command == "stats":
+                    reply = dict(
+                        self.server.generator.stats,
+                        status="ok",
+                        cached_variants=len(self.server.generator.cache),
+                    )
+                elif command == "stop":
+                    reply = {"status": "ok"}
+                    self.server.stopped = True
+                else:
+                    reply = {"status": "error", "message": f"unknown command {command}"}
+            except Exception as e:
+                reply = {"status": "error", "message": str(e)}
+
+            reply.setdefault("size", len(data))
+            self.wfile.write(json.dumps(reply).encode() + b"\n" + data)
+            self.wfile.flush()
+
+            if self.server.stopped:
+                return
+
+
+class PCellServer(socketserver.UnixStreamServer):
+    """
+    Unix domain socket server of the PCells generation.
+
+    The connections are served one at a time, as the PCells libraries are shared by all of
+    them, and the other clients wait in the socket backlog.
+
+    Args:
+        socket_path: The path of the socket.
+        generator: The PCellGenerator of the batches.
+    """
+
+    request_queue_size = 64
+
+    def __init__(self, socket_path, generator):
+        self.generator = generator
+        self.stopped = False
+        super().__init__(socket_path, PCellRequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def serve_until_stopped(self):
+        """
+        Serve the connections until a client asks to stop.
+        """
+        try:
+            while not self.stopped:
+                self.handle_request()
+        finally:
+            self.server_close()
+            os.remove(self.server_address)
+            self.generator.close()
+
+
+def send_request(request, socket_path=None):
+    """
+    Send a request to the server and wait for its reply.
+
+    Args:
+        request: The dict of the request, a batch of PCells or a command.
+        socket_path: The path of the server socket.
+
+    Returns:
+        The reply dict and the bytes of the layout.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(socket_path or default_socket())
+        s.sendall(json.dumps(request).encode() + b"\n")
+        with s.makefile("rb") as f:
+            reply = json.loads(f.readline())
+            data = f.read(reply.get("size", 0))
+
+    return reply, data
+
+
+def check_socket(socket_path):
+    """
+    Remove the socket left by a server that's no longer running.
+
+    Args:
+        socket_path: The path of the server socket.
+    """
+    if not os.path.exists(socket_path):
+        return
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.connect(socket_path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.remove(socket_path)
+        return
+
+    logging.error(f"A PCells server is already running on {socket_path}")
+    exit(1)
+
+
+def serve(socket_path, cache_size):
+    """
+    Runs the PCells server until a client asks to stop
+
+    Args :
+        socket_path : path of the server socket
+        cache_size : number of PCell variants kept drawn
+    """
+
+    check_socket(socket_path)
+
+    generator = PCellGenerator(cache_size)
+    server = PCellServer(socket_path, generator)
+
+    # stop on SIGTERM as on a stop request, removing the socket
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    logging.info(f"PCells server listening on {socket_path}")
+    server.serve_until_stopped()
+    logging.info(f"PCells server stopped, {generator.stats}")
+
+
+def run_request(input_file, output_file, socket_path):
+    """
+    Sends a batch file to the server and writes the returned layout
+
+    Args :
+        input_file : JSON file of the batch
+        output_file : layout file to write, else the batch output is written by the server
+        socket_path : path of the server socket
+    """
+
+    with open(input_file) as f:
+        batch = json.load(f)
+
+    if output_file:
+        batch.pop("output", None)
+        batch.setdefault("format", "oas" if output_file.endswith(".oas") else "gds")
+    elif not batch.get("output"):
+        logging.error("No layout output, please use --output or set the output of the batch.")
+        exit(1)
+    else:
+        batch["output"] = os.path.abspath(batch["output"])
+
+    reply, data = send_request(batch, socket_path)
+
+    if reply["status"] != "ok":
+        logging.error(f"PCells server error: {reply['message']}")
+        exit(1)
+
+    for error in reply["errors"]:
+        logging.error(f"Cell {error['index']} ({error['pcell']}) failed: {error['message']}")
+
+    if output_file:
+        with open(output_file, "wb") as f:
+            f.write(data)
+
+    logging.info(
+        f"Generated {reply['cells']} pcells in {reply['time']}s into {output_file or reply['output']}"
+    )
+
+    if reply["errors"]:
+        exit(1)
+
+
+if __name__ == "__main__":
+
+    # logs format
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)-7s | %(message)s",
+        datefmt="%d-%b-%Y %H:%M:%S",
+    )
+
+    # arguments
+    arguments = docopt(__doc__, version="PCELLS Server: 0.1")
+    socket_path = arguments["--socket"] or default_socket()
+
+    if arguments["serve"]:
+        serve(socket_path, int(arguments["--cache_size"]))
+    elif arguments["request"]:
+        run_request(arguments["--input"], arguments["--output"], socket_path)
+    else:
+        command = "stats" if arguments["stats"] else "stop"
+        try:
+            reply, _ = send_request({"command": command}, socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            logging.error(f"No PCells server is running on {socket_path}")
+            exit(1)
+        logging.info(f"PCells server {command}: {reply}")
@@ -0,0 +1,466 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## PCells parameters sweep for Klayout of GF180MCU
+########################################################################################################################
+
+"""
+Globalfoundries 180u PCells parameters sweep.
+
+Generates the placed PCells, their cdl netlist and an index of their bounding boxes and
+parameters from the same rows of parameters, in one pass.
+
+Usage:
+    pcell_sweep.py (--help| -h)
+    pcell_sweep.py (--device=<device_name>) [--workers=<n>] [--keep_arrays] [--index_format=<fmt>]
+
+Options:
+    --help -h                   Print this help message.
+    --device=<device_name>      Select your device name, the patterns of testing/patterns/<device_name> are generated into testing/testcases.
+    --workers=<n>               Number of worker processes drawing the PCells. [default: 1]
+    --keep_arrays               Keep the contact and via arrays of the pcells as instance arrays of shared cells.
+    --index_format=<fmt>        Format of the index file, json or parquet. [default: json]
+"""
+
+import os
+import sys
+import json
+import glob
+import math
+import logging
+import tempfile
+from itertools import chain
+from multiprocessing import get_context
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from docopt import docopt
+import klayout.db as k
+import pandas as pd
+
+pcell_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, pcell_path)
+
+from cells import gf180mcu, flatten_pcell, release_layout  # noqa E402
+
+DB_PERC = 1000
+
+# columns of the patterns that describe the netlist of the device, not the pcell
+NETLIST_COLUMNS = ["pcell_name", "netlist_name", "netlist_nets", "netlists_param", "dev_name", "dev_tb"]
+
+CDL_HEADER = """
+# Copyright 2022 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## {device_name} Pcells cdl Generator for Klayout of GF180MCU
+########################################################################################################################
+
+.SUBCKT {top_cell}
+        """
+
+CDL_FOOTER = """
+.ENDS
+    """
+
+
+def pcell_params(row, device_name):
+    """
+    Returns the pcell parameters of a row of patterns
+
+    Args :
+        row : dict of the row of patterns
+        device_name : name of the device under test
+    """
+
+    param = {key: value for key, value in row.items() if key not in NETLIST_COLUMNS}
+
+    if "fet" in device_name:
+        param["g_lbl"] = param["g_lbl"].split("_")
+        param["sd_lbl"] = param["sd_lbl"].split("_")
+
+    return param
+
+
+def cdl_lines(row, device_name):
+    """
+    Returns the cdl lines of the devices of a row of patterns
+
+    Args :
+        row : dict of the row of patterns
+        device_name : name of the device under test
+    """
+
+    if "netlist_nets" not in row:
+        return ""
+
+    if "fet" in device_name:
+        nets = row["netlist_nets"].split("_")
+        dev_name = row["dev_name"].split("_")
+        param = row["netlists_param"].split("_")
+
+        return "".join(
+            f"""
+    {dev_name[j]} {nets[j]} {device_name} {param[j]}
+                    """
+            for j in range(len(nets))
+        )
+
+    return f"""
+{row["dev_name"]} {row["netlist_nets"]} {row["dev_tb"]} {row["netlists_param"]}
+                """
+
+
+def grid_position(index, column_size, device_space):
+    """
+    Returns the position in database units of an instance, placed by columns of column_size
+    instances device_space um apart
+
+    Args :
+        index : index of the instance
+        column_size : number of instances in a column
+        device_space : device instances spacing
+    """
+
+    return (
+        (index // column_size) * device_space * DB_PERC,
+        (index % column_size) * device_space * DB_PERC,
+    )
+
+
+def draw_cells(layout, top, cells, keep_arrays=False):
+    """
+    Places the pcells in the top cell and returns their bounding boxes and errors
+
+    Args :
+        layout : layout object
+        top : layout top cell
+        cells : list of (index, pcell name, params, position) of the pcells
+        keep_arrays : keep the contact and via arrays of the pcells
+    """
+
+    lib = k.Library.library_by_name("gf180mcu")
+    results = []
+
+    for index, pcell_name, param, position in cells:
+        bbox = None
+        error = None
+
+        try:
+            declaration = lib.layout().pcell_declaration(pcell_name)
+            if declaration is None:
+                raise ValueError(f"unknown pcell {pcell_name}")
+            pc = layout.add_pcell_variant(
+                lib, declaration.id(), dict(param, keep_arrays=keep_arrays)
+            )
+            trans = k.Trans(*position)
+            top.insert(k.CellInstArray(pc, trans))
+
+            # NOTE: the pcells failing to draw are logged by klayout and give an empty cell
+            box = layout.cell(pc).dbbox()
+            if not box.empty():
+                box = box.transformed(trans.to_dtype(layout.dbu))
+                bbox = [box.left, box.bottom, box.right, box.top]
+        except Exception as e:
+            error = str(e)
+            logging.error(f"Exception happened: {str(e)} for pcell {pcell_name} {param}")
+
+        results.append((index, bbox, error))
+
+    return results
+
+
+def _init_worker(work_dir):
+    """
+    Registers the pcells library in a worker process, working in its own directory as the
+    pcells write their drawn devices into temporary GDS files of fixed names
+
+    Args :
+        work_dir : directory of the worker directories
+    """
+
+    os.chdir(tempfile.mkdtemp(dir=work_dir))
+    gf180mcu()
+
+
+def _draw_chunk(cells, keep_arrays, chunk_name):
+    """
+    Draws a chunk of pcells in a worker process, returns the GDS bytes of the chunk cell and
+    the bounding boxes and errors of the pcells
+
+    Args :
+        cells : list of (index, pcell name, params, position) of the pcells
+        keep_arrays : keep the contact and via arrays of the pcells
+        chunk_name : name of the chunk cell
+    """
+
+    layout = k.Layout()
+    top = layout.create_cell(chunk_name)
+    results = draw_cells(layout, top, cells, keep_arrays)
+    flatten_pcell(top, keep_arrays)
+
+    options = k.SaveLayoutOptions()
+    options.format = "GDS2"
+    options.write_context_info = False
+
+    data = layout.write_bytes(options)
+    release_layout(layout)
+
+    return data, results
+
+
+def write_index(entries, index_file):
+    """
+    Writes the index of the pcells, a parquet file for a .parquet index_file else a json file
+
+    Args :
+        entries : list of the index entries
+        index_file : path of the index file
+    """
+
+    if index_file.endswith(".parquet"):
+        # NOTE: parquet files need pyarrow or fastparquet, only json index files are always available
+        pd.json_normalize(entries).to_parquet(index_file)
+    else:
+        with open(index_file, "w") as f:
+            json.dump(entries, f, indent=1)
+
+
+def sweep(
+    rows,
+    device_name,
+    gds_file,
+    cdl_file=None,
+    index_file=None,
+    device_space=100,
+    column_size=None,
+    top_cell=None,
+    workers=1,
+    keep_arrays=False,
+    chunk_size=50,
+):
+    """
+    Generates the placed pcells of the rows of patterns, their cdl netlist and their index in
+    one pass. The pcells are placed by columns as draw_pcell.py places them and the cdl
+    netlist is the one of cdl_gen.py. The index has an entry per row with its pcell name,
+    parameters, device names, position and bounding box in um, and error if it failed.
+
+    Args :
+        rows : dataframe or iterable of dicts of the patterns, with the pcell_name and the pcell parameters, and the netlist columns of the cdl netlist
+        device_name : name of the device under test
+        gds_file : output layout file, .gds or .oas
+        cdl_file : output cdl file
+        index_file : output index file, .json or .parquet
+        device_space : device instances spacing in um
+        column_size : number of instances in a column, default is the square root of the number of rows
+        top_cell : name of the top cell, default is the netlist name of the first row or <device_name>_pcells
+        workers : number of worker processes drawing the pcells
+        keep_arrays : keep the contact and via arrays of the pcells
+        chunk_size : number of pcells drawn by a worker at once
+
+    Returns :
+        list of the index entries
+    """
+
+    if isinstance(rows, pd.DataFrame):
+        rows = rows.to_dict("records")
+    if column_size is None:
+        rows = list(rows)
+        column_size = max(int(math.sqrt(len(rows))), 1)
+
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        raise ValueError("no patterns to generate")
+    if top_cell is None:
+        top_cell = first.get("netlist_name", f"{device_name}_pcells")
+
+    if k.Library.library_by_name("gf180mcu") is None:
+        gf180mcu()
+
+    layout = k.Layout()
+    top = layout.create_cell(top_cell)
+    entries = []
+    cdl_f = open(cdl_file, "w") if cdl_file else None
+
+    def chunks():
+        """Yields the chunks of pcells of the rows, writing their cdl lines and index entries."""
+        if cdl_f:
+            cdl_f.write(CDL_HEADER.format(device_name=device_name, top_cell=top_cell))
+
+        cells = []
+        for index, row in enumerate(chain([first], rows)):
+            param = pcell_params(row, device_name)
+            x, y = grid_position(index, column_size, device_space)
+            entries.append(
+                {
+                    "index": index,
+                    "pcell_name": row["pcell_name"],
+                    "dev_name": row.get("dev_name"),
+                    "params": param,
+                    "position": [x * layout.dbu, y * layout.dbu],
+                    "bbox": None,
+                    "error": None,
+                }
+            )
+            cells.append((index, row["pcell_name"], param, (x, y)))
+            if cdl_f:
+                cdl_f.write(cdl_lines(row, device_name))
+
+            if len(cells) == chunk_size:
+                yield cells
+                cells = []
+
+        if cells:
+            yield cells
+
+        if cdl_f:
+            cdl_f.write(CDL_FOOTER)
+
+    try:
+        if workers > 1:
+            load_options = k.LoadLayoutOptions()
+            # the cells shared by the chunks when keeping the arrays are the same in all of them
+            load_options.cell_conflict_resolution = k.LoadLayoutOptions.SkipNewCell
+
+            with tempfile.TemporaryDirectory() as work_dir, ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(work_dir,),
+            ) as executor:
+
+                def merge_chunks(done):
+                    """Merges the drawn chunks into the top cell as they complete."""
+                    for future in done:
+                        data, results = future.result()
+                        layout.read_bytes(data, load_options)
+                        chunk = layout.cell(f"{top_cell}_chunk{pending.pop(future)}")
+                        top.insert(k.CellInstArray(chunk.cell_index(), k.Trans()))
+                        for index, bbox, error in results:
+                            entries[index].update(bbox=bbox, error=error)
+
+                # the chunks in flight are bounded, so the rows are read as the workers draw them
+                pending = {}
+                for i, cells in enumerate(chunks()):
+                    if len(pending) >= 2 * workers:
+                        merge_chunks(wait(pending, return_when=FIRST_COMPLETED).done)
+                    future = executor.submit(
+                        _draw_chunk, cells, keep_arrays, f"{top_cell}_chunk{i}"
+                    )
+                    pending[future] = i
+                merge_chunks(as_completed(list(pending)))
+        else:
+            for cells in chunks():
+                for index, bbox, error in draw_cells(layout, top, cells, keep_arrays):
+                    entries[index].update(bbox=bbox, error=error)
+    finally:
+        if cdl_f:
+            cdl_f.close()
+
+    # Flatten cell
+    flatten_pcell(top, keep_arrays)
+
+    # Save the file
+    options = k.SaveLayoutOptions()
+    options.write_context_info = False
+    options.set_format_from_filename(gds_file)
+    layout.write(gds_file, options)
+
+    release_layout(layout)
+
+    if index_file:
+        write_index(entries, index_file)
+
+    return entries
+
+
+def run_sweep(target_device, workers=1, keep_arrays=False, index_format="json"):
+    """
+    Runs the generation of the layout, cdl netlist and index of the device under test
+
+    Args :
+        target_device : category of device under test
+        workers : number of worker processes drawing the pcells
+        keep_arrays : keep the contact and via arrays of the pcells
+        index_format : format of the index files, json or parquet
+    """
+
+    testing_path = os.path.join(pcell_path, "testing")
+    list_patt_files = glob.glob(
+        os.path.join(testing_path, "patterns", target_device, "*.csv")
+    )
+
+    # Read device setting
+    with open(f"{testing_path}/patterns/{target_device}.json") as f:
+        dev_setting = json.load(f)
+
+    os.makedirs(f"{testing_path}/testcases", exist_ok=True)
+
+    for p in list_patt_files:
+
+        # Get device_name
+        device = p.split("/")[-1].split("_patt")[0]
+        out_file = os.path.join(testing_path, "testcases", f"{device}_pcells")
+
+        logging.info(f"Generating pcells, cdl and index for {device}")
+        entries = sweep(
+            pd.read_csv(p),
+            device,
+            f"{out_file}.gds",
+            cdl_file=f"{out_file}.cdl",
+            index_file=f"{out_file}.{index_format}",
+            device_space=dev_setting["spacing"],
+            workers=workers,
+            keep_arrays=keep_arrays,
+        )
+
+        failed = sum(1 for entry in entries if entry["error"] or entry["bbox"] is None)
+        logging.info(f"Generated {len(entries) - failed} of {len(entries)} pcells for {device}")
+
+
+if __name__ == "__main__":
+
+    # logs format
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)-7s | %(message)s",
+        datefmt="%d-%b-%Y %H:%M:%S",
+    )
+
+    # arguments
+    arguments = docopt(__doc__, version="PCELLS Sweep: 0.1")
+    index_format = arguments["--index_format"]
+
+    if index_format not in ["json", "parquet"]:
+        logging.error(f"Unknown index format {index_format}, allowed formats are json and parquet")
+        exit(1)
+
+    # Calling main function
+    run_sweep(
+        arguments["--device"],
+        int(arguments["--workers"]),
+        arguments["--keep_arrays"],
+        index_format,
+    )
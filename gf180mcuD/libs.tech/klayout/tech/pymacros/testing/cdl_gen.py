@@ -32,8 +32,14 @@ Options:
 import pandas as pd
 from docopt import docopt
 import os
+import sys
 import glob
 
+pcell_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, pcell_path)
+
+from pcell_sweep import CDL_HEADER, CDL_FOOTER, cdl_lines  # noqa E402
+
 
 def cdl_gen(df, device_name):
     """
@@ -44,74 +50,15 @@ def cdl_gen(df, device_name):
         device_name : name of device under test
     """
 
-    # open cdl file for write
-    cdl_f = open(f"testcases/{device_name}_pcells.cdl", "w")
-
     # reading top_cell name
     top_cell = df["netlist_name"][0]
 
-    # write header of cdl file
-    cdl_f.write(
-        f"""
-# Copyright 2022 GlobalFoundries PDK Authors
-#
-# Licensed under the Apache License, Version 2.0 (the "License");
-# you may not use this file except in compliance with the License.
-# You may obtain a copy of the License at
-#
-#      http://www.apache.org/licenses/LICENSE-2.0
-#
-# Unless required by applicable law or agreed to in writing, software
-# distributed under the License is distributed on an "AS IS" BASIS,
-# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
-# See the License for the specific language governing permissions and
-# limitations under the License.
-
-########################################################################################################################
-## {device_name} Pcells cdl Generator for Klayout of GF180MCU
-########################################################################################################################
-
-.SUBCKT {top_cell}
-        """
-    )
-
-    if "fet" in device_name:
-
-        # reading netlist parameters (name,nets,type,values) for every pattern
-        for i, row in df.iterrows():
-            nets = row["netlist_nets"].split("_")
-            dev_name = row["dev_name"].split("_")
-            param = row["netlists_param"].split("_")
-            nl = len(nets)
-
-            for j in range(nl):
-                cdl_f.write(
-                    f"""
-    {dev_name[j]} {nets[j]} {device_name} {param[j]}
-                    """
-                )
-
-    else :
-
-        # reading netlist parameters (name,nets,type,values) for every pattern
-        for i, row in df.iterrows():
-            nets = row["netlist_nets"]
-            dev_name = row["dev_name"]
-            dev_tb = row["dev_tb"]
-            param = row["netlists_param"]
-
-            cdl_f.write(
-                f"""
-{dev_name} {nets} {dev_tb} {param}
-                """
-            )
-
-    # write the end of cdl file
-    cdl_f.write(
-        """
-.ENDS
-    """
-    )
+    # write the header, the netlist parameters (name,nets,type,values) of every pattern and the end of cdl file
+    with open(f"testcases/{device_name}_pcells.cdl", "w") as cdl_f:
+        cdl_f.write(CDL_HEADER.format(device_name=device_name, top_cell=top_cell))
+        for row in df.to_dict("records"):
+            cdl_f.write(cdl_lines(row, device_name))
+        cdl_f.write(CDL_FOOTER)
 
 
 if __name__ == "__main__":
@@ -21,11 +21,12 @@ Globalfoundries 180u PCells Generator.
 
 Usage:
     draw_pcell.py (--help| -h)
-    draw_pcell.py (--device=<device_name>)
+    draw_pcell.py (--device=<device_name>) [--keep_arrays]
 
 Options:
     --help -h                   Print this help message.
     --device=<device_name>      Select your device name. Allowed devices are (bjt , diode, MIM-A, MIM-B_gfB, MIM-B_gfC , fet, cap_mos, res)
+    --keep_arrays               Keep the contact and via arrays of the pcells as instance arrays of shared cells.
 """
 
 import os
@@ -41,14 +42,11 @@ import json
 pcell_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, pcell_path)
 
-from cells import gf180mcu  # noqa E402
+from cells import gf180mcu, flatten_pcell  # noqa E402
+from pcell_sweep import grid_position, pcell_params  # noqa E402
 
-# DEV_SPACES = dict()
-# DEV_SPACES["fet"] = 450
-DB_PERC = 1000
 
-
-def draw_pcell(layout, top, lib, patt_file, device_name, device_space):
+def draw_pcell(layout, top, lib, patt_file, device_name, device_space, keep_arrays=False):
     """
     draws pcell using klayout pymacros
 
@@ -59,6 +57,7 @@ def draw_pcell(layout, top, lib, patt_file, device_name, device_space):
         patt_file : patterns csv file path
         device_name : name of the device under test
         device_space : device instances spacing
+        keep_arrays : keep the contact and via arrays of the pcells
     """
 
     # Read csv file of patterns
@@ -68,41 +67,16 @@ def draw_pcell(layout, top, lib, patt_file, device_name, device_space):
     patterns_no = df.shape[0]
     pcell_row_no = int(math.sqrt(patterns_no))
 
-    # inital value for instances location
-    x_shift = 0
-    y_shift = 0
-
     # Insert instance for each row
-    for i, row in df.iterrows():
+    for i, row in enumerate(df.to_dict("records")):
 
         # Get isntance location
-        if (i % pcell_row_no) == 0:
-            x_shift = 0 if i == 0 else x_shift + device_space * DB_PERC
-
-        if (i % pcell_row_no) == 0:
-            y_shift = 0
-        else:
-            y_shift = 0 if i == 0 else y_shift + device_space * DB_PERC
+        x_shift, y_shift = grid_position(i, pcell_row_no, device_space)
 
         pcell_name = row["pcell_name"]
+        param = pcell_params(row, device_name)
 
-        if "fet" in device_name:
-            param = row.drop(
-                labels=[
-                    "pcell_name",
-                    "netlist_name",
-                    "netlist_nets",
-                    "netlists_param",
-                    "dev_name",
-                ]
-            ).to_dict()
-
-            param["g_lbl"] = param["g_lbl"].split("_")
-            param["sd_lbl"] = param["sd_lbl"].split("_")
-
-        else:
-
-            param = row.drop(labels=["pcell_name"]).to_dict()
+        param["keep_arrays"] = keep_arrays
 
         try:
             logging.info(f"Generating pcell for {device_name} with params : {param}")
@@ -115,12 +89,13 @@ def draw_pcell(layout, top, lib, patt_file, device_name, device_space):
             )
 
 
-def run_generation(target_device):
+def run_generation(target_device, keep_arrays=False):
     """
     Runs generation of the device under test
 
     Args :
         target_device : category of device under test
+        keep_arrays : keep the contact and via arrays of the pcells
     """
 
     file_path = os.path.dirname(os.path.abspath(__file__))
@@ -150,10 +125,10 @@ def run_generation(target_device):
         top = layout.create_cell(f"{device}_pcells")
 
         # Call draww_pcell
-        draw_pcell(layout, top, lib, p, device, dev_setting["spacing"])
+        draw_pcell(layout, top, lib, p, device, dev_setting["spacing"], keep_arrays)
 
         # Flatten cell
-        top.flatten(1)
+        flatten_pcell(top, keep_arrays)
 
         # Save the file
         options = k.SaveLayoutOptions()
@@ -173,9 +148,10 @@ if __name__ == "__main__":
     # arguments
     arguments = docopt(__doc__, version="PCELLS Gen.: 0.1")
     target_device = arguments["--device"]
+    keep_arrays = arguments["--keep_arrays"]
 
     # Instantiate and register the library
     gf180mcu()
 
     # Calling main function
-    run_generation(target_device)
+    run_generation(target_device, keep_arrays)
@@ -0,0 +1,183 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## FET Pcells geometry backends equivalence test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import glob
+import itertools
+import pytest
+import pandas as pd
+import klayout.db as k
+
+pcell_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, pcell_path)
+
+from cells import gf180mcu  # noqa E402
+
+# step between the fet patterns rows compared
+PATT_STEP = 50
+
+
+def fet_cases():
+    """
+    Returns the (pcell name, parameters) cases compared between the backends:
+    the combinations of the device options, interdigitated devices, then every PATT_STEP fet pattern.
+    """
+
+    cases = []
+
+    for pcell, volt, bulk, nf, gate_con_pos, dn in itertools.product(
+        ["nfet", "pfet"],
+        ["3.3V", "5V", "6V"],
+        ["None", "Bulk Tie", "Guard Ring"],
+        [1, 2, 3],
+        ["top", "bottom", "alternating"],
+        [(0, 0), (1, 0), (1, 1)],
+    ):
+        cases.append(
+            (
+                pcell,
+                {
+                    "volt": volt,
+                    "bulk": bulk,
+                    "nf": nf,
+                    "gate_con_pos": gate_con_pos,
+                    "deepnwell": dn[0],
+                    "pcmpgr": dn[1],
+                    "w_gate": 1.1,
+                    "l_gate": 0.9,
+                    "lbl": 1,
+                    "sd_lbl": [f"sd{i}" for i in range(nf + 1)],
+                    "g_lbl": [f"g{i}" for i in range(nf)],
+                    "sub_lbl": "sub",
+                },
+            )
+        )
+
+    for pcell, gate_con_pos, patt in itertools.product(
+        ["nfet", "pfet"],
+        ["top", "bottom", "alternating"],
+        ["ABBA", "ABCABCAB", "AB" * 40],
+    ):
+        symbols = sorted(set(patt))
+        cases.append(
+            (
+                pcell,
+                {
+                    "interdig": 1,
+                    "patt": patt,
+                    "nf": len(patt),
+                    "gate_con_pos": gate_con_pos,
+                    "w_gate": 1.1,
+                    "l_gate": 0.901,
+                    "bulk": "Guard Ring",
+                    "lbl": 1,
+                    "patt_lbl": 1,
+                    "sd_lbl": [f"sd{i}" for i in range(len(patt) + 1)],
+                    "g_lbl": [f"g{s}" for s in symbols],
+                    "sub_lbl": "sub",
+                },
+            )
+        )
+
+    file_path = os.path.dirname(os.path.abspath(__file__))
+    for patt_file in sorted(glob.glob(os.path.join(file_path, "patterns", "*fet*", "*.csv"))):
+        df = pd.read_csv(patt_file)
+        for _, row in df.iloc[::PATT_STEP].iterrows():
+            param = row.drop(
+                labels=[
+                    "pcell_name",
+                    "netlist_name",
+                    "netlist_nets",
+                    "netlists_param",
+                    "dev_name",
+                ]
+            ).to_dict()
+
+            param["nf"] = int(param["nf"])
+            param["sd_con_col"] = int(param["sd_con_col"])
+            param["g_lbl"] = param["g_lbl"].split("_")
+            param["sd_lbl"] = param["sd_lbl"].split("_")
+
+            cases.append((row["pcell_name"], param))
+
+    return cases
+
+
+def draw_fet(pcell, param, backend):
+    """
+    Returns the layout and the flat cell of the fet drawn with the given backend
+    """
+
+    lib = k.Library.library_by_name("gf180mcu")
+
+    layout = k.Layout()
+    top = layout.create_cell("TOP")
+    pc = layout.add_pcell_variant(lib, lib.layout().pcell_id(pcell), dict(param, backend=backend))
+    top.insert(k.CellInstArray(pc, k.Trans()))
+    top.flatten(1)
+
+    return layout, top
+
+
+def texts(layout, cell):
+    """
+    Returns the set of labels of the cell with their layer and position
+    """
+
+    labels = set()
+    for li in layout.layer_indexes():
+        for shape in cell.shapes(li).each(k.Shapes.STexts):
+            text = shape.text
+            labels.add((str(layout.get_info(li)), text.string, text.x, text.y))
+
+    return labels
+
+
+@pytest.fixture(scope="module", autouse=True)
+def library():
+    """
+    Registers the pcells library
+    """
+    return gf180mcu()
+
+
+@pytest.mark.parametrize("pcell,param", fet_cases())
+def test_fet_backends_geometry(pcell, param):
+    """
+    Checks that the pya backend draws the same geometry and labels as the gdsfactory backend
+
+    Args:
+        pcell : name of the fet pcell
+        param : pcell parameters
+    """
+
+    ly_gf, top_gf = draw_fet(pcell, param, "gdsfactory")
+    ly_pya, top_pya = draw_fet(pcell, param, "pya")
+
+    layers = {str(ly_gf.get_info(li)) for li in ly_gf.layer_indexes()}
+    layers |= {str(ly_pya.get_info(li)) for li in ly_pya.layer_indexes()}
+
+    for lyr in sorted(layers):
+        info = k.LayerInfo.from_string(lyr)
+        region_gf = k.Region(top_gf.begin_shapes_rec(ly_gf.layer(info)))
+        region_pya = k.Region(top_pya.begin_shapes_rec(ly_pya.layer(info)))
+        diff = region_gf ^ region_pya
+        assert diff.is_empty(), f"{pcell} {param} differs on layer {lyr}: {diff}"
+
+    assert texts(ly_gf, top_gf) == texts(ly_pya, top_pya)
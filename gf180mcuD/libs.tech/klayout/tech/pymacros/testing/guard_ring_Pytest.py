@@ -0,0 +1,108 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## Guard rings generator test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import pytest
+import klayout.db as k
+
+pcell_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, pcell_path)
+
+from cells import gf180mcu  # noqa E402
+from cells.guard_ring import guard_ring, rectangle_box  # noqa E402
+from cells.layers_def import layer  # noqa E402
+
+
+@pytest.mark.parametrize(
+    "size,position,expected",
+    [
+        # sizes are snapped to 2 dbu
+        ((0.501, 0.499), (0, 0), (0, 0, 502, 500)),
+        # a half dbu move is rounded away from zero
+        ((1.0, 1.0), (0.0005, -0.0005), (1, -1, 1001, 999)),
+    ],
+)
+def test_rectangle_box(size, position, expected):
+    """
+    Checks the boxes of the rectangles placed as gdsfactory places them
+
+    Args :
+        size : size of the rectangle
+        position : move of the rectangle
+        expected : left, bottom, right and top of the box in database units
+    """
+
+    assert rectangle_box(size, position) == k.Box(*expected)
+
+
+def test_guard_ring():
+    """
+    Checks the regions and contacts of a guard ring and that it's cached
+    """
+
+    inner = (-1000, -2000, 3000, 4000)
+    ring = guard_ring(inner, 0.36, layer["pplus"], 0.17, 0.22, 0.29, 0.08)
+
+    assert guard_ring(inner, 0.36, layer["pplus"], 0.17, 0.22, 0.29, 0.08) is ring
+    assert ring.outer == k.Box(-1360, -2360, 3360, 4360)
+
+    comp = ring.regions[layer["comp"]]
+    assert comp.area() == ring.outer.area() - ring.inner.area()
+    assert ring.regions[layer["metal1"]] == comp
+    assert (comp.sized(170) - ring.regions[layer["pplus"]]).is_empty()
+
+    for side in range(4):
+        contacts = k.Region(ring.contact(side).box)
+        assert not contacts.is_empty()
+        assert (contacts - comp).is_empty()
+
+
+@pytest.mark.parametrize(
+    "pcell,param",
+    [
+        ("nfet", {"volt": "3.3V", "bulk": "Guard Ring", "deepnwell": 1, "pcmpgr": 1}),
+        ("diode_pw2dw", {"volt": "3.3V", "pcmpgr": 1}),
+        ("diode_dw2ps", {"volt": "5/6V", "pcmpgr": 1}),
+        ("cap_pmos", {"volt": "3.3V", "pcmpgr": 1}),
+        ("ppolyf_u_resistor", {"deepnwell": 1, "pcmpgr": 1}),
+    ],
+)
+def test_pcell_guard_ring(pcell, param):
+    """
+    Checks that the contacts of the guard rings of pcells are covered by metal1
+
+    Args :
+        pcell : name of the pcell
+        param : pcell parameters
+    """
+
+    gf180mcu()
+    lib = k.Library.library_by_name("gf180mcu")
+
+    layout = k.Layout()
+    top = layout.create_cell("TOP")
+    pc = layout.add_pcell_variant(lib, lib.layout().pcell_id(pcell), param)
+    top.insert(k.CellInstArray(pc, k.Trans()))
+    top.flatten(1)
+
+    contacts = k.Region(top.begin_shapes_rec(layout.layer(*layer["contact"])))
+    metal1 = k.Region(top.begin_shapes_rec(layout.layer(*layer["metal1"])))
+
+    assert not contacts.is_empty()
+    assert (contacts - metal1).is_empty()
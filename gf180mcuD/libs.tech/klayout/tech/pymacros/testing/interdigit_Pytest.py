@@ -0,0 +1,106 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## Interdigitated FETs gate routing generator test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import pytest
+import klayout.db as k
+
+pcell_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, pcell_path)
+
+from cells.interdigit import interdigit_plan  # noqa E402
+
+# poly contacts rows of 0.36um fingers at a 0.64um pitch, by gate contacts position
+SD_DIFF = k.DBox(-0.36, 0, 64.36, 1.1)
+PC_Y = {
+    "top": ((1.4, 1.76), (1.4, 1.76)),
+    "bottom": ((-0.66, -0.3), (-0.66, -0.3)),
+    "alternating": ((-0.66, -0.3), (1.4, 1.76)),
+}
+
+
+def poly_contacts(gate_con_pos):
+    """
+    Returns the boxes of the two poly contacts rows
+    """
+    (b1, t1), (b2, t2) = PC_Y[gate_con_pos]
+    return k.DBox(0, b1, 63.64, t1), k.DBox(0.64, b2, 63.0, t2)
+
+
+@pytest.mark.parametrize(
+    "patt,gate_con_pos,expected",
+    [
+        # one array per symbol
+        ("AB" * 50, "top", [(0, 1280, 50), (0, 1280, 50)]),
+        ("AB" * 50, "alternating", [(0, 1280, 50), (0, 1280, 50)]),
+        # the symbols on both poly contacts rows
+        ("AABB" * 25, "bottom", [(0, 2560, 25)] * 4),
+        # uneven fingers are split in evenly spaced arrays
+        ("AAAB", "top", [(0, 1280, 2), (0, 0, 1), (0, 0, 1)]),
+    ],
+)
+def test_interdigit_plan(patt, gate_con_pos, expected):
+    """
+    Checks the finger arrays of the gate routing of the patterns
+
+    Args :
+        patt : pattern of the fingers
+        gate_con_pos : position of the gate contacts
+        expected : (offset, pitch, count) arrays of the finger units in database units
+    """
+
+    plan = interdigit_plan(
+        SD_DIFF,
+        *poly_contacts(gate_con_pos),
+        pc_x=0.36,
+        pc_spacing=1.28,
+        patt=patt,
+        gate_con_pos=gate_con_pos,
+    )
+
+    assert [run for unit in plan.units for run in unit.runs] == expected
+
+    # each finger strap reaches its metal2 track and its via1
+    rails = k.Region()
+    for box, pitch, rows in plan.rails:
+        for i in range(rows):
+            rails.insert(box.moved(0, i * pitch))
+    for unit in plan.units:
+        assert not (k.Region(unit.m1) & rails).is_empty()
+        assert unit.via.origin[0] > unit.m1.left
+
+
+def test_interdigit_labels():
+    """
+    Checks the pattern and gate labels of the fingers
+    """
+
+    plan = interdigit_plan(
+        SD_DIFF,
+        *poly_contacts("top"),
+        pc_x=0.36,
+        pc_spacing=1.28,
+        patt="ABC",
+        gate_con_pos="top",
+        lbl=1,
+        g_lbl=["ga", "gb", "gc"],
+        patt_lbl=1,
+    )
+
+    assert sorted(text for text, _, _ in plan.labels) == ["A", "B", "C", "ga", "gb", "gc"]
@@ -0,0 +1,63 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## PCells gdsfactory cells lifecycle test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import pytest
+import klayout.db as k
+
+pcell_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, pcell_path)
+
+from cells import gf180mcu, arena_stats, kfactory_cell_count  # noqa E402
+
+
+@pytest.mark.parametrize(
+    "pcell,param",
+    [
+        ("nfet", {"volt": "3.3V", "bulk": "Guard Ring", "nf": 2}),
+        ("pfet", {"volt": "5V", "bulk": "Bulk Tie", "deepnwell": 1, "pcmpgr": 1}),
+        ("diode_nd2ps", {"volt": "3.3V"}),
+        ("metal_resistor", {"res_type": "rm1"}),
+    ],
+)
+def test_pcell_kfactory_cells(pcell, param):
+    """
+    Checks that producing pcells doesn't leave cells in the kfactory layout
+
+    Args:
+        pcell : name of the pcell
+        param : pcell parameters
+    """
+
+    gf180mcu()
+    lib = k.Library.library_by_name("gf180mcu")
+
+    counts = []
+    for i in range(3):
+        layout = k.Layout()
+        top = layout.create_cell("TOP")
+        pc = layout.add_pcell_variant(lib, lib.layout().pcell_id(pcell), dict(param, lbl=i % 2))
+        top.insert(k.CellInstArray(pc, k.Trans()))
+        top.flatten(1)
+
+        assert not top.bbox().empty()
+        counts.append(kfactory_cell_count())
+
+    assert counts[0] == counts[-1]
+    assert arena_stats()["deleted_cells"] > 0
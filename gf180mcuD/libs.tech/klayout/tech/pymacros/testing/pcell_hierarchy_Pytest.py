@@ -0,0 +1,95 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## PCells hierarchical output test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import pytest
+import klayout.db as k
+
+pcell_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, pcell_path)
+
+from cells import gf180mcu, flatten_pcell  # noqa E402
+
+
+def draw(pcell, param, keep_arrays):
+    """
+    Returns the layout and the top cell holding the pcell variant
+
+    Args:
+        pcell : name of the pcell
+        param : pcell parameters
+        keep_arrays : keep the contact and via arrays of the pcell
+    """
+
+    lib = k.Library.library_by_name("gf180mcu")
+
+    layout = k.Layout()
+    top = layout.create_cell("TOP")
+    pc = layout.add_pcell_variant(
+        lib, lib.layout().pcell_id(pcell), dict(param, keep_arrays=keep_arrays)
+    )
+    top.insert(k.CellInstArray(pc, k.Trans(k.Trans.R90, 1000, 2000)))
+
+    return layout, top
+
+
+@pytest.mark.parametrize(
+    "pcell,param",
+    [
+        ("nfet", {"volt": "3.3V", "bulk": "Guard Ring", "w_gate": 10, "nf": 3, "lbl": 1,
+                  "sd_lbl": ["s", "d", "s", "d"], "g_lbl": ["g"] * 3, "sub_lbl": "b"}),
+        ("pfet", {"volt": "5V", "bulk": "Bulk Tie", "w_gate": 5, "nf": 2, "backend": "pya"}),
+        ("cap_mim", {"lc": 12, "wc": 9}),
+        ("diode_nd2ps", {"volt": "3.3V", "w": 6, "la": 4}),
+        ("npolyf_s_resistor", {"w_res": 4, "l_res": 10}),
+        ("via_dev", {"base_layer": "comp", "metal_level": "M3", "x_max": 5, "y_max": 3}),
+    ],
+)
+def test_pcell_keep_arrays(pcell, param):
+    """
+    Checks that the pcells keeping their arrays draw the same geometry and labels as the flat pcells
+
+    Args:
+        pcell : name of the pcell
+        param : pcell parameters
+    """
+
+    gf180mcu()
+
+    ly_flat, top_flat = draw(pcell, param, False)
+    ly_arr, top_arr = draw(pcell, param, True)
+
+    flat_cell = ly_flat.cell(top_flat.each_inst().__next__().cell_index)
+    arr_cell = ly_arr.cell(top_arr.each_inst().__next__().cell_index)
+    assert flat_cell.child_cells() == 0
+    assert any(inst.size() > 1 for inst in arr_cell.each_inst())
+
+    # same geometry and labels once flattened, also when flattening the top keeping the arrays
+    flatten_pcell(top_flat)
+    flatten_pcell(top_arr, keep_arrays=True)
+
+    for li in ly_flat.layer_indexes():
+        info = ly_flat.get_info(li)
+        region_flat = k.Region(top_flat.begin_shapes_rec(li))
+        region_arr = k.Region(top_arr.begin_shapes_rec(ly_arr.layer(info)))
+        assert (region_flat ^ region_arr).is_empty(), f"{pcell} differs on layer {info}"
+
+        texts_flat = {(t.text.string, t.text.x, t.text.y) for t in top_flat.shapes(li).each(k.Shapes.STexts)}
+        texts_arr = {(t.text.string, t.text.x, t.text.y) for t in top_arr.shapes(ly_arr.layer(info)).each(k.Shapes.STexts)}
+        assert texts_flat == texts_arr
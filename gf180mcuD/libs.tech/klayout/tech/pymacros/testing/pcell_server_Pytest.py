@@ -0,0 +1,101 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## PCells generation server test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import json
+import pytest
+import threading
+import klayout.db as k
+
+pcell_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, pcell_path)
+
+from pcell_server import PCellGenerator, PCellServer, run_request, send_request  # noqa E402
+
+
+def test_pcell_server(tmp_path, monkeypatch):
+    """
+    Checks the batches generated by the server and its cache of PCell variants
+    """
+
+    socket_path = str(tmp_path / "pcells.sock")
+    server = PCellServer(socket_path, PCellGenerator(cache_size=10))
+    thread = threading.Thread(target=server.serve_until_stopped)
+    thread.start()
+
+    batch = {
+        "top": "BATCH",
+        "cells": [
+            {"pcell": "nfet", "params": {"w_gate": 2, "nf": 2}},
+            {"pcell": "nfet", "params": {"w_gate": 2, "nf": 2}, "position": [20, 0]},
+            {"pcell": "unknown"},
+        ],
+    }
+
+    try:
+        reply, data = send_request(batch, socket_path)
+        assert reply["status"] == "ok"
+        assert reply["cells"] == 2
+        assert [error["index"] for error in reply["errors"]] == [2]
+
+        layout = k.Layout()
+        layout.read_bytes(data)
+        top = layout.top_cell()
+        assert top.name == "BATCH"
+        assert top.child_cells() == 0
+        assert top.dbbox().width() > 20
+
+        # the same batch is copied from the cached variants
+        assert send_request(batch, socket_path)[1] == data
+        stats = send_request({"command": "stats"}, socket_path)[0]
+        assert (stats["cache_misses"], stats["cache_hits"]) == (1, 3)
+
+        output = str(tmp_path / "batch.oas")
+        reply, data = send_request(dict(batch, output=output, flatten=False), socket_path)
+        assert (reply["output"], data) == (output, b"")
+        layout = k.Layout()
+        layout.read(output)
+        assert layout.top_cell().child_cells() == 1
+
+        # a relative output is written by the client from its own working directory
+        reply = send_request(dict(batch, output="batch.gds"), socket_path)[0]
+        assert reply["status"] == "error"
+        input_file = tmp_path / "batch.json"
+        input_file.write_text(json.dumps(dict(batch, output="batch.gds", cells=batch["cells"][:1])))
+        monkeypatch.chdir(tmp_path)
+        run_request(str(input_file), None, socket_path)
+        assert (tmp_path / "batch.gds").exists()
+    finally:
+        send_request({"command": "stop"}, socket_path)
+        thread.join()
+
+    assert not os.path.exists(socket_path)
+
+
+def test_request_without_output(tmp_path):
+    """
+    Checks that a batch without any layout output is rejected before it's sent to the server
+    """
+
+    input_file = tmp_path / "batch.json"
+    input_file.write_text(json.dumps({"cells": [{"pcell": "nfet"}]}))
+
+    with pytest.raises(SystemExit) as e:
+        run_request(str(input_file), None, str(tmp_path / "pcells.sock"))
+    assert e.value.code == 1
@@ -0,0 +1,99 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## PCells parameters sweep test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import json
+import pytest
+import pandas as pd
+import klayout.db as k
+
+pcell_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, pcell_path)
+
+from pcell_sweep import sweep  # noqa E402
+
+PATTERNS = os.path.join(pcell_path, "testing", "patterns", "diodes", "diode_dw2ps_patterns.csv")
+
+
+def read_regions(gds_file):
+    """
+    Returns the regions of the shapes of the top cell of a layout file by layer
+    """
+
+    layout = k.Layout()
+    layout.read(str(gds_file))
+    top = layout.top_cell()
+
+    return {
+        layout.get_info(li).to_s(): k.Region(top.begin_shapes_rec(li))
+        for li in layout.layer_indexes()
+    }
+
+
+@pytest.mark.parametrize("keep_arrays", [False, True])
+def test_sweep(tmp_path, keep_arrays):
+    """
+    Checks the layout, cdl netlist and index of a sweep, and that the workers draw the same layout
+
+    Args :
+        keep_arrays : keep the contact and via arrays of the pcells
+    """
+
+    df = pd.read_csv(PATTERNS).head(6)
+
+    entries = sweep(
+        df,
+        "diode_dw2ps",
+        str(tmp_path / "sweep.gds"),
+        cdl_file=str(tmp_path / "sweep.cdl"),
+        index_file=str(tmp_path / "sweep.json"),
+        device_space=50,
+        keep_arrays=keep_arrays,
+    )
+
+    # three columns of two pcells
+    assert [entry["position"] for entry in entries] == [
+        [x, y] for x in (0, 50, 100) for y in (0, 50)
+    ]
+    for entry in entries:
+        left, bottom, right, top = entry["bbox"]
+        assert left < entry["position"][0] + 50 and bottom < entry["position"][1] + 50
+    assert json.load(open(tmp_path / "sweep.json")) == entries
+
+    cdl = open(tmp_path / "sweep.cdl").read()
+    assert ".SUBCKT diode_dw2ps_pcells" in cdl
+    assert all(f"\n{name} " in cdl for name in df["dev_name"])
+
+    # more chunks than the ones kept in flight by the workers
+    workers_entries = sweep(
+        df,
+        "diode_dw2ps",
+        str(tmp_path / "workers.gds"),
+        device_space=50,
+        keep_arrays=keep_arrays,
+        workers=2,
+        chunk_size=1,
+    )
+    assert workers_entries == entries
+
+    regions = read_regions(tmp_path / "sweep.gds")
+    workers_regions = read_regions(tmp_path / "workers.gds")
+    assert regions.keys() == workers_regions.keys()
+    for name, region in regions.items():
+        assert (region ^ workers_regions[name]).is_empty()
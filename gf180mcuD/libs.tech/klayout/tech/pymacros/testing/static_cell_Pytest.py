@@ -0,0 +1,137 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## PCells static devices test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import pytest
+import klayout.db as k
+
+pcell_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, pcell_path)
+
+from cells import gf180mcu  # noqa E402
+from cells.draw_bjt import draw_bjt  # noqa E402
+from cells.draw_efuse import draw_efuse  # noqa E402
+
+BJT_TYPES = [
+    ("npn_bjt", "npn_10p00x10p00"),
+    ("npn_bjt", "npn_05p00x05p00"),
+    ("npn_bjt", "npn_00p54x16p00"),
+    ("npn_bjt", "npn_00p54x08p00"),
+    ("npn_bjt", "npn_00p54x04p00"),
+    ("npn_bjt", "npn_00p54x02p00"),
+    ("pnp_bjt", "pnp_10p00x10p00"),
+    ("pnp_bjt", "pnp_05p00x05p00"),
+    ("pnp_bjt", "pnp_10p00x00p42"),
+    ("pnp_bjt", "pnp_05p00x00p42"),
+]
+
+
+def read_regions(layout, cell):
+    """
+    Returns the merged region of each layer of a cell and its child cells
+
+    Args :
+        layout : layout of the cell
+        cell : cell to read
+    """
+
+    regions = {}
+    for li in layout.layer_indexes():
+        region = k.Region(cell.begin_shapes_rec(li))
+        if not region.is_empty():
+            info = layout.get_info(li)
+            regions[(info.layer, info.datatype)] = region.merged()
+
+    return regions
+
+
+def check_static_cell(layout, cell, gds_file, cell_name):
+    """
+    Checks that a cell has the same geometry as the cell of its static device GDS file
+
+    Args :
+        layout : layout of the cell
+        cell : cell drawn from the static device
+        gds_file : static device GDS file in the cells package
+        cell_name : name of the cell in the GDS file
+    """
+
+    ref = k.Layout()
+    ref.read(os.path.join(pcell_path, "cells", gds_file))
+    ref_regions = read_regions(ref, ref.cell(cell_name))
+
+    regions = read_regions(layout, cell)
+    assert regions.keys() == ref_regions.keys()
+    for info, region in regions.items():
+        assert (region ^ ref_regions[info]).is_empty(), f"{cell_name} differs on layer {info}"
+
+
+@pytest.mark.parametrize("pcell,bjt_type", BJT_TYPES)
+def test_bjt(pcell, bjt_type):
+    """
+    Checks the BJT pcells against their GDS files
+
+    Args :
+        pcell : name of the pcell
+        bjt_type : name of the BJT cell
+    """
+
+    gf180mcu()
+    lib = k.Library.library_by_name("gf180mcu")
+
+    layout = k.Layout()
+    top = layout.create_cell("TOP")
+    pc = layout.add_pcell_variant(lib, lib.layout().pcell_id(pcell), {"Type": bjt_type})
+    top.insert(k.CellInstArray(pc, k.Trans()))
+    top.flatten(True)
+
+    check_static_cell(layout, top, f"bjt/{bjt_type}.gds", bjt_type)
+
+
+def test_efuse():
+    """
+    Checks the efuse cell against its GDS file
+    """
+
+    layout = k.Layout()
+    check_static_cell(layout, draw_efuse(layout), "efuse/efuse.gds", "efuse_cell")
+
+
+def test_static_cell_reuse():
+    """
+    Checks that a static device is copied once into a layout
+    """
+
+    layout = k.Layout()
+    bjt = draw_bjt(layout, "npn_05p00x05p00")
+    efuse = draw_efuse(layout)
+    cell_count = len(list(layout.each_cell()))
+
+    assert draw_bjt(layout, "npn_05p00x05p00").cell_index() == bjt.cell_index()
+    assert draw_efuse(layout).cell_index() == efuse.cell_index()
+    assert len(list(layout.each_cell())) == cell_count
+
+    # a deleted cell is copied again
+    layout.prune_cell(bjt.cell_index(), -1)
+    assert draw_bjt(layout, "npn_05p00x05p00").name == "npn_05p00x05p00"
+    assert len(list(layout.each_cell())) == cell_count
+
+    # the cells aren't shared with another layout
+    other = k.Layout()
+    assert draw_bjt(other, "npn_05p00x05p00").layout() is other
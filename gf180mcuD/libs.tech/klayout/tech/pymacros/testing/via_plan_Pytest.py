@@ -0,0 +1,55 @@
+# Copyright 2025 GlobalFoundries PDK Authors
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+########################################################################################################################
+## Via arrays planner test for Klayout of GF180MCU
+########################################################################################################################
+
+import os
+import sys
+import pytest
+
+pcell_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, pcell_path)
+
+from cells.via_plan import via_array_plan  # noqa E402
+
+
+@pytest.mark.parametrize(
+    "x_range,y_range,expected",
+    [
+        # one via at least, centered
+        ((0, 0.1), (0, 0.1), (1, 1, (-60, -60))),
+        # contacts of a 1um wide diffusion
+        ((0, 1.0), (0, 0.36), (2, 1, (155, 70))),
+        # exact fit of 10 pitches, the float computation used to drop a row
+        ((0, 0.36), (2.1, 6.8), (1, 10, (70, 2225))),
+        # a half database unit margin is rounded down
+        ((0, 0.437), (-0.873, 0.5), (1, 2, (108, -532))),
+    ],
+)
+def test_via_array_plan(x_range, y_range, expected):
+    """
+    Checks the columns, rows and origin of via arrays of 0.22um contacts
+
+    Args:
+        x_range : range of the array in x
+        y_range : range of the array in y
+        expected : columns, rows and origin of the array in database units
+    """
+
+    plan = via_array_plan(x_range, y_range, (0.22, 0.22), (0.07, 0.07), (0.25, 0.25))
+
+    assert (plan.columns, plan.rows, plan.origin) == expected
+    assert plan.pitch == (470, 470)